@@ -9,16 +9,30 @@ Destinations are random (Paris / Tokyo / New York).  The script
 submits every known city name so at least one answer is correct
 regardless of which destination the server picks.  Scoring is
 validated against the actual reveal data.
+
+Two WebSocket transports are available (``--transport``):
+
+  thread   websocket-client, one ``run_forever`` thread per connection
+           (default; fine for a handful of clients)
+  asyncio  ``websockets`` on the test's own event loop, no threads; use
+           this when simulating hundreds or thousands of connections
 """
 
+import argparse
 import asyncio
 import json
+import socket
 import time
 import sys
 import datetime
+import functools
+import threading
 import urllib.request
 import urllib.error
-from websocket import WebSocketApp          # websocket-client (sync)
+
+from e2e_capture import MessageLog, SpillWriter
+from e2e_delta import SNAPSHOT_MODES, DeltaTracker
+from e2e_stats import LatencyRecorder, estimate_clock_offset, format_event_table
 
 # ---------------------------------------------------------------------------
 # CONFIG
@@ -27,56 +41,209 @@ BACKEND  = "http://localhost:3000"
 AI_URL   = "http://localhost:3001"
 WS_BASE  = "ws://localhost:3000/ws"
 STEP_TIMEOUT_S = 20   # seconds per step before FAIL (ROUND_INTRO can be slow)
+WS_TRANSPORT   = "thread"   # "thread" (websocket-client) | "asyncio" (websockets)
+TRANSPORTS     = ("thread", "asyncio")
+CAPTURE_WINDOW = None       # messages kept in memory per client (None = all)
+TIME_SCALE     = None       # backend pacing compression (needs ALLOW_TIME_SCALE=true), None = real time
+SNAPSHOT_MODE  = "full"     # "full" | "delta" (versioned STATE_PATCH, see e2e_delta.py)
 
 # All possible correct answers (one will match the random destination)
 KNOWN_CITIES = ["Paris", "Tokyo", "New York"]
 
 # ---------------------------------------------------------------------------
-# SHARED STATE  (written by WS threads, read by main loop via asyncio)
+# EVENT FILTERS  (compiled once per wait, not once per message)
+# ---------------------------------------------------------------------------
+@functools.lru_cache(maxsize=None)
+def _split_key(key: str) -> tuple[str, ...]:
+    # dot-notation for nested keys: "payload.state.phase"
+    return tuple(key.split("."))
+
+class EventFilter:
+    """Event type + pre-split dot-notation filters; call it with a message."""
+    __slots__ = ("event_type", "checks")
+
+    def __init__(self, event_type: str, filters: dict | None = None):
+        self.event_type = event_type
+        self.checks     = tuple((_split_key(k), v) for k, v in (filters or {}).items())
+
+    def __call__(self, msg: dict) -> bool:
+        for path, want in self.checks:
+            node = msg
+            for p in path:
+                if isinstance(node, dict):
+                    node = node.get(p)
+                else:
+                    node = None
+                    break
+            if node != want:
+                return False
+        return True
+
+# ---------------------------------------------------------------------------
+# SHARED STATE  (mutated on the event loop only)
 # ---------------------------------------------------------------------------
 class Client:
     """One WS connection – host or player."""
-    def __init__(self, name: str, role: str):
+    def __init__(self, name: str, role: str, transport: str = WS_TRANSPORT,
+                 quiet: bool = False, window: int | None = CAPTURE_WINDOW,
+                 spill: SpillWriter | None = None, snapshots: str = SNAPSHOT_MODE,
+                 connect_kwargs: dict | None = None):
+        if transport not in TRANSPORTS:
+            raise ValueError(f"unknown transport {transport!r} (expected one of {TRANSPORTS})")
+        if snapshots not in SNAPSHOT_MODES:
+            raise ValueError(f"unknown snapshot mode {snapshots!r} (expected one of {SNAPSHOT_MODES})")
         self.name        = name
         self.role        = role
+        self.transport   = transport
+        self.quiet       = quiet         # suppress per-socket close/error prints (load runs)
         self.player_id   = None          # set after REST join
         self.token       = None          # JWT from REST
         self.session_id  = None
-        self.ws          = None          # WebSocketApp instance
+        self.ws          = None          # WebSocketApp (thread) or client connection (asyncio)
         self.connected   = asyncio.Event()   # set when WELCOME received
-        self.messages    = []            # all received messages (append-only)
+        self.messages    = MessageLog(window, spill, name)   # received, oldest first
+        self._waiters    = {}            # event type -> [(EventFilter, Future)]
+        self.observers   = []            # callables (client, msg, recv_ms), e.g. LatencyRecorder
+        self.taps        = []            # callables (client, outgoing, raw), e.g. TraceWriter
         self.loop        = None          # the asyncio event loop (set before run)
+        self._task       = None          # reader task (asyncio transport only)
+        self._outbox     = None          # asyncio.Queue of outgoing frames (asyncio transport only)
+        self._open       = False         # socket open (asyncio transport only)
+        self.delta       = DeltaTracker(self) if snapshots == "delta" else None
+        self.rx_bytes    = 0             # received frame bytes
+        self.wire_rx_bytes = 0           # bytes read off the socket (asyncio transport only)
+        self.connect_kwargs = connect_kwargs or {}   # extra websockets.connect options (asyncio)
+        self.decode_ns   = 0             # json.loads + patch apply time
 
     # ------------------------------------------------------------------
-    # WebSocketApp callbacks  (run in WS thread)
+    # WebSocketApp callbacks  (run in WS thread; asyncio transport calls
+    # them directly from the reader task)
     # ------------------------------------------------------------------
     def _on_open(self, ws):
         pass   # WELCOME is the real signal
 
     def _on_message(self, ws, raw):
+        recv_ms = time.time() * 1000     # wall clock, comparable with serverTimeMs
+        for tap in self.taps:
+            tap(self, False, raw)
+        t0 = time.perf_counter_ns()
         msg = json.loads(raw)
-        self.messages.append(msg)
-        if msg.get("type") == "WELCOME":
-            # Signal from WS thread -> asyncio
-            self.loop.call_soon_threadsafe(self.connected.set)
+        self.decode_ns += time.perf_counter_ns() - t0
+        self.rx_bytes  += len(raw.encode()) if isinstance(raw, str) else len(raw)
+        if self.transport == "asyncio":
+            self._ingest(msg, recv_ms)
+        else:
+            # Hand over from WS thread -> asyncio; the store is loop-only
+            self.loop.call_soon_threadsafe(self._ingest, msg, recv_ms)
 
     def _on_error(self, ws, err):
-        print(f"  [WS-ERR] {self.name}: {err}")
+        if not self.quiet:
+            print(f"  [WS-ERR] {self.name}: {err}")
 
     def _on_close(self, ws, code, reason):
-        print(f"  [WS-CLOSE] {self.name}: code={code} reason={reason}")
+        if not self.quiet:
+            print(f"  [WS-CLOSE] {self.name}: code={code} reason={reason}")
+
+    def _ingest(self, msg: dict, recv_ms: float):
+        """Store a decoded message and wake any waiter it satisfies."""
+        event_type = msg.get("type")
+        for observe in self.observers:
+            observe(self, msg, recv_ms)
+        if self.delta:
+            t0 = time.perf_counter_ns()
+            msg = self.delta.on_message(msg)
+            self.decode_ns += time.perf_counter_ns() - t0
+            if msg is None:
+                return
+            event_type = msg.get("type")
+        self.messages.append(msg, recv_ms)
+        if event_type == "WELCOME":
+            self.connected.set()
+        waiters = self._waiters.get(event_type)
+        if waiters:
+            for flt, fut in list(waiters):
+                if not fut.done() and flt(msg):
+                    fut.set_result(msg)
+                    waiters.remove((flt, fut))
+
+    # ------------------------------------------------------------------
+    # asyncio transport  (single event loop, no thread per socket)
+    # ------------------------------------------------------------------
+    async def _run_asyncio(self, url: str):
+        """Connect, pump the outbox and feed received frames to _on_message."""
+        import websockets   # only needed for --transport asyncio
+
+        writer = None
+        try:
+            async with websockets.connect(
+                url,
+                open_timeout=STEP_TIMEOUT_S,
+                max_size=None,        # STATE_SNAPSHOT grows with player count
+                ping_interval=None,   # keepalive pings would skew timings at scale
+                create_connection=self._counting_connection(websockets.ClientConnection),
+                **self.connect_kwargs,
+            ) as conn:
+                self.ws    = conn
+                self._open = True
+                # Frames can arrive in the same read as the 101 response
+                self.wire_rx_bytes -= len(conn.response.serialize())
+                self._on_open(conn)
+                writer = asyncio.create_task(self._drain_outbox(conn))
+                try:
+                    async for raw in conn:
+                        self._on_message(conn, raw)
+                except websockets.ConnectionClosed:
+                    pass
+                self._open = False
+                self._on_close(conn, conn.close_code, conn.close_reason)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._on_error(self.ws, e)
+        finally:
+            self._open = False
+            if writer:
+                writer.cancel()
+
+    def _counting_connection(self, base):
+        """Connection class that adds every byte read off the socket to wire_rx_bytes."""
+        client = self
+
+        class CountingConnection(base):
+            def data_received(self, data: bytes):
+                client.wire_rx_bytes += len(data)
+                super().data_received(data)
+
+        return CountingConnection
+
+    async def _drain_outbox(self, conn):
+        """Send queued frames in order; send() itself stays synchronous."""
+        while True:
+            data = await self._outbox.get()
+            await conn.send(data)
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
     def send(self, payload: dict):
-        """Thread-safe send."""
-        self.ws.send(json.dumps(payload))
+        """Thread-safe send (asyncio transport: queued, sent in order)."""
+        data = json.dumps(payload)
+        for tap in self.taps:
+            tap(self, True, data)
+        if self.transport == "asyncio":
+            self._outbox.put_nowait(data)
+        else:
+            self.ws.send(data)
 
     def start(self, loop: asyncio.AbstractEventLoop):
-        """Spin up WebSocketApp in a background thread."""
+        """Open the WebSocket: a background thread (thread) or a task (asyncio)."""
         self.loop = loop
-        url = f"{WS_BASE}?token={self.token}"
+        url = f"{WS_BASE}?token={self.token}" + ("&snapshots=delta" if self.delta else "")
+        if self.transport == "asyncio":
+            self._outbox = asyncio.Queue()
+            self._task   = loop.create_task(self._run_asyncio(url))
+            return
+        from websocket import WebSocketApp          # websocket-client (sync)
         self.ws = WebSocketApp(
             url,
             on_open=self._on_open,
@@ -84,39 +251,70 @@ class Client:
             on_error=self._on_error,
             on_close=self._on_close,
         )
-        import threading
         t = threading.Thread(target=self.ws.run_forever, daemon=True)
         t.start()
 
     def close(self):
+        self.messages.drain()
+        if self.transport == "asyncio":
+            if self.ws and self._open:
+                self.loop.create_task(self.ws.close())
+            elif self._task:
+                self._task.cancel()
+            return
         if self.ws:
             self.ws.close()
 
-    def has_event(self, event_type: str, **filters) -> dict | None:
-        """Return first message matching type + optional payload filters."""
-        for m in self.messages:
-            if m.get("type") != event_type:
-                continue
-            match = True
-            for k, v in filters.items():
-                # dot-notation for nested keys: "payload.state.phase"
-                parts = k.split(".")
-                node = m
-                for p in parts:
-                    if isinstance(node, dict):
-                        node = node.get(p)
-                    else:
-                        node = None
-                        break
-                if node != v:
-                    match = False
-                    break
-            if match:
+    def kill(self):
+        """Drop the TCP connection without a close handshake (simulated network loss)."""
+        if self.transport == "asyncio":
+            if self.ws and self._open:
+                self.ws.transport.abort()
+            elif self._task:
+                self._task.cancel()
+            return
+        sock = self.ws.sock if self.ws else None
+        if sock and sock.sock:
+            sock.sock.shutdown(socket.SHUT_RDWR)
+
+    @property
+    def alive(self) -> bool:
+        """True while the underlying socket is open."""
+        if self.transport == "asyncio":
+            return self._open
+        return bool(self.ws and self.ws.sock)
+
+    def find(self, flt: EventFilter) -> dict | None:
+        """Return the first stored message matching a compiled filter."""
+        for m in self.messages.of_type(flt.event_type):
+            if flt(m):
                 return m
         return None
 
+    def has_event(self, event_type: str, **filters) -> dict | None:
+        """Return first message matching type + optional payload filters."""
+        return self.find(EventFilter(event_type, filters))
+
     def all_events(self, event_type: str) -> list[dict]:
-        return [m for m in self.messages if m.get("type") == event_type]
+        return list(self.messages.of_type(event_type))
+
+    def latest(self, event_type: str) -> dict | None:
+        return self.messages.latest(event_type)
+
+    async def wait_for(self, flt: EventFilter) -> dict:
+        """Resolve with the first message matching flt, already stored or not."""
+        found = self.find(flt)
+        if found is not None:
+            return found
+        fut = asyncio.get_running_loop().create_future()
+        entry = (flt, fut)
+        waiters = self._waiters.setdefault(flt.event_type, [])
+        waiters.append(entry)
+        try:
+            return await fut
+        finally:
+            if entry in waiters:
+                waiters.remove(entry)
 
 # ---------------------------------------------------------------------------
 # REST helpers  (synchronous – fine for setup)
@@ -136,6 +334,10 @@ def _get(url: str) -> dict:
     with urllib.request.urlopen(url) as resp:
         return json.loads(resp.read().decode())
 
+def create_session(time_scale: float | None = None) -> dict:
+    """POST /v1/sessions, asking for an accelerated server clock when time_scale is set."""
+    return _post(f"{BACKEND}/v1/sessions", {"timeScale": time_scale} if time_scale else None)
+
 # ---------------------------------------------------------------------------
 # TEST RESULTS
 # ---------------------------------------------------------------------------
@@ -149,42 +351,60 @@ class Results:
         print(f"  [{tag}] {name} ({elapsed_ms} ms)  {detail}")
 
 # ---------------------------------------------------------------------------
-# WAIT HELPER  – poll clients for an event within timeout
+# WAIT HELPERS  – resolve the moment a matching message lands (no polling)
 # ---------------------------------------------------------------------------
 async def wait_for_event(
     clients: list[Client],
     event_type: str,
     timeout_s: float = STEP_TIMEOUT_S,
-    poll_interval: float = 0.1,
     **filters,
 ) -> dict | None:
     """Block until ALL clients have a matching event (or timeout)."""
-    deadline = time.monotonic() + timeout_s
-    while time.monotonic() < deadline:
-        if all(c.has_event(event_type, **filters) for c in clients):
-            return clients[0].has_event(event_type, **filters)
-        await asyncio.sleep(poll_interval)
-    return None   # timeout
+    flt = EventFilter(event_type, filters)
+    try:
+        found = await asyncio.wait_for(
+            asyncio.gather(*(c.wait_for(flt) for c in clients)), timeout_s)
+    except asyncio.TimeoutError:
+        return None   # timeout
+    return found[0]
 
 async def wait_for_event_any(
     client: Client,
     event_type: str,
     timeout_s: float = STEP_TIMEOUT_S,
-    poll_interval: float = 0.1,
     **filters,
 ) -> dict | None:
     """Block until ONE client has a matching event."""
-    deadline = time.monotonic() + timeout_s
-    while time.monotonic() < deadline:
-        if client.has_event(event_type, **filters):
-            return client.has_event(event_type, **filters)
-        await asyncio.sleep(poll_interval)
-    return None
+    try:
+        return await asyncio.wait_for(
+            client.wait_for(EventFilter(event_type, filters)), timeout_s)
+    except asyncio.TimeoutError:
+        return None
+
+async def wait_for_first(
+    client: Client,
+    event_types: list[str],
+    timeout_s: float = STEP_TIMEOUT_S,
+) -> tuple[str | None, dict | None]:
+    """Block until the client has any of event_types; return (type, message)."""
+    tasks = {asyncio.ensure_future(client.wait_for(EventFilter(t))): t for t in event_types}
+    done, pending = await asyncio.wait(tasks, timeout=timeout_s,
+                                       return_when=asyncio.FIRST_COMPLETED)
+    for t in pending:
+        t.cancel()
+    if not done:
+        return None, None
+    # Several may land in the same tick; honour the caller's priority order
+    for task, event_type in tasks.items():
+        if task in done:
+            return event_type, task.result()
+    return None, None
 
 # ---------------------------------------------------------------------------
 # MAIN TEST
 # ---------------------------------------------------------------------------
-async def run_test():
+async def run_test(transport: str = WS_TRANSPORT, recorder: LatencyRecorder | None = None,
+                   trace=None, time_scale: float | None = TIME_SCALE):
     results = Results()
     loop = asyncio.get_event_loop()
 
@@ -207,7 +427,7 @@ async def run_test():
     # ====================================================================
     t0 = time.monotonic()
     try:
-        session_resp = _post(f"{BACKEND}/v1/sessions")
+        session_resp = create_session(time_scale)
         session_id   = session_resp["sessionId"]
         join_code    = session_resp["joinCode"]
         results.record("2. Session creation", True,
@@ -221,8 +441,8 @@ async def run_test():
     # STEP 3 — Join as host + 3 players via REST
     # ====================================================================
     t0 = time.monotonic()
-    host = Client("Host", "host")
-    players = [Client(f"Player{i+1}", "player") for i in range(3)]
+    host = Client("Host", "host", transport)
+    players = [Client(f"Player{i+1}", "player", transport) for i in range(3)]
 
     try:
         # Host joins with role=host to claim the host slot
@@ -252,6 +472,10 @@ async def run_test():
     t0 = time.monotonic()
     all_clients = [host] + players
     for c in all_clients:
+        if recorder:
+            c.observers.append(recorder)
+        if trace:
+            trace.attach(c)
         c.start(loop)
 
     # Wait for all WELCOME events
@@ -285,7 +509,7 @@ async def run_test():
     lobby_ok = await wait_for_event(all_clients, "LOBBY_UPDATED")
     if lobby_ok:
         # Count connected players in the latest LOBBY_UPDATED on host
-        latest_lobby = host.all_events("LOBBY_UPDATED")[-1] if host.all_events("LOBBY_UPDATED") else lobby_ok
+        latest_lobby = host.latest("LOBBY_UPDATED") or lobby_ok
         player_count = len(latest_lobby.get("payload", {}).get("players", []))
         results.record("5. LOBBY_UPDATED seen by all", player_count >= 3,
                        f"players_in_lobby={player_count}",
@@ -535,15 +759,10 @@ async def run_test():
     t0 = time.monotonic()
     # After reveal the server either starts followups or goes straight to scoreboard.
     # Wait for either SCOREBOARD_UPDATE or FOLLOWUP_QUESTION_PRESENT.
-    scoreboard_evt = None
-    followup_evt   = None
-    deadline = time.monotonic() + STEP_TIMEOUT_S
-    while time.monotonic() < deadline:
-        scoreboard_evt = host.has_event("SCOREBOARD_UPDATE")
-        followup_evt   = host.has_event("FOLLOWUP_QUESTION_PRESENT")
-        if scoreboard_evt or followup_evt:
-            break
-        await asyncio.sleep(0.1)
+    first_type, first_evt = await wait_for_first(
+        host, ["SCOREBOARD_UPDATE", "FOLLOWUP_QUESTION_PRESENT"])
+    scoreboard_evt = first_evt if first_type == "SCOREBOARD_UPDATE" else None
+    followup_evt   = first_evt if first_type == "FOLLOWUP_QUESTION_PRESENT" else None
 
     if scoreboard_evt:
         sb = scoreboard_evt["payload"].get("scoreboard", [])
@@ -557,13 +776,8 @@ async def run_test():
         # Let followups run out via server timer (15 s each, max 2 questions)
         # We just wait for the eventual SCOREBOARD_UPDATE
         print("    [INFO] Waiting for followup sequence to complete (server-timed)...")
-        scoreboard_evt = None
-        fq_deadline = time.monotonic() + 60   # 60 s max for 2 * 15 s questions + overhead
-        while time.monotonic() < fq_deadline:
-            scoreboard_evt = host.has_event("SCOREBOARD_UPDATE")
-            if scoreboard_evt:
-                break
-            await asyncio.sleep(0.5)
+        # 60 s max for 2 * 15 s questions + overhead
+        scoreboard_evt = await wait_for_event_any(host, "SCOREBOARD_UPDATE", timeout_s=60)
         if scoreboard_evt:
             sb = scoreboard_evt["payload"].get("scoreboard", [])
             results.record("13b. SCOREBOARD_UPDATE after followups", True,
@@ -581,14 +795,16 @@ async def run_test():
     # STEP 14 — Validate scoreboard from STATE_SNAPSHOT (all 4 consistent)
     # ====================================================================
     t0 = time.monotonic()
+    # Waits resolve on the host's copy; let every client catch up to the same
+    # broadcast before comparing their latest snapshots.
+    await wait_for_event(all_clients, "SCOREBOARD_UPDATE", timeout_s=5)
     # Get the latest STATE_SNAPSHOT from each client; check scoreboard presence
     all_have_scoreboard = True
     for c in all_clients:
-        snapshots = c.all_events("STATE_SNAPSHOT")
-        if not snapshots:
+        latest = c.latest("STATE_SNAPSHOT")
+        if not latest:
             all_have_scoreboard = False
             break
-        latest = snapshots[-1]
         sb = latest.get("payload", {}).get("state", {}).get("scoreboard", None)
         if sb is None:
             all_have_scoreboard = False
@@ -596,7 +812,7 @@ async def run_test():
 
     results.record("14. All 4 WS alive + scoreboard in latest snapshot",
                    all_have_scoreboard,
-                   f"connections_ok={all(c.ws and c.ws.sock for c in all_clients)}",
+                   f"connections_ok={all(c.alive for c in all_clients)}",
                    int((time.monotonic()-t0)*1000))
 
     # ====================================================================
@@ -605,9 +821,9 @@ async def run_test():
     t0 = time.monotonic()
     scoreboards_raw = []
     for c in all_clients:
-        snapshots = c.all_events("STATE_SNAPSHOT")
-        if snapshots:
-            sb = snapshots[-1].get("payload", {}).get("state", {}).get("scoreboard", [])
+        latest = c.latest("STATE_SNAPSHOT")
+        if latest:
+            sb = latest.get("payload", {}).get("state", {}).get("scoreboard", [])
             # Normalise: sort by playerId for comparison
             scoreboards_raw.append(sorted([(e["playerId"], e["score"]) for e in sb]))
         else:
@@ -671,14 +887,58 @@ def write_report(results: Results):
 # ---------------------------------------------------------------------------
 # ENTRY POINT
 # ---------------------------------------------------------------------------
+def raise_fd_limit():
+    """Lift the soft open-files limit to the hard limit (one fd per socket)."""
+    try:
+        import resource
+    except ImportError:   # not available on Windows
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        target = hard if hard != resource.RLIM_INFINITY else max(soft, 65536)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+        except (ValueError, OSError):
+            pass
+
 def main():
+    parser = argparse.ArgumentParser(description="TASK-601 E2E integration test")
+    parser.add_argument("--transport", choices=TRANSPORTS, default=WS_TRANSPORT,
+                        help="WebSocket transport (default: %(default)s)")
+    parser.add_argument("--record", default=None, metavar="PATH",
+                        help="record every WS frame to a trace (see e2e_trace.py)")
+    parser.add_argument("--time-scale", type=float, default=TIME_SCALE,
+                        help="compress server pacing by this factor (backend needs ALLOW_TIME_SCALE=true)")
+    parser.add_argument("--report", default=None, metavar="PATH",
+                        help="also write the step table as markdown to this path")
+    parser.add_argument("--json", dest="json_path", default=None, metavar="PATH",
+                        help="also write steps and event latencies as JSON to this path")
+    args = parser.parse_args()
+
     print("=" * 70)
     print("  TASK-601 — E2E Integration Test")
     print("  Backend: http://localhost:3000 | AI: http://localhost:3001")
+    print(f"  Transport: {args.transport}"
+          + (f" | time scale: {args.time_scale}x" if args.time_scale else ""))
     print("=" * 70)
     print()
 
-    results = asyncio.run(run_test())
+    if args.transport == "asyncio":
+        raise_fd_limit()
+    try:
+        offset_ms, _ = estimate_clock_offset(BACKEND)
+    except Exception:
+        offset_ms = 0.0   # health check in run_test reports the real problem
+    recorder = LatencyRecorder(offset_ms)
+    trace = None
+    if args.record:
+        from e2e_trace import TraceWriter   # e2e_trace imports this module
+        trace = TraceWriter(args.record)
+    try:
+        results = asyncio.run(run_test(args.transport, recorder, trace, args.time_scale))
+    finally:
+        if trace:
+            trace.close()
 
     print()
     print("=" * 70)
@@ -686,13 +946,19 @@ def main():
     total      = len(results.steps)
     print(f"  FINAL: {pass_count} / {total} PASS")
     print("=" * 70)
-
-    # Write report
-    report_path = "/Users/oskar/pa-sparet-party/docs/sprint-1-test-checklist.md"
-    report_text = write_report(results)
-    with open(report_path, "w") as f:
-        f.write(report_text)
-    print(f"\n  Report written to {report_path}")
+    print()
+    print("  Server-emit → client-receive latency (ms) per event type")
+    print(format_event_table(recorder.summary()))
+
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write(write_report(results))
+        print(f"\n  Report written to {args.report}")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"passed": pass_count, "total": total, "steps": results.steps,
+                       "events": recorder.summary()}, f, indent=2)
+        print(f"\n  Summary written to {args.json_path}")
 
     sys.exit(0 if pass_count == total else 1)
 
@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite — named scenarios, repeated runs, stored baselines.
+
+Runs each scenario for --warmup discarded iterations and then --iterations
+measured ones against one backend, merges every latency histogram over
+the measured iterations and writes machine-readable JSON with environment
+metadata (host, Python, git commit, backend health, settings).  `compare`
+diffs a result file against a stored baseline and exits 1 when any
+metric's p95 regressed by more than --threshold percent.
+
+Scenarios (each reuses the matching harness script):
+
+  single_game       e2e_601.run_test — one full game loop, per-step
+                    elapsed ms and server-emit → receive latency per event
+  join_storm        e2e_join_storm.run_storm — REST latency per endpoint
+  brake_burst       e2e_brake.run_level — BRAKE_PULL accept / reject
+                    latency and burst resolution
+  reconnect_storm   e2e_reconnect.run_wave — reconnect / recovery / outage
+                    per storm phase
+  followup_burst    every player of every session submits the follow-up
+                    answer at one shared instant; submit → answeredByMe
+                    snapshot latency and burst resolution
+  snapshot_fanout   one session per connection count (4 → 64) plays the
+                    clue ladder; per STATE_SNAPSHOT broadcast: projection
+                    cost, whole fan-out and per-recipient cost, from the
+                    backend's GET /metrics (projection should stay flat)
+
+An iteration fails when its scenario's own invariants fail (same rules as
+the standalone scripts' exit codes); failed iterations are counted but
+their latencies are still merged.
+
+Usage:
+  python3 docs/e2e_bench.py run --out bench.json
+  python3 docs/e2e_bench.py run single_game brake_burst --iterations 10 --warmup 2
+  python3 docs/e2e_bench.py run --time-scale 20 --out nightly.json --baseline baseline.json
+  python3 docs/e2e_bench.py compare nightly.json baseline.json --threshold 15
+  python3 docs/e2e_bench.py list
+
+Accelerated runs (--time-scale) need ALLOW_TIME_SCALE=true on the backend;
+reconnect_storm creates its sessions at the backend's default pacing (set
+TIME_SCALE on the backend to speed it up too).  Only compare results
+recorded with the same settings (compare warns when they differ).
+"""
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from e2e_601 import (
+    BACKEND,
+    Client,
+    _get,
+    _post,
+    create_session,
+    raise_fd_limit,
+    run_test,
+    wait_for_event,
+)
+from e2e_brake import BurstGate, run_level
+from e2e_join_storm import StormClient, run_storm
+from e2e_load import _cmd, _require
+from e2e_metrics import fetch_metrics, timing_window
+from e2e_reconnect import STORM_PHASES, SoakStats, run_wave
+from e2e_stats import Histogram, LatencyRecorder, estimate_clock_offset
+
+# ---------------------------------------------------------------------------
+# CONFIG
+# ---------------------------------------------------------------------------
+SCHEMA_VERSION     = 1
+DEFAULT_ITERATIONS = 5
+DEFAULT_WARMUP     = 1
+DEFAULT_THRESHOLD  = 10.0       # % p95 increase that fails compare
+DEFAULT_MIN_DELTA  = 1.0        # ms; smaller absolute p95 increases are noise
+FOLLOWUP_TIMEOUT_S = 60         # reveal → first FOLLOWUP_QUESTION_PRESENT
+ACK_TIMEOUT_S      = 10         # max wait for every answer of one burst
+MAX_PROJECTIONS    = 3          # per snapshot broadcast: one per role (host / tv / player)
+
+# Per-scenario parameters (small enough that one iteration takes seconds
+# with --time-scale, and about a game's length without)
+SCENARIO_PARAMS = {
+    "single_game":     {"transport": "asyncio"},
+    "join_storm":      {"sessions": 10, "players": 40, "host_claims": 4, "concurrency": 64},
+    "brake_burst":     {"sessions": 4, "players": 8, "clues": 5, "window_ms": 2.0,
+                        "transport": "asyncio"},
+    "reconnect_storm": {"sessions": 4, "players": 6, "fraction": 0.5, "down_ms": 500,
+                        "phases": list(STORM_PHASES), "transport": "asyncio"},
+    "followup_burst":  {"sessions": 4, "players": 8, "window_ms": 2.0, "transport": "asyncio"},
+    "snapshot_fanout": {"connections": [4, 16, 64], "transport": "asyncio"},
+}
+
+# ---------------------------------------------------------------------------
+# ITERATION RESULT
+# ---------------------------------------------------------------------------
+class Sample:
+    """Outcome of one scenario iteration: pass/fail plus named latency histograms."""
+
+    def __init__(self):
+        self.ok      = True
+        self.metrics: dict[str, Histogram] = {}
+        self.notes:   list[str] = []
+
+    def hist(self, name: str) -> Histogram:
+        return self.metrics.setdefault(name, Histogram())
+
+    def add(self, name: str, h: Histogram):
+        if h.total:
+            self.hist(name).merge(h)
+
+    def fail(self, note: str):
+        self.ok = False
+        self.notes.append(note)
+
+# ---------------------------------------------------------------------------
+# SCENARIOS
+# ---------------------------------------------------------------------------
+def _single_game(params: dict, time_scale: float | None) -> Sample:
+    sample = Sample()
+    try:
+        offset_ms, _ = estimate_clock_offset(BACKEND)
+    except Exception:
+        offset_ms = 0.0
+    recorder = LatencyRecorder(offset_ms)
+    t0 = time.monotonic()
+    with contextlib.redirect_stdout(io.StringIO()):   # run_test narrates every step
+        results = asyncio.run(run_test(params["transport"], recorder, None, time_scale))
+    sample.hist("game_ms").record((time.monotonic() - t0) * 1000)
+    for step in results.steps:
+        if step["elapsed_ms"]:
+            sample.hist(f"step:{step['name']}").record(step["elapsed_ms"])
+        if step["result"] != "PASS":
+            sample.fail(f"{step['name']}: {step['detail']}")
+    for event_type, h in recorder.latency.items():
+        sample.add(f"event:{event_type}", h)
+    return sample
+
+def _join_storm(params: dict, time_scale: float | None) -> Sample:
+    sample = Sample()
+    client = StormClient(params["concurrency"])
+    summary = run_storm(params["sessions"], params["players"], params["host_claims"],
+                        params["concurrency"], client=client)
+    for endpoint, st in client.stats.items():
+        sample.add(f"http:{endpoint}", st.latency)
+    for stage, st in summary["stages"].items():
+        sample.hist(f"stage:{stage}_ms").record(st["wall_s"] * 1000)
+    if summary["violations"]:
+        sample.fail(f"violations {summary['violations']}")
+    if summary["created"] != summary["sessions"]:
+        sample.fail(f"created {summary['created']}/{summary['sessions']} sessions")
+    return sample
+
+def _brake_burst(params: dict, time_scale: float | None) -> Sample:
+    sample = Sample()
+    stats = asyncio.run(run_level(params["sessions"], params["players"], params["clues"],
+                                  params["window_ms"], params["transport"],
+                                  time_scale=time_scale))
+    sample.add("brake:accept_ms", stats.accept_ms)
+    sample.add("brake:reject_ms", stats.reject_ms)
+    sample.add("brake:resolve_ms", stats.resolve_ms)
+    if stats.violations:
+        sample.fail(f"violations {dict(stats.violations)}")
+    if stats.games_failed:
+        sample.fail(f"{stats.games_failed} games failed {dict(stats.failures)}")
+    return sample
+
+def _reconnect_storm(params: dict, time_scale: float | None) -> Sample:
+    sample = Sample()
+    stats = SoakStats()
+    asyncio.run(run_wave(params["sessions"], params["players"], set(params["phases"]),
+                         params["fraction"], params["down_ms"], stats, params["transport"]))
+    for phase, st in stats.phases.items():
+        if not st.storms:
+            continue
+        sample.add(f"{phase}:reconnect_ms", st.reconnect_ms)
+        sample.add(f"{phase}:recovery_ms", st.recovery_ms)
+        sample.add(f"{phase}:outage_ms", st.outage_ms)
+        if st.mismatches:
+            sample.fail(f"{phase}: {len(st.mismatches)} clients disagree with the host")
+        if st.recovered < st.dropped:
+            sample.fail(f"{phase}: {st.dropped - st.recovered} drops never recovered")
+    if stats.games_failed:
+        sample.fail(f"{stats.games_failed} games failed {dict(stats.failures)}")
+    return sample
+
+# --- follow-up answer burst ------------------------------------------------
+class AnswerWatch:
+    """
+    Player observer for one follow-up burst: the first reply each armed
+    player gets — its answeredByMe STATE_SNAPSHOT or an ERROR.
+    """
+
+    def __init__(self):
+        self.replies: dict[str, tuple] = {}   # player id -> (accepted, recv_ms)
+        self._expect: set[str] = set()
+        self._done: asyncio.Future | None = None
+
+    def arm(self, player_ids: set[str]) -> asyncio.Future:
+        self.replies = {}
+        self._expect = set(player_ids)
+        self._done = asyncio.get_running_loop().create_future()
+        return self._done
+
+    def __call__(self, client, msg: dict, recv_ms: float):
+        pid = client.player_id
+        if pid not in self._expect or pid in self.replies:
+            return
+        event_type = msg.get("type")
+        if event_type == "STATE_SNAPSHOT":
+            fq = ((msg.get("payload") or {}).get("state") or {}).get("followupQuestion") or {}
+            if not fq.get("answeredByMe"):
+                return
+            self.replies[pid] = (True, recv_ms)
+        elif event_type == "ERROR":
+            self.replies[pid] = (False, recv_ms)
+        else:
+            return
+        if self._expect <= self.replies.keys() and not self._done.done():
+            self._done.set_result(None)
+
+async def _play_followups(index: int, n_players: int, window_ms: float, gate: BurstGate,
+                          sample: Sample, transport: str, time_scale: float | None):
+    clients: list[Client] = []
+    step = "create"
+    try:
+        resp       = await asyncio.to_thread(create_session, time_scale)
+        session_id = resp["sessionId"]
+
+        host    = Client(f"F{index}-Host", "host", transport, quiet=True)
+        players = [Client(f"F{index}-P{i+1}", "player", transport, quiet=True)
+                   for i in range(n_players)]
+        clients = [host] + players
+
+        step = "join"
+        h = await asyncio.to_thread(_post, f"{BACKEND}/v1/sessions/{session_id}/join",
+                                    {"name": "Host", "role": "host"})
+        host.player_id, host.token, host.session_id = h["playerId"], h["playerAuthToken"], session_id
+        for p in players:
+            r = await asyncio.to_thread(_post, f"{BACKEND}/v1/sessions/{session_id}/join",
+                                        {"name": p.name})
+            p.player_id, p.token, p.session_id = r["playerId"], r["playerAuthToken"], session_id
+
+        step = "connect"
+        watch = AnswerWatch()
+        loop  = asyncio.get_running_loop()
+        for c in clients:
+            c.observers.append(watch)
+            c.start(loop)
+        _require(await wait_for_event(clients, "STATE_SNAPSHOT",
+                                      **{"payload.state.phase": "LOBBY"}), step)
+
+        step = "clues"
+        host.send(_cmd("HOST_START_GAME", session_id, {"sessionId": session_id}))
+        _require(await wait_for_event([host], "CLUE_PRESENT",
+                                      **{"payload.clueLevelPoints": 10}), step)
+        for level in (8, 6, 4, 2):
+            host.send(_cmd("HOST_NEXT_CLUE", session_id, {}))
+            _require(await wait_for_event([host], "CLUE_PRESENT",
+                                          **{"payload.clueLevelPoints": level}), step)
+        host.send(_cmd("HOST_NEXT_CLUE", session_id, {}))
+
+        question, total = 0, 1
+        while question < total:
+            step = f"question_{question}"
+            present = await wait_for_event(clients, "FOLLOWUP_QUESTION_PRESENT",
+                                           timeout_s=FOLLOWUP_TIMEOUT_S,
+                                           **{"payload.currentQuestionIndex": question})
+            _require(present, step)
+            total   = present["payload"].get("totalQuestions", 1)
+            options = present["payload"].get("options") or ["?"]
+
+            step = f"burst_{question}"
+            release_ms = await gate.arrive(question)
+            done  = watch.arm({p.player_id for p in players})
+            sends = _schedule_answers(players, session_id, options, release_ms, window_ms)
+            try:
+                await asyncio.wait_for(done, ACK_TIMEOUT_S)
+            except asyncio.TimeoutError:
+                sample.fail(f"{len(sends) - len(watch.replies)} answers without reply")
+            for pid, (accepted, recv_ms) in watch.replies.items():
+                if accepted:
+                    sample.hist("followup:ack_ms").record(recv_ms - sends[pid])
+                else:
+                    sample.fail("answer rejected")
+            if watch.replies:
+                sample.hist("followup:resolve_ms").record(
+                    max(r[1] for r in watch.replies.values()) - release_ms)
+            question += 1
+    except Exception as e:
+        sample.fail(f"session failed at {step} ({type(e).__name__})")
+    finally:
+        gate.leave()
+        for c in clients:
+            c.close()
+
+def _schedule_answers(players: list[Client], session_id: str, options: list,
+                      release_ms: float, window_ms: float) -> dict:
+    """Schedule FOLLOWUP_ANSWER_SUBMIT from every player; returns player id -> send epoch ms."""
+    loop  = asyncio.get_running_loop()
+    sends: dict[str, float] = {}
+
+    def fire(p: Client):
+        sends[p.player_id] = time.time() * 1000
+        p.send(_cmd("FOLLOWUP_ANSWER_SUBMIT", session_id, {
+            "playerId": p.player_id,
+            "answerText": random.choice(options),
+        }))
+
+    for p in players:
+        at_ms = release_ms + random.uniform(0.0, window_ms)
+        loop.call_at(loop.time() + (at_ms - time.time() * 1000) / 1000, fire, p)
+    return sends
+
+def _followup_burst(params: dict, time_scale: float | None) -> Sample:
+    sample = Sample()
+
+    async def run():
+        gate = BurstGate(params["sessions"])
+        await asyncio.gather(*(
+            _play_followups(i, params["players"], params["window_ms"], gate, sample,
+                            params["transport"], time_scale)
+            for i in range(params["sessions"])))
+
+    asyncio.run(run())
+    return sample
+
+# --- snapshot fan-out --------------------------------------------------------
+async def _play_fanout(n_connections: int, transport: str,
+                       time_scale: float | None) -> tuple[dict, dict]:
+    """Host + (n-1) players play the clue ladder; /metrics before and after."""
+    resp       = await asyncio.to_thread(create_session, time_scale)
+    session_id = resp["sessionId"]
+    host    = Client(f"S{n_connections}-Host", "host", transport, quiet=True)
+    players = [Client(f"S{n_connections}-P{i+1}", "player", transport, quiet=True)
+               for i in range(n_connections - 1)]
+    clients = [host] + players
+    try:
+        h = await asyncio.to_thread(_post, f"{BACKEND}/v1/sessions/{session_id}/join",
+                                    {"name": "Host", "role": "host"})
+        host.player_id, host.token, host.session_id = h["playerId"], h["playerAuthToken"], session_id
+        for p in players:
+            r = await asyncio.to_thread(_post, f"{BACKEND}/v1/sessions/{session_id}/join",
+                                        {"name": p.name})
+            p.player_id, p.token, p.session_id = r["playerId"], r["playerAuthToken"], session_id
+
+        loop = asyncio.get_running_loop()
+        for c in clients:
+            c.start(loop)
+        _require(await wait_for_event(clients, "STATE_SNAPSHOT",
+                                      **{"payload.state.phase": "LOBBY"}), "connect")
+
+        before = await asyncio.to_thread(fetch_metrics, BACKEND)
+        host.send(_cmd("HOST_START_GAME", session_id, {"sessionId": session_id}))
+        _require(await wait_for_event(clients, "CLUE_PRESENT",
+                                      **{"payload.clueLevelPoints": 10}), "clues")
+        for level in (8, 6, 4, 2):
+            host.send(_cmd("HOST_NEXT_CLUE", session_id, {}))
+            _require(await wait_for_event(clients, "CLUE_PRESENT",
+                                          **{"payload.clueLevelPoints": level}), "clues")
+        after = await asyncio.to_thread(fetch_metrics, BACKEND)
+        return before, after
+    finally:
+        for c in clients:
+            c.close()
+
+def _snapshot_fanout(params: dict, time_scale: float | None) -> Sample:
+    sample = Sample()
+    for n in params["connections"]:
+        before, after = asyncio.run(_play_fanout(n, params["transport"], time_scale))
+        if before is None or after is None:
+            sample.fail("backend has no /metrics")
+            return sample
+        broadcasts = after["snapshots"]["broadcasts"] - before["snapshots"]["broadcasts"]
+        recipients = after["snapshots"]["recipients"] - before["snapshots"]["recipients"]
+        if not broadcasts:
+            sample.fail(f"{n} connections: no snapshot broadcasts")
+            continue
+        project   = timing_window(before["timings"]["projectState"], after["timings"]["projectState"])
+        broadcast = timing_window(before["timings"]["snapshotBroadcast"],
+                                  after["timings"]["snapshotBroadcast"])
+        sample.hist(f"fanout:{n}:project_ms").record(project["total"] / broadcasts)
+        sample.hist(f"fanout:{n}:broadcast_ms").record(broadcast["total"] / broadcasts)
+        sample.hist(f"fanout:{n}:per_recipient_ms").record(broadcast["total"] / max(recipients, 1))
+        if project["count"] > MAX_PROJECTIONS * broadcasts:
+            sample.fail(f"{n} connections: {project['count'] / broadcasts:.1f} projections "
+                        f"per broadcast (max {MAX_PROJECTIONS})")
+    return sample
+
+SCENARIOS = {
+    "single_game":     _single_game,
+    "join_storm":      _join_storm,
+    "brake_burst":     _brake_burst,
+    "reconnect_storm": _reconnect_storm,
+    "followup_burst":  _followup_burst,
+    "snapshot_fanout": _snapshot_fanout,
+}
+
+# ---------------------------------------------------------------------------
+# RUNNER
+# ---------------------------------------------------------------------------
+def _git(*args: str) -> str | None:
+    try:
+        out = subprocess.run(["git", *args], cwd=os.path.dirname(os.path.abspath(__file__)),
+                             capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() if out.returncode == 0 else None
+
+def environment() -> dict:
+    try:
+        health = _get(f"{BACKEND}/health")
+    except Exception as e:
+        health = {"error": str(e)}
+    return {
+        "hostname":  socket.gethostname(),
+        "platform":  platform.platform(),
+        "machine":   platform.machine(),
+        "cpus":      os.cpu_count(),
+        "loadavg":   list(os.getloadavg()) if hasattr(os, "getloadavg") else None,
+        "python":    platform.python_version(),
+        "git_commit": _git("rev-parse", "HEAD"),
+        "git_dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "backend":   BACKEND,
+        "backend_health": health,
+    }
+
+def run_scenario(name: str, iterations: int, warmup: int,
+                 time_scale: float | None) -> dict:
+    params  = SCENARIO_PARAMS[name]
+    merged: dict[str, Histogram] = {}
+    runs    = []
+    for i in range(warmup + iterations):
+        measured = i >= warmup
+        t0 = time.monotonic()
+        try:
+            sample = SCENARIOS[name](params, time_scale)
+        except Exception as e:
+            sample = Sample()
+            sample.fail(f"{type(e).__name__}: {e}")
+        wall_s = time.monotonic() - t0
+        label  = f"{i - warmup + 1}/{iterations}" if measured else f"warmup {i + 1}/{warmup}"
+        print(f"  {name:<16} {label:<12} {wall_s:>7.1f}s  {'ok' if sample.ok else 'FAIL'}"
+              + (f"  {sample.notes[0]}" if sample.notes else ""), flush=True)
+        if not measured:
+            continue
+        for metric, h in sample.metrics.items():
+            merged.setdefault(metric, Histogram()).merge(h)
+        runs.append({
+            "ok":     sample.ok,
+            "wall_s": round(wall_s, 2),
+            "notes":  sample.notes[:10],
+            "p95":    {m: h.summary()["p95"] for m, h in sorted(sample.metrics.items())},
+        })
+    return {
+        "params":     params,
+        "iterations": runs,
+        "failed":     sum(1 for r in runs if not r["ok"]),
+        "metrics":    {m: h.summary() for m, h in sorted(merged.items())},
+    }
+
+def run_suite(names: list[str], iterations: int, warmup: int,
+              time_scale: float | None, label: str | None) -> dict:
+    started = datetime.datetime.now(datetime.timezone.utc)
+    t0 = time.monotonic()
+    result = {
+        "schema":     SCHEMA_VERSION,
+        "label":      label,
+        "started_at": started.isoformat(timespec="seconds"),
+        "settings":   {"iterations": iterations, "warmup": warmup, "time_scale": time_scale},
+        "env":        environment(),
+        "scenarios":  {},
+    }
+    for name in names:
+        result["scenarios"][name] = run_scenario(name, iterations, warmup, time_scale)
+    result["wall_s"] = round(time.monotonic() - t0, 1)
+    return result
+
+def format_report(result: dict) -> str:
+    lines = []
+    for name, sc in result["scenarios"].items():
+        lines.append(f"  {name}: {len(sc['iterations']) - sc['failed']}/{len(sc['iterations'])} "
+                     f"iterations ok")
+        lines.append(f"    {'metric':<48}{'count':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+        for metric, st in sc["metrics"].items():
+            lines.append(f"    {metric[:47]:<48}{st['count']:>7}{st['p50']:>9}{st['p95']:>9}"
+                         f"{st['p99']:>9}{st['max']:>9}")
+        lines.append("")
+    return "\n".join(lines)
+
+# ---------------------------------------------------------------------------
+# COMPARE
+# ---------------------------------------------------------------------------
+def compare(current: dict, baseline: dict, threshold: float, min_delta_ms: float) -> dict:
+    """p95 of every metric in both files; regressed = +threshold % and +min_delta_ms."""
+    rows, regressions, missing = [], [], []
+    for name, base_sc in baseline["scenarios"].items():
+        cur_sc = current["scenarios"].get(name)
+        if cur_sc is None:
+            missing.append(name)
+            continue
+        for metric, base in base_sc["metrics"].items():
+            cur = cur_sc["metrics"].get(metric)
+            if cur is None:
+                missing.append(f"{name}/{metric}")
+                continue
+            delta = cur["p95"] - base["p95"]
+            pct   = 100.0 * delta / base["p95"] if base["p95"] else (0.0 if not delta else float("inf"))
+            row = {"scenario": name, "metric": metric, "baseline_p95": base["p95"],
+                   "current_p95": cur["p95"], "delta_ms": round(delta, 2),
+                   "delta_pct": round(pct, 1) if pct != float("inf") else None,
+                   "regressed": pct > threshold and delta > min_delta_ms}
+            rows.append(row)
+            if row["regressed"]:
+                regressions.append(row)
+    failed = {name: sc["failed"] for name, sc in current["scenarios"].items() if sc["failed"]}
+    return {"threshold_pct": threshold, "min_delta_ms": min_delta_ms,
+            "settings_match": current.get("settings") == baseline.get("settings"),
+            "rows": rows, "regressions": regressions, "missing": missing,
+            "failed_iterations": failed}
+
+def format_compare(diff: dict) -> str:
+    lines = [f"  {'scenario/metric':<56}{'base p95':>10}{'now p95':>10}{'Δ ms':>9}{'Δ %':>8}"]
+    for r in diff["rows"]:
+        pct = "new" if r["delta_pct"] is None else f"{r['delta_pct']:+.1f}"
+        mark = "  ✗" if r["regressed"] else ""
+        lines.append(f"  {(r['scenario'] + '/' + r['metric'])[:55]:<56}{r['baseline_p95']:>10}"
+                     f"{r['current_p95']:>10}{r['delta_ms']:>+9.1f}{pct:>8}{mark}")
+    lines.append("")
+    if not diff["settings_match"]:
+        lines.append("  [WARN] settings differ from the baseline (iterations / warmup / time scale)")
+    if diff["missing"]:
+        lines.append(f"  [WARN] missing from this run: {', '.join(diff['missing'][:10])}")
+    if diff["failed_iterations"]:
+        lines.append(f"  [FAIL] failed iterations: {diff['failed_iterations']}")
+    if diff["regressions"]:
+        lines.append(f"  [FAIL] {len(diff['regressions'])} p95 regression(s) beyond "
+                     f"{diff['threshold_pct']}% (and {diff['min_delta_ms']} ms)")
+    else:
+        lines.append(f"  [PASS] no p95 regressed beyond {diff['threshold_pct']}%")
+    return "\n".join(lines)
+
+def _compare_ok(diff: dict) -> bool:
+    return not diff["regressions"] and not diff["failed_iterations"]
+
+# ---------------------------------------------------------------------------
+# ENTRY POINT
+# ---------------------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark suite with baselines and a p95 regression gate")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run scenarios and write JSON results")
+    run.add_argument("scenarios", nargs="*", metavar="SCENARIO",
+                     help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    run.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS,
+                     help="measured iterations per scenario (default: %(default)s)")
+    run.add_argument("--warmup", type=int, default=DEFAULT_WARMUP,
+                     help="discarded iterations before measuring (default: %(default)s)")
+    run.add_argument("--time-scale", type=float, default=None,
+                     help="compress server pacing by this factor (backend needs ALLOW_TIME_SCALE=true)")
+    run.add_argument("--label", default=None, help="free-form label stored in the results")
+    run.add_argument("--seed", type=int, default=None, help="seed for burst offsets and answers")
+    run.add_argument("--out", default=None, metavar="PATH", help="write results JSON here")
+    run.add_argument("--baseline", default=None, metavar="PATH",
+                     help="compare against this baseline after the run (exit 1 on regression)")
+    run.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                     help="allowed p95 increase in %% (default: %(default)s)")
+    run.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA,
+                     help="ignore p95 increases smaller than this (default: %(default)s)")
+
+    cmp_ = sub.add_parser("compare", help="diff a results file against a baseline")
+    cmp_.add_argument("current")
+    cmp_.add_argument("baseline")
+    cmp_.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                      help="allowed p95 increase in %% (default: %(default)s)")
+    cmp_.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA,
+                      help="ignore p95 increases smaller than this (default: %(default)s)")
+    cmp_.add_argument("--json", dest="json_path", default=None,
+                      help="also write the comparison as JSON to this path")
+
+    sub.add_parser("list", help="list scenarios and their parameters")
+    return parser
+
+def _load(path: str) -> dict:
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("schema") != SCHEMA_VERSION:
+        print(f"  {path}: unsupported schema {data.get('schema')!r} (expected {SCHEMA_VERSION})")
+        sys.exit(2)
+    return data
+
+def main():
+    args = build_parser().parse_args()
+
+    if args.command == "list":
+        for name, params in SCENARIO_PARAMS.items():
+            print(f"  {name:<16} {json.dumps(params)}")
+        return
+
+    if args.command == "compare":
+        diff = compare(_load(args.current), _load(args.baseline), args.threshold, args.min_delta_ms)
+        print(format_compare(diff))
+        if args.json_path:
+            with open(args.json_path, "w") as f:
+                json.dump(diff, f, indent=2)
+        sys.exit(0 if _compare_ok(diff) else 1)
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown or args.iterations < 1 or args.warmup < 0:
+        print(f"unknown scenario(s) {unknown}; choose from {list(SCENARIOS)} "
+              "(--iterations >= 1, --warmup >= 0)")
+        sys.exit(2)
+    baseline = _load(args.baseline) if args.baseline else None
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    print("=" * 70)
+    print("  TASK-601 — Benchmark suite")
+    print(f"  Backend: {BACKEND} | scenarios={names} iterations={args.iterations} "
+          f"warmup={args.warmup}" + (f" | time scale: {args.time_scale}x" if args.time_scale else ""))
+    print("=" * 70)
+
+    raise_fd_limit()
+    result = run_suite(names, args.iterations, args.warmup, args.time_scale, args.label)
+
+    print()
+    print("=" * 70)
+    print(format_report(result))
+    print("=" * 70)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\n  Results written to {args.out}")
+
+    ok = not any(sc["failed"] for sc in result["scenarios"].values())
+    if baseline:
+        print()
+        diff = compare(result, baseline, args.threshold, args.min_delta_ms)
+        print(format_compare(diff))
+        ok = ok and _compare_ok(diff)
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Brake-contention benchmark — synchronized BRAKE_PULL bursts.
+
+Step 8 of e2e_601.py has one player pull the brake.  In a real room 8–10
+phones slam it at once, and pullBrake() (state-machine.ts) plus the
+brakeFairness map decide who wins.  This script plays many sessions side
+by side and, on every clue level, releases one burst per session:
+
+  all sessions reach CLUE_PRESENT(level) → shared release instant →
+  every player without a locked answer sends BRAKE_PULL within
+  --window-ms → wait for BRAKE_ACCEPTED / BRAKE_REJECTED per player →
+  winner submits → BRAKE_ANSWER_LOCKED → auto-advance to the next level
+
+Load grows by running the bursts at increasing session counts (--levels).
+Per level the report gives:
+
+  - accept / reject latency (BRAKE_PULL send → own reply) and burst
+    resolution time (release → last reply)
+  - invariants: exactly one BRAKE_ACCEPTED per clue, seen by every client
+    with the same winner; every pull answered; rejections name that winner
+  - ordering: was the winner the earliest clientTimeMs ("fair"), the
+    winner's rank and lead over the earliest pull, and how often pairs of
+    pulls were processed (reply serverTimeMs) in clientTimeMs order
+
+Usage:
+  python3 docs/e2e_brake.py
+  python3 docs/e2e_brake.py --levels 1,8,32,64 --players 10 --window-ms 1
+  python3 docs/e2e_brake.py --levels 16 --clues 3 --json brake.json
+
+Exit code 0 only when no invariant was violated and every game finished.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter
+
+from e2e_601 import (
+    BACKEND,
+    TRANSPORTS,
+    Client,
+    _post,
+    create_session,
+    raise_fd_limit,
+    wait_for_event,
+)
+from e2e_load import StepTimeout, _cmd, _require
+from e2e_stats import Histogram
+
+# ---------------------------------------------------------------------------
+# CONFIG
+# ---------------------------------------------------------------------------
+CLUE_LEVELS        = (10, 8, 6, 4, 2)
+DEFAULT_LEVELS     = "1,4,16"   # concurrent sessions per load level
+DEFAULT_PLAYERS    = 8
+DEFAULT_WINDOW_MS  = 2.0        # pulls of one burst are spread over this window
+DEFAULT_CLUES      = len(CLUE_LEVELS)
+RELEASE_LEAD_MS    = 50         # release instant is set this far after the last arrival
+GATE_TIMEOUT_S     = 30         # max wait for every session to reach a burst
+RESOLVE_TIMEOUT_S  = 10         # max wait for all replies to one burst
+
+# ---------------------------------------------------------------------------
+# CROSS-SESSION BARRIER
+# ---------------------------------------------------------------------------
+class BurstGate:
+    """
+    Barrier keyed by clue level: once every live session has arrived, all of
+    them get the same release time (epoch ms).  Sessions that fail or finish
+    early call leave() so the others are not held back.
+    """
+
+    def __init__(self, parties: int):
+        self.parties = parties
+        self._rounds: dict[int, list] = {}   # level -> [arrived, future]
+
+    async def arrive(self, level: int) -> float:
+        rnd = self._rounds.get(level)
+        if rnd is None:
+            rnd = self._rounds[level] = [0, asyncio.get_running_loop().create_future()]
+        rnd[0] += 1
+        self._check(level)
+        try:
+            return await asyncio.wait_for(asyncio.shield(rnd[1]), GATE_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            raise StepTimeout(f"gate_{level}")
+
+    def leave(self):
+        self.parties -= 1
+        for level in self._rounds:
+            self._check(level)
+
+    def _check(self, level: int):
+        arrived, fut = self._rounds[level]
+        if arrived >= self.parties and not fut.done():
+            fut.set_result(time.time() * 1000 + RELEASE_LEAD_MS)
+
+# ---------------------------------------------------------------------------
+# BRAKE REPLIES
+# ---------------------------------------------------------------------------
+class BrakeWatch:
+    """
+    Client observer for one session: every BRAKE_ACCEPTED any client sees,
+    by clue level, and the reply each puller got in the armed burst.
+    """
+
+    def __init__(self):
+        self.accepts: dict[int, list] = {}   # level -> [(client name, winner id)]
+        self.replies: dict[str, tuple] = {}  # player id -> (type, payload, recv_ms, serverTimeMs)
+        self._expect: set[str] = set()
+        self._done: asyncio.Future | None = None
+
+    def arm(self, player_ids: set[str]) -> asyncio.Future:
+        self.replies = {}
+        self._expect = set(player_ids)
+        self._done = asyncio.get_running_loop().create_future()
+        return self._done
+
+    def __call__(self, client, msg: dict, recv_ms: float):
+        event_type = msg.get("type")
+        if event_type not in ("BRAKE_ACCEPTED", "BRAKE_REJECTED"):
+            return
+        payload = msg.get("payload") or {}
+        if event_type == "BRAKE_ACCEPTED":
+            self.accepts.setdefault(payload.get("clueLevelPoints"), []).append(
+                (client.name, payload.get("playerId")))
+        if client.player_id == payload.get("playerId") and client.player_id in self._expect:
+            self.replies.setdefault(client.player_id,
+                                    (event_type, payload, recv_ms, msg.get("serverTimeMs")))
+            if self._expect <= self.replies.keys() and not self._done.done():
+                self._done.set_result(None)
+
+# ---------------------------------------------------------------------------
+# STATS
+# ---------------------------------------------------------------------------
+class LevelStats:
+    """Aggregates for one load level (N concurrent sessions)."""
+
+    def __init__(self, sessions: int):
+        self.sessions        = sessions
+        self.games_completed = 0
+        self.games_failed    = 0
+        self.bursts          = 0
+        self.pulls           = 0
+        self.fair            = 0            # winner had the earliest clientTimeMs
+        self.rank_sum        = 0
+        self.concordant      = 0            # pull pairs processed in clientTimeMs order
+        self.pairs           = 0
+        self.accept_ms       = Histogram()
+        self.reject_ms       = Histogram()
+        self.resolve_ms      = Histogram()
+        self.winner_lead_ms  = Histogram()  # winner clientTimeMs − earliest clientTimeMs
+        self.reasons         = Counter()
+        self.violations      = Counter()
+        self.failures        = Counter()
+
+    def record_burst(self, pulls: dict, replies: dict, winner: str, release_ms: float):
+        """pulls: player id -> (clientTimeMs, send epoch ms)."""
+        self.bursts += 1
+        self.pulls  += len(pulls)
+        for pid, (event_type, payload, recv_ms, _) in replies.items():
+            latency = recv_ms - pulls[pid][1]
+            if event_type == "BRAKE_ACCEPTED":
+                self.accept_ms.record(latency)
+            else:
+                self.reject_ms.record(latency)
+                self.reasons[payload.get("reason")] += 1
+                if payload.get("winnerPlayerId") not in (None, winner):
+                    self.violations["reject_names_other_winner"] += 1
+        if replies:
+            self.resolve_ms.record(max(r[2] for r in replies.values()) - release_ms)
+
+        client_ms = {pid: p[0] for pid, p in pulls.items()}
+        earliest  = min(client_ms.values())
+        rank      = 1 + sum(1 for t in client_ms.values() if t < client_ms[winner])
+        self.rank_sum += rank
+        self.fair     += rank == 1
+        self.winner_lead_ms.record(client_ms[winner] - earliest)
+
+        # Processing order: the winner is by definition first; rejections are
+        # stamped when pullBrake() ran, so their serverTimeMs orders the rest.
+        server_ms = {pid: (float("-inf") if pid == winner else r[3])
+                     for pid, r in replies.items() if r[3] is not None or pid == winner}
+        ids = [pid for pid in server_ms if pid in client_ms]
+        for i, a in enumerate(ids):
+            for b in ids[i + 1:]:
+                dc = client_ms[a] - client_ms[b]
+                ds = server_ms[a] - server_ms[b]
+                if dc and ds:
+                    self.pairs += 1
+                    self.concordant += (dc > 0) == (ds > 0)
+
+    def summary(self) -> dict:
+        bursts = self.bursts or 1
+        return {
+            "sessions":        self.sessions,
+            "games_completed": self.games_completed,
+            "games_failed":    self.games_failed,
+            "bursts":          self.bursts,
+            "pulls":           self.pulls,
+            "fair_pct":        round(100.0 * self.fair / bursts, 1),
+            "mean_winner_rank": round(self.rank_sum / bursts, 2),
+            "concordance_pct": round(100.0 * self.concordant / self.pairs, 1) if self.pairs else None,
+            "accept_ms":       self.accept_ms.summary(),
+            "reject_ms":       self.reject_ms.summary(),
+            "resolve_ms":      self.resolve_ms.summary(),
+            "winner_lead_ms":  self.winner_lead_ms.summary(),
+            "reject_reasons":  dict(self.reasons),
+            "violations":      dict(self.violations),
+            "failures":        dict(self.failures),
+        }
+
+def format_report(levels: list[dict]) -> str:
+    lines = [f"  {'sessions':>8}{'bursts':>8}{'pulls':>8}{'fair%':>8}{'rank':>7}{'lead p99':>10}"
+             f"{'concord%':>10}{'acc p50':>9}{'acc p99':>9}{'rej p50':>9}{'rej p99':>9}"
+             f"{'resolve p99':>13}"]
+    for lv in levels:
+        concord = "-" if lv["concordance_pct"] is None else lv["concordance_pct"]
+        lines.append(f"  {lv['sessions']:>8}{lv['bursts']:>8}{lv['pulls']:>8}{lv['fair_pct']:>8}"
+                     f"{lv['mean_winner_rank']:>7}{lv['winner_lead_ms']['p99']:>10}{concord:>10}"
+                     f"{lv['accept_ms']['p50']:>9}{lv['accept_ms']['p99']:>9}"
+                     f"{lv['reject_ms']['p50']:>9}{lv['reject_ms']['p99']:>9}"
+                     f"{lv['resolve_ms']['p99']:>13}")
+    lines.append("")
+    for lv in levels:
+        status = "OK" if not lv["violations"] else "VIOLATION"
+        lines.append(f"  [{status}] {lv['sessions']} sessions: "
+                     f"{lv['games_completed']} games ok / {lv['games_failed']} failed"
+                     f"  reasons={lv['reject_reasons']}"
+                     + (f"  violations={lv['violations']}" if lv["violations"] else "")
+                     + (f"  failures={lv['failures']}" if lv["failures"] else ""))
+    return "\n".join(lines)
+
+# ---------------------------------------------------------------------------
+# ONE SESSION
+# ---------------------------------------------------------------------------
+def _schedule_burst(pullers: list[Client], session_id: str,
+                    release_ms: float, window_ms: float) -> dict:
+    """Schedule BRAKE_PULL from every puller around release_ms; pulls fill in as they fire."""
+    loop  = asyncio.get_running_loop()
+    pulls: dict[str, tuple] = {}
+
+    def fire(p: Client):
+        now_ms = time.time() * 1000
+        pulls[p.player_id] = (int(now_ms), now_ms)
+        p.send(_cmd("BRAKE_PULL", session_id, {
+            "playerId": p.player_id,
+            "clientTimeMs": int(now_ms),
+        }))
+
+    for p in pullers:
+        at_ms = release_ms + random.uniform(0.0, window_ms)
+        loop.call_at(loop.time() + (at_ms - time.time() * 1000) / 1000, fire, p)
+    return pulls
+
+async def play_session(index: int, n_players: int, n_clues: int, window_ms: float,
+                       gate: BurstGate, stats: LevelStats, transport: str,
+                       time_scale: float | None = None) -> bool:
+    clients: list[Client] = []
+    step = "create"
+    try:
+        resp       = await asyncio.to_thread(create_session, time_scale)
+        session_id = resp["sessionId"]
+
+        host    = Client(f"B{index}-Host", "host", transport, quiet=True)
+        players = [Client(f"B{index}-P{i+1}", "player", transport, quiet=True)
+                   for i in range(n_players)]
+        clients = [host] + players
+
+        step = "join"
+        h = await asyncio.to_thread(_post, f"{BACKEND}/v1/sessions/{session_id}/join",
+                                    {"name": "Host", "role": "host"})
+        host.player_id, host.token, host.session_id = h["playerId"], h["playerAuthToken"], session_id
+        for p in players:
+            r = await asyncio.to_thread(_post, f"{BACKEND}/v1/sessions/{session_id}/join",
+                                        {"name": p.name})
+            p.player_id, p.token, p.session_id = r["playerId"], r["playerAuthToken"], session_id
+
+        step = "connect"
+        watch = BrakeWatch()
+        loop  = asyncio.get_running_loop()
+        for c in clients:
+            c.observers.append(watch)
+            c.start(loop)
+        _require(await wait_for_event(clients, "STATE_SNAPSHOT",
+                                      **{"payload.state.phase": "LOBBY"}), step)
+
+        step = "start_game"
+        host.send(_cmd("HOST_START_GAME", session_id, {"sessionId": session_id}))
+
+        locked: set[str] = set()
+        bursted: list[int] = []
+        for level in CLUE_LEVELS[:n_clues]:
+            step = f"clue_{level}"
+            _require(await wait_for_event(clients, "CLUE_PRESENT",
+                                          **{"payload.clueLevelPoints": level}), step)
+            pullers = [p for p in players if p.player_id not in locked]
+            if not pullers:
+                break
+
+            step = f"burst_{level}"
+            release_ms = await gate.arrive(level)
+            done  = watch.arm({p.player_id for p in pullers})
+            pulls = _schedule_burst(pullers, session_id, release_ms, window_ms)
+            try:
+                await asyncio.wait_for(done, RESOLVE_TIMEOUT_S)
+            except asyncio.TimeoutError:
+                stats.violations["pull_without_reply"] += len(pulls) - len(watch.replies)
+            bursted.append(level)
+
+            winners = {pid for _, pid in watch.accepts.get(level, [])}
+            if len(winners) != 1:
+                stats.violations["winners_per_clue_ne_1"] += 1
+                raise StepTimeout(step)
+            winner = winners.pop()
+            stats.record_burst(pulls, dict(watch.replies), winner, release_ms)
+
+            step = f"answer_{level}"
+            owner = next(p for p in players if p.player_id == winner)
+            owner.send(_cmd("BRAKE_ANSWER_SUBMIT", session_id, {
+                "playerId": winner,
+                "answerText": "Paris",
+            }))
+            _require(await wait_for_event(clients, "BRAKE_ANSWER_LOCKED",
+                                          **{"payload.playerId": winner}), step)
+            locked.add(winner)
+
+        # Exactly one BRAKE_ACCEPTED per clue, on every client, same winner
+        for level in bursted:
+            seen = watch.accepts.get(level, [])
+            per_client = Counter(name for name, _ in seen)
+            if any(per_client.get(c.name, 0) != 1 for c in clients):
+                stats.violations["accepted_count_ne_1"] += 1
+            if len({pid for _, pid in seen}) > 1:
+                stats.violations["winner_mismatch"] += 1
+
+        stats.games_completed += 1
+        return True
+    except Exception:
+        stats.games_failed += 1
+        stats.failures[step] += 1
+        return False
+    finally:
+        gate.leave()
+        for c in clients:
+            c.close()
+
+async def run_level(sessions: int, n_players: int, n_clues: int, window_ms: float,
+                    transport: str, index_base: int = 0,
+                    time_scale: float | None = None) -> LevelStats:
+    stats = LevelStats(sessions)
+    gate  = BurstGate(sessions)
+    await asyncio.gather(*(
+        play_session(index_base + i, n_players, n_clues, window_ms, gate, stats, transport,
+                     time_scale)
+        for i in range(sessions)))
+    return stats
+
+# ---------------------------------------------------------------------------
+# ENTRY POINT
+# ---------------------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Brake-contention benchmark (synchronized BRAKE_PULL bursts)")
+    parser.add_argument("--levels", default=DEFAULT_LEVELS,
+                        help="comma-separated concurrent session counts, run in order (default: %(default)s)")
+    parser.add_argument("--players", type=int, default=DEFAULT_PLAYERS,
+                        help="players per session (default: %(default)s)")
+    parser.add_argument("--window-ms", type=float, default=DEFAULT_WINDOW_MS,
+                        help="spread of one burst's pulls (default: %(default)s)")
+    parser.add_argument("--clues", type=int, default=DEFAULT_CLUES, choices=range(1, len(CLUE_LEVELS) + 1),
+                        help="clue levels per game that get a burst (default: %(default)s)")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="asyncio",
+                        help="WebSocket transport (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for pull offsets within the window")
+    parser.add_argument("--time-scale", type=float, default=None,
+                        help="compress server pacing by this factor (backend needs ALLOW_TIME_SCALE=true)")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="also write the per-level summary as JSON to this path")
+    return parser
+
+def main():
+    args = build_parser().parse_args()
+    if args.players < 2:
+        print("--players must be >= 2 (contention needs at least two pullers)")
+        sys.exit(2)
+    levels = [int(x) for x in args.levels.split(",") if x.strip()]
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    print("=" * 70)
+    print("  TASK-601 — Brake-contention benchmark")
+    print(f"  Backend: {BACKEND} | levels={levels} players={args.players} "
+          f"window={args.window_ms}ms clues={args.clues} transport={args.transport}")
+    print("=" * 70)
+
+    raise_fd_limit()
+    results = []
+    index_base = 0
+    for sessions in levels:
+        t0 = time.monotonic()
+        stats = asyncio.run(run_level(sessions, args.players, args.clues, args.window_ms,
+                                      args.transport, index_base, args.time_scale))
+        index_base += sessions
+        summary = stats.summary()
+        results.append(summary)
+        print(f"  {sessions:>4} sessions: {summary['bursts']} bursts, "
+              f"fair {summary['fair_pct']}%, violations {sum(stats.violations.values())}, "
+              f"{time.monotonic() - t0:.1f}s", flush=True)
+
+    print()
+    print("=" * 70)
+    print(format_report(results))
+    print("=" * 70)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"players": args.players, "window_ms": args.window_ms,
+                       "clues": args.clues, "levels": results}, f, indent=2)
+        print(f"\n  Summary written to {args.json_path}")
+
+    ok = all(not lv["violations"] and lv["games_failed"] == 0 for lv in results)
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
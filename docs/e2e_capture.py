@@ -0,0 +1,157 @@
+"""
+Bounded message capture for the e2e / load harness.
+
+  MessageLog    what Client.messages holds: received messages in arrival
+                order, indexed by event type.  Unbounded by default; with a
+                window it keeps only the newest N messages (plus the latest
+                message of each type) and hands evicted ones to a spill
+  SpillWriter   append-only, gzip-compressed JSONL segment files written
+                by a background thread; one writer serves every client of
+                the process
+  read_spill    stream records back from a spill directory
+
+Waits (Client.wait_for / find) only see the in-memory window: size it to
+cover the longest look-back a scenario does (one game's worth is plenty).
+
+Spill record:  {"c": client name, "t": recv epoch ms, "m": message}
+Segments are written in eviction order; per client, records are in
+arrival order.
+"""
+
+import glob
+import gzip
+import json
+import os
+import queue
+import threading
+from collections import deque
+
+# ---------------------------------------------------------------------------
+# SPILL
+# ---------------------------------------------------------------------------
+SEGMENT_BYTES   = 64 * 1024 * 1024   # uncompressed bytes per segment file
+SPILL_QUEUE_MAX = 50_000             # records in flight before writers block
+SEGMENT_GLOB    = "seg-*.jsonl.gz"
+
+class SpillWriter:
+    """Compress and append spilled messages on a background thread."""
+
+    def __init__(self, directory: str, segment_bytes: int = SEGMENT_BYTES,
+                 compresslevel: int = 6):
+        os.makedirs(directory, exist_ok=True)
+        self.directory     = directory
+        self.segment_bytes = segment_bytes
+        self.compresslevel = compresslevel
+        self.records       = 0
+        self.segments      = 0
+        self._queue        = queue.Queue(SPILL_QUEUE_MAX)   # bounded: memory stays flat
+        self._thread       = threading.Thread(target=self._run, name="spill-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, owner: str, recv_ms: float, msg: dict):
+        """Queue one record; blocks only if the writer thread falls behind."""
+        self._queue.put((owner, recv_ms, msg))
+
+    def close(self):
+        """Flush everything queued and close the current segment."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _open_segment(self):
+        path = os.path.join(self.directory, f"seg-{self.segments:06d}.jsonl.gz")
+        self.segments += 1
+        return gzip.open(path, "wb", compresslevel=self.compresslevel)
+
+    def _run(self):
+        out, written = None, 0
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                owner, recv_ms, msg = item
+                line = json.dumps({"c": owner, "t": recv_ms, "m": msg},
+                                  separators=(",", ":")).encode() + b"\n"
+                if out is None or written >= self.segment_bytes:
+                    if out is not None:
+                        out.close()
+                    out, written = self._open_segment(), 0
+                out.write(line)
+                written += len(line)
+                self.records += 1
+        finally:
+            if out is not None:
+                out.close()
+
+def read_spill(directory: str, owner: str | None = None):
+    """Yield (client name, recv ms, message) from every segment, oldest first."""
+    for path in sorted(glob.glob(os.path.join(directory, SEGMENT_GLOB))):
+        with gzip.open(path, "rb") as f:
+            for line in f:
+                rec = json.loads(line)
+                if owner is None or rec["c"] == owner:
+                    yield rec["c"], rec["t"], rec["m"]
+
+# ---------------------------------------------------------------------------
+# IN-MEMORY LOG
+# ---------------------------------------------------------------------------
+class MessageLog:
+    """
+    Received messages, oldest first, with a per-type index.
+
+    window=None keeps everything (the original behaviour).  With a window,
+    the oldest message is evicted (and spilled, if a SpillWriter is given)
+    once more than `window` are held; latest(type) survives eviction.
+    """
+
+    def __init__(self, window: int | None = None, spill: SpillWriter | None = None,
+                 owner: str = ""):
+        if window is not None and window < 1:
+            raise ValueError("window must be >= 1")
+        self.window   = window
+        self.spill    = spill
+        self.owner    = owner
+        self.total    = 0                 # messages ever appended
+        self._items   = deque()           # (recv_ms, msg), oldest first
+        self._by_type = {}                # event type -> deque of msgs, oldest first
+        self._latest  = {}                # event type -> newest msg (kept past eviction)
+        self._spilled = False
+
+    def append(self, msg: dict, recv_ms: float):
+        event_type = msg.get("type")
+        self._items.append((recv_ms, msg))
+        self._by_type.setdefault(event_type, deque()).append(msg)
+        self._latest[event_type] = msg
+        self.total += 1
+        if self.window is not None and len(self._items) > self.window:
+            self._evict()
+
+    def _evict(self):
+        recv_ms, msg = self._items.popleft()
+        event_type = msg.get("type")
+        same = self._by_type[event_type]
+        same.popleft()                    # FIFO: it is also the oldest of its type
+        if not same:
+            del self._by_type[event_type]
+        if self.spill is not None:
+            self.spill.write(self.owner, recv_ms, msg)
+
+    def drain(self):
+        """Spill the messages still held (once, e.g. on client close); the window stays readable."""
+        if self.spill is None or self._spilled:
+            return
+        self._spilled = True
+        for recv_ms, msg in self._items:
+            self.spill.write(self.owner, recv_ms, msg)
+
+    def of_type(self, event_type: str):
+        return self._by_type.get(event_type, ())
+
+    def latest(self, event_type: str) -> dict | None:
+        return self._latest.get(event_type)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return (msg for _, msg in self._items)
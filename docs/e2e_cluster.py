@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Cluster scaling check — game throughput versus backend worker processes.
+
+For each worker count N the backend is started with CLUSTER_WORKERS=N
+(services/backend/src/cluster/), saturated with closed-loop load
+(e2e_load --profile closed: N x --per-worker games always in flight, on
+an accelerated clock) and stopped again.  The report gives games/min per
+count, speedup over the first count and scaling efficiency (speedup
+divided by the worker ratio, 1.0 = linear), plus how evenly backend CPU
+was spread over the workers.
+
+Completed games double as a routing check: a session's REST joins and
+all of its WebSockets must reach the worker that created it, otherwise
+the game fails on "Session not found".
+
+Exit code 1 when any game fails or efficiency drops below --min-efficiency.
+
+The load generator shards across --client-workers processes; give it
+enough cores that the client side is not the bottleneck (the report shows
+client CPU per game next to backend CPU per game).
+
+Usage:
+  python3 docs/e2e_cluster.py                              # 1, 2 and 4 workers
+  python3 docs/e2e_cluster.py --workers 1 2 4 8 --duration 60 --per-worker 24
+  python3 docs/e2e_cluster.py --no-start --workers 4       # backend already up with CLUSTER_WORKERS=4
+"""
+
+import argparse
+import json
+import os
+import resource
+import shlex
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+
+from e2e_601 import BACKEND, _get
+from e2e_load import run_sharded
+from e2e_metrics import fetch_metrics
+
+# ---------------------------------------------------------------------------
+# CONFIG
+# ---------------------------------------------------------------------------
+BACKEND_DIR         = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "services", "backend")
+DEFAULT_BACKEND_CMD = "npx tsx src/index.ts"
+DEFAULT_WORKERS     = (1, 2, 4)
+DEFAULT_PER_WORKER  = 16      # games in flight per backend worker
+DEFAULT_DURATION    = 30.0    # seconds of load per worker count
+DEFAULT_TIME_SCALE  = 100.0
+DEFAULT_PLAYERS     = 3
+MIN_EFFICIENCY      = 0.8
+STARTUP_TIMEOUT_S   = 60
+STOP_TIMEOUT_S      = 10
+WARMUP_S            = 2.0     # settle time after /health turns ok
+
+# ---------------------------------------------------------------------------
+# BACKEND LIFECYCLE
+# ---------------------------------------------------------------------------
+def backend_workers() -> int | None:
+    """Workers the running backend reports on /health (1 when not clustered)."""
+    try:
+        health = _get(f"{BACKEND}/health")
+    except Exception:
+        return None
+    if health.get("status") != "ok":
+        return None
+    return (health.get("cluster") or {}).get("workers", 1)
+
+def start_backend(cmd: str, workers: int, log_level: str, log_path: str) -> subprocess.Popen:
+    port = urllib.parse.urlparse(BACKEND).port or 80
+    env  = dict(os.environ,
+                PORT=str(port),
+                CLUSTER_WORKERS=str(workers),
+                ALLOW_TIME_SCALE="true",
+                LOG_LEVEL=log_level)
+    log  = open(log_path, "w")
+    proc = subprocess.Popen(shlex.split(cmd), cwd=BACKEND_DIR, env=env,
+                            stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+    deadline = time.monotonic() + STARTUP_TIMEOUT_S
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"backend exited with {proc.returncode} (see {log_path})")
+        if backend_workers() == workers:
+            time.sleep(WARMUP_S)
+            return proc
+        time.sleep(0.25)
+    stop_backend(proc)
+    raise RuntimeError(f"backend did not report {workers} ready workers within "
+                       f"{STARTUP_TIMEOUT_S}s (see {log_path})")
+
+def stop_backend(proc: subprocess.Popen):
+    """SIGTERM the whole process group (npx / tsx / primary / workers)."""
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=STOP_TIMEOUT_S)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.wait()
+    except ProcessLookupError:
+        pass
+
+# ---------------------------------------------------------------------------
+# ONE WORKER COUNT
+# ---------------------------------------------------------------------------
+def _children_cpu_s() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+def _worker_cpu(before: dict | None, after: dict | None) -> list[float]:
+    """Backend CPU ms per worker over the run (from the router's merged /metrics)."""
+    if not before or not after:
+        return []
+    first = {w["index"]: w["cpuMs"] for w in (before.get("cluster") or {}).get("workers", [])}
+    last  = {w["index"]: w["cpuMs"] for w in (after.get("cluster") or {}).get("workers", [])}
+    if not last:
+        cpu = lambda m: m["process"]["cpuUserMs"] + m["process"]["cpuSystemMs"]
+        return [cpu(after) - cpu(before)]
+    return [last[i] - first.get(i, 0) for i in sorted(last)]
+
+def measure(workers: int, args) -> dict:
+    load_kwargs = dict(
+        profile="closed",
+        rate=0.0,
+        duration=args.duration,
+        n_players=args.players,
+        concurrency=workers * args.per_worker,
+        time_scale=args.time_scale,
+    )
+    before  = fetch_metrics(BACKEND)
+    cpu0    = _children_cpu_s()
+    stats   = run_sharded(args.client_workers, load_kwargs, progress=args.verbose)
+    client_cpu_ms = (_children_cpu_s() - cpu0) * 1000
+    after   = fetch_metrics(BACKEND)
+    summary = stats.summary()
+
+    per_worker = _worker_cpu(before, after)
+    games      = max(summary["games_completed"], 1)
+    return {
+        "workers":           workers,
+        "concurrency":       load_kwargs["concurrency"],
+        "elapsed_s":         summary["elapsed_s"],
+        "games_completed":   summary["games_completed"],
+        "games_failed":      summary["games_failed"],
+        "games_per_min":     summary["games_per_min"],
+        "events_per_s":      summary["events_per_s"],
+        "client_cpu_ms_per_game":  round(client_cpu_ms / games, 1),
+        "backend_cpu_ms_per_game": round(sum(per_worker) / games, 1) if per_worker else None,
+        # min / max backend CPU over workers (1.0 = perfectly even)
+        "balance":           round(min(per_worker) / max(per_worker), 2) if per_worker and max(per_worker) else None,
+        "failures":          {step: n for step, n in stats.failures.items() if n},
+    }
+
+# ---------------------------------------------------------------------------
+# REPORT
+# ---------------------------------------------------------------------------
+def add_scaling(results: list[dict]):
+    base = results[0]
+    for r in results:
+        if base["games_per_min"] and r["games_completed"]:
+            r["speedup"]    = round(r["games_per_min"] / base["games_per_min"], 2)
+            r["efficiency"] = round(r["speedup"] / (r["workers"] / base["workers"]), 2)
+        else:
+            r["speedup"] = r["efficiency"] = None
+
+def format_report(results: list[dict]) -> str:
+    lines = [f"  {'workers':>7}{'in flight':>11}{'games/min':>11}{'failed':>8}{'speedup':>9}"
+             f"{'effic.':>8}{'balance':>9}{'backend ms/g':>14}{'client ms/g':>13}"]
+    fmt = lambda v, spec: format(v, spec) if v is not None else format("-", spec.rstrip("f").split(".")[0])
+    for r in results:
+        lines.append(f"  {r['workers']:>7}{r['concurrency']:>11}{r['games_per_min']:>11.0f}"
+                     f"{r['games_failed']:>8}{fmt(r['speedup'], '>9.2f')}{fmt(r['efficiency'], '>8.2f')}"
+                     f"{fmt(r['balance'], '>9.2f')}{fmt(r['backend_cpu_ms_per_game'], '>14.1f')}"
+                     f"{r['client_cpu_ms_per_game']:>13.1f}")
+    return "\n".join(lines)
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Backend cluster scaling check (throughput vs worker processes)")
+    parser.add_argument("--workers", type=int, nargs="+", default=list(DEFAULT_WORKERS),
+                        help="backend worker counts to measure, first one is the baseline (default: 1 2 4)")
+    parser.add_argument("--per-worker", type=int, default=DEFAULT_PER_WORKER,
+                        help="games in flight per backend worker (default: %(default)s)")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help="seconds of load per worker count (default: %(default)s)")
+    parser.add_argument("--players", type=int, default=DEFAULT_PLAYERS,
+                        help="players per game (default: %(default)s)")
+    parser.add_argument("--time-scale", type=float, default=DEFAULT_TIME_SCALE,
+                        help="server pacing compression (default: %(default)s)")
+    parser.add_argument("--client-workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="load generator processes (default: half the cores, %(default)s)")
+    parser.add_argument("--min-efficiency", type=float, default=MIN_EFFICIENCY,
+                        help="fail below this scaling efficiency (default: %(default)s)")
+    parser.add_argument("--backend-cmd", default=DEFAULT_BACKEND_CMD,
+                        help="command starting the backend in services/backend (default: %(default)s)")
+    parser.add_argument("--log-level", default="warn",
+                        help="backend LOG_LEVEL while measuring (default: %(default)s)")
+    parser.add_argument("--no-start", action="store_true",
+                        help="measure the already running backend (single --workers value)")
+    parser.add_argument("--verbose", action="store_true",
+                        help="print load generator progress lines")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="also write the results as JSON to this path")
+    return parser
+
+def main():
+    args = build_parser().parse_args()
+    if args.no_start and len(args.workers) != 1:
+        print("--no-start measures one running backend: pass a single --workers value")
+        sys.exit(2)
+
+    print("=" * 70)
+    print("  Backend cluster scaling")
+    print(f"  Backend: {BACKEND} | workers={args.workers} per_worker={args.per_worker} "
+          f"duration={args.duration}s players={args.players} time_scale={args.time_scale}x "
+          f"client_workers={args.client_workers}")
+    print("=" * 70)
+
+    results = []
+    for workers in args.workers:
+        proc = None
+        try:
+            if args.no_start:
+                running = backend_workers()
+                if running != workers:
+                    print(f"  backend reports {running} workers, expected {workers}")
+                    sys.exit(2)
+            else:
+                log_path = os.path.join(tempfile.gettempdir(), f"backend-cluster-{workers}.log")
+                print(f"  ... starting backend with {workers} worker(s) (log: {log_path})")
+                proc = start_backend(args.backend_cmd, workers, args.log_level, log_path)
+            print(f"  ... {workers} worker(s): {workers * args.per_worker} games in flight "
+                  f"for {args.duration}s")
+            results.append(measure(workers, args))
+        finally:
+            if proc:
+                stop_backend(proc)
+
+    add_scaling(results)
+    print()
+    print("=" * 70)
+    print(format_report(results))
+    print("=" * 70)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"backend": BACKEND, "settings": {k: v for k, v in vars(args).items()
+                                                       if k != "json_path"},
+                       "results": results}, f, indent=2)
+        print(f"\n  Results written to {args.json_path}")
+
+    ok = True
+    for r in results:
+        if r["games_failed"] or not r["games_completed"]:
+            print(f"  FAIL: {r['workers']} worker(s): {r['games_failed']} games failed {r['failures']}")
+            ok = False
+        if r["efficiency"] is not None and r["efficiency"] < args.min_efficiency:
+            print(f"  FAIL: {r['workers']} worker(s): scaling efficiency {r['efficiency']} "
+                  f"< {args.min_efficiency}")
+            ok = False
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
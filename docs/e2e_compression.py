@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Compression benchmark — bytes on the wire for /ws with and without
+permessage-deflate (RFC 7692).
+
+For each variant the same full game loops (e2e_load.play_game) are played
+with a different client offer:
+
+  off                   no offer; the baseline every variant is compared to
+  deflate               websockets' default offer (context takeover both ways)
+  no_context            server_no_context_takeover: every message compressed
+                        on its own, no per-connection dictionary on the server
+  window10              server_max_window_bits=10 (8 KiB instead of 32 KiB
+                        window per connection)
+  window10_no_context   both
+
+The backend only compresses when started with WS_COMPRESSION=true (see
+services/backend/src/utils/ws-compression.ts); what it accepted is read
+back from each connection's negotiated extension.
+
+Every server → client frame is recorded per connection and, after the run,
+replayed through zlib with the negotiated parameters and the backend's
+level / memLevel / threshold from GET /metrics — that gives the compressed
+size per frame and therefore per event type.  The modelled total is checked
+against the bytes actually read off each socket.  Client inflate cost is
+timed per event type on the same replay; CPU for the whole run comes from
+time.process_time() (client) and the /metrics process counters (backend).
+
+Usage:
+  WS_COMPRESSION=true npm run dev            # in services/backend
+  python3 docs/e2e_compression.py
+  python3 docs/e2e_compression.py --games 10 --players 6 --time-scale 50
+  python3 docs/e2e_compression.py --variants off deflate --json compression.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import zlib
+
+from e2e_601 import BACKEND, raise_fd_limit
+from e2e_load import LoadStats, play_game
+from e2e_metrics import fetch_metrics
+
+# ---------------------------------------------------------------------------
+# CONFIG
+# ---------------------------------------------------------------------------
+VARIANTS         = ("off", "deflate", "no_context", "window10", "window10_no_context")
+DEFAULT_GAMES    = 5
+DEFAULT_PLAYERS  = 3
+SERVER_DEFAULTS  = {"threshold": 1024, "level": 6, "memLevel": 8}   # ws / zlib defaults
+MODEL_TOLERANCE  = 0.02     # model vs socket bytes, fraction of socket bytes
+FLUSH_TRAILER    = b"\x00\x00\xff\xff"
+
+def variant_options(name: str) -> dict:
+    """websockets.connect() options for one variant's client offer."""
+    from websockets.extensions.permessage_deflate import ClientPerMessageDeflateFactory
+
+    if name == "off":
+        return {"compression": None}
+    if name == "deflate":
+        return {}
+    offer = {
+        "no_context":          {"server_no_context_takeover": True},
+        "window10":            {"server_max_window_bits": 10},
+        "window10_no_context": {"server_no_context_takeover": True, "server_max_window_bits": 10},
+    }[name]
+    return {"compression": None, "extensions": [ClientPerMessageDeflateFactory(**offer)]}
+
+# ---------------------------------------------------------------------------
+# CAPTURE
+# ---------------------------------------------------------------------------
+class FrameProbe:
+    """
+    Client tap (same attach() contract as TraceWriter): keeps every
+    received frame per client and the deflate parameters it negotiated.
+    """
+
+    def __init__(self):
+        self.clients = []
+        self.frames: dict[int, list[tuple[str, bytes]]] = {}   # id(client) -> [(type, raw)]
+
+    def attach(self, client):
+        self.clients.append(client)
+        self.frames[id(client)] = []
+        client.taps.append(self)
+
+    def __call__(self, client, outgoing: bool, raw):
+        if outgoing:
+            return
+        data = raw.encode() if isinstance(raw, str) else raw
+        try:
+            event_type = json.loads(data).get("type", "?")
+        except ValueError:
+            event_type = "?"
+        self.frames[id(client)].append((event_type, data))
+
+def negotiated(client) -> dict | None:
+    """Server-side deflate parameters the client agreed to, None if uncompressed."""
+    protocol = getattr(client.ws, "protocol", None)
+    for ext in getattr(protocol, "extensions", None) or []:
+        if ext.name == "permessage-deflate":
+            return {
+                "no_context":  ext.remote_no_context_takeover,
+                "window_bits": ext.remote_max_window_bits,
+            }
+    return None
+
+# ---------------------------------------------------------------------------
+# MODEL
+# ---------------------------------------------------------------------------
+def frame_header(payload_len: int) -> int:
+    """Unmasked (server → client) frame header size."""
+    if payload_len < 126:
+        return 2
+    return 4 if payload_len < 65536 else 10
+
+def replay(frames: list[tuple[str, bytes]], params: dict | None, server: dict, per_type: dict) -> int:
+    """
+    Compress one connection's stream the way the server does, accumulate
+    raw / wire bytes and inflate time per event type; returns wire bytes.
+    """
+    deflater = inflater = None
+    total    = 0
+    for event_type, data in frames:
+        row = per_type.setdefault(event_type, {"frames": 0, "raw": 0, "wire": 0,
+                                               "compressed": 0, "inflate_ns": 0})
+        row["frames"] += 1
+        row["raw"]    += len(data)
+        payload = len(data)
+        if params is not None and len(data) >= server["threshold"]:
+            # zlib refuses an 8-bit raw deflate window; 9 is what servers use instead
+            wbits = -max(params["window_bits"], 9)
+            if deflater is None or params["no_context"]:
+                deflater = zlib.compressobj(server["level"], zlib.DEFLATED, wbits, server["memLevel"])
+                inflater = zlib.decompressobj(wbits)
+            block   = (deflater.compress(data) + deflater.flush(zlib.Z_SYNC_FLUSH))[:-4]
+            payload = len(block)
+            t0 = time.perf_counter_ns()
+            inflater.decompress(block + FLUSH_TRAILER)
+            row["inflate_ns"] += time.perf_counter_ns() - t0
+            row["compressed"] += 1
+        wire = payload + frame_header(payload)
+        row["wire"] += wire
+        total       += wire
+    return total
+
+# ---------------------------------------------------------------------------
+# RUN
+# ---------------------------------------------------------------------------
+def _cpu_ms(metrics: dict | None) -> float | None:
+    if not metrics:
+        return None
+    return metrics["process"]["cpuUserMs"] + metrics["process"]["cpuSystemMs"]
+
+async def _play(games: int, players: int, time_scale: float | None,
+                options: dict, probe: FrameProbe) -> LoadStats:
+    stats = LoadStats()
+    await asyncio.gather(*(
+        play_game(i, players, stats, "asyncio", trace=probe,
+                  time_scale=time_scale, connect_kwargs=options)
+        for i in range(games)
+    ))
+    return stats
+
+def run_variant(name: str, games: int, players: int, time_scale: float | None) -> dict:
+    probe = FrameProbe()
+    before = fetch_metrics(BACKEND)
+    cpu0   = time.process_time()
+    t0     = time.monotonic()
+    stats  = asyncio.run(_play(games, players, time_scale, variant_options(name), probe))
+    wall_s = time.monotonic() - t0
+    client_cpu_ms = (time.process_time() - cpu0) * 1000
+    after  = fetch_metrics(BACKEND)
+
+    server = dict(SERVER_DEFAULTS)
+    server.update({k: v for k, v in ((after or {}).get("compression") or {}).items() if k in server})
+
+    per_type: dict[str, dict] = {}
+    model = socket = 0
+    compressed_conns = 0
+    for client in probe.clients:
+        params = negotiated(client)
+        compressed_conns += params is not None
+        model  += replay(probe.frames[id(client)], params, server, per_type)
+        socket += client.wire_rx_bytes
+    raw = sum(row["raw"] for row in per_type.values())
+
+    cpu_before, cpu_after = _cpu_ms(before), _cpu_ms(after)
+    return {
+        "variant":          name,
+        "games_completed":  stats.games_completed,
+        "games_failed":     stats.games_failed,
+        "connections":      len(probe.clients),
+        "compressed_conns": compressed_conns,
+        "wall_s":           round(wall_s, 2),
+        "raw_bytes":        raw,
+        "wire_bytes":       model,
+        "socket_bytes":     socket,
+        "client_cpu_ms":    round(client_cpu_ms, 1),
+        "server_cpu_ms":    (cpu_after - cpu_before) if cpu_before is not None and cpu_after is not None else None,
+        "server_settings":  server,
+        "events": {
+            event_type: {
+                "frames":         row["frames"],
+                "raw_bytes":      row["raw"],
+                "wire_bytes":     row["wire"],
+                "ratio":          round(row["wire"] / row["raw"], 3) if row["raw"] else None,
+                "inflate_us":     round(row["inflate_ns"] / row["compressed"] / 1000, 1)
+                                  if row["compressed"] else None,
+            }
+            for event_type, row in sorted(per_type.items(), key=lambda kv: -kv[1]["raw"])
+        },
+    }
+
+def model_error(result: dict) -> float:
+    """Relative gap between modelled and socket bytes (ping/close frames are not modelled)."""
+    if not result["socket_bytes"]:
+        return 0.0
+    return abs(result["wire_bytes"] - result["socket_bytes"]) / result["socket_bytes"]
+
+# ---------------------------------------------------------------------------
+# REPORT
+# ---------------------------------------------------------------------------
+def _kib(n: int) -> str:
+    return f"{n / 1024:.1f}"
+
+def format_report(results: list[dict]) -> str:
+    lines = []
+    for r in results:
+        games = max(r["games_completed"], 1)
+        lines.append(f"  [{r['variant']}]  {r['compressed_conns']}/{r['connections']} connections "
+                     f"compressed, {r['games_completed']} games ({r['games_failed']} failed), "
+                     f"{r['wall_s']}s")
+        lines.append(f"    {'event type':<24}{'frames':>8}{'raw KiB':>10}{'wire KiB':>10}"
+                     f"{'ratio':>8}{'inflate µs':>12}")
+        for event_type, row in r["events"].items():
+            ratio   = f"{row['ratio']:.2f}" if row["ratio"] is not None else "-"
+            inflate = f"{row['inflate_us']:.1f}" if row["inflate_us"] is not None else "-"
+            lines.append(f"    {event_type:<24}{row['frames']:>8}{_kib(row['raw_bytes']):>10}"
+                         f"{_kib(row['wire_bytes']):>10}{ratio:>8}{inflate:>12}")
+        server_cpu = (f"{r['server_cpu_ms'] / games:.1f}" if r["server_cpu_ms"] is not None else "n/a")
+        lines.append(f"    per game: raw {_kib(r['raw_bytes'] // games)} KiB, "
+                     f"wire {_kib(r['wire_bytes'] // games)} KiB "
+                     f"(socket {_kib(r['socket_bytes'] // games)} KiB, model off by "
+                     f"{model_error(r) * 100:.1f}%), "
+                     f"client CPU {r['client_cpu_ms'] / games:.1f} ms, backend CPU {server_cpu} ms")
+        lines.append("")
+
+    base = next((r for r in results if r["variant"] == "off"), None)
+    if base and base["games_completed"]:
+        lines.append(f"  {'variant':<22}{'wire/game KiB':>15}{'vs off':>9}"
+                     f"{'client CPU Δ':>15}{'backend CPU Δ':>16}")
+        base_games = base["games_completed"]
+        for r in results:
+            games = max(r["games_completed"], 1)
+            wire  = r["wire_bytes"] / games
+            saved = wire / (base["wire_bytes"] / base_games) if base["wire_bytes"] else 1.0
+            d_client = r["client_cpu_ms"] / games - base["client_cpu_ms"] / base_games
+            d_server = ("n/a" if r["server_cpu_ms"] is None or base["server_cpu_ms"] is None
+                        else f"{r['server_cpu_ms'] / games - base['server_cpu_ms'] / base_games:+.1f} ms")
+            lines.append(f"  {r['variant']:<22}{wire / 1024:>15.1f}{saved:>9.2f}"
+                         f"{d_client:>+12.1f} ms{d_server:>16}")
+    return "\n".join(lines)
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="permessage-deflate bytes-on-wire benchmark for /ws")
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=list(VARIANTS),
+                        help="client offers to compare (default: all)")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES,
+                        help="concurrent games per variant (default: %(default)s)")
+    parser.add_argument("--players", type=int, default=DEFAULT_PLAYERS,
+                        help="players per game (default: %(default)s)")
+    parser.add_argument("--time-scale", type=float, default=None,
+                        help="compress server pacing by this factor (backend needs ALLOW_TIME_SCALE=true)")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="also write the results as JSON to this path")
+    return parser
+
+def main():
+    args = build_parser().parse_args()
+    if args.players < 1:
+        print("--players must be >= 1 (player 1 pulls the brake)")
+        sys.exit(2)
+
+    print("=" * 70)
+    print("  /ws compression — bytes on the wire")
+    print(f"  Backend: {BACKEND} | games={args.games} players={args.players}"
+          + (f" time_scale={args.time_scale}x" if args.time_scale else ""))
+    print("=" * 70)
+
+    metrics = fetch_metrics(BACKEND)
+    settings = (metrics or {}).get("compression") or {}
+    if metrics is None:
+        print("  (backend /metrics not available — assuming ws defaults, no backend CPU)")
+    elif not settings.get("enabled"):
+        print("  WARNING: backend has compression disabled (WS_COMPRESSION!=true); "
+              "every variant will run uncompressed")
+    else:
+        print("  Backend settings: " + ", ".join(f"{k}={v}" for k, v in settings.items() if k != "enabled"))
+
+    raise_fd_limit()
+    results = []
+    for name in args.variants:
+        print(f"  ... {name}")
+        results.append(run_variant(name, args.games, args.players, args.time_scale))
+
+    print()
+    print("=" * 70)
+    print(format_report(results))
+    print("=" * 70)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"backend": BACKEND, "games": args.games, "players": args.players,
+                       "time_scale": args.time_scale, "results": results}, f, indent=2)
+        print(f"\n  Results written to {args.json_path}")
+
+    ok = True
+    for r in results:
+        if r["games_failed"] or not r["games_completed"]:
+            print(f"  FAIL: {r['variant']}: {r['games_failed']} games failed")
+            ok = False
+        if model_error(r) > MODEL_TOLERANCE:
+            print(f"  FAIL: {r['variant']}: modelled wire bytes off by {model_error(r) * 100:.1f}% "
+                  f"from socket bytes (negotiated parameters not what the server used?)")
+            ok = False
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Content pack index check — do listing and game start stay flat as the pack
+directory grows?
+
+Seeds content packs into the backend's CONTENT_PACKS_DIR in steps (default
+100 → 1 000 → 10 000), waits for the backend's index to pick them up (its
+directory watcher, services/backend/src/game/content-pack-loader.ts) and at
+each step measures
+
+  list         GET /v1/content/packs?limit=50&offset=<random>
+  list_filter  the same with ?verified=true&q=<destination>
+  select       HOST_SELECT_CONTENT_PACK of a random seeded pack → CONTENT_PACK_SELECTED
+  start_game   HOST_START_GAME → STATE_SNAPSHOT(ROUND_INTRO), checking the
+               round runs on the selected pack
+
+The report lists p50 / p99 per step and size plus growth (p50 at the
+largest size over p50 at the smallest); exit code 1 when a game fails to
+start on its pack, the index does not catch up within --index-timeout or a
+growth exceeds --max-growth.
+
+Seeded packs are named <prefix>-NNNNN and removed again at the end unless
+--keep is given.  The backend must read the same directory (--packs-dir,
+default $CONTENT_PACKS_DIR or the backend's default).
+
+Usage:
+  python3 docs/e2e_content_index.py                          # 100, 1k, 10k packs
+  python3 docs/e2e_content_index.py --sizes 1000 20000 --games 50
+  python3 docs/e2e_content_index.py --packs-dir /srv/packs --keep --json index.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import urllib.parse
+
+from e2e_601 import BACKEND, Client, _get, _post, create_session, wait_for_event_any
+from e2e_load import _cmd, percentile
+
+# ---------------------------------------------------------------------------
+# CONFIG
+# ---------------------------------------------------------------------------
+DEFAULT_PACKS_DIR = os.environ.get("CONTENT_PACKS_DIR", "/tmp/pa-sparet-content-packs")
+DEFAULT_SIZES     = (100, 1000, 10000)
+DEFAULT_REQUESTS  = 200       # listing requests per kind and size
+DEFAULT_GAMES     = 30        # select + start per size
+DEFAULT_PREFIX    = "e2eidx"
+PAGE_SIZE         = 50
+MAX_GROWTH        = 2.0       # p50 at largest size / p50 at smallest
+INDEX_TIMEOUT_S   = 120.0
+EVENT_TIMEOUT_S   = 10.0
+DESTINATIONS      = ("Stockholm", "Göteborg", "Malmö", "Kiruna", "Visby",
+                     "Oslo", "Bergen", "Köpenhamn", "Helsingfors", "Reykjavik")
+
+# ---------------------------------------------------------------------------
+# SEEDING
+# ---------------------------------------------------------------------------
+def pack_id(prefix: str, i: int) -> str:
+    return f"{prefix}-{i:05d}"
+
+def make_pack(prefix: str, i: int) -> dict:
+    city = DESTINATIONS[i % len(DESTINATIONS)]
+    return {
+        "roundId": pack_id(prefix, i),
+        "destination": {"name": f"{city} {i}", "country": "Norden", "aliases": [city.lower()]},
+        "clues": [{"level": level, "text": f"Ledtråd {level} för {city} {i}"}
+                  for level in (10, 8, 6, 4, 2)],
+        "followups": [{"questionText": f"Fråga {n} om {city}?", "options": ["A", "B", "C"],
+                       "correctAnswer": "A"} for n in (1, 2)],
+        "metadata": {"generatedAt": f"2026-01-01T00:00:00.{i % 1000:03d}Z",
+                     "verified": i % 3 != 0, "antiLeakChecked": True},
+    }
+
+def seed(packs_dir: str, prefix: str, start: int, stop: int):
+    """Writes packs start..stop-1; write-then-rename so the watcher sees whole files."""
+    os.makedirs(packs_dir, exist_ok=True)
+    for i in range(start, stop):
+        path = os.path.join(packs_dir, f"{pack_id(prefix, i)}.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(make_pack(prefix, i), f)
+        os.replace(path + ".tmp", path)
+
+def unseed(packs_dir: str, prefix: str, count: int):
+    for i in range(count):
+        try:
+            os.remove(os.path.join(packs_dir, f"{pack_id(prefix, i)}.json"))
+        except FileNotFoundError:
+            pass
+
+def list_url(**query) -> str:
+    return f"{BACKEND}/v1/content/packs?{urllib.parse.urlencode(query)}"
+
+def wait_for_index(prefix: str, count: int, timeout_s: float) -> float | None:
+    """Seconds until the listing reports all seeded packs, None on timeout."""
+    t0 = time.monotonic()
+    while time.monotonic() - t0 < timeout_s:
+        if _get(list_url(q=prefix, limit=1)).get("total") == count:
+            return round(time.monotonic() - t0, 2)
+        time.sleep(0.2)
+    return None
+
+# ---------------------------------------------------------------------------
+# MEASUREMENT
+# ---------------------------------------------------------------------------
+def _stats(samples: list[float]) -> dict:
+    vals = sorted(samples)
+    if not vals:
+        return {"count": 0, "p50": None, "p99": None}
+    return {"count": len(vals),
+            "p50":   round(percentile(vals, 50), 2),
+            "p99":   round(percentile(vals, 99), 2)}
+
+def _timed_get(url: str) -> tuple[float, dict]:
+    t0 = time.perf_counter()
+    body = _get(url)
+    return (time.perf_counter() - t0) * 1000, body
+
+def measure_listing(size: int, requests: int) -> dict:
+    plain, filtered = [], []
+    for _ in range(requests):
+        ms, _ = _timed_get(list_url(limit=PAGE_SIZE, offset=random.randrange(size)))
+        plain.append(ms)
+        city = random.choice(DESTINATIONS)
+        ms, _ = _timed_get(list_url(limit=PAGE_SIZE, verified="true", q=city))
+        filtered.append(ms)
+    return {"list": _stats(plain), "list_filter": _stats(filtered)}
+
+async def start_one(round_id: str) -> tuple[float, float]:
+    """Select round_id in a fresh session and start it; returns (select_ms, start_ms)."""
+    session_id = (await asyncio.to_thread(create_session))["sessionId"]
+    host = Client("Host", "host", "asyncio", quiet=True)
+    h = await asyncio.to_thread(_post, f"{BACKEND}/v1/sessions/{session_id}/join",
+                                {"name": "Host", "role": "host"})
+    host.player_id, host.token, host.session_id = h["playerId"], h["playerAuthToken"], session_id
+    try:
+        host.start(asyncio.get_running_loop())
+        if not await wait_for_event_any(host, "STATE_SNAPSHOT", EVENT_TIMEOUT_S,
+                                        **{"payload.state.phase": "LOBBY"}):
+            raise RuntimeError("no LOBBY snapshot")
+
+        t0 = time.perf_counter()
+        host.send(_cmd("HOST_SELECT_CONTENT_PACK", session_id, {"contentPackId": round_id}))
+        if not await wait_for_event_any(host, "CONTENT_PACK_SELECTED", EVENT_TIMEOUT_S):
+            raise RuntimeError(f"{round_id} not selected")
+        select_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        host.send(_cmd("HOST_START_GAME", session_id, {"sessionId": session_id}))
+        intro = await wait_for_event_any(host, "STATE_SNAPSHOT", EVENT_TIMEOUT_S,
+                                         **{"payload.state.phase": "ROUND_INTRO"})
+        if not intro:
+            raise RuntimeError("no ROUND_INTRO snapshot")
+        start_ms = (time.perf_counter() - t0) * 1000
+        used = intro["payload"]["state"].get("contentPackId")
+        if used != round_id:
+            raise RuntimeError(f"round started on {used!r}, not {round_id}")
+        return select_ms, start_ms
+    finally:
+        host.close()
+
+async def measure_games(prefix: str, size: int, games: int) -> dict:
+    select, start, errors = [], [], []
+    for _ in range(games):
+        try:
+            select_ms, start_ms = await start_one(pack_id(prefix, random.randrange(size)))
+            select.append(select_ms)
+            start.append(start_ms)
+        except Exception as e:
+            errors.append(str(e))
+    return {"select": _stats(select), "start_game": _stats(start), "game_errors": errors}
+
+# ---------------------------------------------------------------------------
+# REPORT
+# ---------------------------------------------------------------------------
+METRICS = ("list", "list_filter", "select", "start_game")
+
+def add_growth(results: list[dict]) -> dict:
+    first, last = results[0], results[-1]
+    growth = {}
+    for metric in METRICS:
+        a, b = first[metric]["p50"], last[metric]["p50"]
+        growth[metric] = round(b / a, 2) if a and b is not None else None
+    return growth
+
+def format_report(results: list[dict], growth: dict, max_growth: float) -> str:
+    lines = [f"  {'packs':>7}{'indexed s':>11}" + "".join(f"{m + ' p50/p99':>24}" for m in METRICS)]
+    for r in results:
+        cells = "".join(
+            f"{(format(r[m]['p50'], '.2f') + ' / ' + format(r[m]['p99'], '.2f')) if r[m]['count'] else '-':>24}"
+            for m in METRICS)
+        indexed = format(r["index_catchup_s"], ".2f") if r["index_catchup_s"] is not None else "timeout"
+        lines.append(f"  {r['packs']:>7}{indexed:>11}{cells}")
+    lines.append(f"  {'growth':>7}{'':>11}" + "".join(
+        f"{(format(growth[m], '.2f') + 'x') if growth[m] is not None else '-':>24}" for m in METRICS)
+        + f"   (max {max_growth:g}x)")
+    return "\n".join(lines)
+
+def check(results: list[dict], growth: dict, args) -> list[str]:
+    problems = []
+    for r in results:
+        if r["index_catchup_s"] is None:
+            problems.append(f"{r['packs']} packs: index did not catch up within {args.index_timeout}s")
+        if r["game_errors"]:
+            problems.append(f"{r['packs']} packs: {len(r['game_errors'])} games failed "
+                            f"(first: {r['game_errors'][0]})")
+    if len(results) > 1:
+        for metric, g in growth.items():
+            if g is not None and g > args.max_growth:
+                problems.append(f"{metric} p50 grew {g}x from {results[0]['packs']} to "
+                                f"{results[-1]['packs']} packs (max {args.max_growth}x)")
+    return problems
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Content pack listing / game start latency vs pack count")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="pack counts to measure at, ascending (default: 100 1000 10000)")
+    parser.add_argument("--packs-dir", default=DEFAULT_PACKS_DIR,
+                        help="the backend's CONTENT_PACKS_DIR (default: %(default)s)")
+    parser.add_argument("--prefix", default=DEFAULT_PREFIX,
+                        help="roundId prefix of seeded packs (default: %(default)s)")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS,
+                        help="listing requests per kind and size (default: %(default)s)")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES,
+                        help="select + start rounds per size (default: %(default)s)")
+    parser.add_argument("--max-growth", type=float, default=MAX_GROWTH,
+                        help="fail when a p50 grows more than this from first to last size "
+                             "(default: %(default)s)")
+    parser.add_argument("--index-timeout", type=float, default=INDEX_TIMEOUT_S,
+                        help="seconds to wait for the index to list new packs (default: %(default)s)")
+    parser.add_argument("--keep", action="store_true",
+                        help="leave the seeded packs in place")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="also write the results as JSON to this path")
+    return parser
+
+def main():
+    args = build_parser().parse_args()
+    sizes = sorted(set(args.sizes))
+
+    print("=" * 70)
+    print("  Content pack index")
+    print(f"  Backend: {BACKEND} | packs_dir={args.packs_dir} sizes={sizes} "
+          f"requests={args.requests} games={args.games}")
+    print("=" * 70)
+
+    results = []
+    seeded = 0
+    try:
+        for size in sizes:
+            print(f"  ... seeding to {size} packs")
+            seed(args.packs_dir, args.prefix, seeded, size)
+            seeded = size
+            catchup = wait_for_index(args.prefix, size, args.index_timeout)
+            print(f"  ... {size} packs listed after {catchup if catchup is not None else 'timeout'} s, measuring")
+            result = {"packs": size, "index_catchup_s": catchup}
+            result.update(measure_listing(size, args.requests))
+            result.update(asyncio.run(measure_games(args.prefix, size, args.games)))
+            results.append(result)
+    finally:
+        if not args.keep:
+            unseed(args.packs_dir, args.prefix, seeded)
+
+    growth = add_growth(results)
+    print()
+    print("=" * 70)
+    print(format_report(results, growth, args.max_growth))
+    print("=" * 70)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"backend": BACKEND, "settings": {k: v for k, v in vars(args).items()
+                                                       if k != "json_path"},
+                       "results": results, "growth": growth}, f, indent=2)
+        print(f"\n  Results written to {args.json_path}")
+
+    problems = check(results, growth, args)
+    for problem in problems:
+        print(f"  FAIL: {problem}")
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Content pool generation timing — serial vs pipelined, memoized verification.
+
+Runs services/ai-content's generate-content-pool.ts (npx tsx) three times
+against the stub LLM (docs/e2e_fake_llm.py, via ANTHROPIC_BASE_URL), each
+into a fresh packs directory:
+
+  serial     VERIFY_CONCURRENCY=1 VERIFY_CACHE=false — verification calls
+             one at a time, nothing memoized (the old serial checkers)
+  pipeline   VERIFY_CONCURRENCY=--concurrency, empty verdict cache
+  warm       the same batch again on the pipeline run's verdict cache
+             (regenerating / re-verifying identical content)
+
+The stub's reply sequence restarts before every run, so all three generate
+the same packs.  Per run the report gives wall time, packs per run, LLM
+requests by kind (from the stub), cached verdicts (from the pool's
+metadata.json) and the stub's peak concurrent verification requests.
+
+Exit code 1 when a pack fails, the pipeline run takes more than
+--max-ratio of the serial run's wall time, the warm run still sends
+verification requests, or more than --concurrency verification requests
+were in flight at once.
+
+The serial run matches the pre-pipeline checkers only with --parallel 1:
+VERIFY_CONCURRENCY is one limit for the whole process, where each pack
+used to run its own checks one at a time.
+
+Usage:
+  python3 docs/e2e_fake_llm.py &
+  python3 docs/e2e_content_pool.py
+  python3 docs/e2e_content_pool.py --count 8 --concurrency 12 --json pool.json
+  python3 docs/e2e_content_pool.py --skip-serial --parallel 3
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from e2e_601 import _get, _post
+
+# ---------------------------------------------------------------------------
+# CONFIG
+# ---------------------------------------------------------------------------
+LLM_URL             = os.environ.get("LLM_STUB_URL", "http://localhost:3010")
+SERVICE_DIR         = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "services", "ai-content")
+POOL_SCRIPT         = "src/scripts/generate-content-pool.ts"
+DEFAULT_COUNT       = 4
+DEFAULT_PARALLEL    = 1
+DEFAULT_CONCURRENCY = 8       # VERIFY_CONCURRENCY for the pipeline runs
+MAX_RATIO           = 0.5     # pipeline wall time / serial wall time
+RUN_TIMEOUT_S       = 1800
+GENERATE_KINDS      = ("destination", "clues", "followups")
+VERIFY_KINDS        = ("fact", "leak", "overlap")
+
+# ---------------------------------------------------------------------------
+# MEASUREMENT
+# ---------------------------------------------------------------------------
+def run_pool(name: str, args, packs_dir: str, cache_dir: str, env_overrides: dict) -> dict:
+    _post(f"{args.llm_url}/__stats/reset")
+    env = {
+        **os.environ,
+        "ANTHROPIC_BASE_URL": args.llm_url,
+        "ANTHROPIC_API_KEY":  os.environ.get("ANTHROPIC_API_KEY") or "stub",
+        "CONTENT_PACKS_DIR":  packs_dir,
+        "METRICS_DIR":        os.path.join(packs_dir, "metrics"),
+        "VERIFY_CACHE_DIR":   cache_dir,
+        **env_overrides,
+    }
+    cmd = ["npx", "tsx", POOL_SCRIPT, "--count", str(args.count), "--parallel", str(args.parallel)]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=args.service_dir, env=env, capture_output=True, text=True,
+                          timeout=RUN_TIMEOUT_S)
+    wall_s = time.perf_counter() - start
+    llm = _get(f"{args.llm_url}/__stats")
+
+    metadata = {}
+    try:
+        with open(os.path.join(packs_dir, "metadata.json"), encoding="utf-8") as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        pass
+    stats = metadata.get("stats", {})
+    verification = stats.get("verification") or {}
+    kinds = llm.get("kinds", {})
+    return {
+        "run":             name,
+        "exit_code":       proc.returncode,
+        "stderr_tail":     proc.stderr.strip().splitlines()[-5:] if proc.returncode else [],
+        "wall_s":          round(wall_s, 2),
+        "successful":      stats.get("successful", 0),
+        "failed":          stats.get("failed", args.count),
+        "s_per_pack":      round(wall_s / stats["successful"], 2) if stats.get("successful") else None,
+        "generate_calls":  sum(kinds.get(k, {}).get("requests", 0) for k in GENERATE_KINDS),
+        "verify_calls":    sum(kinds.get(k, {}).get("requests", 0) for k in VERIFY_KINDS),
+        "verify_peak":     max((kinds.get(k, {}).get("peakConcurrent", 0) for k in VERIFY_KINDS), default=0),
+        "cached_verdicts": sum(verification.get(k, 0) for k in ("hits", "diskHits", "coalesced")),
+        "verification":    verification,
+        "llm_kinds":       {k: v.get("requests", 0) for k, v in kinds.items()},
+    }
+
+def measure(args) -> list[dict]:
+    work = tempfile.mkdtemp(prefix="pool-timing-")
+    cache_dir = os.path.join(work, "verification-cache")
+    pipeline_env = {"VERIFY_CONCURRENCY": str(args.concurrency)}
+    runs = []
+    if not args.skip_serial:
+        runs.append(("serial", os.path.join(work, "serial-cache"),
+                     {"VERIFY_CONCURRENCY": "1", "VERIFY_CACHE": "false"}))
+    runs += [("pipeline", cache_dir, pipeline_env),
+             ("warm",     cache_dir, pipeline_env)]
+    results = []
+    try:
+        for name, run_cache, env_overrides in runs:
+            print(f"  ... {name}: {args.count} packs, parallel {args.parallel}, "
+                  f"VERIFY_CONCURRENCY={env_overrides['VERIFY_CONCURRENCY']}")
+            results.append(run_pool(name, args, os.path.join(work, name), run_cache, env_overrides))
+    finally:
+        if not args.keep:
+            shutil.rmtree(work, ignore_errors=True)
+        else:
+            print(f"  kept {work}")
+    return results
+
+# ---------------------------------------------------------------------------
+# REPORT
+# ---------------------------------------------------------------------------
+def format_report(results: list[dict]) -> str:
+    lines = [f"  {'run':<10}{'packs':>7}{'failed':>8}{'wall s':>9}{'s/pack':>9}"
+             f"{'gen calls':>11}{'verify calls':>14}{'cached':>8}{'peak':>6}"]
+    for r in results:
+        per_pack = f"{r['s_per_pack']:.2f}" if r["s_per_pack"] is not None else "-"
+        lines.append(f"  {r['run']:<10}{r['successful']:>7}{r['failed']:>8}{r['wall_s']:>9.2f}{per_pack:>9}"
+                     f"{r['generate_calls']:>11}{r['verify_calls']:>14}{r['cached_verdicts']:>8}"
+                     f"{r['verify_peak']:>6}")
+    by_run = {r["run"]: r for r in results}
+    if "serial" in by_run and by_run["serial"]["wall_s"]:
+        base = by_run["serial"]["wall_s"]
+        lines.append("")
+        lines.append("  wall time vs serial: " + ", ".join(
+            f"{r['run']} {r['wall_s'] / base:.2f}x" for r in results if r["run"] != "serial"))
+    return "\n".join(lines)
+
+def check(results: list[dict], args) -> list[str]:
+    problems = []
+    by_run = {r["run"]: r for r in results}
+    for r in results:
+        if r["exit_code"] or r["failed"] or not r["successful"]:
+            problems.append(f"{r['run']}: exit {r['exit_code']}, {r['failed']} packs failed "
+                            f"{' | '.join(r['stderr_tail'])}")
+    serial, pipeline, warm = by_run.get("serial"), by_run["pipeline"], by_run["warm"]
+    if serial and serial["wall_s"] and pipeline["wall_s"] / serial["wall_s"] > args.max_ratio:
+        problems.append(f"pipeline took {pipeline['wall_s'] / serial['wall_s']:.2f}x the serial wall time "
+                        f"> {args.max_ratio}")
+    if warm["verify_calls"]:
+        problems.append(f"warm run sent {warm['verify_calls']} verification requests (expected 0)")
+    for r in (pipeline, warm):
+        if r["verify_peak"] > args.concurrency:
+            problems.append(f"{r['run']}: {r['verify_peak']} verification requests in flight "
+                            f"> VERIFY_CONCURRENCY {args.concurrency}")
+    return problems
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Content pool generation timing against a stub LLM")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT,
+                        help="packs per run (default: %(default)s)")
+    parser.add_argument("--parallel", type=int, default=DEFAULT_PARALLEL,
+                        help="generate-content-pool --parallel (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="VERIFY_CONCURRENCY for the pipeline runs (default: %(default)s)")
+    parser.add_argument("--max-ratio", type=float, default=MAX_RATIO,
+                        help="fail when pipeline / serial wall time is higher (default: %(default)s)")
+    parser.add_argument("--skip-serial", action="store_true",
+                        help="only run pipeline and warm")
+    parser.add_argument("--llm-url", default=LLM_URL,
+                        help="stub LLM (docs/e2e_fake_llm.py) base URL (default: %(default)s)")
+    parser.add_argument("--service-dir", default=SERVICE_DIR,
+                        help="services/ai-content checkout with node_modules (default: %(default)s)")
+    parser.add_argument("--keep", action="store_true",
+                        help="keep the generated packs and verdict cache")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="also write the results as JSON to this path")
+    return parser
+
+def main():
+    args = build_parser().parse_args()
+    try:
+        _get(f"{args.llm_url}/__stats")
+    except Exception:
+        print(f"  stub LLM not reachable at {args.llm_url} (docs/e2e_fake_llm.py)")
+        sys.exit(2)
+
+    print("=" * 70)
+    print("  Content pool generation timing")
+    print(f"  LLM: {args.llm_url} | count={args.count} parallel={args.parallel} "
+          f"concurrency={args.concurrency}")
+    print("=" * 70)
+
+    results = measure(args)
+    print()
+    print("=" * 70)
+    print(format_report(results))
+    print("=" * 70)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"llm": args.llm_url, "settings": {k: v for k, v in vars(args).items()
+                                                        if k != "json_path"},
+                       "results": results}, f, indent=2)
+        print(f"\n  Results written to {args.json_path}")
+
+    problems = check(results, args)
+    for problem in problems:
+        print(f"  FAIL: {problem}")
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
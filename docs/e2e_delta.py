@@ -0,0 +1,169 @@
+"""
+Delta STATE_SNAPSHOT protocol — reference client (opt-in: /ws?snapshots=delta).
+
+  apply_patch    apply STATE_PATCH ops to a state without mutating it
+                 (copy-on-write along the patched paths only)
+  DeltaTracker   per-client version history: applies each STATE_PATCH to
+                 the snapshot it names as base, acknowledges every version
+                 (STATE_ACK), asks for a full snapshot on a version gap
+                 (STATE_RESYNC) and every verify_every patches compares its
+                 patched state with the full snapshot the server sends back
+
+Client(snapshots="delta") wires a tracker in front of its message store:
+every applied patch is stored and dispatched as a STATE_SNAPSHOT with the
+patched state (payload.patched = true), so wait_for_event filters on
+payload.state.* work unchanged in either mode.
+
+Server side: services/backend/src/utils/state-delta.ts.
+"""
+
+import time
+
+# ---------------------------------------------------------------------------
+# CONFIG
+# ---------------------------------------------------------------------------
+SNAPSHOT_MODES  = ("full", "delta")
+VERIFY_EVERY    = 10       # patches between verification resyncs (0 = never)
+MAX_MISMATCHES  = 5        # mismatch details kept per client
+
+# ---------------------------------------------------------------------------
+# PATCHES
+# ---------------------------------------------------------------------------
+def apply_patch(state, ops: list):
+    """
+    Return state with ops applied; state itself is left untouched.
+
+    Ops are [path, value] (set) or [path] (delete); an empty path replaces
+    the whole state.  Only containers on a patched path are copied, the
+    rest is shared with the base.
+    """
+    if not ops:
+        return state
+    root  = state.copy()
+    owned = {id(root)}
+    for op in ops:
+        path = op[0]
+        if not path:
+            root = op[1]
+            owned.add(id(root))
+            continue
+        node = root
+        for key in path[:-1]:
+            child = node[key]
+            if id(child) not in owned:
+                child = child.copy()
+                owned.add(id(child))
+                node[key] = child
+            node = child
+        if len(op) == 1:
+            del node[path[-1]]
+        else:
+            node[path[-1]] = op[1]
+    return root
+
+# ---------------------------------------------------------------------------
+# TRACKER
+# ---------------------------------------------------------------------------
+class DeltaTracker:
+    """Version history and counters for one delta-mode client."""
+
+    def __init__(self, client, verify_every: int = VERIFY_EVERY):
+        self.client       = client
+        self.verify_every = verify_every
+        self.states: dict[int, dict] = {}     # seq -> state, from the oldest possible base
+        self.full       = 0      # versioned full snapshots received
+        self.patches    = 0      # patches applied
+        self.ops        = 0      # patch ops applied
+        self.resyncs    = 0      # STATE_RESYNC sent (gaps + verifications)
+        self.gaps       = 0      # patches whose base we did not have
+        self.verified   = 0      # patched states confirmed by a full snapshot
+        self.mismatches = 0
+        self.mismatch_details: list[str] = []
+        self._since_verify = 0
+
+    def on_message(self, msg: dict) -> dict | None:
+        """Return the message to store / dispatch, or None to drop it."""
+        event_type = msg.get("type")
+        if event_type == "STATE_PATCH":
+            return self._on_patch(msg)
+        if event_type == "STATE_SNAPSHOT":
+            seq = (msg.get("payload") or {}).get("seq")
+            if seq is not None:
+                self._on_versioned(seq, msg["payload"]["state"])
+        return msg
+
+    def _on_versioned(self, seq: int, state: dict):
+        self.full += 1
+        known = self.states.get(seq)
+        if known is not None:
+            if known == state:
+                self.verified += 1
+            else:
+                self.mismatches += 1
+                if len(self.mismatch_details) < MAX_MISMATCHES:
+                    self.mismatch_details.append(f"seq {seq}: {_first_difference(known, state)}")
+        self.states[seq] = state
+        self._ack(seq)
+
+    def _on_patch(self, msg: dict) -> dict | None:
+        payload = msg["payload"]
+        seq, base_seq = payload["seq"], payload["baseSeq"]
+        base = self.states.get(base_seq)
+        if base is None:
+            self.gaps += 1
+            self._resync()
+            return None
+        state = apply_patch(base, payload["ops"])
+        self.patches += 1
+        self.ops     += len(payload["ops"])
+        self.states[seq] = state
+        # The server only ever diffs against its newest acknowledged version
+        for old in [s for s in self.states if s < base_seq]:
+            del self.states[old]
+        self._ack(seq)
+        self._since_verify += 1
+        if self.verify_every and self._since_verify >= self.verify_every:
+            self._since_verify = 0
+            self._resync()
+        return {
+            "type":         "STATE_SNAPSHOT",
+            "sessionId":    msg.get("sessionId"),
+            "serverTimeMs": msg.get("serverTimeMs"),
+            "payload":      {"state": state, "seq": seq, "patched": True},
+        }
+
+    def _ack(self, seq: int):
+        self.client.send(_command("STATE_ACK", self.client.session_id, {"seq": seq}))
+
+    def _resync(self):
+        self.resyncs += 1
+        self.client.send(_command("STATE_RESYNC", self.client.session_id, {}))
+
+    def counters(self) -> dict:
+        return {
+            "full": self.full, "patches": self.patches, "ops": self.ops,
+            "resyncs": self.resyncs, "gaps": self.gaps,
+            "verified": self.verified, "mismatches": self.mismatches,
+        }
+
+def _command(event_type: str, session_id: str | None, payload: dict) -> dict:
+    return {
+        "type": event_type,
+        "sessionId": session_id,
+        "serverTimeMs": int(time.time() * 1000),
+        "payload": payload,
+    }
+
+def _first_difference(a, b, path: str = "state") -> str:
+    """Human-readable location of the first difference between two JSON values."""
+    if isinstance(a, dict) and isinstance(b, dict):
+        for key in sorted(set(a) | set(b)):
+            if key not in a or key not in b:
+                return f"{path}.{key} only on {'server' if key in b else 'client'}"
+            if a[key] != b[key]:
+                return _first_difference(a[key], b[key], f"{path}.{key}")
+    elif isinstance(a, list) and isinstance(b, list) and len(a) == len(b):
+        for i, (x, y) in enumerate(zip(a, b)):
+            if x != y:
+                return _first_difference(x, y, f"{path}[{i}]")
+    return f"{path}: client {a!r:.60} != server {b!r:.60}"
@@ -0,0 +1,764 @@
+#!/usr/bin/env python3
+"""
+Local ai-content stand-in with configurable latency and failure profiles.
+
+Speaks the same HTTP API as services/ai-content so the backend can run
+against it (AI_CONTENT_URL / AI_CONTENT_SERVICE_URL) without ElevenLabs
+or Anthropic keys, while each request class is slowed down or broken on
+purpose.  Useful to measure how slow TTS stretches phase transitions and
+how the backend degrades when generation times out.
+
+Endpoints (same shapes as the real service):
+
+  GET  /health                      {ok: true}
+  GET  /cache/<assetId>.wav         silent 16 kHz mono WAV of the clip length (HEAD too)
+  POST /tts                         {assetId, url, durationMs}
+  POST /tts/batch                   {roundId, clips: [{clipId, phraseId, url, durationMs, generatedAtMs}]}
+  POST /generate/round              {success, contentPack, progress} (+ roundId / status for the backend proxy)
+  GET  /generate/round/<id>/status  {status, currentStep, totalSteps, roundId}
+  POST /generate/batch              {success, packs: [{id, name, country}], count} (packs run as jobs)
+  POST /generate/jobs               202 {success, jobs, queue}
+  GET  /generate/jobs[?ids=a,b]     {success, queue, jobs}
+  GET  /generate/jobs/<jobId>       {success, job}
+  POST /generate/destination        {success, destination}
+  GET  /generate/status             {success, configured, ...}
+  GET  /generate/packs/index        {success, index}
+  GET  /generate/packs/<roundId>    {success, contentPack}
+
+Generated packs are also written to --packs-dir as <roundId>.json, which is
+where the backend's content loader reads them (CONTENT_PACKS_DIR).
+
+Faults are drawn per request class:
+
+  tts        one POST /tts
+  clip       one line of POST /tts/batch (lines run BATCH_SIZE in parallel,
+             like the real service; a failed line is dropped from clips)
+  generate   one content pack (POST /generate/round, each job / pack of a batch;
+             a job's latency is spread over its GENERATION_STEPS progress steps)
+
+  latency    const:MS | uniform:LO:HI | normal:MEAN:SD | lognormal:MEDIAN:SIGMA | exp:MEAN
+  error      fraction answered with 500 {error}
+  timeout    fraction that hangs --hang-s before answering 504 (longer than
+             the backend's 5 s TTS fetch timeout, so the caller gives up)
+
+Jobs run --generation-workers at a time, like the real service's
+GENERATION_WORKERS.
+
+Control / observation endpoints (not part of the real API):
+
+  GET  /__stats                     request counts, errors, timeouts, latency percentiles per class
+  POST /__stats/reset
+  GET  /__profile                   current profile
+  POST /__profile                   {"profile": "slow"} and/or per-class overrides, e.g.
+                                    {"tts": {"latency": "lognormal:2500:0.5", "timeout": 0.05}}
+
+Usage:
+  python3 docs/e2e_fake_ai.py                                 # :3001, profile "fast"
+  python3 docs/e2e_fake_ai.py --profile realistic
+  python3 docs/e2e_fake_ai.py --profile flaky --seed 7
+  python3 docs/e2e_fake_ai.py --tts-latency lognormal:1800:0.6 --tts-timeout 0.05
+  python3 docs/e2e_fake_ai.py --profile-file profiles.json --profile nightly
+
+  AI_CONTENT_URL=http://localhost:3001 AI_CONTENT_SERVICE_URL=http://localhost:3001 npm run dev
+  curl -s localhost:3001/__stats | jq
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import struct
+import sys
+import threading
+import time
+import urllib.parse
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from e2e_stats import Histogram
+
+# ---------------------------------------------------------------------------
+# CONFIG
+# ---------------------------------------------------------------------------
+PORT             = 3001
+PUBLIC_URL       = None          # default http://localhost:<port>
+PACKS_DIR        = os.environ.get("CONTENT_PACKS_DIR", "/tmp/pa-sparet-content-packs")
+HANG_S           = 30.0          # how long a "timeout" request hangs
+BATCH_SIZE       = 3             # /tts/batch lines generated in parallel (matches the real service)
+SAMPLE_RATE      = 16_000        # served WAV: 16 kHz mono 16-bit silence
+MAX_CLIP_MS      = 30_000
+MS_PER_CHAR      = 65            # ~15 chars/s of Swedish narration
+MIN_CLIP_MS      = 600           # the real mock clip length
+GENERATION_STEPS = 8             # what /generate/round/<id>/status and jobs report
+GENERATION_WORKERS = 3           # jobs generated at once (the real GENERATION_WORKERS default)
+JOB_POLL_S       = 0.05          # /generate/batch waiting on its jobs
+
+CLASSES = ("tts", "clip", "generate")
+
+# Named profiles: per class latency spec, error rate, timeout rate
+PROFILES = {
+    "instant": {
+        "tts":      {"latency": "const:0",  "error": 0.0, "timeout": 0.0},
+        "clip":     {"latency": "const:0",  "error": 0.0, "timeout": 0.0},
+        "generate": {"latency": "const:0",  "error": 0.0, "timeout": 0.0},
+    },
+    "fast": {
+        "tts":      {"latency": "const:20",  "error": 0.0, "timeout": 0.0},
+        "clip":     {"latency": "const:20",  "error": 0.0, "timeout": 0.0},
+        "generate": {"latency": "const:200", "error": 0.0, "timeout": 0.0},
+    },
+    # ElevenLabs turbo + Claude as observed in dev: ~0.5 s per line, ~1 min per pack
+    "realistic": {
+        "tts":      {"latency": "lognormal:450:0.4",    "error": 0.0, "timeout": 0.0},
+        "clip":     {"latency": "lognormal:450:0.4",    "error": 0.0, "timeout": 0.0},
+        "generate": {"latency": "lognormal:60000:0.25", "error": 0.0, "timeout": 0.0},
+    },
+    # p99 TTS near the backend's 5 s fetch timeout
+    "slow": {
+        "tts":      {"latency": "lognormal:2000:0.5",    "error": 0.0, "timeout": 0.02},
+        "clip":     {"latency": "lognormal:2000:0.5",    "error": 0.0, "timeout": 0.02},
+        "generate": {"latency": "lognormal:120000:0.3",  "error": 0.0, "timeout": 0.02},
+    },
+    "flaky": {
+        "tts":      {"latency": "lognormal:450:0.6",    "error": 0.10, "timeout": 0.05},
+        "clip":     {"latency": "lognormal:450:0.6",    "error": 0.10, "timeout": 0.05},
+        "generate": {"latency": "lognormal:60000:0.3",  "error": 0.10, "timeout": 0.05},
+    },
+    "down": {
+        "tts":      {"latency": "const:5", "error": 1.0, "timeout": 0.0},
+        "clip":     {"latency": "const:5", "error": 1.0, "timeout": 0.0},
+        "generate": {"latency": "const:5", "error": 1.0, "timeout": 0.0},
+    },
+}
+
+# Destinations for generated packs: (name, country, aliases, IATA code, founded, population)
+DESTINATIONS = [
+    ("Stockholm",  "Sverige",      ["sthlm"],                 "ARN", 1252, 980_000),
+    ("Oslo",       "Norge",        ["christiania"],           "OSL", 1040, 700_000),
+    ("Köpenhamn",  "Danmark",      ["copenhagen", "kobenhavn"], "CPH", 1167, 650_000),
+    ("Helsingfors", "Finland",     ["helsinki"],              "HEL", 1550, 660_000),
+    ("Reykjavik",  "Island",       ["reykjavík"],             "KEF", 874,  140_000),
+    ("Lissabon",   "Portugal",     ["lisbon", "lisboa"],      "LIS", 1147, 550_000),
+    ("Wien",       "Österrike",    ["vienna"],                "VIE", 1155, 1_980_000),
+    ("Prag",       "Tjeckien",     ["prague", "praha"],       "PRG", 885,  1_350_000),
+    ("Kairo",      "Egypten",      ["cairo"],                 "CAI", 969,  10_000_000),
+    ("Buenos Aires", "Argentina",  ["ba"],                    "EZE", 1536, 3_100_000),
+    ("Kyoto",      "Japan",        [],                        "KIX", 794,  1_460_000),
+    ("Marrakech",  "Marocko",      ["marrakesh"],             "RAK", 1070, 930_000),
+]
+
+# ---------------------------------------------------------------------------
+# PROFILES
+# ---------------------------------------------------------------------------
+class Latency:
+    """Latency distribution parsed from a spec string; samples milliseconds."""
+
+    KINDS = {"const": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exp": 1}
+
+    def __init__(self, spec: str):
+        spec = str(spec).strip()
+        if re.fullmatch(r"[\d.]+", spec):
+            spec = f"const:{spec}"
+        kind, _, rest = spec.partition(":")
+        try:
+            params = [float(p) for p in rest.split(":")] if rest else []
+        except ValueError:
+            params = None
+        if kind not in self.KINDS or params is None or len(params) != self.KINDS[kind] \
+                or any(p < 0 for p in params):
+            raise ValueError(f"bad latency spec {spec!r} "
+                             "(const:MS | uniform:LO:HI | normal:MEAN:SD | lognormal:MEDIAN:SIGMA | exp:MEAN)")
+        self.spec, self.kind, self.params = spec, kind, params
+
+    def sample(self, rng: random.Random) -> float:
+        p = self.params
+        if self.kind == "const":
+            return p[0]
+        if self.kind == "uniform":
+            return rng.uniform(min(p), max(p))
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(p[0], p[1]))
+        if self.kind == "lognormal":
+            return p[0] * math.exp(rng.gauss(0.0, p[1]))
+        return rng.expovariate(1.0 / p[0]) if p[0] else 0.0
+
+    def __str__(self):
+        return self.spec
+
+class Fault:
+    """Latency / error / timeout settings for one request class."""
+
+    def __init__(self, latency="const:0", error=0.0, timeout=0.0):
+        self.latency = latency if isinstance(latency, Latency) else Latency(latency)
+        self.error   = _rate(error, "error")
+        self.timeout = _rate(timeout, "timeout")
+
+    def update(self, overrides: dict) -> "Fault":
+        unknown = set(overrides) - {"latency", "error", "timeout"}
+        if unknown:
+            raise ValueError(f"unknown fault setting(s): {', '.join(sorted(unknown))}")
+        return Fault(overrides.get("latency", self.latency),
+                     overrides.get("error", self.error),
+                     overrides.get("timeout", self.timeout))
+
+    def to_dict(self) -> dict:
+        return {"latency": str(self.latency), "error": self.error, "timeout": self.timeout}
+
+def _rate(value, name: str) -> float:
+    rate = float(value)
+    if not 0.0 <= rate <= 1.0:
+        raise ValueError(f"{name} rate must be in [0, 1], got {value!r}")
+    return rate
+
+def load_profile(name: str, profiles: dict) -> dict[str, Fault]:
+    if name not in profiles:
+        raise ValueError(f"unknown profile {name!r} (have: {', '.join(sorted(profiles))})")
+    return {cls: Fault(**profiles[name].get(cls, {})) for cls in CLASSES}
+
+# ---------------------------------------------------------------------------
+# CONTENT
+# ---------------------------------------------------------------------------
+def asset_id(text: str, voice_id: str) -> str:
+    """Same cache key as the real service: sha256(text \\0 voiceId)[:16]."""
+    return "tts_" + hashlib.sha256(f"{text}\0{voice_id}".encode()).hexdigest()[:16]
+
+def clip_duration_ms(text: str) -> int:
+    """Narration length from text: ~MS_PER_CHAR per spoken char plus SSML breaks."""
+    breaks = sum(float(s) * 1000 for s in re.findall(r'<break time="([\d.]+)s"', text))
+    spoken = re.sub(r"<[^>]+>", "", text).strip()
+    return int(min(MAX_CLIP_MS, max(MIN_CLIP_MS, len(spoken) * MS_PER_CHAR + breaks)))
+
+def silent_wav(duration_ms: int) -> bytes:
+    frames = SAMPLE_RATE * duration_ms // 1000
+    data_len = frames * 2
+    header = struct.pack("<4sI4s4sIHHIIHH4sI",
+                         b"RIFF", 36 + data_len, b"WAVE", b"fmt ", 16, 1, 1,
+                         SAMPLE_RATE, SAMPLE_RATE * 2, 2, 16, b"data", data_len)
+    return header + bytes(data_len)
+
+def _iso_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+def make_pack(rng: random.Random, round_id: str | None = None) -> dict:
+    name, country, aliases, code, founded, population = rng.choice(DESTINATIONS)
+    clues = [
+        {"level": 10, "text": f"Här har människor bott sedan åtminstone år {founded}."},
+        {"level": 8,  "text": f"Staden har omkring {population:,} invånare.".replace(",", " ")},
+        {"level": 6,  "text": "Härifrån går både tåg och flyg vidare ut i världen."},
+        {"level": 4,  "text": f"Flygplatsen hit har koden {code}."},
+        {"level": 2,  "text": "Det här är en av landets mest kända städer."},
+    ]
+
+    def options(correct: int, step: int) -> list[str]:
+        offset = rng.randrange(4)
+        return [str(correct + (i - offset) * step) for i in range(4)]
+
+    founded_opts = options(founded, 50)
+    pop_opts = options(population // 1000 * 1000, max(1000, population // 4000 * 1000))
+    followups = [
+        {"questionText": f"Ungefär vilket år grundades {name}?",
+         "options": founded_opts, "correctAnswer": str(founded)},
+        {"questionText": f"Ungefär hur många invånare har {name}?",
+         "options": pop_opts, "correctAnswer": str(population // 1000 * 1000)},
+    ]
+    return {
+        "roundId": round_id or str(uuid.uuid4()),
+        "destination": {"name": name, "country": country,
+                        "aliases": [name.lower(), *aliases]},
+        "clues": clues,
+        "followups": followups,
+        "metadata": {
+            "generatedAt": _iso_now(),
+            "verified": True,
+            "antiLeakChecked": True,
+            "generator": "e2e_fake_ai",
+        },
+    }
+
+# ---------------------------------------------------------------------------
+# SERVER STATE
+# ---------------------------------------------------------------------------
+class FakeAIContent:
+    """Shared state behind the request handlers: profile, packs and stats."""
+
+    def __init__(self, faults: dict[str, Fault], profile_name: str, profiles: dict,
+                 public_url: str, packs_dir: str | None, hang_s: float, seed: int | None,
+                 generation_workers: int = GENERATION_WORKERS):
+        self.faults       = faults
+        self.profile_name = profile_name
+        self.profiles     = profiles
+        self.public_url   = public_url.rstrip("/")
+        self.packs_dir    = packs_dir
+        self.hang_s       = hang_s
+        self.rng          = random.Random(seed)
+        self.lock         = threading.Lock()
+        self.packs: dict[str, dict] = {}
+        self.clip_ms: dict[str, int] = {}
+        self.jobs: dict[str, dict] = {}
+        self.generation_workers = generation_workers
+        self.worker_slots = threading.Semaphore(generation_workers)
+        self.job_seq = 0
+        self.reset_stats()
+        if packs_dir:
+            os.makedirs(packs_dir, exist_ok=True)
+
+    # -- faults ------------------------------------------------------------
+    def draw(self, cls: str) -> tuple[str, float]:
+        """Outcome for one request of a class: ("ok" | "error" | "timeout", delay ms)."""
+        with self.lock:
+            fault = self.faults[cls]
+            roll = self.rng.random()
+            delay = fault.latency.sample(self.rng)
+        if roll < fault.timeout:
+            return "timeout", self.hang_s * 1000
+        if roll < fault.timeout + fault.error:
+            return "error", delay
+        return "ok", delay
+
+    def set_profile(self, body: dict):
+        faults, name = self.faults, self.profile_name
+        if "profile" in body:
+            name = body["profile"]
+            faults = load_profile(name, self.profiles)
+        faults = dict(faults)
+        for cls in CLASSES:
+            if cls in body:
+                faults[cls] = faults[cls].update(body[cls])
+                name = f"{name}+custom" if not name.endswith("+custom") else name
+        with self.lock:
+            self.faults, self.profile_name = faults, name
+
+    def profile(self) -> dict:
+        with self.lock:
+            return {"profile": self.profile_name,
+                    **{cls: f.to_dict() for cls, f in self.faults.items()}}
+
+    # -- stats -------------------------------------------------------------
+    def reset_stats(self):
+        with self.lock:
+            self.started = time.time()
+            self.counts: dict[str, dict[str, int]] = {}
+            self.hists:  dict[str, Histogram] = {}
+
+    def record(self, cls: str, outcome: str, elapsed_ms: float):
+        with self.lock:
+            c = self.counts.setdefault(cls, {"requests": 0, "ok": 0, "error": 0, "timeout": 0})
+            c["requests"] += 1
+            c[outcome] += 1
+            self.hists.setdefault(cls, Histogram()).record(elapsed_ms)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "uptimeS": round(time.time() - self.started, 1),
+                "profile": self.profile_name,
+                "classes": {cls: {**c, "latencyMs": self.hists[cls].summary()}
+                            for cls, c in sorted(self.counts.items())},
+                "packs":   len(self.packs),
+                "clips":   len(self.clip_ms),
+                "jobs":    self._queue_stats(),
+            }
+
+    # -- content -----------------------------------------------------------
+    def tts(self, text: str, voice_id: str) -> dict:
+        aid = asset_id(text, voice_id)
+        duration = clip_duration_ms(text)
+        with self.lock:
+            self.clip_ms[aid] = duration
+        return {"assetId": aid, "url": f"{self.public_url}/cache/{aid}.wav", "durationMs": duration}
+
+    def new_pack(self) -> dict:
+        with self.lock:
+            pack = make_pack(self.rng)
+            self.packs[pack["roundId"]] = pack
+        if self.packs_dir:
+            path = os.path.join(self.packs_dir, f"{pack['roundId']}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(pack, f, ensure_ascii=False, indent=2)
+        return pack
+
+    # -- generation jobs ---------------------------------------------------
+    def submit_jobs(self, count: int) -> list[dict]:
+        created = []
+        with self.lock:
+            for _ in range(count):
+                self.job_seq += 1
+                job = {"jobId": str(uuid.uuid4()), "status": "queued", "currentStep": 0,
+                       "totalSteps": GENERATION_STEPS, "createdAt": _iso_now(), "_seq": self.job_seq}
+                self.jobs[job["jobId"]] = job
+                created.append(job)
+        for job in created:
+            threading.Thread(target=self._run_job, args=(job,), daemon=True).start()
+        return [self.job(job["jobId"]) for job in created]
+
+    def _run_job(self, job: dict):
+        with self.worker_slots:
+            with self.lock:
+                job.update(status="generating", startedAt=_iso_now())
+            outcome, delay = self.draw("generate")
+            for step in range(1, GENERATION_STEPS + 1):
+                with self.lock:
+                    job.update(currentStep=step, currentStepDescription=f"Steg {step}")
+                time.sleep(delay / GENERATION_STEPS / 1000)
+            self.record("generate", outcome, delay)
+            pack = self.new_pack() if outcome == "ok" else None
+            with self.lock:
+                if pack:
+                    job.update(status="completed", contentPackId=pack["roundId"],
+                               destination=pack["destination"]["name"],
+                               country=pack["destination"]["country"],
+                               currentStepDescription="Klar!")
+                else:
+                    job.update(status="failed", error=f"Injected generate {outcome}")
+                job["finishedAt"] = _iso_now()
+
+    def job(self, job_id: str) -> dict | None:
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            view = {k: v for k, v in job.items() if not k.startswith("_")}
+            if job["status"] == "queued":
+                view["queuePosition"] = 1 + sum(1 for j in self.jobs.values()
+                                                if j["status"] == "queued" and j["_seq"] < job["_seq"])
+            return view
+
+    def recent_job_ids(self, limit: int = 100) -> list[str]:
+        with self.lock:
+            return list(self.jobs)[-limit:]
+
+    def _queue_stats(self) -> dict:
+        statuses = [j["status"] for j in self.jobs.values()]
+        return {"workers": self.generation_workers, "running": statuses.count("generating"),
+                "queued": statuses.count("queued"), "completed": statuses.count("completed"),
+                "failed": statuses.count("failed")}
+
+    def queue_stats(self) -> dict:
+        with self.lock:
+            return self._queue_stats()
+
+    def index(self) -> dict:
+        with self.lock:
+            packs = list(self.packs.values())
+        return {
+            "version": "1.0",
+            "lastUpdated": _iso_now(),
+            "totalPacks": len(packs),
+            "packs": [{
+                "roundId": p["roundId"],
+                "destination": p["destination"]["name"],
+                "country": p["destination"]["country"],
+                "generatedAt": p["metadata"]["generatedAt"],
+                "verified": p["metadata"]["verified"],
+                "antiLeakChecked": p["metadata"]["antiLeakChecked"],
+                "filePath": os.path.join(self.packs_dir or "", f"{p['roundId']}.json"),
+            } for p in packs],
+        }
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+class Handler(BaseHTTPRequestHandler):
+    server_version = "e2e-fake-ai/1.0"
+    protocol_version = "HTTP/1.1"
+    app: FakeAIContent          # set by serve()
+
+    def log_message(self, fmt, *args):
+        pass
+
+    # -- plumbing ----------------------------------------------------------
+    def _send(self, status: int, body, content_type: str = "application/json"):
+        data = body if isinstance(body, bytes) else json.dumps(body, ensure_ascii=False).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass                # caller already gave up (timed out)
+
+    def _body(self) -> dict | None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except (ValueError, UnicodeDecodeError):
+            return None
+        return body if isinstance(body, dict) else None
+
+    def _faulted(self, cls: str) -> tuple[str, float]:
+        """Sleeps the drawn latency; answers and returns outcome != "ok" on a fault."""
+        start = time.perf_counter()
+        outcome, delay = self.app.draw(cls)
+        time.sleep(delay / 1000)
+        if outcome == "timeout":
+            self._send(504, {"error": "Upstream timed out (injected)"})
+        elif outcome == "error":
+            self._send(500, {"error": f"Injected {cls} failure"})
+        return outcome, start
+
+    def _done(self, cls: str, outcome: str, start: float):
+        self.app.record(cls, outcome, (time.perf_counter() - start) * 1000)
+
+    # -- routing -----------------------------------------------------------
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        app = self.app
+        if path == "/health":
+            return self._send(200, {"ok": True})
+        if path.startswith("/cache/"):
+            aid = path[len("/cache/"):].rsplit(".", 1)[0]
+            duration = app.clip_ms.get(aid)
+            if duration is None:
+                return self._send(404, {"error": "Not found"})
+            return self._send(200, silent_wav(duration), "audio/wav")
+        if path == "/generate/status":
+            return self._send(200, {"success": True, "configured": True, "fake": True,
+                                    "profile": app.profile_name})
+        if path == "/generate/packs/index":
+            return self._send(200, {"success": True, "index": app.index()})
+        m = re.fullmatch(r"/generate/packs/([^/]+)", path)
+        if m:
+            pack = app.packs.get(m.group(1))
+            if pack is None:
+                return self._send(404, {"success": False, "error": "Content pack not found"})
+            return self._send(200, {"success": True, "contentPack": pack})
+        if path == "/generate/jobs":
+            query = urllib.parse.parse_qs(self.path.partition("?")[2])
+            ids = [i for i in ",".join(query.get("ids", [])).split(",") if i] if "ids" in query \
+                else app.recent_job_ids()
+            jobs = [job for job in map(app.job, ids) if job is not None]
+            return self._send(200, {"success": True, "queue": app.queue_stats(), "jobs": jobs})
+        m = re.fullmatch(r"/generate/jobs/([^/]+)", path)
+        if m:
+            job = app.job(m.group(1))
+            if job is None:
+                return self._send(404, {"success": False, "error": "Generation job not found"})
+            return self._send(200, {"success": True, "job": job})
+        m = re.fullmatch(r"/generate/round/([^/]+)/status", path)
+        if m:
+            if m.group(1) not in app.packs:
+                return self._send(404, {"error": "Round not found"})
+            return self._send(200, {"status": "completed", "currentStep": GENERATION_STEPS,
+                                    "totalSteps": GENERATION_STEPS, "roundId": m.group(1)})
+        if path == "/__stats":
+            return self._send(200, app.stats())
+        if path == "/__profile":
+            return self._send(200, app.profile())
+        self._send(404, {"error": "Not found"})
+
+    def do_HEAD(self):
+        # the backend's clip cache checks stored clip URLs with HEAD
+        self.do_GET()
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0]
+        body = self._body()
+        if body is None:
+            return self._send(400, {"error": "Body must be a JSON object"})
+        routes = {
+            "/tts":                  self._tts,
+            "/tts/batch":            self._tts_batch,
+            "/generate/round":       self._generate_round,
+            "/generate/batch":       self._generate_batch,
+            "/generate/jobs":        self._generate_jobs,
+            "/generate/destination": self._generate_destination,
+            "/__profile":            self._set_profile,
+            "/__stats/reset":        lambda _: (self.app.reset_stats(), self._send(200, {"ok": True})),
+        }
+        route = routes.get(path)
+        if route is None:
+            return self._send(404, {"error": "Not found"})
+        route(body)
+
+    # -- real API ----------------------------------------------------------
+    def _tts(self, body: dict):
+        text = body.get("text")
+        if not isinstance(text, str) or not text:
+            return self._send(400, {"error": "text is required"})
+        outcome, start = self._faulted("tts")
+        if outcome == "ok":
+            self._send(200, self.app.tts(text, body.get("voiceId") or "default"))
+        self._done("tts", outcome, start)
+
+    def _tts_batch(self, body: dict):
+        round_id, lines = body.get("roundId"), body.get("voiceLines")
+        if not isinstance(round_id, str) or not isinstance(lines, list):
+            return self._send(400, {"error": "roundId and voiceLines[] are required"})
+        start = time.perf_counter()
+        clips, wait_ms, hung = [], 0.0, False
+        # Lines run BATCH_SIZE at a time: a group costs its slowest line
+        for i in range(0, len(lines), BATCH_SIZE):
+            group_ms = 0.0
+            for line in lines[i:i + BATCH_SIZE]:
+                outcome, delay = self.app.draw("clip")
+                group_ms = max(group_ms, delay)
+                hung = hung or outcome == "timeout"
+                self.app.record("clip", outcome, delay)
+                text = line.get("text") if isinstance(line, dict) else None
+                if outcome != "ok" or not isinstance(text, str) or not text:
+                    continue
+                clip = self.app.tts(text, line.get("voiceId") or "default")
+                clips.append({
+                    "clipId": f"{line.get('phraseId')}_{round_id}",
+                    "phraseId": line.get("phraseId"),
+                    "url": clip["url"],
+                    "durationMs": clip["durationMs"],
+                    "generatedAtMs": int(time.time() * 1000),
+                })
+            wait_ms += group_ms
+        time.sleep(self.app.hang_s if hung else wait_ms / 1000)
+        if hung:
+            self._send(504, {"error": "Upstream timed out (injected)"})
+        else:
+            self._send(200, {"roundId": round_id, "clips": clips})
+        self._done("batch", "timeout" if hung else "ok", start)
+
+    def _generate_round(self, body: dict):
+        outcome, start = self._faulted("generate")
+        if outcome == "ok":
+            pack = self.app.new_pack()
+            self._send(200, {
+                "success": True,
+                "contentPack": pack,
+                "progress": {"currentStep": GENERATION_STEPS, "totalSteps": GENERATION_STEPS,
+                             "stepName": "Klar!"},
+                # backend/src/routes/content.ts proxies this endpoint and polls by roundId
+                "roundId": pack["roundId"],
+                "status": "completed",
+            })
+        self._done("generate", outcome, start)
+
+    def _generate_batch(self, body: dict):
+        count = body.get("count", 3)
+        if not isinstance(count, int) or not 3 <= count <= 5:
+            return self._send(400, {"success": False, "error": "count must be between 3 and 5"})
+        if body.get("language", "sv") != "sv":
+            return self._send(400, {"success": False, "error": "language must be one of: sv"})
+        start = time.perf_counter()
+        ids = [job["jobId"] for job in self.app.submit_jobs(count)]
+        while True:
+            jobs = [self.app.job(i) for i in ids]
+            if all(job["status"] in ("completed", "failed") for job in jobs):
+                break
+            time.sleep(JOB_POLL_S)
+        done = [job for job in jobs if job["status"] == "completed"]
+        if not done:
+            self._send(500, {"success": False, "error": "All packs failed (injected)"})
+            return self._done("batch_generate", "error", start)
+        self._send(200, {"success": True, "count": len(done),
+                         "packs": [{"id": job["contentPackId"], "name": job["destination"],
+                                    "country": job["country"]} for job in done]})
+        self._done("batch_generate", "ok", start)
+
+    def _generate_jobs(self, body: dict):
+        count = body.get("count", 1)
+        if not isinstance(count, int) or not 1 <= count <= 5:
+            return self._send(400, {"success": False, "error": "count must be an integer between 1 and 5"})
+        if body.get("language", "sv") != "sv":
+            return self._send(400, {"success": False, "error": "language must be one of: sv"})
+        jobs = self.app.submit_jobs(count)
+        self._send(202, {"success": True, "jobs": jobs, "queue": self.app.queue_stats()})
+
+    def _generate_destination(self, body: dict):
+        outcome, start = self._faulted("generate")
+        if outcome == "ok":
+            with self.app.lock:
+                pack = make_pack(self.app.rng)
+            self._send(200, {"success": True, "destination": pack["destination"]})
+        self._done("generate", outcome, start)
+
+    # -- control -----------------------------------------------------------
+    def _set_profile(self, body: dict):
+        try:
+            self.app.set_profile(body)
+        except (ValueError, TypeError) as e:
+            return self._send(400, {"error": str(e)})
+        self._send(200, self.app.profile())
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+def serve(app: FakeAIContent, host: str, port: int) -> ThreadingHTTPServer:
+    handler = type("BoundHandler", (Handler,), {"app": app})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Fake ai-content server with latency / failure profiles")
+    p.add_argument("--host", default="0.0.0.0")
+    p.add_argument("--port", type=int, default=PORT)
+    p.add_argument("--public-url", default=PUBLIC_URL,
+                   help="Base of clip URLs (default http://localhost:<port>)")
+    p.add_argument("--packs-dir", default=PACKS_DIR,
+                   help="Where generated packs are written ('' = keep in memory only)")
+    p.add_argument("--profile", default="fast",
+                   help=f"Named profile ({', '.join(PROFILES)}) or one from --profile-file")
+    p.add_argument("--profile-file",
+                   help="JSON {name: {tts|clip|generate: {latency, error, timeout}}} merged over the built-ins")
+    p.add_argument("--hang-s", type=float, default=HANG_S, help="How long an injected timeout hangs")
+    p.add_argument("--seed", type=int, help="RNG seed for reproducible fault sequences")
+    p.add_argument("--generation-workers", type=int, default=GENERATION_WORKERS,
+                   help="Generation jobs run at once (default: %(default)s)")
+    for cls in CLASSES:
+        p.add_argument(f"--{cls}-latency", metavar="SPEC", help=f"Override {cls} latency distribution")
+        p.add_argument(f"--{cls}-error", type=float, metavar="P", help=f"Override {cls} error rate")
+        p.add_argument(f"--{cls}-timeout", type=float, metavar="P", help=f"Override {cls} timeout rate")
+    return p
+
+def main():
+    args = build_parser().parse_args()
+    profiles = copy.deepcopy(PROFILES)
+    if args.profile_file:
+        with open(args.profile_file, encoding="utf-8") as f:
+            profiles.update(json.load(f))
+
+    try:
+        faults = load_profile(args.profile, profiles)
+        name = args.profile
+        for cls in CLASSES:
+            overrides = {k: v for k, v in (("latency", getattr(args, f"{cls}_latency")),
+                                           ("error",   getattr(args, f"{cls}_error")),
+                                           ("timeout", getattr(args, f"{cls}_timeout")))
+                         if v is not None}
+            if overrides:
+                faults[cls] = faults[cls].update(overrides)
+                name = f"{args.profile}+custom"
+    except ValueError as e:
+        print(f"  ✗ {e}", file=sys.stderr)
+        sys.exit(2)
+
+    app = FakeAIContent(faults, name, profiles,
+                        public_url=args.public_url or f"http://localhost:{args.port}",
+                        packs_dir=args.packs_dir or None, hang_s=args.hang_s, seed=args.seed,
+                        generation_workers=max(1, args.generation_workers))
+    server = serve(app, args.host, args.port)
+
+    print("=" * 60)
+    print("  Fake ai-content")
+    print("=" * 60)
+    print(f"  Listening: http://{args.host}:{args.port}   profile: {name}")
+    for cls, f in faults.items():
+        print(f"    {cls:<9} latency {str(f.latency):<24} error {f.error:.0%}  timeout {f.timeout:.0%}")
+    print(f"  Packs dir: {app.packs_dir or '(memory only)'}")
+    print(f"  Backend:   AI_CONTENT_URL=http://localhost:{args.port} "
+          f"AI_CONTENT_SERVICE_URL=http://localhost:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(app.stats(), indent=2))
+
+if __name__ == "__main__":
+    main()
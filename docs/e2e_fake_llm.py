@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Local Anthropic Messages API stand-in with injected latency, for timing
+services/ai-content content generation without an API key or API costs.
+
+Answers POST /v1/messages with a canned but valid reply for every prompt
+ai-content sends, recognised from its system / user prompt:
+
+  destination   generators/destination-generator.ts   next of DESTINATIONS
+  clues         generators/clue-generator.ts           5 clues, levels 10..2
+  followups     generators/followup-generator.ts       N questions, 4 options
+  fact          verification/fact-checker.ts           verified
+  leak          verification/anti-leak-checker.ts      cannot guess
+  overlap       verification/overlap-checker.ts        no overlap
+
+Replies depend only on the prompt and on how many destinations were handed
+out since the last reset, so generating the same batch twice (after POST
+/__stats/reset) asks the same verification questions again.  Generation
+requests (sonnet) and verification requests (haiku) have separate latency
+distributions (same specs as docs/e2e_fake_ai.py); --error answers that
+fraction of requests with 529 overloaded_error, which the SDK and the
+verification pipeline retry.
+
+Control / observation endpoints:
+
+  GET  /__stats                     per kind: requests, errors, latency percentiles;
+                                    peak concurrent requests overall and per kind
+  POST /__stats/reset               also restarts the destination sequence
+
+Usage:
+  python3 docs/e2e_fake_llm.py                              # :3010
+  python3 docs/e2e_fake_llm.py --generate-latency lognormal:6000:0.3 --verify-latency lognormal:1500:0.3
+
+  # in services/ai-content
+  ANTHROPIC_BASE_URL=http://localhost:3010 ANTHROPIC_API_KEY=stub npm run generate-pool -- --count 6
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from e2e_fake_ai import DESTINATIONS, Latency, _rate
+from e2e_stats import Histogram
+
+# ---------------------------------------------------------------------------
+# CONFIG
+# ---------------------------------------------------------------------------
+PORT             = 3010
+GENERATE_LATENCY = "const:1200"   # sonnet: destination, clues, followups
+VERIFY_LATENCY   = "const:400"    # haiku: fact, leak and overlap checks
+
+KINDS = ("destination", "clues", "followups", "fact", "leak", "overlap")
+GENERATE_KINDS = ("destination", "clues", "followups")
+
+# ---------------------------------------------------------------------------
+# CONTENT
+# ---------------------------------------------------------------------------
+def classify(system: str, prompt: str) -> str | None:
+    if prompt.startswith("Generera EN intressant destination"):
+        return "destination"
+    if prompt.startswith("Generera 5 ledtrådar"):
+        return "clues"
+    if re.match(r"Generera \d följdfrågor", prompt):
+        return "followups"
+    if system.startswith("Du är en expert fact-checker"):
+        return "fact"
+    if system.startswith("Du är en spelare"):
+        return "leak"
+    if system.startswith("Du är en kvalitetskontrollant"):
+        return "overlap"
+    return None
+
+def destination_reply(n: int) -> dict:
+    name, country, aliases, *_ = DESTINATIONS[n % len(DESTINATIONS)]
+    if n >= len(DESTINATIONS):
+        name = f"{name} {n // len(DESTINATIONS) + 1}"
+    return {"name": name, "country": country, "aliases": [a.lower() for a in aliases],
+            "reasoning": "Stub destination"}
+
+def _destination_of(prompt: str) -> tuple[str, str]:
+    m = re.search(r"destinationen: (.+), (.+)", prompt)
+    return (m.group(1).strip(), m.group(2).strip()) if m else ("Okänd", "Okänt land")
+
+def clues_reply(prompt: str) -> dict:
+    name, country = _destination_of(prompt)
+    texts = {
+        10: f"Här har människor bott i många hundra år ({len(name)} bokstäver i namnet).",
+        8:  f"Platsen har en egen flygplats och en gammal hamn ({country[:1]}...).",
+        6:  f"Det här är en av de största orterna i {country}.",
+        4:  f"Turister från hela världen besöker orten i {country} varje sommar.",
+        2:  f"{name} i {country}.",
+    }
+    return {"clues": [{"level": level, "text": text, "reasoning": "Stub clue"}
+                      for level, text in texts.items()]}
+
+def followups_reply(prompt: str) -> dict:
+    name, country = _destination_of(prompt)
+    m = re.match(r"Generera (\d) följdfrågor", prompt)
+    count = int(m.group(1)) if m else 2
+    seed = sum(map(ord, name))
+    followups = []
+    for i in range(count):
+        base = 1000 + (seed * (i + 3)) % 900
+        options = [str(base + step * 25) for step in range(4)]
+        followups.append({
+            "questionText": f"Ungefär vilket år ({i + 1}) grundades denna plats i {country}?",
+            "options": options,
+            "correctAnswer": options[(seed + i) % 4],
+            "reasoning": "Stub followup",
+        })
+    return {"followups": followups}
+
+def verdict_reply(kind: str) -> dict:
+    if kind == "fact":
+        return {"verified": True, "status": "verified", "reason": "Stub: stämmer", "sources": ["stub"]}
+    if kind == "leak":
+        return {"canGuess": False, "confidence": "none", "reasoning": "Stub: kan inte gissa"}
+    return {"hasOverlap": False, "overlappingConcepts": [], "reason": "Stub: ingen overlap"}
+
+# ---------------------------------------------------------------------------
+# SERVER STATE
+# ---------------------------------------------------------------------------
+class FakeLLM:
+    """Shared state behind the request handlers: latency, sequence and stats."""
+
+    def __init__(self, generate_latency: Latency, verify_latency: Latency, error: float,
+                 seed: int | None):
+        self.generate_latency = generate_latency
+        self.verify_latency   = verify_latency
+        self.error            = error
+        self.rng              = random.Random(seed)
+        self.lock             = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.started      = time.time()
+            self.destinations = 0
+            self.active       = {kind: 0 for kind in KINDS}
+            self.peak         = {kind: 0 for kind in KINDS}
+            self.peak_total   = 0
+            self.counts: dict[str, dict[str, int]] = {}
+            self.hists:  dict[str, Histogram] = {}
+
+    def begin(self, kind: str) -> tuple[bool, float]:
+        """Marks a request in flight; returns (inject error?, delay ms)."""
+        latency = self.generate_latency if kind in GENERATE_KINDS else self.verify_latency
+        with self.lock:
+            self.active[kind] += 1
+            self.peak[kind] = max(self.peak[kind], self.active[kind])
+            self.peak_total = max(self.peak_total, sum(self.active.values()))
+            return self.rng.random() < self.error, latency.sample(self.rng)
+
+    def end(self, kind: str, ok: bool, elapsed_ms: float):
+        with self.lock:
+            self.active[kind] -= 1
+            c = self.counts.setdefault(kind, {"requests": 0, "ok": 0, "error": 0})
+            c["requests"] += 1
+            c["ok" if ok else "error"] += 1
+            self.hists.setdefault(kind, Histogram()).record(elapsed_ms)
+
+    def next_destination(self) -> int:
+        with self.lock:
+            n = self.destinations
+            self.destinations += 1
+            return n
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "uptimeS":   round(time.time() - self.started, 1),
+                "kinds":     {kind: {**c, "peakConcurrent": self.peak[kind],
+                                     "latencyMs": self.hists[kind].summary()}
+                              for kind, c in sorted(self.counts.items())},
+                "requests":  sum(c["requests"] for c in self.counts.values()),
+                "peakConcurrent": self.peak_total,
+            }
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+class Handler(BaseHTTPRequestHandler):
+    server_version = "e2e-fake-llm/1.0"
+    protocol_version = "HTTP/1.1"
+    app: FakeLLM                # set by serve()
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status: int, body: dict):
+        data = json.dumps(body, ensure_ascii=False).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _error(self, status: int, kind: str, message: str):
+        self._send(status, {"type": "error", "error": {"type": kind, "message": message}})
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] == "/__stats":
+            return self._send(200, self.app.stats())
+        self._error(404, "not_found_error", "Not found")
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0]
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length)) if length else {}
+        except (ValueError, UnicodeDecodeError):
+            body = None
+        if path == "/__stats/reset":
+            self.app.reset_stats()
+            return self._send(200, {"ok": True})
+        if path != "/v1/messages":
+            return self._error(404, "not_found_error", "Not found")
+        if not isinstance(body, dict) or not body.get("messages"):
+            return self._error(400, "invalid_request_error", "messages is required")
+        self._messages(body)
+
+    def _messages(self, body: dict):
+        system = body.get("system") or ""
+        if isinstance(system, list):
+            system = "".join(block.get("text", "") for block in system)
+        content = body["messages"][-1].get("content", "")
+        if isinstance(content, list):
+            content = "".join(block.get("text", "") for block in content)
+        kind = classify(system, content)
+        if kind is None:
+            return self._error(400, "invalid_request_error", "Stub does not recognise this prompt")
+
+        start = time.perf_counter()
+        failed, delay = self.app.begin(kind)
+        time.sleep(delay / 1000)
+        if failed:
+            self._error(529, "overloaded_error", "Overloaded (injected)")
+        else:
+            if kind == "destination":
+                reply = destination_reply(self.app.next_destination())
+            elif kind == "clues":
+                reply = clues_reply(content)
+            elif kind == "followups":
+                reply = followups_reply(content)
+            else:
+                reply = verdict_reply(kind)
+            text = json.dumps(reply, ensure_ascii=False)
+            self._send(200, {
+                "id": f"msg_{uuid.uuid4().hex[:24]}",
+                "type": "message",
+                "role": "assistant",
+                "model": body.get("model", "stub"),
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": (len(system) + len(content)) // 4,
+                          "output_tokens": len(text) // 4},
+            })
+        self.app.end(kind, not failed, (time.perf_counter() - start) * 1000)
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+def serve(app: FakeLLM, host: str, port: int) -> ThreadingHTTPServer:
+    handler = type("BoundHandler", (Handler,), {"app": app})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Fake Anthropic Messages API with injected latency")
+    p.add_argument("--host", default="0.0.0.0")
+    p.add_argument("--port", type=int, default=PORT)
+    p.add_argument("--generate-latency", default=GENERATE_LATENCY, metavar="SPEC",
+                   help="latency of destination / clue / followup generation (default: %(default)s)")
+    p.add_argument("--verify-latency", default=VERIFY_LATENCY, metavar="SPEC",
+                   help="latency of fact / leak / overlap checks (default: %(default)s)")
+    p.add_argument("--error", type=float, default=0.0, metavar="P",
+                   help="fraction of requests answered 529 overloaded (default: %(default)s)")
+    p.add_argument("--seed", type=int, help="RNG seed for reproducible latency / error sequences")
+    return p
+
+def main():
+    args = build_parser().parse_args()
+    try:
+        app = FakeLLM(Latency(args.generate_latency), Latency(args.verify_latency),
+                      _rate(args.error, "error"), args.seed)
+    except ValueError as e:
+        print(f"  ✗ {e}", file=sys.stderr)
+        sys.exit(2)
+    server = serve(app, args.host, args.port)
+
+    print("=" * 60)
+    print("  Fake Anthropic Messages API")
+    print("=" * 60)
+    print(f"  Listening: http://{args.host}:{args.port}")
+    print(f"    generate latency {app.generate_latency}   verify latency {app.verify_latency}   "
+          f"error {app.error:.0%}")
+    print(f"  ai-content: ANTHROPIC_BASE_URL=http://localhost:{args.port} ANTHROPIC_API_KEY=stub")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(app.stats(), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+AI game plan generation — blocking request vs queued jobs with progress events.
+
+Per run a fresh session is created and its host connected, then the same
+game plan is generated twice through the backend against the ai-content
+stand-in (docs/e2e_fake_ai.py, slowed down with --generate-latency per
+pack):
+
+  sync    POST /v1/sessions/:id/game-plan/generate-ai — the request is held
+          open until every pack is generated
+  async   the same with {"async": true} — answered at once with the job IDs;
+          the host follows CONTENT_GENERATION_PROGRESS until every job has
+          completed, then GET .../game-plan must list the packs
+
+The report gives p50 / max of the sync request time, the async accept time,
+the time to the first progress event and to the last completed event, and
+the progress events per job.  Exit code 1 when a request fails, a job does
+not complete, the async game plan is missing destinations, the accept p50 is
+above --max-accept-ms, or a job got fewer than two progress events.
+
+Usage:
+  python3 docs/e2e_fake_ai.py --generation-workers 3 &
+  AI_CONTENT_URL=http://localhost:3001 AI_CONTENT_SERVICE_URL=http://localhost:3001 npm run dev
+  python3 docs/e2e_generation_jobs.py
+  python3 docs/e2e_generation_jobs.py --count 5 --runs 5 --generate-latency const:4000 --json jobs.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+from e2e_601 import BACKEND, Client, _get, _post, create_session, wait_for_event, wait_for_event_any
+
+# ---------------------------------------------------------------------------
+# CONFIG
+# ---------------------------------------------------------------------------
+AI_CONTENT_URL   = os.environ.get("AI_CONTENT_URL", "http://localhost:3001")
+DEFAULT_COUNT    = 3
+DEFAULT_RUNS     = 3
+GENERATE_LATENCY = "const:2000"   # per pack on the stand-in
+MAX_ACCEPT_MS    = 500.0          # async accept p50
+JOB_TIMEOUT_S    = 300
+EVENT            = "CONTENT_GENERATION_PROGRESS"
+
+# ---------------------------------------------------------------------------
+# MEASUREMENT
+# ---------------------------------------------------------------------------
+def _plan_url(session_id: str) -> str:
+    return f"{BACKEND}/v1/sessions/{session_id}/game-plan"
+
+async def wait_final(host: Client, ids: list[str], timeout_s: float) -> list[dict | None]:
+    """Each job's completed / failed event (None for jobs that never finished)."""
+    deadline = time.monotonic() + timeout_s
+    while True:
+        finals = {e["payload"]["generateId"]: e for e in host.all_events(EVENT)
+                  if e["payload"]["status"] in ("completed", "failed")}
+        if all(gid in finals for gid in ids) or time.monotonic() > deadline:
+            return [finals.get(gid) for gid in ids]
+        await asyncio.sleep(0.05)
+
+async def run_once(run: int, args) -> dict:
+    result = {"run": run, "error": None}
+    host = None
+    try:
+        session_id = (await asyncio.to_thread(create_session))["sessionId"]
+        host = Client(f"R{run}-Host", "host", "asyncio", quiet=True)
+        h = await asyncio.to_thread(_post, f"{BACKEND}/v1/sessions/{session_id}/join",
+                                    {"name": "Host", "role": "host"})
+        host.player_id, host.token, host.session_id = h["playerId"], h["playerAuthToken"], session_id
+        host.start(asyncio.get_running_loop())
+        if not await wait_for_event([host], "STATE_SNAPSHOT", **{"payload.state.phase": "LOBBY"}):
+            raise RuntimeError("host never reached LOBBY")
+
+        start = time.perf_counter()
+        sync = await asyncio.to_thread(_post, f"{_plan_url(session_id)}/generate-ai",
+                                       {"numDestinations": args.count})
+        result["sync_ms"] = (time.perf_counter() - start) * 1000
+        result["sync_destinations"] = len(sync["gamePlan"]["destinations"])
+
+        start = time.perf_counter()
+        accepted = await asyncio.to_thread(_post, f"{_plan_url(session_id)}/generate-ai",
+                                           {"numDestinations": args.count, "async": True})
+        result["accept_ms"] = (time.perf_counter() - start) * 1000
+        ids = accepted["generateIds"]
+
+        first = await wait_for_event_any(host, EVENT, JOB_TIMEOUT_S)
+        result["first_event_ms"] = (time.perf_counter() - start) * 1000 if first else None
+        finals = await wait_final(host, ids, JOB_TIMEOUT_S)
+        result["done_ms"] = (time.perf_counter() - start) * 1000
+        result["completed"] = sum(1 for f in finals if f and f["payload"]["status"] == "completed")
+        result["jobs"] = len(ids)
+        events = host.all_events(EVENT)
+        result["events_per_job"] = min(sum(1 for e in events if e["payload"]["generateId"] == gid)
+                                       for gid in ids)
+
+        plan = await asyncio.to_thread(_get, _plan_url(session_id))
+        packs = {d["contentPackId"] for d in plan["gamePlan"]["destinations"]}
+        result["async_destinations"] = len(packs & {f["payload"].get("contentPackId") for f in finals if f})
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if host:
+            host.close()
+    return result
+
+def measure(args) -> list[dict]:
+    _post(f"{args.ai_url}/__profile", {"generate": {"latency": args.generate_latency,
+                                                    "error": 0.0, "timeout": 0.0}})
+    results = []
+    for run in range(1, args.runs + 1):
+        print(f"  ... run {run}: {args.count} destinations, sync then async")
+        results.append(asyncio.run(run_once(run, args)))
+    return results
+
+# ---------------------------------------------------------------------------
+# REPORT
+# ---------------------------------------------------------------------------
+def summarize(results: list[dict]) -> dict:
+    ok = [r for r in results if not r["error"]]
+
+    def stat(key: str) -> dict | None:
+        values = [r[key] for r in ok if r.get(key) is not None]
+        if not values:
+            return None
+        return {"p50": round(statistics.median(values), 1), "max": round(max(values), 1)}
+
+    return {key: stat(key) for key in ("sync_ms", "accept_ms", "first_event_ms", "done_ms")}
+
+def format_report(results: list[dict], summary: dict) -> str:
+    lines = [f"  {'':<26}{'p50 ms':>10}{'max ms':>10}"]
+    labels = {"sync_ms": "sync request", "accept_ms": "async accept",
+              "first_event_ms": "async first progress", "done_ms": "async all completed"}
+    for key, label in labels.items():
+        s = summary[key]
+        lines.append(f"  {label:<26}{s['p50'] if s else '-':>10}{s['max'] if s else '-':>10}")
+    lines.append("")
+    for r in results:
+        if r["error"]:
+            lines.append(f"  run {r['run']}: ERROR {r['error']}")
+        else:
+            lines.append(f"  run {r['run']}: {r['completed']}/{r['jobs']} completed, "
+                         f"plan {r['async_destinations']} destinations, "
+                         f">= {r['events_per_job']} events per job")
+    return "\n".join(lines)
+
+def check(results: list[dict], summary: dict, args) -> list[str]:
+    problems = []
+    for r in results:
+        if r["error"]:
+            problems.append(f"run {r['run']}: {r['error']}")
+            continue
+        if r["completed"] != r["jobs"]:
+            problems.append(f"run {r['run']}: {r['completed']}/{r['jobs']} jobs completed")
+        if r["async_destinations"] != args.count:
+            problems.append(f"run {r['run']}: async game plan has {r['async_destinations']} "
+                            f"of {args.count} generated packs")
+        if r["events_per_job"] < 2:
+            problems.append(f"run {r['run']}: a job got {r['events_per_job']} progress events (expected >= 2)")
+    accept = summary["accept_ms"]
+    if accept and accept["p50"] > args.max_accept_ms:
+        problems.append(f"async accept p50 {accept['p50']} ms > {args.max_accept_ms}")
+    return problems
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Blocking vs queued AI game plan generation")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT,
+                        help="destinations per game plan, 3-5 (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help="sessions, each generating sync then async (default: %(default)s)")
+    parser.add_argument("--generate-latency", default=GENERATE_LATENCY,
+                        help="stand-in latency per pack (default: %(default)s)")
+    parser.add_argument("--max-accept-ms", type=float, default=MAX_ACCEPT_MS,
+                        help="fail when the async accept p50 is higher (default: %(default)s)")
+    parser.add_argument("--ai-url", default=AI_CONTENT_URL,
+                        help="ai-content stand-in the backend uses (default: %(default)s)")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="also write the results as JSON to this path")
+    return parser
+
+def main():
+    args = build_parser().parse_args()
+    try:
+        _get(f"{args.ai_url}/__stats")
+    except Exception:
+        print(f"  ai-content stand-in not reachable at {args.ai_url} (docs/e2e_fake_ai.py)")
+        sys.exit(2)
+
+    print("=" * 70)
+    print("  AI game plan generation: sync vs queued jobs")
+    print(f"  Backend: {BACKEND} | ai-content={args.ai_url} count={args.count} runs={args.runs} "
+          f"latency={args.generate_latency}")
+    print("=" * 70)
+
+    results = measure(args)
+    summary = summarize(results)
+    print()
+    print("=" * 70)
+    print(format_report(results, summary))
+    print("=" * 70)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"backend": BACKEND, "settings": {k: v for k, v in vars(args).items()
+                                                       if k != "json_path"},
+                       "summary": summary, "results": results}, f, indent=2)
+        print(f"\n  Results written to {args.json_path}")
+
+    problems = check(results, summary, args)
+    for problem in problems:
+        print(f"  FAIL: {problem}")
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
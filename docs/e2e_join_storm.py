@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+REST join-storm benchmark — a whole venue scanning the QR code at once.
+
+Builds on the apps/ios-host/test-unified-flow.py scenario, scaled out over
+many sessions and keep-alive connection pools:
+
+  1. create      POST /v1/sessions                       (every session)
+  2. storm       per session, shuffled across all sessions and fired together:
+                   --host-claims × POST /join {role: host}   → exactly one 200, rest 409
+                   --players × (GET /by-code/:joinCode → POST /join)
+  3. finish      POST /v1/sessions/:id/tv, GET /by-code (hasHost must be true)
+
+Requests go through one requests.Session whose urllib3 pool holds up to
+--concurrency keep-alive connections, driven by a thread pool of the same
+size.  --no-keepalive sends "Connection: close" on every call to compare
+with the one-connection-per-call behaviour of e2e_601.py's _post/_get.
+
+Report: req/s per stage, latency percentiles / status mix / 409 and error
+rates per endpoint, and the duplicate-host invariant per session.
+
+Usage:
+  python3 docs/e2e_join_storm.py
+  python3 docs/e2e_join_storm.py --sessions 50 --players 80 --concurrency 512
+  python3 docs/e2e_join_storm.py --no-keepalive --json storm.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from e2e_601 import BACKEND
+from e2e_stats import Histogram
+
+# ---------------------------------------------------------------------------
+# CONFIG
+# ---------------------------------------------------------------------------
+DEFAULT_SESSIONS    = 20
+DEFAULT_PLAYERS     = 100    # joins per session (each preceded by a by-code lookup)
+DEFAULT_HOST_CLAIMS = 4      # concurrent role=host joins per session
+DEFAULT_CONCURRENCY = 256    # pooled connections == worker threads
+REQUEST_TIMEOUT_S   = 30
+
+ENDPOINTS = ("create", "by_code", "join_host", "join_player", "tv")
+
+# ---------------------------------------------------------------------------
+# HTTP + STATS
+# ---------------------------------------------------------------------------
+class EndpointStats:
+    __slots__ = ("latency", "statuses", "errors")
+
+    def __init__(self):
+        self.latency  = Histogram()
+        self.statuses = Counter()    # HTTP status -> count
+        self.errors   = Counter()    # exception name -> count (no response)
+
+    def summary(self, wall_s: float) -> dict:
+        total = sum(self.statuses.values()) + sum(self.errors.values())
+        non_2xx = sum(n for s, n in self.statuses.items() if not 200 <= s < 300)
+        return {
+            "requests":   total,
+            "req_per_s":  round(total / wall_s, 1) if wall_s else 0.0,
+            "latency_ms": self.latency.summary(),
+            "statuses":   {str(s): n for s, n in sorted(self.statuses.items())},
+            "errors":     dict(self.errors),
+            "error_rate": round((non_2xx - self.statuses.get(409, 0) + sum(self.errors.values()))
+                                / total, 4) if total else 0.0,
+            "conflict_rate": round(self.statuses.get(409, 0) / total, 4) if total else 0.0,
+        }
+
+class StormClient:
+    """Thread-safe pooled HTTP client that times every call per endpoint."""
+
+    def __init__(self, concurrency: int, keepalive: bool = True):
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency, pool_block=True)
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        self.headers = {} if keepalive else {"Connection": "close"}
+        self.stats   = {name: EndpointStats() for name in ENDPOINTS}
+        self._lock   = threading.Lock()
+
+    def call(self, endpoint: str, method: str, path: str,
+             body: dict | None = None) -> tuple[int | None, dict]:
+        t0 = time.monotonic()
+        try:
+            resp = self.http.request(method, f"{BACKEND}{path}", json=body,
+                                     headers=self.headers, timeout=REQUEST_TIMEOUT_S)
+        except requests.RequestException as e:
+            with self._lock:
+                self.stats[endpoint].errors[type(e).__name__] += 1
+            return None, {}
+        ms = (time.monotonic() - t0) * 1000
+        try:
+            data = resp.json()
+        except ValueError:
+            data = {}
+        with self._lock:
+            st = self.stats[endpoint]
+            st.latency.record(ms)
+            st.statuses[resp.status_code] += 1
+        return resp.status_code, data
+
+    def close(self):
+        self.http.close()
+
+# ---------------------------------------------------------------------------
+# STAGES
+# ---------------------------------------------------------------------------
+class Venue:
+    """One session's bookkeeping across the stages."""
+    __slots__ = ("session_id", "join_code", "host_ok", "host_409", "players_ok",
+                 "has_host_after", "tv_ok")
+
+    def __init__(self, session_id: str, join_code: str):
+        self.session_id     = session_id
+        self.join_code      = join_code
+        self.host_ok        = 0
+        self.host_409       = 0
+        self.players_ok     = 0
+        self.has_host_after = None
+        self.tv_ok          = False
+
+def _run_stage(pool: ThreadPoolExecutor, jobs: list) -> float:
+    t0 = time.monotonic()
+    for fut in [pool.submit(fn, *args) for fn, *args in jobs]:
+        fut.result()
+    return time.monotonic() - t0
+
+def run_storm(sessions: int, players: int, host_claims: int, concurrency: int,
+              keepalive: bool = True, client: StormClient | None = None) -> dict:
+    """Pass a StormClient to keep its per-endpoint histograms after the run."""
+    client = client or StormClient(concurrency, keepalive)
+    venues: list[Venue] = []
+    lock   = threading.Lock()
+    stage_s: dict[str, float] = {}
+
+    def create():
+        status, data = client.call("create", "POST", "/v1/sessions", {})
+        if status is not None and 200 <= status < 300:
+            with lock:
+                venues.append(Venue(data["sessionId"], data["joinCode"]))
+
+    def claim_host(v: Venue, i: int):
+        status, _ = client.call("join_host", "POST", f"/v1/sessions/{v.session_id}/join",
+                                {"name": f"Host {i + 1}", "role": "host"})
+        with lock:
+            if status == 200:
+                v.host_ok += 1
+            elif status == 409:
+                v.host_409 += 1
+
+    def scan_and_join(v: Venue, i: int):
+        status, data = client.call("by_code", "GET", f"/v1/sessions/by-code/{v.join_code}")
+        if status != 200:
+            return
+        status, _ = client.call("join_player", "POST", f"/v1/sessions/{data['sessionId']}/join",
+                                {"name": f"Player {i + 1}"})
+        if status == 200:
+            with lock:
+                v.players_ok += 1
+
+    def finish(v: Venue):
+        status, _ = client.call("tv", "POST", f"/v1/sessions/{v.session_id}/tv", {})
+        v.tv_ok = status == 200
+        status, data = client.call("by_code", "GET", f"/v1/sessions/by-code/{v.join_code}")
+        v.has_host_after = data.get("hasHost") if status == 200 else None
+
+    t_start = time.monotonic()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="storm") as pool:
+            stage_s["create"] = _run_stage(pool, [(create,)] * sessions)
+
+            storm = [(claim_host, v, i) for v in venues for i in range(host_claims)]
+            storm += [(scan_and_join, v, i) for v in venues for i in range(players)]
+            random.shuffle(storm)
+            stage_s["storm"] = _run_stage(pool, storm)
+
+            stage_s["finish"] = _run_stage(pool, [(finish, v) for v in venues])
+    finally:
+        client.close()
+    wall_s = time.monotonic() - t_start
+
+    violations = Counter()
+    for v in venues:
+        if v.host_ok != 1:
+            violations["host_grants_ne_1"] += 1
+        if v.host_409 != host_claims - 1:
+            violations["host_409s_ne_claims_minus_1"] += 1
+        if v.has_host_after is not True:
+            violations["has_host_false_after_claim"] += 1
+        if v.players_ok != players:
+            violations["player_joins_missing"] += 1
+        if not v.tv_ok:
+            violations["tv_token_failed"] += 1
+
+    stage_requests = {
+        "create": sum(client.stats["create"].statuses.values()),
+        "storm":  host_claims * len(venues) + 2 * players * len(venues),
+        "finish": 2 * len(venues),
+    }
+    return {
+        "sessions":    sessions,
+        "created":     len(venues),
+        "players":     players,
+        "host_claims": host_claims,
+        "concurrency": concurrency,
+        "keepalive":   keepalive,
+        "wall_s":      round(wall_s, 2),
+        "stages": {name: {"wall_s": round(s, 3),
+                          "requests": stage_requests[name],
+                          "req_per_s": round(stage_requests[name] / s, 1) if s else 0.0}
+                   for name, s in stage_s.items()},
+        "endpoints":  {name: st.summary(wall_s) for name, st in client.stats.items()},
+        "violations": dict(violations),
+    }
+
+def format_report(summary: dict) -> str:
+    lines = [f"  Sessions:  {summary['created']}/{summary['sessions']} created, "
+             f"{summary['players']} players + {summary['host_claims']} host claims each",
+             f"  Pool:      {summary['concurrency']} connections, "
+             f"keep-alive {'on' if summary['keepalive'] else 'off'}",
+             ""]
+    for name, st in summary["stages"].items():
+        lines.append(f"  {name:<8}{st['requests']:>8} req  {st['wall_s']:>8.2f} s  {st['req_per_s']:>9} req/s")
+    lines.append("")
+    lines.append(f"  {'endpoint':<13}{'count':>7}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}"
+                 f"{'409%':>8}{'err%':>8}  statuses")
+    for name, st in summary["endpoints"].items():
+        if not st["requests"]:
+            continue
+        lat = st["latency_ms"]
+        lines.append(f"  {name:<13}{st['requests']:>7}{lat['p50']:>9}{lat['p90']:>9}{lat['p99']:>9}"
+                     f"{lat['max']:>9}{st['conflict_rate'] * 100:>8.2f}{st['error_rate'] * 100:>8.2f}"
+                     f"  {st['statuses']}" + (f" {st['errors']}" if st["errors"] else ""))
+    lines.append("")
+    if summary["violations"]:
+        lines.append(f"  [FAIL] invariant violations: {summary['violations']}")
+    else:
+        lines.append("  [PASS] exactly one host per session, every other claim 409, all joins accepted")
+    return "\n".join(lines)
+
+# ---------------------------------------------------------------------------
+# ENTRY POINT
+# ---------------------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="REST join-storm benchmark (session endpoints)")
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS,
+                        help="sessions (venues) to create (default: %(default)s)")
+    parser.add_argument("--players", type=int, default=DEFAULT_PLAYERS,
+                        help="player joins per session (default: %(default)s)")
+    parser.add_argument("--host-claims", type=int, default=DEFAULT_HOST_CLAIMS,
+                        help="concurrent role=host joins per session (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="pooled connections / worker threads (default: %(default)s)")
+    parser.add_argument("--no-keepalive", action="store_true",
+                        help="send Connection: close on every request")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="also write the summary as JSON to this path")
+    return parser
+
+def main():
+    args = build_parser().parse_args()
+    if args.host_claims < 1:
+        print("--host-claims must be >= 1")
+        sys.exit(2)
+
+    print("=" * 70)
+    print("  TASK-601 — REST join storm")
+    print(f"  Backend: {BACKEND} | sessions={args.sessions} players={args.players} "
+          f"host_claims={args.host_claims} concurrency={args.concurrency}")
+    print("=" * 70)
+
+    summary = run_storm(args.sessions, args.players, args.host_claims,
+                        args.concurrency, keepalive=not args.no_keepalive)
+
+    print(format_report(summary))
+    print("=" * 70)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\n  Summary written to {args.json_path}")
+
+    ok = not summary["violations"] and summary["created"] == summary["sessions"]
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,778 @@
+#!/usr/bin/env python3
+"""
+Load generator — many concurrent TASK-601 game loops against one backend.
+
+Every simulated session plays the same flow as e2e_601.py:
+
+  create → join (host + N players) → WS connect → HOST_START_GAME →
+  BRAKE_PULL → BRAKE_ANSWER_SUBMIT → auto-advance to 8 → HOST_NEXT_CLUE
+  8→6→4→2 → reveal → DESTINATION_RESULTS → SCOREBOARD_UPDATE
+
+With --scenario idle nobody brakes, answers or advances: every clue,
+followup and scoreboard step waits for its server timer until
+FINAL_RESULTS_PRESENT, and an observer on the host records how late each
+clue and followup deadline was honoured (clue_late / followup_late: server time of
+the event that ended it minus the deadline the server advertised).
+
+Sessions arrive according to a profile (constant / ramp / step) for a
+fixed duration; in-flight games are then allowed to finish.  The closed
+profile instead keeps --concurrency games in flight, starting a new one as
+soon as one ends, so throughput is whatever the backend sustains.  The report
+gives throughput (games/min, events/s), per-step latency percentiles and,
+per event type, server-emit → client-receive latency and broadcast
+fan-out skew (see e2e_stats.py).
+
+Usage:
+  python3 docs/e2e_load.py --rate 2 --duration 120 --players 6
+  python3 docs/e2e_load.py --profile ramp --rate 5 --duration 300 --json load.json
+  python3 docs/e2e_load.py --workers 0 --rate 40 --duration 600   # one worker per core
+  python3 docs/e2e_load.py --duration 7200 --capture-window 500 --spill-dir /tmp/capture
+  python3 docs/e2e_load.py --rate 2 --duration 60 --record party.trace.gz
+  python3 docs/e2e_load.py --rate 50 --duration 60 --time-scale 200   # ALLOW_TIME_SCALE=true
+  python3 docs/e2e_load.py --profile closed --concurrency 32 --duration 60 --time-scale 200
+  python3 docs/e2e_load.py --scenario idle --profile closed --concurrency 100 --time-scale 100
+
+With --workers the sessions are sharded across worker processes (each
+with its own event loop); workers stream compact latency samples and
+counters back over a pipe and the coordinator merges them into a single
+live dashboard line and one final report.
+
+--capture-window bounds the messages each client keeps in memory;
+with --spill-dir evicted messages go to compressed segment files (one
+subdirectory per worker) that e2e_capture.read_spill streams back.
+
+--time-scale asks the backend to compress its pacing delays for every
+session it creates (accelerated-clock test mode), so games finish in
+well under a second and throughput is bounded by the state machine
+rather than by intro / reveal / results holds.
+
+While the run is in flight the backend's GET /metrics is scraped every
+--metrics-interval seconds (see e2e_metrics.py); the report then lines up
+server-side cost per event type (frames, bytes) with the client-observed
+latency, and adds projectState / JSON.stringify / broadcast timings,
+pending timers, event-loop lag and backend CPU for the same window.
+
+--snapshots delta opts every client into versioned STATE_PATCH deltas
+(e2e_delta.py): clients apply and acknowledge patches and periodically
+verify them against a full snapshot.  Received bytes and decode time
+(json.loads + patch apply) per game are reported in either mode, so two
+runs compare the protocols directly.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import multiprocessing.connection
+import os
+import sys
+import time
+
+from e2e_601 import (
+    BACKEND,
+    TRANSPORTS,
+    Client,
+    SNAPSHOT_MODE,
+    _post,
+    create_session,
+    raise_fd_limit,
+    wait_for_event,
+    wait_for_event_any,
+)
+from e2e_capture import SpillWriter
+from e2e_delta import SNAPSHOT_MODES
+from e2e_metrics import DEFAULT_INTERVAL_S, MetricsScraper, format_server_report
+from e2e_stats import LatencyRecorder, estimate_clock_offset, format_event_table
+from e2e_trace import TraceWriter
+
+# ---------------------------------------------------------------------------
+# CONFIG
+# ---------------------------------------------------------------------------
+PROFILES          = ("constant", "ramp", "step", "closed")
+SCENARIOS         = ("brake", "idle")
+DEFAULT_PLAYERS   = 3
+DEFAULT_RATE      = 1.0    # new sessions per second (peak for ramp/step)
+DEFAULT_DURATION  = 60.0   # seconds of arrivals
+DEFAULT_STEPS     = 4      # number of plateaus for the step profile
+DEFAULT_CONCURRENCY = 10   # games in flight for the closed profile
+DRAIN_TIMEOUT_S   = 180    # max wait for in-flight games after arrivals stop
+IDLE_GAME_TIMEOUT_S = 300  # start → FINAL_RESULTS_PRESENT for --scenario idle
+PROGRESS_EVERY_S  = 5.0
+TICK_S            = 0.05   # arrival scheduler resolution
+REPORT_EVERY_S    = 1.0    # worker -> coordinator delta interval
+SHARD_INDEX_SPAN  = 10_000_000   # session index offset per worker (unique names)
+
+# Additive counters shipped worker -> coordinator as deltas
+COUNTERS = ("games_started", "games_completed", "games_failed", "events_received",
+            "rx_bytes", "decode_us", "delta_full", "delta_patches", "delta_resyncs",
+            "delta_gaps", "delta_verified", "delta_mismatches")
+
+# Steps in play order; used for report ordering
+STEPS = [
+    "create",
+    "join",
+    "connect",
+    "select_pack",
+    "start_game",
+    "first_clue",
+    "brake",
+    "answer_lock",
+    "auto_advance",
+    "next_clue",
+    "reveal",
+    "results",
+    "scoreboard",
+    "final_results",
+    "game_total",
+    "clue_late",
+    "followup_late",
+]
+
+_STEP_INDEX = {name: i for i, name in enumerate(STEPS)}
+
+class StepTimeout(Exception):
+    """A step did not complete within STEP_TIMEOUT_S."""
+
+# ---------------------------------------------------------------------------
+# STATISTICS
+# ---------------------------------------------------------------------------
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+class LoadStats:
+    """Per-step latency samples plus game/event counters for one run."""
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {}   # step -> [ms]
+        self.failures: dict[str, int]        = {}   # step -> count
+        for name in COUNTERS:
+            setattr(self, name, 0)
+        self.snapshot_mode   = SNAPSHOT_MODE
+        self.started_at      = time.monotonic()
+        self.events          = LatencyRecorder()
+        self._pending: list[tuple[int, int]] | None = None   # (step idx, ms) since last delta
+        self._pending_fail: dict[str, int]          = {}
+        self._counters_sent  = (0,) * len(COUNTERS)
+
+    def record(self, step: str, elapsed_ms: float):
+        self.samples.setdefault(step, []).append(elapsed_ms)
+        if self._pending is not None:
+            self._pending.append((_STEP_INDEX.get(step, -1), int(round(elapsed_ms))))
+
+    def fail(self, step: str):
+        self.failures[step] = self.failures.get(step, 0) + 1
+        if self._pending is not None:
+            self._pending_fail[step] = self._pending_fail.get(step, 0) + 1
+
+    # -- sharding: compact deltas sent from worker to coordinator ----------
+    def track_deltas(self):
+        self._pending = []
+
+    def take_delta(self, final: bool = False) -> tuple:
+        """(counter deltas, [(step idx, ms)], {step: failures}, event histograms) since the last call."""
+        counters = tuple(getattr(self, name) for name in COUNTERS)
+        diff = tuple(a - b for a, b in zip(counters, self._counters_sent))
+        self._counters_sent = counters
+        samples, self._pending = self._pending or [], []
+        fails, self._pending_fail = self._pending_fail, {}
+        return diff, samples, fails, self.events.take_state(final)
+
+    def merge_delta(self, delta: tuple):
+        counters, samples, fails, event_state = delta
+        self.events.merge_state(event_state)
+        for name, n in zip(COUNTERS, counters):
+            setattr(self, name, getattr(self, name) + n)
+        for idx, ms in samples:
+            name = STEPS[idx] if 0 <= idx < len(STEPS) else "other"
+            self.samples.setdefault(name, []).append(float(ms))
+        for name, n in fails.items():
+            self.failures[name] = self.failures.get(name, 0) + n
+
+    def add_client(self, client: Client):
+        """Fold one finished client's receive and delta-protocol counters in."""
+        self.events_received += client.messages.total
+        self.rx_bytes        += client.rx_bytes
+        self.decode_us       += client.decode_ns // 1000
+        if client.delta:
+            c = client.delta.counters()
+            self.delta_full       += c["full"]
+            self.delta_patches    += c["patches"]
+            self.delta_resyncs    += c["resyncs"]
+            self.delta_gaps       += c["gaps"]
+            self.delta_verified   += c["verified"]
+            self.delta_mismatches += c["mismatches"]
+
+    def elapsed_s(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def summary(self) -> dict:
+        elapsed = self.elapsed_s()
+        games   = self.games_completed + self.games_failed
+        steps = {}
+        for name in STEPS + sorted(set(self.samples) - set(STEPS)):
+            vals = sorted(self.samples.get(name, []))
+            if not vals and name not in self.failures:
+                continue
+            steps[name] = {
+                "count":  len(vals),
+                "failed": self.failures.get(name, 0),
+                "p50":    round(percentile(vals, 50), 1),
+                "p90":    round(percentile(vals, 90), 1),
+                "p99":    round(percentile(vals, 99), 1),
+                "max":    round(vals[-1], 1) if vals else 0.0,
+            }
+        return {
+            "elapsed_s":       round(elapsed, 1),
+            "games_started":   self.games_started,
+            "games_completed": self.games_completed,
+            "games_failed":    self.games_failed,
+            "games_per_min":   round(self.games_completed / elapsed * 60, 2) if elapsed else 0.0,
+            "events_received": self.events_received,
+            "events_per_s":    round(self.events_received / elapsed, 1) if elapsed else 0.0,
+            "rx_bytes_per_game": round(self.rx_bytes / games) if games else 0,
+            "decode_ms_per_game": round(self.decode_us / 1000 / games, 2) if games else 0.0,
+            "snapshots":       {
+                "mode":       self.snapshot_mode,
+                "full":       self.delta_full,
+                "patches":    self.delta_patches,
+                "resyncs":    self.delta_resyncs,
+                "gaps":       self.delta_gaps,
+                "verified":   self.delta_verified,
+                "mismatches": self.delta_mismatches,
+            },
+            "steps":           steps,
+            "events":          self.events.summary(),
+        }
+
+    def progress_line(self, in_flight: int) -> str:
+        elapsed = self.elapsed_s()
+        rate = self.events_received / elapsed if elapsed else 0.0
+        return (f"  t={elapsed:6.1f}s  started={self.games_started}  done={self.games_completed}"
+                f"  failed={self.games_failed}  in_flight={in_flight}  events/s={rate:.0f}")
+
+def format_report(summary: dict) -> str:
+    lines = []
+    lines.append(f"  Elapsed:     {summary['elapsed_s']} s")
+    lines.append(f"  Games:       {summary['games_completed']} completed / "
+                 f"{summary['games_started']} started / {summary['games_failed']} failed")
+    lines.append(f"  Throughput:  {summary['games_per_min']} games/min, "
+                 f"{summary['events_per_s']} events/s")
+    lines.append(f"  Received:    {summary['rx_bytes_per_game'] / 1024:.1f} KiB/game, "
+                 f"decode {summary['decode_ms_per_game']} ms/game")
+    snaps = summary["snapshots"]
+    if snaps["mode"] == "delta":
+        lines.append(f"  Snapshots:   delta — {snaps['patches']} patches, {snaps['full']} full, "
+                     f"{snaps['resyncs']} resyncs ({snaps['gaps']} gaps), "
+                     f"{snaps['verified']} verified, {snaps['mismatches']} mismatches")
+    lines.append("")
+    lines.append(f"  {'step':<14}{'count':>7}{'fail':>6}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    for name, st in summary["steps"].items():
+        lines.append(f"  {name:<14}{st['count']:>7}{st['failed']:>6}"
+                     f"{st['p50']:>10}{st['p90']:>10}{st['p99']:>10}{st['max']:>10}")
+    if summary.get("events", {}).get("latency"):
+        lines.append("")
+        lines.append("  Server-emit → client-receive latency (ms) per event type")
+        lines.append(format_event_table(summary["events"]))
+    if summary.get("server"):
+        lines.append("")
+        lines.append("  Server-side cost (GET /metrics) vs client latency (ms)")
+        lines.append(format_server_report(summary["server"], summary.get("events")))
+    return "\n".join(lines)
+
+# ---------------------------------------------------------------------------
+# ONE GAME
+# ---------------------------------------------------------------------------
+def _cmd(event_type: str, session_id: str, payload: dict) -> dict:
+    return {
+        "type": event_type,
+        "sessionId": session_id,
+        "serverTimeMs": int(time.time() * 1000),
+        "payload": payload,
+    }
+
+class _Step:
+    """async-with timer: records elapsed ms on success, a failure otherwise."""
+    def __init__(self, stats: LoadStats, name: str):
+        self.stats = stats
+        self.name  = name
+
+    async def __aenter__(self):
+        self.t0 = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.stats.record(self.name, (time.monotonic() - self.t0) * 1000)
+        else:
+            self.stats.fail(self.name)
+        return False
+
+def _require(found, step: str):
+    if found is None:
+        raise StepTimeout(step)
+    return found
+
+async def play_game(
+    index: int,
+    n_players: int,
+    stats: LoadStats,
+    transport: str = "asyncio",
+    window: int | None = None,
+    spill: SpillWriter | None = None,
+    trace: TraceWriter | None = None,
+    time_scale: float | None = None,
+    snapshots: str = SNAPSHOT_MODE,
+    connect_kwargs: dict | None = None,
+    scenario: str = "brake",
+    content_pack_id: str | None = None,
+) -> bool:
+    """Play one full game loop; returns True when the scenario's last step was reached.
+
+    With content_pack_id the host selects that pack before starting (otherwise
+    the backend picks built-in content)."""
+    stats.games_started += 1
+    t_game = time.monotonic()
+    clients: list[Client] = []
+    try:
+        async with _Step(stats, "create"):
+            resp       = await asyncio.to_thread(create_session, time_scale)
+            session_id = resp["sessionId"]
+
+        host    = Client(f"S{index}-Host", "host", transport, quiet=True,
+                         window=window, spill=spill, snapshots=snapshots,
+                         connect_kwargs=connect_kwargs)
+        players = [Client(f"S{index}-P{i+1}", "player", transport, quiet=True,
+                          window=window, spill=spill, snapshots=snapshots,
+                          connect_kwargs=connect_kwargs)
+                   for i in range(n_players)]
+        clients = [host] + players
+
+        async with _Step(stats, "join"):
+            h = await asyncio.to_thread(_post, f"{BACKEND}/v1/sessions/{session_id}/join",
+                                        {"name": "Host", "role": "host"})
+            host.player_id, host.token, host.session_id = h["playerId"], h["playerAuthToken"], session_id
+            for p in players:
+                r = await asyncio.to_thread(_post, f"{BACKEND}/v1/sessions/{session_id}/join",
+                                            {"name": p.name})
+                p.player_id, p.token, p.session_id = r["playerId"], r["playerAuthToken"], session_id
+
+        deadlines = DeadlineWatch()
+        if scenario == "idle":
+            host.observers.append(deadlines)
+        loop = asyncio.get_running_loop()
+        async with _Step(stats, "connect"):
+            for c in clients:
+                c.observers.append(stats.events)
+                if trace:
+                    trace.attach(c)
+                c.start(loop)
+            _require(await wait_for_event(clients, "STATE_SNAPSHOT",
+                                          **{"payload.state.phase": "LOBBY"}), "connect")
+
+        if content_pack_id:
+            async with _Step(stats, "select_pack"):
+                host.send(_cmd("HOST_SELECT_CONTENT_PACK", session_id,
+                               {"contentPackId": content_pack_id}))
+                _require(await wait_for_event(clients, "CONTENT_PACK_SELECTED"), "select_pack")
+
+        async with _Step(stats, "start_game"):
+            host.send(_cmd("HOST_START_GAME", session_id, {"sessionId": session_id}))
+            _require(await wait_for_event(clients, "STATE_SNAPSHOT",
+                                          **{"payload.state.phase": "ROUND_INTRO"}), "start_game")
+
+        async with _Step(stats, "first_clue"):
+            _require(await wait_for_event(clients, "CLUE_PRESENT",
+                                          **{"payload.clueLevelPoints": 10}), "first_clue")
+
+        if scenario == "idle":
+            await _idle_flow(stats, host, deadlines)
+        else:
+            await _brake_flow(stats, session_id, host, players, clients)
+
+        stats.record("game_total", (time.monotonic() - t_game) * 1000)
+        stats.games_completed += 1
+        return True
+    except Exception:
+        stats.games_failed += 1
+        return False
+    finally:
+        for c in clients:
+            stats.add_client(c)
+            c.close()
+
+async def _brake_flow(stats: LoadStats, session_id: str, host: Client,
+                      players: list[Client], clients: list[Client]):
+    """TASK-601: brake + answer at 10, host advances 8→2 and reveals."""
+    p1 = players[0]
+    async with _Step(stats, "brake"):
+        p1.send(_cmd("BRAKE_PULL", session_id, {
+            "playerId": p1.player_id,
+            "clientTimeMs": int(time.time() * 1000),
+        }))
+        _require(await wait_for_event(clients, "BRAKE_ACCEPTED",
+                                      **{"payload.playerId": p1.player_id}), "brake")
+
+    async with _Step(stats, "answer_lock"):
+        p1.send(_cmd("BRAKE_ANSWER_SUBMIT", session_id, {
+            "playerId": p1.player_id,
+            "answerText": "Paris",
+        }))
+        _require(await wait_for_event(clients, "BRAKE_ANSWER_LOCKED",
+                                      **{"payload.playerId": p1.player_id}), "answer_lock")
+
+    async with _Step(stats, "auto_advance"):
+        _require(await wait_for_event(clients, "CLUE_PRESENT",
+                                      **{"payload.clueLevelPoints": 8}), "auto_advance")
+
+    for level in (6, 4, 2):
+        async with _Step(stats, "next_clue"):
+            host.send(_cmd("HOST_NEXT_CLUE", session_id, {}))
+            _require(await wait_for_event(clients, "CLUE_PRESENT",
+                                          **{"payload.clueLevelPoints": level}), "next_clue")
+
+    async with _Step(stats, "reveal"):
+        host.send(_cmd("HOST_NEXT_CLUE", session_id, {}))
+        _require(await wait_for_event(clients, "DESTINATION_REVEAL"), "reveal")
+
+    async with _Step(stats, "results"):
+        _require(await wait_for_event(clients, "DESTINATION_RESULTS"), "results")
+
+    async with _Step(stats, "scoreboard"):
+        _require(await wait_for_event_any(host, "SCOREBOARD_UPDATE"), "scoreboard")
+
+async def _idle_flow(stats: LoadStats, host: Client, deadlines: "DeadlineWatch"):
+    """Hands-off: server timers drive the game to FINAL_RESULTS_PRESENT."""
+    async with _Step(stats, "final_results"):
+        _require(await wait_for_event_any(host, "FINAL_RESULTS_PRESENT",
+                                          timeout_s=IDLE_GAME_TIMEOUT_S), "final_results")
+    for kind, late_ms in deadlines.late:
+        stats.record(f"{kind}_late", late_ms)
+
+class DeadlineWatch:
+    """
+    Host observer: (kind, ms) per clue / followup deadline the server let
+    expire, tracked as events arrive so a --capture-window log that has
+    evicted them by the end of the game does not lose samples.
+
+    A clue deadline is CLUE_PRESENT.timerEnd, ended by the next (lower)
+    CLUE_PRESENT; the level-2 deadline is skipped because the reveal waits
+    for banter on top.  A followup deadline is startAtServerMs +
+    timerDurationMs, ended by FOLLOWUP_ANSWERS_LOCKED.  Both ends are
+    server timestamps, so client clock offset plays no part.
+    """
+
+    def __init__(self):
+        self.late: list[tuple[str, float]] = []
+        self._clue = None                        # (level, timerEnd) of the clue on screen
+        self._followups: dict[int, float] = {}   # question index -> deadline
+
+    def __call__(self, client, msg: dict, recv_ms: float):
+        event_type = msg.get("type")
+        payload    = msg.get("payload") or {}
+        if event_type == "CLUE_PRESENT":
+            level = payload.get("clueLevelPoints")
+            if self._clue and self._clue[1] is not None and level < self._clue[0]:
+                self.late.append(("clue", msg["serverTimeMs"] - self._clue[1]))
+            self._clue = (level, payload.get("timerEnd"))
+        elif event_type == "DESTINATION_REVEAL":
+            self._clue = None
+        elif event_type == "FOLLOWUP_QUESTION_PRESENT":
+            if payload.get("startAtServerMs") is not None:
+                self._followups[payload["currentQuestionIndex"]] = (payload["startAtServerMs"]
+                                                                    + payload["timerDurationMs"])
+        elif event_type == "FOLLOWUP_ANSWERS_LOCKED":
+            deadline = self._followups.pop(payload.get("currentQuestionIndex"), None)
+            if deadline is not None:
+                self.late.append(("followup", msg["serverTimeMs"] - deadline))
+
+# ---------------------------------------------------------------------------
+# ARRIVALS
+# ---------------------------------------------------------------------------
+def arrival_rate(profile: str, t: float, rate: float, duration: float,
+                 steps: int = DEFAULT_STEPS) -> float:
+    """Sessions per second at time t into the run."""
+    if profile == "constant":
+        return rate
+    frac = min(1.0, max(0.0, t / duration)) if duration > 0 else 1.0
+    if profile == "ramp":
+        return rate * frac
+    if profile == "step":
+        return rate * min(steps, math.floor(frac * steps) + 1) / steps
+    raise ValueError(f"unknown profile {profile!r}")
+
+async def run_load(
+    profile: str = "constant",
+    rate: float = DEFAULT_RATE,
+    duration: float = DEFAULT_DURATION,
+    n_players: int = DEFAULT_PLAYERS,
+    max_sessions: int | None = None,
+    steps: int = DEFAULT_STEPS,
+    transport: str = "asyncio",
+    stats: LoadStats | None = None,
+    progress: bool = True,
+    index_base: int = 0,
+    capture_window: int | None = None,
+    spill_dir: str | None = None,
+    record: str | None = None,
+    time_scale: float | None = None,
+    snapshots: str = SNAPSHOT_MODE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    scenario: str = "brake",
+) -> LoadStats:
+    """Start sessions per the arrival profile, then drain in-flight games."""
+    stats    = stats or LoadStats()
+    stats.snapshot_mode = snapshots
+    try:
+        stats.events.offset_ms, _ = await asyncio.to_thread(estimate_clock_offset, BACKEND)
+    except Exception as e:
+        print(f"  [WARN] clock offset estimate failed ({e}); assuming 0 ms", flush=True)
+    spill    = SpillWriter(spill_dir) if spill_dir else None
+    trace    = TraceWriter(record) if record else None
+    tasks: set[asyncio.Task] = set()
+    credit   = 0.0
+    started  = 0
+    t_start  = time.monotonic()
+    next_progress = t_start + PROGRESS_EVERY_S
+
+    while True:
+        now = time.monotonic()
+        t   = now - t_start
+        if t >= duration or (max_sessions is not None and started >= max_sessions):
+            break
+        if profile == "closed":
+            due = concurrency - len(tasks)
+        else:
+            credit += arrival_rate(profile, t, rate, duration, steps) * TICK_S
+            due     = int(credit)
+            credit -= due
+        if max_sessions is not None:
+            due = min(due, max_sessions - started)
+        for _ in range(due):
+            task = asyncio.create_task(
+                play_game(index_base + started, n_players, stats, transport,
+                          capture_window, spill, trace, time_scale, snapshots,
+                          scenario=scenario))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            started += 1
+        if progress and now >= next_progress:
+            print(stats.progress_line(len(tasks)), flush=True)
+            next_progress = now + PROGRESS_EVERY_S
+        if profile == "closed" and tasks:
+            # Refill as soon as a game ends, not on the next tick
+            await asyncio.wait(set(tasks), timeout=TICK_S, return_when=asyncio.FIRST_COMPLETED)
+        else:
+            await asyncio.sleep(TICK_S)
+
+    # Drain
+    drain_deadline = time.monotonic() + DRAIN_TIMEOUT_S
+    while tasks and time.monotonic() < drain_deadline:
+        await asyncio.wait(set(tasks), timeout=PROGRESS_EVERY_S)
+        if progress:
+            print(stats.progress_line(len(tasks)), flush=True)
+    for task in list(tasks):
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    if spill:
+        await asyncio.to_thread(spill.close)
+    if trace:
+        trace.close()
+    return stats
+
+# ---------------------------------------------------------------------------
+# SHARDED DRIVER  (one event loop per worker process)
+# ---------------------------------------------------------------------------
+async def _worker_run(conn, load_kwargs: dict):
+    stats = LoadStats()
+    stats.track_deltas()
+    load  = asyncio.create_task(run_load(stats=stats, progress=False, **load_kwargs))
+    while not load.done():
+        await asyncio.wait({load}, timeout=REPORT_EVERY_S)
+        conn.send(("delta", stats.take_delta(final=load.done())))
+    load.result()   # surface crashes in the worker's traceback
+
+def _worker_main(conn, load_kwargs: dict):
+    """Process entry point: run one shard and stream deltas over conn."""
+    raise_fd_limit()
+    try:
+        asyncio.run(_worker_run(conn, load_kwargs))
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.send(("done", None))
+        conn.close()
+
+def shard_kwargs(load_kwargs: dict, workers: int, shard: int) -> dict:
+    """Split rate, concurrency and session budget evenly; give each shard its own name range and spill dir."""
+    kw = dict(load_kwargs)
+    kw["rate"] = load_kwargs["rate"] / workers
+    for key in ("max_sessions", "concurrency"):
+        if load_kwargs.get(key) is not None:
+            total = load_kwargs[key]
+            kw[key] = total // workers + (1 if shard < total % workers else 0)
+    kw["index_base"] = shard * SHARD_INDEX_SPAN
+    if load_kwargs.get("spill_dir"):
+        kw["spill_dir"] = os.path.join(load_kwargs["spill_dir"], f"shard-{shard}")
+    return kw
+
+def run_sharded(workers: int, load_kwargs: dict, progress: bool = True) -> LoadStats:
+    """Run the load across worker processes and merge their statistics."""
+    ctx   = multiprocessing.get_context("spawn")
+    stats = LoadStats()
+    stats.snapshot_mode = load_kwargs.get("snapshots", SNAPSHOT_MODE)
+    conns = {}
+    procs = []
+    for shard in range(workers):
+        parent, child = ctx.Pipe(duplex=False)
+        proc = ctx.Process(target=_worker_main, name=f"load-shard-{shard}",
+                           args=(child, shard_kwargs(load_kwargs, workers, shard)),
+                           daemon=True)
+        proc.start()
+        child.close()
+        conns[parent] = shard
+        procs.append(proc)
+
+    next_progress = time.monotonic() + PROGRESS_EVERY_S
+    try:
+        while conns:
+            for conn in multiprocessing.connection.wait(list(conns), timeout=REPORT_EVERY_S):
+                try:
+                    kind, body = conn.recv()
+                except EOFError:
+                    kind, body = "done", None
+                if kind == "delta":
+                    stats.merge_delta(body)
+                elif kind == "error":
+                    print(f"  [SHARD-{conns[conn]}] {body}", flush=True)
+                elif kind == "done":
+                    del conns[conn]
+            if progress and time.monotonic() >= next_progress:
+                in_flight = stats.games_started - stats.games_completed - stats.games_failed
+                print(stats.progress_line(in_flight) + f"  workers={len(conns)}", flush=True)
+                next_progress = time.monotonic() + PROGRESS_EVERY_S
+    finally:
+        for proc in procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+    return stats
+
+# ---------------------------------------------------------------------------
+# ENTRY POINT
+# ---------------------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Multi-session load generator (TASK-601 scenario)")
+    parser.add_argument("--profile", choices=PROFILES, default="constant",
+                        help="arrival profile (default: %(default)s)")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="brake",
+                        help="brake: TASK-601 flow; idle: hands-off, server timers only "
+                             "(default: %(default)s)")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help="new sessions per second; peak rate for ramp/step (default: %(default)s)")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help="seconds of arrivals before draining (default: %(default)s)")
+    parser.add_argument("--players", type=int, default=DEFAULT_PLAYERS,
+                        help="players per session (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="games kept in flight for --profile closed (default: %(default)s)")
+    parser.add_argument("--sessions", type=int, default=None,
+                        help="stop arrivals after this many sessions")
+    parser.add_argument("--steps", type=int, default=DEFAULT_STEPS,
+                        help="plateaus for --profile step (default: %(default)s)")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="asyncio",
+                        help="WebSocket transport (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes; 0 = one per CPU core (default: %(default)s)")
+    parser.add_argument("--capture-window", type=int, default=None,
+                        help="messages kept in memory per client (default: all)")
+    parser.add_argument("--spill-dir", default=None,
+                        help="write evicted / closed-client messages to compressed segments here")
+    parser.add_argument("--record", default=None, metavar="PATH",
+                        help="record every WS frame to a replayable trace (single worker only)")
+    parser.add_argument("--time-scale", type=float, default=None,
+                        help="compress server pacing by this factor (backend needs ALLOW_TIME_SCALE=true)")
+    parser.add_argument("--snapshots", choices=SNAPSHOT_MODES, default=SNAPSHOT_MODE,
+                        help="full STATE_SNAPSHOTs or versioned delta patches (default: %(default)s)")
+    parser.add_argument("--metrics-interval", type=float, default=DEFAULT_INTERVAL_S,
+                        help="scrape backend /metrics every N seconds; 0 disables (default: %(default)s)")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="also write the summary as JSON to this path")
+    return parser
+
+def main():
+    args = build_parser().parse_args()
+    if args.players < 1:
+        print("--players must be >= 1 (player 1 pulls the brake)")
+        sys.exit(2)
+
+    print("=" * 70)
+    print("  TASK-601 — Load generator")
+    load = (f"concurrency={args.concurrency}" if args.profile == "closed" else f"rate={args.rate}/s")
+    print(f"  Backend: {BACKEND} | profile={args.profile} {load} "
+          f"duration={args.duration}s players={args.players} transport={args.transport}"
+          + (f" scenario={args.scenario}" if args.scenario != "brake" else "")
+          + (f" time_scale={args.time_scale}x" if args.time_scale else ""))
+    print("=" * 70)
+
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    load_kwargs = dict(
+        profile=args.profile,
+        rate=args.rate,
+        duration=args.duration,
+        n_players=args.players,
+        max_sessions=args.sessions,
+        steps=args.steps,
+        transport=args.transport,
+        capture_window=args.capture_window,
+        spill_dir=args.spill_dir,
+        record=args.record,
+        time_scale=args.time_scale,
+        snapshots=args.snapshots,
+        concurrency=args.concurrency,
+        scenario=args.scenario,
+    )
+    if args.record and workers != 1:
+        print("--record needs --workers 1 (one trace file per run)")
+        sys.exit(2)
+    scraper = None
+    if args.metrics_interval > 0:
+        scraper = MetricsScraper(BACKEND, args.metrics_interval)
+        if not scraper.start():
+            print("  (backend /metrics not available — server-side report skipped)")
+            scraper = None
+    if workers == 1:
+        raise_fd_limit()
+        stats = asyncio.run(run_load(**load_kwargs))
+    else:
+        print(f"  Sharding across {workers} worker processes")
+        stats = run_sharded(workers, load_kwargs)
+    if scraper:
+        scraper.stop()
+    summary = stats.summary()
+    summary["workers"] = workers
+    if scraper:
+        summary["server"] = scraper.summary()
+
+    print()
+    print("=" * 70)
+    print(format_report(summary))
+    print("=" * 70)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\n  Summary written to {args.json_path}")
+
+    ok = (summary["games_failed"] == 0 and summary["games_completed"] > 0
+          and summary["snapshots"]["mismatches"] == 0)
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Server-side metrics for the e2e / load harness.
+
+  fetch_metrics     one GET /metrics from the backend (None if unavailable)
+  MetricsScraper    background thread polling /metrics during a run; keeps
+                    the first and last snapshot plus peaks of the gauges
+                    (live sessions, open connections, pending timers)
+  format_server_report
+                    server cost per event type (frames, bytes) next to the
+                    client-observed latency from LatencyRecorder, plus
+                    windowed projectState / stringify / broadcast timings,
+                    event-loop lag, session timer drift per kind and
+                    backend CPU
+
+The backend's counters and timing buckets are cumulative since process
+start, so everything here is the difference between the first and last
+scrape — i.e. the cost of this run only, even on a long-lived backend.
+"""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+# ---------------------------------------------------------------------------
+# CONFIG
+# ---------------------------------------------------------------------------
+DEFAULT_INTERVAL_S = 1.0
+FETCH_TIMEOUT_S    = 2.0
+TIMINGS            = ("stringify", "projectState", "snapshotBroadcast")
+
+def fetch_metrics(backend: str, timeout: float = FETCH_TIMEOUT_S) -> dict | None:
+    try:
+        with urllib.request.urlopen(f"{backend}/metrics", timeout=timeout) as resp:
+            return json.loads(resp.read().decode())
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
+
+# ---------------------------------------------------------------------------
+# WINDOWED TIMINGS
+# ---------------------------------------------------------------------------
+def _bucket_delta(first: dict | None, last: dict) -> list[tuple[float, int]]:
+    """[(upper edge ms, count)] observed between two cumulative timing snapshots."""
+    before = {edge: n for edge, n in (first or {}).get("buckets", [])}
+    out = []
+    for edge, n in last.get("buckets", []):
+        d = n - before.get(edge, 0)
+        if d > 0:
+            out.append((edge, d))
+    return out
+
+def _bucket_percentile(buckets: list[tuple[float, int]], total: int, q: float) -> float:
+    target = max(1, -(-total * q // 100))
+    seen = 0
+    for edge, n in buckets:
+        seen += n
+        if seen >= target:
+            return edge
+    return buckets[-1][0] if buckets else 0.0
+
+def timing_window(first: dict | None, last: dict) -> dict:
+    """count / mean / p50 / p99 of a backend Timing between two scrapes (ms, bucket upper edges)."""
+    count = last.get("count", 0) - (first or {}).get("count", 0)
+    if count <= 0:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p99": 0.0, "total": 0.0}
+    total = last.get("totalMs", 0.0) - (first or {}).get("totalMs", 0.0)
+    buckets = _bucket_delta(first, last)
+    return {
+        "count": count,
+        "mean":  round(total / count, 3),
+        "p50":   round(_bucket_percentile(buckets, count, 50), 3),
+        "p99":   round(_bucket_percentile(buckets, count, 99), 3),
+        "total": round(total, 1),
+    }
+
+def timer_drift(first: dict | None, last: dict) -> dict:
+    """Per timer kind: timers fired between two scrapes and how late (ms, timers.drift)."""
+    before = ((first or {}).get("timers") or {}).get("drift", {})
+    after  = (last.get("timers") or {}).get("drift", {})
+    out = {}
+    for kind in sorted(after):
+        window = timing_window(before.get(kind), after[kind])
+        if window["count"] <= 0:
+            continue
+        buckets = _bucket_delta(before.get(kind), after[kind])
+        window["max"] = round(buckets[-1][0], 3) if buckets else 0.0   # bucket upper edge
+        out[kind] = window
+    return out
+
+# ---------------------------------------------------------------------------
+# SCRAPER
+# ---------------------------------------------------------------------------
+class MetricsScraper:
+    """Polls GET /metrics every interval_s on a daemon thread."""
+    def __init__(self, backend: str, interval_s: float = DEFAULT_INTERVAL_S):
+        self.backend    = backend
+        self.interval_s = interval_s
+        self.first: dict | None = None
+        self.last: dict | None  = None
+        self.scrapes  = 0
+        self.failures = 0
+        self.peaks    = {"sessions": 0, "connections": 0, "timers": 0, "timers_per_session": 0}
+        self._first_at = self._last_at = 0.0
+        self._stop   = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def available(self) -> bool:
+        return self.first is not None
+
+    def scrape(self) -> bool:
+        snap = fetch_metrics(self.backend)
+        now = time.monotonic()
+        if snap is None:
+            self.failures += 1
+            return False
+        self.scrapes += 1
+        if self.first is None:
+            self.first, self._first_at = snap, now
+        self.last, self._last_at = snap, now
+        peaks = self.peaks
+        peaks["sessions"]           = max(peaks["sessions"], snap["sessions"]["live"])
+        peaks["connections"]        = max(peaks["connections"], snap["connections"]["open"])
+        peaks["timers"]             = max(peaks["timers"], snap["timers"]["pending"])
+        peaks["timers_per_session"] = max(peaks["timers_per_session"], snap["timers"]["maxPerSession"])
+        return True
+
+    def start(self) -> bool:
+        """Take the baseline scrape and start polling; False if the backend has no /metrics."""
+        if not self.scrape():
+            return False
+        self._thread = threading.Thread(target=self._run, name="metrics-scraper", daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            self.scrape()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        if self.available:
+            self.scrape()   # closing snapshot so the window covers the whole run
+
+    def summary(self) -> dict:
+        if not self.available:
+            return {"available": False}
+        first, last = self.first, self.last
+        window = max(self._last_at - self._first_at, 1e-9)
+
+        sends = {}
+        before = first["sends"]["byType"]
+        for event_type, entry in last["sends"]["byType"].items():
+            prev = before.get(event_type, {"count": 0, "bytes": 0})
+            count = entry["count"] - prev["count"]
+            if count <= 0:
+                continue
+            nbytes = entry["bytes"] - prev["bytes"]
+            sends[event_type] = {
+                "count":        count,
+                "bytes":        nbytes,
+                "per_s":        round(count / window, 1),
+                "bytes_per_msg": round(nbytes / count),
+            }
+
+        broadcasts = last["snapshots"]["broadcasts"] - first["snapshots"]["broadcasts"]
+        recipients = last["snapshots"]["recipients"] - first["snapshots"]["recipients"]
+        cpu_ms = ((last["process"]["cpuUserMs"] + last["process"]["cpuSystemMs"])
+                  - (first["process"]["cpuUserMs"] + first["process"]["cpuSystemMs"]))
+        return {
+            "available":  True,
+            "window_s":   round(window, 1),
+            "scrapes":    self.scrapes,
+            "failed_scrapes": self.failures,
+            "peaks":      dict(self.peaks),
+            "sends": {
+                "count":  sum(s["count"] for s in sends.values()),
+                "bytes":  sum(s["bytes"] for s in sends.values()),
+                "byType": dict(sorted(sends.items())),
+            },
+            "snapshots": {
+                "broadcasts": broadcasts,
+                "recipients_per_broadcast": round(recipients / broadcasts, 1) if broadcasts else 0.0,
+            },
+            "timings": {name: timing_window(first["timings"].get(name), last["timings"][name])
+                        for name in TIMINGS},
+            "event_loop_lag": timing_window(first["eventLoop"]["lag"], last["eventLoop"]["lag"]),
+            "timer_drift": timer_drift(first, last),
+            "cpu": {"ms": cpu_ms, "util_pct": round(cpu_ms / (window * 1000) * 100, 1)},
+            "rss_mb": round(last["process"]["rssBytes"] / 2**20, 1),
+        }
+
+# ---------------------------------------------------------------------------
+# REPORT
+# ---------------------------------------------------------------------------
+def format_server_report(server: dict, events: dict | None = None) -> str:
+    """Server cost per event type lined up against client latency (events = LatencyRecorder.summary())."""
+    if not server.get("available"):
+        return "  Server metrics: unavailable (backend has no /metrics)"
+    latency = (events or {}).get("latency", {})
+    lines = [f"  Window: {server['window_s']} s, {server['scrapes']} scrapes"
+             f" ({server['failed_scrapes']} failed)"
+             f"   backend CPU: {server['cpu']['util_pct']}%   RSS: {server['rss_mb']} MB",
+             f"  Peaks: sessions={server['peaks']['sessions']}"
+             f" connections={server['peaks']['connections']}"
+             f" pending timers={server['peaks']['timers']}"
+             f" (max {server['peaks']['timers_per_session']}/session)",
+             "",
+             f"  {'event':<28}{'frames':>9}{'/s':>8}{'B/frame':>9}{'KiB':>9}"
+             f"{'recv':>9}{'p50':>9}{'p99':>9}"]
+    for event_type in sorted(set(server["sends"]["byType"]) | set(latency)):
+        s = server["sends"]["byType"].get(event_type)
+        lat = latency.get(event_type)
+        send_cols = (f"{s['count']:>9}{s['per_s']:>8}{s['bytes_per_msg']:>9}{s['bytes'] // 1024:>9}"
+                     if s else f"{'-':>9}{'-':>8}{'-':>9}{'-':>9}")
+        lat_cols = (f"{lat['count']:>9}{lat['p50']:>9}{lat['p99']:>9}" if lat
+                    else f"{'-':>9}{'-':>9}{'-':>9}")
+        lines.append(f"  {event_type:<28}" + send_cols + lat_cols)
+
+    snaps = server["snapshots"]
+    lines += ["",
+              f"  STATE_SNAPSHOT broadcasts: {snaps['broadcasts']}"
+              f" ({snaps['recipients_per_broadcast']} recipients each)",
+              "",
+              f"  {'server timing (ms)':<28}{'count':>9}{'mean':>9}{'p50':>9}{'p99':>9}{'total':>10}"]
+    rows = list(server["timings"].items()) + [("eventLoopLag", server["event_loop_lag"])]
+    for name, t in rows:
+        lines.append(f"  {name:<28}{t['count']:>9}{t['mean']:>9}{t['p50']:>9}{t['p99']:>9}{t['total']:>10}")
+    drift = server.get("timer_drift")
+    if drift:
+        lines += ["", f"  {'timer drift (ms)':<28}{'fired':>9}{'mean':>9}{'p50':>9}{'p99':>9}{'max<=':>10}"]
+        for kind, t in drift.items():
+            lines.append(f"  {kind:<28}{t['count']:>9}{t['mean']:>9}{t['p50']:>9}{t['p99']:>9}{t['max']:>10}")
+    return "\n".join(lines)
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Reconnect-storm soak — mass disconnects mid-phase and state recovery.
+
+Venue Wi-Fi drops take out every phone at once.  The backend then marks
+the players disconnected (the _disconnectTimers grace period in server.ts)
+and must hand each reconnecting socket a projected STATE_SNAPSHOT that
+agrees with everyone else.  This script plays sessions side by side and,
+in each selected phase, drops a fraction of the player sockets without a
+close handshake, then reconnects them with their existing tokens:
+
+  CLUE_LEVEL          after CLUE_PRESENT(10)
+  PAUSED_FOR_BRAKE    after BRAKE_ACCEPTED (the brake owner may be dropped)
+  FOLLOWUP_QUESTION   after FOLLOWUP_QUESTION_PRESENT (only if the
+                      destination has follow-ups)
+
+All sessions storm together (same barrier as e2e_brake.py).  A reconnect
+is "consistent" once its STATE_SNAPSHOT matches the host's latest on
+phase, clueLevelPoints and scoreboard.  Per phase the report gives:
+
+  - reconnect (connect → WELCOME), recovery (connect → consistent
+    snapshot) and outage (drop → consistent snapshot) percentiles
+  - events/s delivered to all clients during the storm vs. just before it
+  - every client whose recovered scoreboard still disagrees with the host
+
+Usage:
+  python3 docs/e2e_reconnect.py
+  python3 docs/e2e_reconnect.py --sessions 20 --players 8 --fraction 1.0
+  python3 docs/e2e_reconnect.py --phases CLUE_LEVEL --waves 10 --json soak.json
+
+--waves repeats the whole run (fresh sessions) for soak testing;
+--capture-window / --spill-dir keep client memory flat across waves (see
+e2e_capture.py).
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter
+
+from e2e_601 import (
+    BACKEND,
+    KNOWN_CITIES,
+    TRANSPORTS,
+    Client,
+    _post,
+    raise_fd_limit,
+    wait_for_event,
+    wait_for_first,
+)
+from e2e_brake import BurstGate
+from e2e_capture import SpillWriter
+from e2e_load import _cmd, _require
+from e2e_stats import Histogram
+
+# ---------------------------------------------------------------------------
+# CONFIG
+# ---------------------------------------------------------------------------
+STORM_PHASES         = ("CLUE_LEVEL", "PAUSED_FOR_BRAKE", "FOLLOWUP_QUESTION")
+DEFAULT_SESSIONS     = 4
+DEFAULT_PLAYERS      = 6
+DEFAULT_FRACTION     = 0.5     # share of player sockets dropped per storm
+DEFAULT_DOWN_MS      = 500     # time between drop and reconnect
+DEFAULT_WAVES        = 1
+CONSISTENT_TIMEOUT_S = 15      # max wait for a reconnect to match the host
+
+# ---------------------------------------------------------------------------
+# CONSISTENCY
+# ---------------------------------------------------------------------------
+def _scoreboard(state: dict) -> list:
+    return sorted((e.get("playerId"), e.get("score")) for e in state.get("scoreboard") or [])
+
+def _view(snapshot: dict | None) -> tuple | None:
+    """The part of a STATE_SNAPSHOT every role must agree on."""
+    if snapshot is None:
+        return None
+    st = snapshot["payload"]["state"]
+    return st.get("phase"), st.get("clueLevelPoints"), _scoreboard(st)
+
+class RecoveryProbe:
+    """
+    Observer on a reconnected client: resolves with the receive time of the
+    first STATE_SNAPSHOT that matches the host's latest snapshot.
+    """
+
+    def __init__(self, host: Client):
+        self.host     = host
+        self.welcome  = None            # recv ms of WELCOME on the new socket
+        self.done     = asyncio.get_running_loop().create_future()
+
+    def __call__(self, client, msg: dict, recv_ms: float):
+        if msg.get("type") == "WELCOME":
+            self.welcome = recv_ms
+        elif msg.get("type") == "STATE_SNAPSHOT" and not self.done.done():
+            if _view(msg) == _view(self.host.latest("STATE_SNAPSHOT")):
+                self.done.set_result(recv_ms)
+
+class EventMeter:
+    """Observer counting received events per wall-clock 100 ms bucket."""
+
+    def __init__(self):
+        self.buckets = Counter()
+
+    def __call__(self, client, msg: dict, recv_ms: float):
+        self.buckets[int(recv_ms // 100)] += 1
+
+    def rate(self, start_ms: float, end_ms: float) -> float:
+        lo, hi = int(start_ms // 100), int(end_ms // 100)
+        n = sum(self.buckets[b] for b in range(lo, hi + 1))
+        return n / max(0.1, (end_ms - start_ms) / 1000)
+
+# ---------------------------------------------------------------------------
+# STATS
+# ---------------------------------------------------------------------------
+class PhaseStats:
+    def __init__(self):
+        self.storms       = 0
+        self.dropped      = 0
+        self.recovered    = 0
+        self.reconnect_ms = Histogram()
+        self.recovery_ms  = Histogram()
+        self.outage_ms    = Histogram()
+        self.storm_rate   = []          # events/s during each storm window
+        self.before_rate  = []          # events/s in an equal window before it
+        self.mismatches   = []          # [{client, phase, client_view, host_view}]
+
+    def summary(self) -> dict:
+        def mean(xs):
+            return round(sum(xs) / len(xs), 1) if xs else 0.0
+        return {
+            "storms":          self.storms,
+            "dropped":         self.dropped,
+            "recovered":       self.recovered,
+            "reconnect_ms":    self.reconnect_ms.summary(),
+            "recovery_ms":     self.recovery_ms.summary(),
+            "outage_ms":       self.outage_ms.summary(),
+            "events_per_s_during": mean(self.storm_rate),
+            "events_per_s_before": mean(self.before_rate),
+            "mismatches":      self.mismatches,
+        }
+
+class SoakStats:
+    def __init__(self):
+        self.phases          = {p: PhaseStats() for p in STORM_PHASES}
+        self.games_completed = 0
+        self.games_failed    = 0
+        self.failures        = Counter()
+        self.meter           = EventMeter()
+
+    def summary(self) -> dict:
+        return {
+            "games_completed": self.games_completed,
+            "games_failed":    self.games_failed,
+            "failures":        dict(self.failures),
+            "phases":          {p: s.summary() for p, s in self.phases.items() if s.storms},
+        }
+
+def format_report(summary: dict) -> str:
+    lines = [f"  Games: {summary['games_completed']} completed / {summary['games_failed']} failed"
+             + (f"  failures={summary['failures']}" if summary["failures"] else ""),
+             "",
+             f"  {'phase':<19}{'storms':>7}{'drops':>7}{'ok':>6}{'reconn p50':>11}{'p99':>8}"
+             f"{'recov p50':>10}{'p99':>8}{'outage p99':>11}{'ev/s before':>12}{'during':>9}"]
+    for phase, st in summary["phases"].items():
+        lines.append(f"  {phase:<19}{st['storms']:>7}{st['dropped']:>7}{st['recovered']:>6}"
+                     f"{st['reconnect_ms']['p50']:>11}{st['reconnect_ms']['p99']:>8}"
+                     f"{st['recovery_ms']['p50']:>10}{st['recovery_ms']['p99']:>8}"
+                     f"{st['outage_ms']['p99']:>11}{st['events_per_s_before']:>12}"
+                     f"{st['events_per_s_during']:>9}")
+    lines.append("")
+    mismatches = [m for st in summary["phases"].values() for m in st["mismatches"]]
+    if mismatches:
+        lines.append(f"  [FAIL] {len(mismatches)} client(s) disagree with the host after recovery:")
+        for m in mismatches[:20]:
+            lines.append(f"    {m['client']} in {m['phase']}: client={m['client_view']} "
+                         f"host={m['host_view']}")
+    else:
+        lines.append("  [PASS] every reconnected client matches the host's scoreboard")
+    return "\n".join(lines)
+
+# ---------------------------------------------------------------------------
+# STORM
+# ---------------------------------------------------------------------------
+def _clone(old: Client) -> Client:
+    """New socket with the same identity and token (what a phone does on reconnect)."""
+    c = Client(old.name, old.role, old.transport, quiet=True,
+               window=old.messages.window, spill=old.messages.spill)
+    c.player_id, c.token, c.session_id = old.player_id, old.token, old.session_id
+    return c
+
+async def _recover(old: Client, host: Client, stats: SoakStats, phase: str,
+                   drop_ms: float, down_ms: float) -> Client:
+    await asyncio.sleep(down_ms / 1000)
+    new   = _clone(old)
+    probe = RecoveryProbe(host)
+    new.observers += [stats.meter, probe]
+    t0 = time.time() * 1000
+    new.start(asyncio.get_running_loop())
+    st = stats.phases[phase]
+    try:
+        await asyncio.wait_for(new.connected.wait(), CONSISTENT_TIMEOUT_S)
+        new.send(_cmd("RESUME_SESSION", new.session_id, {"playerId": new.player_id}))
+        ready_ms = await asyncio.wait_for(probe.done, CONSISTENT_TIMEOUT_S)
+    except asyncio.TimeoutError:
+        return new
+    st.recovered += 1
+    st.reconnect_ms.record(probe.welcome - t0)
+    st.recovery_ms.record(ready_ms - t0)
+    st.outage_ms.record(ready_ms - drop_ms)
+    return new
+
+async def storm(phase: str, host: Client, players: list[Client], gate: BurstGate,
+                stats: SoakStats, fraction: float, down_ms: float) -> list[Client]:
+    """Drop a fraction of players at the shared instant, reconnect, check; returns the new list."""
+    release_ms = await gate.arrive(phase)
+    await asyncio.sleep(max(0.0, (release_ms - time.time() * 1000) / 1000))
+
+    k      = max(1, round(fraction * len(players)))
+    victim = set(random.sample(range(len(players)), k))
+    st     = stats.phases[phase]
+    st.storms  += 1
+    st.dropped += k
+
+    drop_ms = time.time() * 1000
+    for i in victim:
+        players[i].kill()
+        players[i].messages.drain()
+    fresh = await asyncio.gather(*(
+        _recover(players[i], host, stats, phase, drop_ms, down_ms) for i in sorted(victim)))
+    end_ms = time.time() * 1000
+    span   = end_ms - drop_ms
+    st.storm_rate.append(stats.meter.rate(drop_ms, end_ms))
+    st.before_rate.append(stats.meter.rate(drop_ms - span, drop_ms))
+
+    players = list(players)
+    for i, c in zip(sorted(victim), fresh):
+        players[i] = c
+
+    # Final word: each recovered client's latest view vs. the host's
+    host_view = _view(host.latest("STATE_SNAPSHOT"))
+    for i in sorted(victim):
+        view = _view(players[i].latest("STATE_SNAPSHOT"))
+        if view is None or view[2] != host_view[2]:
+            st.mismatches.append({"client": players[i].name, "phase": phase,
+                                  "client_view": view, "host_view": host_view})
+    return players
+
+# ---------------------------------------------------------------------------
+# ONE SESSION
+# ---------------------------------------------------------------------------
+async def play_session(index: int, n_players: int, phases: set[str], fraction: float,
+                       down_ms: float, gate: BurstGate, stats: SoakStats,
+                       transport: str, window: int | None = None,
+                       spill: SpillWriter | None = None) -> bool:
+    clients: list[Client] = []
+    step = "create"
+    try:
+        resp       = await asyncio.to_thread(_post, f"{BACKEND}/v1/sessions")
+        session_id = resp["sessionId"]
+
+        host    = Client(f"R{index}-Host", "host", transport, quiet=True,
+                         window=window, spill=spill)
+        players = [Client(f"R{index}-P{i+1}", "player", transport, quiet=True,
+                          window=window, spill=spill)
+                   for i in range(n_players)]
+
+        step = "join"
+        h = await asyncio.to_thread(_post, f"{BACKEND}/v1/sessions/{session_id}/join",
+                                    {"name": "Host", "role": "host"})
+        host.player_id, host.token, host.session_id = h["playerId"], h["playerAuthToken"], session_id
+        for p in players:
+            r = await asyncio.to_thread(_post, f"{BACKEND}/v1/sessions/{session_id}/join",
+                                        {"name": p.name})
+            p.player_id, p.token, p.session_id = r["playerId"], r["playerAuthToken"], session_id
+
+        step = "connect"
+        loop = asyncio.get_running_loop()
+        for c in [host] + players:
+            c.observers.append(stats.meter)
+            c.start(loop)
+        clients = [host] + players
+        _require(await wait_for_event(clients, "STATE_SNAPSHOT",
+                                      **{"payload.state.phase": "LOBBY"}), step)
+
+        step = "first_clue"
+        host.send(_cmd("HOST_START_GAME", session_id, {"sessionId": session_id}))
+        _require(await wait_for_event(clients, "CLUE_PRESENT",
+                                      **{"payload.clueLevelPoints": 10}), step)
+        if "CLUE_LEVEL" in phases:
+            step = "storm_clue"
+            players = await storm("CLUE_LEVEL", host, players, gate, stats, fraction, down_ms)
+            clients = [host] + players
+
+        step = "brake"
+        owner = players[0]
+        owner.send(_cmd("BRAKE_PULL", session_id, {
+            "playerId": owner.player_id,
+            "clientTimeMs": int(time.time() * 1000),
+        }))
+        _require(await wait_for_event([host], "BRAKE_ACCEPTED",
+                                      **{"payload.playerId": owner.player_id}), step)
+        if "PAUSED_FOR_BRAKE" in phases:
+            step = "storm_brake"
+            players = await storm("PAUSED_FOR_BRAKE", host, players, gate, stats, fraction, down_ms)
+            clients = [host] + players
+
+        step = "answer"
+        owner = players[0]
+        owner.send(_cmd("BRAKE_ANSWER_SUBMIT", session_id, {
+            "playerId": owner.player_id,
+            "answerText": KNOWN_CITIES[0],
+        }))
+        _require(await wait_for_event([host], "BRAKE_ANSWER_LOCKED",
+                                      **{"payload.playerId": owner.player_id}), step)
+
+        step = "clues"
+        _require(await wait_for_event([host], "CLUE_PRESENT",
+                                      **{"payload.clueLevelPoints": 8}), step)
+        for level in (6, 4, 2):
+            host.send(_cmd("HOST_NEXT_CLUE", session_id, {}))
+            _require(await wait_for_event([host], "CLUE_PRESENT",
+                                          **{"payload.clueLevelPoints": level}), step)
+        host.send(_cmd("HOST_NEXT_CLUE", session_id, {}))
+
+        step = "results"
+        first_type, _ = await wait_for_first(host, ["SCOREBOARD_UPDATE", "FOLLOWUP_QUESTION_PRESENT"])
+        _require(first_type, step)
+        if first_type == "FOLLOWUP_QUESTION_PRESENT" and "FOLLOWUP_QUESTION" in phases:
+            step = "storm_followup"
+            _require(await wait_for_event(clients, "FOLLOWUP_QUESTION_PRESENT"), step)
+            players = await storm("FOLLOWUP_QUESTION", host, players, gate, stats, fraction, down_ms)
+            clients = [host] + players
+
+        stats.games_completed += 1
+        return True
+    except Exception:
+        stats.games_failed += 1
+        stats.failures[step] += 1
+        return False
+    finally:
+        gate.leave()
+        for c in clients:
+            c.close()
+
+async def run_wave(sessions: int, n_players: int, phases: set[str], fraction: float,
+                   down_ms: float, stats: SoakStats, transport: str, index_base: int = 0,
+                   window: int | None = None, spill: SpillWriter | None = None):
+    gate = BurstGate(sessions)
+    await asyncio.gather(*(
+        play_session(index_base + i, n_players, phases, fraction, down_ms, gate, stats,
+                     transport, window, spill)
+        for i in range(sessions)))
+
+# ---------------------------------------------------------------------------
+# ENTRY POINT
+# ---------------------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Reconnect-storm soak (mass disconnects mid-phase)")
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS,
+                        help="concurrent sessions per wave (default: %(default)s)")
+    parser.add_argument("--players", type=int, default=DEFAULT_PLAYERS,
+                        help="players per session (default: %(default)s)")
+    parser.add_argument("--fraction", type=float, default=DEFAULT_FRACTION,
+                        help="share of player sockets dropped per storm (default: %(default)s)")
+    parser.add_argument("--down-ms", type=float, default=DEFAULT_DOWN_MS,
+                        help="delay between drop and reconnect (default: %(default)s)")
+    parser.add_argument("--phases", default=",".join(STORM_PHASES),
+                        help="comma-separated phases to storm in (default: %(default)s)")
+    parser.add_argument("--waves", type=int, default=DEFAULT_WAVES,
+                        help="repeat the run this many times with fresh sessions (default: %(default)s)")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="asyncio",
+                        help="WebSocket transport (default: %(default)s)")
+    parser.add_argument("--capture-window", type=int, default=None,
+                        help="messages kept in memory per client (default: all)")
+    parser.add_argument("--spill-dir", default=None,
+                        help="write evicted / closed-client messages to compressed segments here")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="also write the summary as JSON to this path")
+    return parser
+
+def main():
+    args = build_parser().parse_args()
+    phases = {p.strip() for p in args.phases.split(",") if p.strip()}
+    unknown = phases - set(STORM_PHASES)
+    if unknown or not 0.0 < args.fraction <= 1.0:
+        print(f"--phases must be a subset of {STORM_PHASES} and 0 < --fraction <= 1")
+        sys.exit(2)
+
+    print("=" * 70)
+    print("  TASK-601 — Reconnect-storm soak")
+    print(f"  Backend: {BACKEND} | sessions={args.sessions} players={args.players} "
+          f"fraction={args.fraction} down={args.down_ms}ms waves={args.waves}")
+    print(f"  Phases: {', '.join(p for p in STORM_PHASES if p in phases)}")
+    print("=" * 70)
+
+    raise_fd_limit()
+    stats = SoakStats()
+    spill = SpillWriter(args.spill_dir) if args.spill_dir else None
+    for wave in range(args.waves):
+        t0 = time.monotonic()
+        asyncio.run(run_wave(args.sessions, args.players, phases, args.fraction,
+                             args.down_ms, stats, args.transport, wave * args.sessions,
+                             args.capture_window, spill))
+        print(f"  wave {wave + 1}/{args.waves}: {stats.games_completed} ok / "
+              f"{stats.games_failed} failed, {time.monotonic() - t0:.1f}s", flush=True)
+    if spill:
+        spill.close()
+
+    summary = stats.summary()
+    print()
+    print("=" * 70)
+    print(format_report(summary))
+    print("=" * 70)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\n  Summary written to {args.json_path}")
+
+    mismatches = any(st["mismatches"] for st in summary["phases"].values())
+    lost = any(st["recovered"] < st["dropped"] for st in summary["phases"].values())
+    sys.exit(1 if mismatches or lost or summary["games_failed"] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Latency statistics for the e2e / load harness.
+
+  Histogram         HDR-style log-linear histogram (~3 significant digits),
+                    sparse buckets so it merges and pickles cheaply
+  estimate_clock_offset
+                    NTP-style offset between this box and the backend,
+                    from /health serverTimeMs probes (min-RTT sample wins)
+  LatencyRecorder   Client observer: server-emit → client-receive latency
+                    per event type (envelope serverTimeMs), plus broadcast
+                    fan-out skew (first vs last client receiving the same
+                    broadcast)
+"""
+
+import json
+import time
+import urllib.request
+
+# ---------------------------------------------------------------------------
+# HISTOGRAM
+# ---------------------------------------------------------------------------
+SUB_BUCKET_BITS  = 11                       # 2048 linear sub-buckets → ~0.05 % error
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF  = SUB_BUCKET_COUNT >> 1
+UNIT_PER_MS      = 1000                     # values are stored in microseconds
+
+def _bucket_of(v: int) -> int:
+    if v < SUB_BUCKET_COUNT:
+        return v
+    shift = v.bit_length() - SUB_BUCKET_BITS
+    return SUB_BUCKET_COUNT + (shift - 1) * SUB_BUCKET_HALF + ((v >> shift) - SUB_BUCKET_HALF)
+
+def _bucket_value(b: int) -> int:
+    """Upper edge of a bucket (what HDR reports for a percentile)."""
+    if b < SUB_BUCKET_COUNT:
+        return b
+    shift, sub = divmod(b - SUB_BUCKET_COUNT, SUB_BUCKET_HALF)
+    shift += 1
+    return ((sub + SUB_BUCKET_HALF) << shift) + (1 << shift) - 1
+
+class Histogram:
+    """Log-linear latency histogram in milliseconds."""
+    __slots__ = ("counts", "total", "max_us")
+
+    def __init__(self):
+        self.counts: dict[int, int] = {}
+        self.total  = 0
+        self.max_us = 0
+
+    def record(self, value_ms: float):
+        v = max(0, int(value_ms * UNIT_PER_MS))
+        b = _bucket_of(v)
+        self.counts[b] = self.counts.get(b, 0) + 1
+        self.total += 1
+        if v > self.max_us:
+            self.max_us = v
+
+    def merge(self, other: "Histogram"):
+        for b, n in other.counts.items():
+            self.counts[b] = self.counts.get(b, 0) + n
+        self.total += other.total
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, q: float) -> float:
+        if not self.total:
+            return 0.0
+        target = max(1, int(q / 100.0 * self.total + 0.5))
+        seen = 0
+        for b in sorted(self.counts):
+            seen += self.counts[b]
+            if seen >= target:
+                return min(_bucket_value(b), self.max_us) / UNIT_PER_MS
+        return self.max_us / UNIT_PER_MS
+
+    def summary(self) -> dict:
+        return {
+            "count": self.total,
+            "p50":   round(self.percentile(50), 2),
+            "p90":   round(self.percentile(90), 2),
+            "p95":   round(self.percentile(95), 2),
+            "p99":   round(self.percentile(99), 2),
+            "p999":  round(self.percentile(99.9), 2),
+            "max":   round(self.max_us / UNIT_PER_MS, 2),
+        }
+
+    # compact wire form for worker → coordinator pipes
+    def to_state(self) -> tuple:
+        return (self.counts, self.total, self.max_us)
+
+    @classmethod
+    def from_state(cls, state: tuple) -> "Histogram":
+        h = cls()
+        h.counts, h.total, h.max_us = dict(state[0]), state[1], state[2]
+        return h
+
+# ---------------------------------------------------------------------------
+# CLOCK OFFSET
+# ---------------------------------------------------------------------------
+def estimate_clock_offset(backend: str, probes: int = 8) -> tuple[float, float]:
+    """
+    Return (offset_ms, rtt_ms) where offset = server clock − local clock.
+
+    Each probe brackets GET /health between two local timestamps; the probe
+    with the smallest round trip bounds the error to ±rtt/2.
+    """
+    best = None
+    for _ in range(probes):
+        t0 = time.time() * 1000
+        with urllib.request.urlopen(f"{backend}/health") as resp:
+            body = json.loads(resp.read().decode())
+        t1 = time.time() * 1000
+        server_ms = body.get("serverTimeMs")
+        if server_ms is None:
+            continue
+        rtt = t1 - t0
+        offset = server_ms - (t0 + t1) / 2
+        if best is None or rtt < best[1]:
+            best = (offset, rtt)
+    if best is None:
+        raise RuntimeError("backend /health does not report serverTimeMs")
+    return best
+
+# ---------------------------------------------------------------------------
+# PER-EVENT LATENCY + FAN-OUT SKEW
+# ---------------------------------------------------------------------------
+SKEW_GROUP_MAX_AGE_MS = 5000   # broadcasts older than this are closed out
+UNICAST_EVENTS = {"WELCOME", "ERROR", "BRAKE_REJECTED"}   # never fanned out
+
+def _broadcast_key(msg: dict):
+    """
+    Identify one server broadcast across clients.
+
+    Shared envelopes carry one serverTimeMs for every recipient.
+    STATE_SNAPSHOT is built per connection (role projection), so it is
+    keyed on role-independent state fields instead.
+    """
+    if msg.get("type") != "STATE_SNAPSHOT":
+        return msg.get("serverTimeMs")
+    st = (msg.get("payload") or {}).get("state") or {}
+    fq = st.get("followupQuestion") or {}
+    return (st.get("phase"), st.get("clueLevelPoints"), st.get("brakeOwnerPlayerId"),
+            st.get("clueTimerEnd"), fq.get("currentQuestionIndex"))
+
+class LatencyRecorder:
+    """Attach with client.observers.append(recorder) before client.start()."""
+
+    def __init__(self, offset_ms: float = 0.0):
+        self.offset_ms = offset_ms                  # server clock − local clock
+        self.latency: dict[str, Histogram] = {}     # event type -> emit→receive
+        self.skew:    dict[str, Histogram] = {}     # event type -> first→last receive
+        self.negative = 0                           # samples below zero (offset error)
+        self._groups: dict[tuple, list] = {}        # key -> [first, last, {client ids}]
+
+    def __call__(self, client, msg: dict, recv_ms: float):
+        event_type = msg.get("type")
+        server_ms  = msg.get("serverTimeMs")
+        if isinstance(server_ms, (int, float)):
+            lat = recv_ms - (server_ms - self.offset_ms)
+            if lat < 0:
+                self.negative += 1
+            self.latency.setdefault(event_type, Histogram()).record(lat)
+        if event_type not in UNICAST_EVENTS:
+            self._track_skew(client, msg, event_type, recv_ms)
+
+    def _track_skew(self, client, msg: dict, event_type: str, recv_ms: float):
+        key = (msg.get("sessionId"), event_type, _broadcast_key(msg))
+        group = self._groups.get(key)
+        if group is not None and id(client) in group[2]:
+            # Same client again → a later broadcast (or unicast) with equal key
+            self._close(key)
+            group = None
+        if group is None:
+            self._groups[key] = [recv_ms, recv_ms, {id(client)}]
+            if len(self._groups) % 256 == 0:
+                self.flush(recv_ms)
+        else:
+            group[1] = recv_ms
+            group[2].add(id(client))
+
+    def _close(self, key: tuple):
+        first, last, members = self._groups.pop(key)
+        if len(members) >= 2:
+            self.skew.setdefault(key[1], Histogram()).record(last - first)
+
+    def flush(self, now_ms: float | None = None):
+        """Close broadcast groups (all of them, or those older than the max age)."""
+        for key in list(self._groups):
+            if now_ms is None or now_ms - self._groups[key][0] > SKEW_GROUP_MAX_AGE_MS:
+                self._close(key)
+
+    def merge(self, other: "LatencyRecorder"):
+        for src, dst in ((other.latency, self.latency), (other.skew, self.skew)):
+            for event_type, h in src.items():
+                dst.setdefault(event_type, Histogram()).merge(h)
+        self.negative += other.negative
+
+    def take_state(self, final: bool = False) -> tuple:
+        """Finished histograms as a picklable delta; resets this recorder's counts."""
+        self.flush(None if final else time.time() * 1000)
+        state = ({t: h.to_state() for t, h in self.latency.items()},
+                 {t: h.to_state() for t, h in self.skew.items()},
+                 self.negative)
+        self.latency, self.skew, self.negative = {}, {}, 0
+        return state
+
+    def merge_state(self, state: tuple):
+        latency, skew, negative = state
+        for src, dst in ((latency, self.latency), (skew, self.skew)):
+            for event_type, hs in src.items():
+                dst.setdefault(event_type, Histogram()).merge(Histogram.from_state(hs))
+        self.negative += negative
+
+    def summary(self) -> dict:
+        self.flush()
+        return {
+            "clock_offset_ms": round(self.offset_ms, 2),
+            "negative_samples": self.negative,
+            "latency": {t: h.summary() for t, h in sorted(self.latency.items())},
+            "skew":    {t: h.summary() for t, h in sorted(self.skew.items())},
+        }
+
+def format_event_table(summary: dict) -> str:
+    """Fixed-width table: emit→receive latency and fan-out skew per event type."""
+    lines = [f"  Clock offset (server − local): {summary['clock_offset_ms']} ms"
+             f"   negative samples: {summary['negative_samples']}",
+             "",
+             f"  {'event':<28}{'count':>8}{'p50':>9}{'p90':>9}{'p99':>9}{'p999':>9}{'max':>9}"
+             f"{'skew p50':>10}{'skew p99':>10}{'skew max':>10}"]
+    for event_type, lat in summary["latency"].items():
+        sk = summary["skew"].get(event_type)
+        skew_cols = (f"{sk['p50']:>10}{sk['p99']:>10}{sk['max']:>10}" if sk
+                     else f"{'-':>10}{'-':>10}{'-':>10}")
+        lines.append(f"  {event_type:<28}{lat['count']:>8}{lat['p50']:>9}{lat['p90']:>9}"
+                     f"{lat['p99']:>9}{lat['p999']:>9}{lat['max']:>9}" + skew_cols)
+    return "\n".join(lines)
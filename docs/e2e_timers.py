@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Timer drift check — are clue and followup deadlines honoured under load?
+
+Keeps --concurrency hands-off games in flight (e2e_load --scenario idle
+--profile closed: nobody brakes, answers or advances, so every clue,
+followup and scoreboard step waits for its server timer) on an accelerated
+clock, and reads two views of deadline accuracy for the run's window:
+
+  server   GET /metrics timers.drift — per timer kind, how late the session
+           scheduler (services/backend/src/utils/session-scheduler.ts)
+           fired each timer against its deadline
+  client   clue_late / followup_late — server time of the event that ended
+           a deadline minus the deadline advertised to clients (includes the
+           work done between the timer firing and the broadcast)
+
+Exit code 1 when a game fails, a checked kind (--kinds) fired no timers or
+its server drift p99 exceeds --budget-ms, or (with --late-budget-ms) the
+client-observed p99 exceeds that.
+
+The backend must run with ALLOW_TIME_SCALE=true.  Use --client-workers to
+give the load generator enough cores for 500+ sessions.
+
+Usage:
+  python3 docs/e2e_timers.py                                   # 500 games in flight, 60 s
+  python3 docs/e2e_timers.py --concurrency 1000 --budget-ms 50 --client-workers 4
+  python3 docs/e2e_timers.py --kinds clue followup scoreboard --json timers.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from e2e_601 import BACKEND, raise_fd_limit
+from e2e_load import run_load, run_sharded
+from e2e_metrics import MetricsScraper
+
+# ---------------------------------------------------------------------------
+# CONFIG
+# ---------------------------------------------------------------------------
+DEFAULT_CONCURRENCY = 500     # hands-off games in flight
+DEFAULT_DURATION    = 60.0    # seconds of load
+DEFAULT_TIME_SCALE  = 100.0
+DEFAULT_PLAYERS     = 2
+DEFAULT_BUDGET_MS   = 100.0   # server drift p99 per checked kind
+DEFAULT_KINDS       = ("clue", "followup")
+SCRAPE_INTERVAL_S   = 2.0
+
+# ---------------------------------------------------------------------------
+# MEASUREMENT
+# ---------------------------------------------------------------------------
+def measure(args) -> dict:
+    load_kwargs = dict(
+        profile="closed",
+        rate=0.0,
+        duration=args.duration,
+        n_players=args.players,
+        concurrency=args.concurrency,
+        time_scale=args.time_scale,
+        scenario="idle",
+    )
+    scraper = MetricsScraper(BACKEND, SCRAPE_INTERVAL_S)
+    if not scraper.start():
+        print(f"  backend /metrics not reachable at {BACKEND}")
+        sys.exit(2)
+    try:
+        if args.client_workers == 1:
+            raise_fd_limit()
+            stats = asyncio.run(run_load(progress=args.verbose, **load_kwargs))
+        else:
+            stats = run_sharded(args.client_workers, load_kwargs, progress=args.verbose)
+    finally:
+        scraper.stop()
+    summary = stats.summary()
+    server  = scraper.summary()
+    return {
+        "concurrency":     args.concurrency,
+        "elapsed_s":       summary["elapsed_s"],
+        "games_completed": summary["games_completed"],
+        "games_failed":    summary["games_failed"],
+        "failures":        {step: n for step, n in stats.failures.items() if n},
+        "peak_sessions":   server["peaks"]["sessions"],
+        "peak_timers":     server["peaks"]["timers"],
+        "event_loop_lag":  server["event_loop_lag"],
+        "drift":           server["timer_drift"],
+        "late":            {kind: summary["steps"].get(f"{kind}_late")
+                            for kind in ("clue", "followup")},
+    }
+
+# ---------------------------------------------------------------------------
+# REPORT
+# ---------------------------------------------------------------------------
+def format_report(result: dict, kinds: list[str], budget_ms: float) -> str:
+    lines = [f"  Games:       {result['games_completed']} completed / {result['games_failed']} failed "
+             f"in {result['elapsed_s']} s ({result['concurrency']} in flight)",
+             f"  Backend:     peak {result['peak_sessions']} live sessions, "
+             f"{result['peak_timers']} pending timers; event-loop lag "
+             f"p50 {result['event_loop_lag']['p50']} / p99 {result['event_loop_lag']['p99']} ms",
+             "",
+             "  Server timer drift (ms, fire time minus deadline)",
+             f"  {'kind':<12}{'fired':>8}{'p50':>9}{'p99':>9}{'max<=':>9}{'budget':>9}"]
+    for kind, d in result["drift"].items():
+        budget = f"{budget_ms:g}" if kind in kinds else "-"
+        lines.append(f"  {kind:<12}{d['count']:>8}{d['p50']:>9.2f}{d['p99']:>9.2f}"
+                     f"{d['max']:>9.2f}{budget:>9}")
+    lines += ["",
+              "  Client-observed lateness (ms, deadline → event that ended it)",
+              f"  {'kind':<12}{'count':>8}{'p50':>9}{'p99':>9}{'max':>9}"]
+    for kind, st in result["late"].items():
+        if st:
+            lines.append(f"  {kind:<12}{st['count']:>8}{st['p50']:>9.1f}{st['p99']:>9.1f}{st['max']:>9.1f}")
+        else:
+            lines.append(f"  {kind:<12}{0:>8}{'-':>9}{'-':>9}{'-':>9}")
+    return "\n".join(lines)
+
+def check(result: dict, args) -> list[str]:
+    problems = []
+    if result["games_failed"] or not result["games_completed"]:
+        problems.append(f"{result['games_failed']} games failed {result['failures']}")
+    for kind in args.kinds:
+        d = result["drift"].get(kind)
+        if not d:
+            problems.append(f"no {kind} timers fired (backend without timers.drift?)")
+        elif d["p99"] > args.budget_ms:
+            problems.append(f"{kind} drift p99 {d['p99']} ms > budget {args.budget_ms} ms")
+        late = result["late"].get(kind)
+        if args.late_budget_ms is not None and late and late["p99"] > args.late_budget_ms:
+            problems.append(f"{kind} client-observed lateness p99 {late['p99']} ms "
+                            f"> {args.late_budget_ms} ms")
+    return problems
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Session timer drift under load")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="hands-off games kept in flight (default: %(default)s)")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help="seconds of load (default: %(default)s)")
+    parser.add_argument("--players", type=int, default=DEFAULT_PLAYERS,
+                        help="players per game (default: %(default)s)")
+    parser.add_argument("--time-scale", type=float, default=DEFAULT_TIME_SCALE,
+                        help="server pacing compression (default: %(default)s)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="max server drift p99 per checked kind (default: %(default)s)")
+    parser.add_argument("--kinds", nargs="+", default=list(DEFAULT_KINDS),
+                        help="timer kinds held to the budget (default: clue followup)")
+    parser.add_argument("--late-budget-ms", type=float, default=None,
+                        help="also fail when client-observed lateness p99 exceeds this")
+    parser.add_argument("--client-workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="load generator processes (default: half the cores, %(default)s)")
+    parser.add_argument("--verbose", action="store_true",
+                        help="print load generator progress lines")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="also write the result as JSON to this path")
+    return parser
+
+def main():
+    args = build_parser().parse_args()
+
+    print("=" * 70)
+    print("  Session timer drift")
+    print(f"  Backend: {BACKEND} | concurrency={args.concurrency} duration={args.duration}s "
+          f"players={args.players} time_scale={args.time_scale}x budget={args.budget_ms}ms "
+          f"kinds={args.kinds} client_workers={args.client_workers}")
+    print("=" * 70)
+
+    result = measure(args)
+    print()
+    print("=" * 70)
+    print(format_report(result, args.kinds, args.budget_ms))
+    print("=" * 70)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"backend": BACKEND, "settings": {k: v for k, v in vars(args).items()
+                                                       if k != "json_path"},
+                       "result": result}, f, indent=2)
+        print(f"\n  Results written to {args.json_path}")
+
+    problems = check(result, args)
+    for problem in problems:
+        print(f"  FAIL: {problem}")
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
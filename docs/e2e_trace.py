@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Record and replay harness WebSocket traffic.
+
+Recording: a TraceWriter attached to Clients (client.taps) appends every
+frame sent and received to a compact binary trace (gzip'd when the path
+ends in .gz).  e2e_601.py and e2e_load.py take --record PATH.
+
+  file    := MAGIC record*
+  record  := header(<BQII: flags, t_us, client, length) data[length]
+  flags   := kind (bits 0-1: CLIENT / RECV / SEND) | role << 2
+  t_us    := microseconds since the trace started
+  CLIENT  := JSON {name, role, sessionId, playerId}, once per client;
+             later records refer to it by index
+  RECV / SEND := raw frame bytes as seen on the wire
+
+Replay: re-drive the recorded client → server traffic (HOST_START_GAME,
+BRAKE_PULL, BRAKE_ANSWER_SUBMIT, FOLLOWUP_ANSWER_SUBMIT, HOST_NEXT_CLUE,
+…) against a fresh backend.  Sessions and joins are recreated when their
+first client appears, and session / player ids are rewritten.  Each send
+is paced by --speed (1, 10, … or max) and anchored on the last
+milestone event its client had seen when recorded (e.g. the 3rd
+CLUE_PRESENT), so accelerated runs stay causal even when server-side
+pacing is slower.
+
+Usage:
+  python3 docs/e2e_load.py --rate 2 --duration 60 --record party.trace.gz
+  python3 docs/e2e_trace.py info party.trace.gz
+  python3 docs/e2e_trace.py replay party.trace.gz --speed 10 --json replay.json
+  python3 docs/e2e_trace.py replay party.trace.gz --speed max
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import struct
+import sys
+import threading
+import time
+from collections import Counter
+
+from e2e_601 import (
+    BACKEND,
+    STEP_TIMEOUT_S,
+    TRANSPORTS,
+    Client,
+    _post,
+    create_session,
+    raise_fd_limit,
+)
+from e2e_stats import LatencyRecorder, estimate_clock_offset, format_event_table
+
+# ---------------------------------------------------------------------------
+# FORMAT
+# ---------------------------------------------------------------------------
+MAGIC       = b"PSTRACE1"
+HEADER      = struct.Struct("<BQII")
+KIND_CLIENT = 0
+KIND_RECV   = 1
+KIND_SEND   = 2
+ROLES       = ("host", "player", "tv")
+
+# Server events that mark progress; sends wait for the same level on replay
+ANCHOR_TYPES = frozenset({
+    "WELCOME",
+    "LOBBY_UPDATED",             # anchored on lobby size, not count (see _level)
+    "CLUE_PRESENT",
+    "BRAKE_ACCEPTED",
+    "BRAKE_ANSWER_LOCKED",
+    "DESTINATION_REVEAL",
+    "DESTINATION_RESULTS",
+    "FOLLOWUP_QUESTION_PRESENT",
+    "FOLLOWUP_RESULTS",
+    "SCOREBOARD_UPDATE",
+})
+
+def _level(msg: dict, count: int) -> int:
+    """
+    Progress a received anchor event stands for.  Usually how many of that
+    type the client has seen; for LOBBY_UPDATED the number of connected
+    players, because how many updates a host gets depends on who connected
+    first.
+    """
+    if msg.get("type") == "LOBBY_UPDATED":
+        players = (msg.get("payload") or {}).get("players") or ()
+        return sum(1 for p in players if p.get("isConnected", True))
+    return count
+
+def _open(path: str, mode: str):
+    return gzip.open(path, mode) if path.endswith(".gz") else open(path, mode)
+
+class TraceWriter:
+    """Thread-safe tap: client.taps.append(writer) via attach(), after REST join."""
+
+    def __init__(self, path: str):
+        self.path    = path
+        self._f      = _open(path, "wb")
+        self._f.write(MAGIC)
+        self._t0     = time.monotonic_ns()
+        self._index  = {}                 # id(client) -> client index (ids of dead clients get reused)
+        self._next   = 0
+        self._lock   = threading.Lock()
+        self.frames  = 0
+
+    def attach(self, client: Client):
+        info = json.dumps({"name": client.name, "role": client.role,
+                           "sessionId": client.session_id,
+                           "playerId": client.player_id}).encode()
+        with self._lock:
+            idx = self._index[id(client)] = self._next
+            self._next += 1
+            self._write(KIND_CLIENT, client.role, idx, info)
+        client.taps.append(self)
+
+    def __call__(self, client: Client, outgoing: bool, raw):
+        data = raw.encode() if isinstance(raw, str) else raw
+        with self._lock:
+            if self._f is None:
+                return
+            self._write(KIND_SEND if outgoing else KIND_RECV, client.role,
+                        self._index[id(client)], data)
+            self.frames += 1
+
+    def _write(self, kind: int, role: str, idx: int, data: bytes):
+        t_us  = (time.monotonic_ns() - self._t0) // 1000
+        flags = kind | ROLES.index(role) << 2
+        self._f.write(HEADER.pack(flags, t_us, idx, len(data)))
+        self._f.write(data)
+
+    def close(self):
+        with self._lock:
+            if self._f is not None:
+                self._f.close()
+                self._f = None
+
+def read_trace(path: str):
+    """Yield (kind, t_us, client index, role, data bytes) in recorded order."""
+    with _open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path}: not a trace file")
+        while True:
+            head = f.read(HEADER.size)
+            if len(head) < HEADER.size:
+                return
+            flags, t_us, idx, length = HEADER.unpack(head)
+            yield flags & 0b11, t_us, idx, ROLES[flags >> 2], f.read(length)
+
+# ---------------------------------------------------------------------------
+# LOADING
+# ---------------------------------------------------------------------------
+class TracedClient:
+    """One recorded client: identity plus its sends, each with an anchor."""
+    __slots__ = ("idx", "info", "t_us", "sends", "recv_counts")
+
+    def __init__(self, idx: int, info: dict, t_us: int):
+        self.idx         = idx
+        self.info        = info
+        self.t_us        = t_us           # first appearance (REST join done)
+        self.sends       = []             # [(t_us, frame dict, (anchor type, count) | None)]
+        self.recv_counts = Counter()      # event type -> frames received when recorded
+
+def load_trace(path: str) -> tuple[dict[int, TracedClient], int]:
+    """Return ({client index: TracedClient}, duration µs)."""
+    clients: dict[int, TracedClient] = {}
+    anchor: dict[int, tuple | None] = {}
+    end_us = 0
+    for kind, t_us, idx, _role, data in read_trace(path):
+        end_us = t_us
+        if kind == KIND_CLIENT:
+            clients[idx] = TracedClient(idx, json.loads(data), t_us)
+            anchor[idx] = None
+            continue
+        msg = json.loads(data)
+        tc  = clients[idx]
+        if kind == KIND_RECV:
+            event_type = msg.get("type")
+            tc.recv_counts[event_type] += 1
+            if event_type in ANCHOR_TYPES:
+                anchor[idx] = (event_type, _level(msg, tc.recv_counts[event_type]))
+        else:
+            tc.sends.append((t_us, msg, anchor[idx]))
+    return clients, end_us
+
+def trace_info(path: str) -> dict:
+    frames, nbytes = Counter(), Counter()
+    roles = Counter()
+    end_us = 0
+    for kind, t_us, _idx, role, data in read_trace(path):
+        end_us = t_us
+        if kind == KIND_CLIENT:
+            roles[role] += 1
+            continue
+        key = ("send " if kind == KIND_SEND else "recv ") + json.loads(data).get("type", "?")
+        frames[key] += 1
+        nbytes[key] += len(data)
+    return {
+        "duration_s": round(end_us / 1e6, 2),
+        "clients":    dict(roles),
+        "frames":     sum(frames.values()),
+        "bytes":      sum(nbytes.values()),
+        "by_type":    {k: {"frames": frames[k], "bytes": nbytes[k]} for k in sorted(frames)},
+    }
+
+# ---------------------------------------------------------------------------
+# REPLAY
+# ---------------------------------------------------------------------------
+def _rewrite(node, ids: dict):
+    """Replace recorded session / player ids anywhere in a frame."""
+    if isinstance(node, dict):
+        return {k: _rewrite(v, ids) for k, v in node.items()}
+    if isinstance(node, list):
+        return [_rewrite(v, ids) for v in node]
+    if isinstance(node, str):
+        return ids.get(node, node)
+    return node
+
+class _Progress:
+    """Client observer: events received per type, and waits for an anchor level."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.levels = Counter()           # event type -> highest _level seen
+        self._waits: list[tuple] = []     # (event type, level, future)
+
+    def __call__(self, client, msg: dict, recv_ms: float):
+        event_type = msg.get("type")
+        self.counts[event_type] += 1
+        level = _level(msg, self.counts[event_type])
+        if level > self.levels[event_type]:
+            self.levels[event_type] = level
+        for w in list(self._waits):
+            if w[0] == event_type and self.levels[event_type] >= w[1]:
+                if not w[2].done():
+                    w[2].set_result(None)
+                self._waits.remove(w)
+
+    async def reach(self, event_type: str, level: int, timeout_s: float) -> bool:
+        if self.levels[event_type] >= level:
+            return True
+        fut = asyncio.get_running_loop().create_future()
+        self._waits.append((event_type, level, fut))
+        try:
+            await asyncio.wait_for(fut, timeout_s)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+class Replayer:
+    def __init__(self, clients: dict[int, TracedClient], speed: float | None,
+                 transport: str = "asyncio", offset_ms: float = 0.0,
+                 time_scale: float | None = None):
+        self.traced    = clients
+        self.speed     = speed                # None = as fast as possible
+        self.transport = transport
+        self.time_scale = time_scale          # backend pacing compression for replayed sessions
+        self.ids: dict[str, str] = {}         # recorded id -> replay id
+        self.sessions: dict[str, asyncio.Future] = {}
+        self.live: list[Client] = []
+        self.progress: list[_Progress] = []
+        self.latency   = LatencyRecorder(offset_ms)
+        self.sent      = 0
+        self.stalls    = 0                    # anchors not reached within STEP_TIMEOUT_S
+        self.anchor_wait_ms = 0.0
+        self.failed    = Counter()
+
+    async def _session(self, recorded_id: str) -> str:
+        fut = self.sessions.get(recorded_id)
+        if fut is None:
+            fut = self.sessions[recorded_id] = asyncio.get_running_loop().create_future()
+            try:
+                resp = await asyncio.to_thread(create_session, self.time_scale)
+                self.ids[recorded_id] = resp["sessionId"]
+                fut.set_result(resp["sessionId"])
+            except Exception as e:
+                fut.set_exception(e)
+        return await fut
+
+    async def _setup(self, tc: TracedClient) -> tuple[Client, _Progress]:
+        info = tc.info
+        session_id = await self._session(info["sessionId"])
+        c = Client(info["name"], info["role"], self.transport, quiet=True)
+        if info["role"] == "tv":
+            r = await asyncio.to_thread(_post, f"{BACKEND}/v1/sessions/{session_id}/tv", {})
+            c.token = r["tvAuthToken"]
+        else:
+            body = {"name": info["name"]}
+            if info["role"] == "host":
+                body["role"] = "host"
+            r = await asyncio.to_thread(_post, f"{BACKEND}/v1/sessions/{session_id}/join", body)
+            c.player_id, c.token = r["playerId"], r["playerAuthToken"]
+            if info.get("playerId"):
+                self.ids[info["playerId"]] = r["playerId"]
+        c.session_id = session_id
+        progress = _Progress()
+        c.observers += [self.latency, progress]
+        c.start(asyncio.get_running_loop())
+        self.live.append(c)
+        self.progress.append(progress)
+        return c, progress
+
+    async def _drive(self, tc: TracedClient, t_start: float):
+        await self._sleep_until(t_start, tc.t_us)
+        try:
+            c, progress = await self._setup(tc)
+        except Exception as e:
+            self.failed[type(e).__name__] += 1
+            return
+        for t_us, frame, anchor in tc.sends:
+            await self._sleep_until(t_start, t_us)
+            if anchor is not None:
+                t0 = time.monotonic()
+                if not await progress.reach(*anchor, STEP_TIMEOUT_S):
+                    self.stalls += 1
+                self.anchor_wait_ms += (time.monotonic() - t0) * 1000
+            frame = _rewrite(frame, self.ids)
+            now_ms = int(time.time() * 1000)
+            frame["serverTimeMs"] = now_ms
+            payload = frame.get("payload")
+            if isinstance(payload, dict) and "clientTimeMs" in payload:
+                payload["clientTimeMs"] = now_ms
+            c.send(frame)
+            self.sent += 1
+
+    async def _sleep_until(self, t_start: float, t_us: int):
+        if self.speed is None:
+            return
+        delay = t_start + t_us / 1e6 / self.speed - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def run(self, linger_s: float = 2.0) -> float:
+        t_start = time.monotonic()
+        await asyncio.gather(*(self._drive(tc, t_start) for tc in self.traced.values()))
+        await asyncio.sleep(linger_s)            # let the last broadcasts land
+        wall = time.monotonic() - t_start
+        for c in self.live:
+            c.close()
+        return wall
+
+    def summary(self, recorded_s: float, wall_s: float) -> dict:
+        recorded, replayed = Counter(), Counter()
+        for tc in self.traced.values():
+            recorded.update(tc.recv_counts)
+        for progress in self.progress:
+            replayed.update(progress.counts)
+        sends = sum(len(tc.sends) for tc in self.traced.values())
+        return {
+            "recorded_s":     round(recorded_s, 2),
+            "replay_s":       round(wall_s, 2),
+            "speed":          "max" if self.speed is None else self.speed,
+            "clients":        len(self.live),
+            "sends":          sends,
+            "sent":           self.sent,
+            "anchor_stalls":  self.stalls,
+            "anchor_wait_ms": round(self.anchor_wait_ms, 1),
+            "setup_failures": dict(self.failed),
+            "received": {t: {"recorded": recorded[t], "replayed": replayed[t]}
+                         for t in sorted(recorded.keys() | replayed.keys())},
+            "events":         self.latency.summary(),
+        }
+
+def format_replay(summary: dict) -> str:
+    lines = [f"  Recorded {summary['recorded_s']} s → replayed in {summary['replay_s']} s "
+             f"(speed {summary['speed']}), {summary['clients']} clients",
+             f"  Sends: {summary['sent']}/{summary['sends']}   anchor stalls: {summary['anchor_stalls']}"
+             f"   anchor wait: {summary['anchor_wait_ms']} ms"
+             + (f"   setup failures: {summary['setup_failures']}" if summary["setup_failures"] else ""),
+             "",
+             f"  {'event':<28}{'recorded':>10}{'replayed':>10}"]
+    for t, n in summary["received"].items():
+        mark = "" if n["recorded"] == n["replayed"] else "   ≠"
+        lines.append(f"  {t:<28}{n['recorded']:>10}{n['replayed']:>10}{mark}")
+    if summary["events"]["latency"]:
+        lines.append("")
+        lines.append("  Server-emit → client-receive latency (ms) per event type")
+        lines.append(format_event_table(summary["events"]))
+    return "\n".join(lines)
+
+# ---------------------------------------------------------------------------
+# ENTRY POINT
+# ---------------------------------------------------------------------------
+def _speed(value: str) -> float | None:
+    if value == "max":
+        return None
+    speed = float(value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be > 0 or 'max'")
+    return speed
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Record / replay harness WebSocket traffic")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info", help="summarise a trace")
+    info.add_argument("trace")
+    replay = sub.add_parser("replay", help="re-drive a trace against BACKEND")
+    replay.add_argument("trace")
+    replay.add_argument("--speed", type=_speed, default=1.0,
+                        help="time compression: 1, 10, ... or 'max' (default: 1)")
+    replay.add_argument("--transport", choices=TRANSPORTS, default="asyncio",
+                        help="WebSocket transport (default: %(default)s)")
+    replay.add_argument("--time-scale", type=float, default=None,
+                        help="compress server pacing by this factor (backend needs ALLOW_TIME_SCALE=true)")
+    replay.add_argument("--json", dest="json_path", default=None,
+                        help="also write the replay summary as JSON to this path")
+    return parser
+
+def main():
+    args = build_parser().parse_args()
+    if args.command == "info":
+        print(json.dumps(trace_info(args.trace), indent=2))
+        return
+
+    clients, end_us = load_trace(args.trace)
+    print("=" * 70)
+    print("  TASK-601 — Trace replay")
+    print(f"  Backend: {BACKEND} | trace={args.trace} clients={len(clients)} "
+          f"speed={'max' if args.speed is None else args.speed}")
+    print("=" * 70)
+
+    raise_fd_limit()
+    try:
+        offset_ms, _ = estimate_clock_offset(BACKEND)
+    except Exception:
+        offset_ms = 0.0
+    replayer = Replayer(clients, args.speed, args.transport, offset_ms, args.time_scale)
+    wall_s   = asyncio.run(replayer.run())
+    summary  = replayer.summary(end_us / 1e6, wall_s)
+
+    print(format_replay(summary))
+    print("=" * 70)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\n  Summary written to {args.json_path}")
+    sys.exit(0 if summary["sent"] == summary["sends"] and not summary["anchor_stalls"] else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+TTS clip cache check — do parties playing the same pack share their clips?
+
+Seeds one content pack and plays --waves waves of --parties concurrent
+games on it (e2e_load.play_game, the host selects the pack before
+HOST_START_GAME).  The backend must talk to the local ai-content stand-in
+(docs/e2e_fake_ai.py, AI_CONTENT_URL), whose /__stats counts what was
+actually synthesized.  Per wave the report gives
+
+  synth/game    clips synthesized upstream per game (POST /tts requests
+                plus /tts/batch lines, from the stand-in)
+  hit rate      clips served by the backend's clip cache (memory, disk or
+                joined in-flight synthesis) over all clips requested,
+                from GET /metrics tts
+  start_game    HOST_START_GAME → ROUND_INTRO p50 / p99 (includes the
+                round's banter prefetch)
+
+The first wave is cold for the pack's clue and question reads; later waves
+should synthesize next to nothing.  Exit code 1 when a game fails, the
+backend reports no tts metrics or the last wave's hit rate is below
+--min-hit-rate.
+
+For the uncached baseline run the backend with TTS_CLIP_CACHE=false and pass
+--min-hit-rate 0.  A slow stand-in profile (--profile realistic) makes the
+start_game difference visible.
+
+Usage:
+  python3 docs/e2e_fake_ai.py --profile realistic &
+  AI_CONTENT_URL=http://localhost:3001 ALLOW_TIME_SCALE=true npm run dev   # in services/backend
+  python3 docs/e2e_tts_cache.py
+  python3 docs/e2e_tts_cache.py --parties 50 --waves 4 --json tts.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+
+from e2e_601 import BACKEND, _get, _post, raise_fd_limit
+from e2e_content_index import DEFAULT_PACKS_DIR, make_pack, pack_id
+from e2e_load import LoadStats, play_game
+from e2e_metrics import fetch_metrics
+
+# ---------------------------------------------------------------------------
+# CONFIG
+# ---------------------------------------------------------------------------
+AI_CONTENT_URL     = os.environ.get("AI_CONTENT_URL", "http://localhost:3001")
+DEFAULT_PARTIES    = 20       # concurrent games per wave
+DEFAULT_WAVES      = 3
+DEFAULT_PLAYERS    = 2
+DEFAULT_TIME_SCALE = 20.0
+MIN_HIT_RATE       = 0.9      # last wave
+PACK_PREFIX        = "ttscache"
+CACHE_OUTCOMES     = ("hit", "diskHit", "coalesced", "miss", "error")
+
+# ---------------------------------------------------------------------------
+# MEASUREMENT
+# ---------------------------------------------------------------------------
+def seed_pack(packs_dir: str) -> tuple[str, str]:
+    """One fresh pack (new clue texts, so the first wave starts cold)."""
+    i = random.randrange(100_000)
+    pack = make_pack(PACK_PREFIX, i)
+    os.makedirs(packs_dir, exist_ok=True)
+    path = os.path.join(packs_dir, f"{pack['roundId']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(pack, f)
+    return pack_id(PACK_PREFIX, i), path
+
+def upstream_clips(ai_stats: dict) -> int:
+    classes = ai_stats.get("classes", {})
+    return sum(classes.get(cls, {}).get("requests", 0) for cls in ("tts", "clip"))
+
+def cache_delta(before: dict | None, after: dict | None) -> dict | None:
+    if not after or "tts" not in after:
+        return None
+    first = (before or {}).get("tts") or {}
+    return {k: after["tts"][k] - first.get(k, 0) for k in CACHE_OUTCOMES}
+
+async def _play_wave(parties: int, players: int, time_scale: float, round_id: str) -> LoadStats:
+    stats = LoadStats()
+    await asyncio.gather(*(
+        play_game(i, players, stats, "asyncio", time_scale=time_scale, content_pack_id=round_id)
+        for i in range(parties)
+    ))
+    return stats
+
+def run_wave(wave: int, args, round_id: str) -> dict:
+    _post(f"{args.ai_url}/__stats/reset")
+    before  = fetch_metrics(BACKEND)
+    stats   = asyncio.run(_play_wave(args.parties, args.players, args.time_scale, round_id))
+    after   = fetch_metrics(BACKEND)
+    summary = stats.summary()
+    synth   = upstream_clips(_get(f"{args.ai_url}/__stats"))
+    cache   = cache_delta(before, after)
+    requested = sum(cache.values()) if cache else 0
+    start   = summary["steps"].get("start_game") or {}
+    games   = max(summary["games_completed"] + summary["games_failed"], 1)
+    return {
+        "wave":            wave,
+        "games_completed": summary["games_completed"],
+        "games_failed":    summary["games_failed"],
+        "failures":        {step: n for step, n in stats.failures.items() if n},
+        "synthesized":     synth,
+        "synth_per_game":  round(synth / games, 2),
+        "cache":           cache,
+        "hit_rate":        round((cache["hit"] + cache["diskHit"] + cache["coalesced"]) / requested, 3)
+                           if cache and requested else None,
+        "start_game_p50":  start.get("p50"),
+        "start_game_p99":  start.get("p99"),
+    }
+
+# ---------------------------------------------------------------------------
+# REPORT
+# ---------------------------------------------------------------------------
+def format_report(results: list[dict]) -> str:
+    fmt = lambda v, spec: format(v, spec) if v is not None else format("-", spec.rstrip("f").split(".")[0])
+    lines = [f"  {'wave':>5}{'games':>8}{'failed':>8}{'synth':>8}{'synth/game':>12}{'hit rate':>10}"
+             f"{'coalesced':>11}{'start p50':>11}{'start p99':>11}"]
+    for r in results:
+        coalesced = r["cache"]["coalesced"] if r["cache"] else None
+        lines.append(f"  {r['wave']:>5}{r['games_completed']:>8}{r['games_failed']:>8}"
+                     f"{r['synthesized']:>8}{r['synth_per_game']:>12.2f}{fmt(r['hit_rate'], '>10.3f')}"
+                     f"{fmt(coalesced, '>11')}{fmt(r['start_game_p50'], '>11.1f')}"
+                     f"{fmt(r['start_game_p99'], '>11.1f')}")
+    first, last = results[0], results[-1]
+    if len(results) > 1 and first["synth_per_game"]:
+        lines.append("")
+        lines.append(f"  synth/game {first['synth_per_game']} → {last['synth_per_game']} "
+                     f"({(1 - last['synth_per_game'] / first['synth_per_game']) * 100:.0f}% fewer); "
+                     f"start_game p50 {first['start_game_p50']} → {last['start_game_p50']} ms")
+    return "\n".join(lines)
+
+def check(results: list[dict], args) -> list[str]:
+    problems = []
+    for r in results:
+        if r["games_failed"] or not r["games_completed"]:
+            problems.append(f"wave {r['wave']}: {r['games_failed']} games failed {r['failures']}")
+        if r["cache"] is None:
+            problems.append(f"wave {r['wave']}: backend /metrics has no tts section")
+    last = results[-1]
+    if last["hit_rate"] is not None and last["hit_rate"] < args.min_hit_rate:
+        problems.append(f"last wave hit rate {last['hit_rate']} < {args.min_hit_rate}")
+    return problems
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Cross-session TTS clip cache check")
+    parser.add_argument("--parties", type=int, default=DEFAULT_PARTIES,
+                        help="concurrent games per wave (default: %(default)s)")
+    parser.add_argument("--waves", type=int, default=DEFAULT_WAVES,
+                        help="waves played on the same pack (default: %(default)s)")
+    parser.add_argument("--players", type=int, default=DEFAULT_PLAYERS,
+                        help="players per game (default: %(default)s)")
+    parser.add_argument("--time-scale", type=float, default=DEFAULT_TIME_SCALE,
+                        help="server pacing compression (default: %(default)s)")
+    parser.add_argument("--ai-url", default=AI_CONTENT_URL,
+                        help="ai-content stand-in the backend uses (default: %(default)s)")
+    parser.add_argument("--packs-dir", default=DEFAULT_PACKS_DIR,
+                        help="the backend's CONTENT_PACKS_DIR (default: %(default)s)")
+    parser.add_argument("--min-hit-rate", type=float, default=MIN_HIT_RATE,
+                        help="fail when the last wave's hit rate is lower (default: %(default)s)")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="also write the results as JSON to this path")
+    return parser
+
+def main():
+    args = build_parser().parse_args()
+    try:
+        _get(f"{args.ai_url}/__stats")
+    except Exception:
+        print(f"  ai-content stand-in not reachable at {args.ai_url} (docs/e2e_fake_ai.py)")
+        sys.exit(2)
+
+    round_id, path = seed_pack(args.packs_dir)
+    print("=" * 70)
+    print("  TTS clip cache")
+    print(f"  Backend: {BACKEND} | ai-content={args.ai_url} pack={round_id} parties={args.parties} "
+          f"waves={args.waves} players={args.players} time_scale={args.time_scale}x")
+    print("=" * 70)
+
+    raise_fd_limit()
+    results = []
+    try:
+        for wave in range(1, args.waves + 1):
+            print(f"  ... wave {wave}: {args.parties} games on {round_id}")
+            results.append(run_wave(wave, args, round_id))
+    finally:
+        os.remove(path)
+
+    print()
+    print("=" * 70)
+    print(format_report(results))
+    print("=" * 70)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"backend": BACKEND, "settings": {k: v for k, v in vars(args).items()
+                                                       if k != "json_path"},
+                       "pack": round_id, "results": results}, f, indent=2)
+        print(f"\n  Results written to {args.json_path}")
+
+    problems = check(results, args)
+    for problem in problems:
+        print(f"  FAIL: {problem}")
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
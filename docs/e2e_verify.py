@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Streaming protocol-invariant and desync checker for recorded traces.
+
+Reads one or more e2e_trace.py traces in a single pass and checks every
+received frame against the server contract.  Memory is bounded by the
+number of live sessions, not by trace length: per-client state is a few
+fields, broadcast groups expire after --window-ms, and a session is
+dropped once it has been idle for SESSION_IDLE_S of trace time.  Frames
+whose type no check cares about are skipped without being parsed.
+
+Checks (rule names as reported):
+
+  desync              every client of a session sees the same phase,
+                      clueLevelPoints and scoreboard for one STATE_SNAPSHOT
+                      broadcast, and none skips a broadcast the others got
+  clue_order          CLUE_PRESENT runs strictly 10 → 8 → 6 → 4 → 2 per
+                      destination, per client (late joiners continue from
+                      the level in their first snapshot)
+  brake_order         BRAKE_ANSWER_LOCKED only after a BRAKE_ACCEPTED for
+                      that player; at most one accept per clue level
+  destination_leak    unrevealed destination name/country/aliases sent to
+                      TV or PLAYER
+  answer_leak         answerText for TV or PLAYER other than a player's own
+                      (snapshots and BRAKE_ANSWER_LOCKED); TV sees no locked
+                      answers before the reveal
+  followup_leak       followup correctAnswer / answersByPlayer sent to TV or
+                      PLAYER
+  roster_leak         host / tv entries in a TV or PLAYER players list or in
+                      LOBBY_UPDATED
+  audio_leak          audioState for PLAYER, ttsManifest for TV
+
+Unicast snapshots (the one on connect and the reply to RESUME_SESSION)
+are checked for projection rules but not grouped for desync.
+
+Usage:
+  python3 docs/e2e_load.py --rate 2 --duration 60 --record party.trace.gz
+  python3 docs/e2e_verify.py party.trace.gz
+  python3 docs/e2e_verify.py a.trace.gz b.trace.gz --examples 10 --json verify.json
+  python3 docs/e2e_verify.py huge.trace.gz --workers 0     # shard sessions over every core
+
+With --workers each process reads the whole trace but parses and checks
+only its share of sessions (crc32 of the sessionId), so parsing, which
+dominates, scales with cores.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import zlib
+from collections import Counter, OrderedDict
+
+from e2e_stats import SKEW_GROUP_MAX_AGE_MS
+from e2e_trace import KIND_CLIENT, KIND_RECV, KIND_SEND, read_trace
+
+# ---------------------------------------------------------------------------
+# CONFIG
+# ---------------------------------------------------------------------------
+CLUE_LEVELS       = (10, 8, 6, 4, 2)
+SESSION_IDLE_S    = 300          # trace seconds without frames before a session is dropped
+SWEEP_EVERY       = 65_536       # records between idle-session sweeps
+DEFAULT_EXAMPLES  = 3            # examples kept per rule
+PARSE_CACHE       = 1024         # recent raw frames kept parsed (one broadcast is often byte-identical)
+
+# Received event types that are parsed; everything else is only counted
+CHECKED_TYPES = frozenset({
+    "STATE_SNAPSHOT",
+    "LOBBY_UPDATED",
+    "CLUE_PRESENT",
+    "BRAKE_ACCEPTED",
+    "BRAKE_ANSWER_LOCKED",
+    "DESTINATION_REVEAL",
+    "FOLLOWUP_QUESTION_PRESENT",
+    "FOLLOWUP_ANSWERS_LOCKED",
+})
+
+RULES = ("desync", "clue_order", "brake_order", "destination_leak", "answer_leak",
+         "followup_leak", "roster_leak", "audio_leak")
+
+def _sniff_type(data: bytes) -> str | None:
+    """Event type from a raw frame without parsing it (envelopes lead with "type")."""
+    i = data.find(b'"type"')
+    if i < 0:
+        return None
+    j = data.find(b'"', data.find(b":", i + 6) + 1) + 1
+    k = data.find(b'"', j)
+    return data[j:k].decode() if j > 0 and k > j else None
+
+# ---------------------------------------------------------------------------
+# STATE
+# ---------------------------------------------------------------------------
+class ClientState:
+    __slots__ = ("name", "role", "player_id", "session", "first_ms", "last_view",
+                 "unicast_next", "clue_level", "accepted_levels", "open_accepts")
+
+    def __init__(self, info: dict, role: str):
+        self.name            = info.get("name", "?")
+        self.role            = role
+        self.player_id       = info.get("playerId")
+        self.session         = info.get("sessionId")
+        self.first_ms        = None   # first snapshot received (connect baseline)
+        self.last_view       = None
+        self.unicast_next    = False  # next snapshot answers our RESUME_SESSION
+        self.clue_level      = None   # last CLUE_PRESENT level this destination
+        self.accepted_levels = set()  # clue levels with a BRAKE_ACCEPTED this destination
+        self.open_accepts    = set()  # playerIds accepted and not yet locked
+
+class SnapshotGroup:
+    """One STATE_SNAPSHOT broadcast as seen across a session's clients."""
+    __slots__ = ("view", "opened_ms", "members")
+
+    def __init__(self, view: tuple, opened_ms: float, member: int):
+        self.view      = view
+        self.opened_ms = opened_ms
+        self.members   = {member}
+
+class SessionState:
+    __slots__ = ("staff_ids", "clients", "groups", "last_ms")
+
+    def __init__(self):
+        self.staff_ids = set()        # host / tv playerIds: never in a player roster
+        self.clients   = set()        # client indices
+        self.groups    = []           # open SnapshotGroups, oldest first
+        self.last_ms   = 0.0
+
+def _view(state: dict) -> tuple:
+    """Role-independent part of a snapshot that every recipient must agree on."""
+    board = tuple((e.get("playerId"), e.get("score")) for e in state.get("scoreboard") or ())
+    return (state.get("phase"), state.get("clueLevelPoints"), board)
+
+def _view_diff(a: tuple, b: tuple) -> list[str]:
+    return [name for name, x, y in zip(("phase", "clueLevelPoints", "scoreboard"), a, b) if x != y]
+
+# ---------------------------------------------------------------------------
+# VERIFIER
+# ---------------------------------------------------------------------------
+class Verifier:
+    """Feed trace records in order; collects violation counts and examples."""
+
+    def __init__(self, window_ms: float = SKEW_GROUP_MAX_AGE_MS, examples: int = DEFAULT_EXAMPLES,
+                 shard: int = 0, shards: int = 1):
+        self.window_ms  = window_ms
+        self.examples   = examples
+        self.shard      = shard
+        self.shards     = shards
+        self.violations = Counter()
+        self.samples    = {}          # rule -> [example dicts]
+        self.records    = 0
+        self.parsed     = 0
+        self.snapshots  = 0
+        self.grouped    = 0           # snapshots matched against a broadcast group
+        self.clients_seen  = 0
+        self.sessions_seen = 0
+        self.peak_sessions = 0
+        self._parsed  = OrderedDict()     # raw frame -> (payload, snapshot view)
+        self._reset()
+
+    def _reset(self):
+        self.clients: dict[int, ClientState] = {}
+        self.sessions: dict[str, SessionState] = {}
+
+    # -- input ------------------------------------------------------------
+    def feed_trace(self, path: str):
+        """Check one trace; client indices and clocks are per trace, so state restarts."""
+        self._reset()
+        for kind, t_us, idx, role, data in read_trace(path):
+            self.records += 1
+            if self.records % SWEEP_EVERY == 0:
+                self._sweep(t_us / 1000)
+            if kind == KIND_CLIENT:
+                self._client(idx, role, json.loads(data))
+            elif kind == KIND_RECV and idx in self.clients:
+                event_type = _sniff_type(data)
+                if event_type in CHECKED_TYPES:
+                    self._recv(idx, t_us / 1000, event_type, data)
+            elif kind == KIND_SEND and b"RESUME_SESSION" in data:
+                c = self.clients.get(idx)
+                if c is not None:
+                    c.unicast_next = True
+
+    def _client(self, idx: int, role: str, info: dict):
+        if self.shards > 1 and zlib.crc32(info.get("sessionId", "").encode()) % self.shards != self.shard:
+            return                        # another shard's session: its frames are skipped unparsed
+        c = self.clients[idx] = ClientState(info, role)
+        s = self.sessions.get(c.session)
+        if s is None:
+            s = self.sessions[c.session] = SessionState()
+            self.sessions_seen += 1
+            self.peak_sessions = max(self.peak_sessions, len(self.sessions))
+        s.clients.add(idx)
+        if role != "player" and c.player_id:
+            s.staff_ids.add(c.player_id)
+        self.clients_seen += 1
+
+    def _sweep(self, now_ms: float):
+        """Drop sessions (and their clients) idle for SESSION_IDLE_S."""
+        for sid in [sid for sid, s in self.sessions.items()
+                    if now_ms - s.last_ms > SESSION_IDLE_S * 1000 and s.last_ms]:
+            for idx in self.sessions.pop(sid).clients:
+                self.clients.pop(idx, None)
+
+    def _flag(self, rule: str, c: ClientState, t_ms: float, detail: str):
+        self.violations[rule] += 1
+        kept = self.samples.setdefault(rule, [])
+        if len(kept) < self.examples:
+            kept.append({"t_s": round(t_ms / 1000, 3), "client": c.name, "role": c.role,
+                         "sessionId": c.session, "detail": detail})
+
+    # -- per frame ----------------------------------------------------------
+    def _recv(self, idx: int, t_ms: float, event_type: str, data: bytes):
+        c = self.clients.get(idx)
+        if c is None:
+            return
+        s = self.sessions.get(c.session)
+        if s is None:
+            return
+        s.last_ms = t_ms
+        payload, view = self._parse(data, event_type)
+        public = c.role != "host"
+
+        if event_type == "STATE_SNAPSHOT":
+            self._snapshot(c, idx, s, t_ms, payload.get("state") or {}, view)
+        elif event_type == "CLUE_PRESENT":
+            level = payload.get("clueLevelPoints")
+            expected = CLUE_LEVELS[0] if c.clue_level is None else c.clue_level - 2
+            if level != expected:
+                self._flag("clue_order", c, t_ms, f"CLUE_PRESENT {level} after "
+                           f"{c.clue_level if c.clue_level is not None else 'start'}")
+            c.clue_level = level
+        elif event_type == "BRAKE_ACCEPTED":
+            level = payload.get("clueLevelPoints")
+            if level in c.accepted_levels:
+                self._flag("brake_order", c, t_ms, f"second BRAKE_ACCEPTED at level {level}")
+            c.accepted_levels.add(level)
+            c.open_accepts.add(payload.get("playerId"))
+        elif event_type == "BRAKE_ANSWER_LOCKED":
+            pid = payload.get("playerId")
+            if pid in c.open_accepts:
+                c.open_accepts.discard(pid)
+            else:
+                self._flag("brake_order", c, t_ms, f"BRAKE_ANSWER_LOCKED for {pid} without BRAKE_ACCEPTED")
+            if public and "answerText" in payload:
+                self._flag("answer_leak", c, t_ms, "BRAKE_ANSWER_LOCKED carries answerText")
+        elif event_type == "DESTINATION_REVEAL":
+            c.clue_level = None
+            c.accepted_levels.clear()
+            c.open_accepts.clear()
+        elif event_type == "LOBBY_UPDATED":
+            leaked = [p.get("playerId") for p in payload.get("players") or ()
+                      if p.get("playerId") in s.staff_ids or p.get("role", "player") != "player"]
+            if leaked:
+                self._flag("roster_leak", c, t_ms, f"LOBBY_UPDATED lists non-players {leaked}")
+        elif public and event_type == "FOLLOWUP_QUESTION_PRESENT":
+            if payload.get("correctAnswer") is not None:
+                self._flag("followup_leak", c, t_ms, "FOLLOWUP_QUESTION_PRESENT carries correctAnswer")
+        elif public and event_type == "FOLLOWUP_ANSWERS_LOCKED":
+            if payload.get("answersByPlayer"):
+                self._flag("followup_leak", c, t_ms, "FOLLOWUP_ANSWERS_LOCKED carries answersByPlayer")
+
+    def _parse(self, data: bytes, event_type: str) -> tuple[dict, tuple | None]:
+        """Parsed payload (and snapshot view), shared by identical frames; never mutated."""
+        hit = self._parsed.get(data)
+        if hit is not None:
+            self._parsed.move_to_end(data)
+            return hit
+        payload = json.loads(data).get("payload") or {}
+        self.parsed += 1
+        view = _view(payload.get("state") or {}) if event_type == "STATE_SNAPSHOT" else None
+        hit = self._parsed[data] = (payload, view)
+        if len(self._parsed) > PARSE_CACHE:
+            self._parsed.popitem(last=False)
+        return hit
+
+    def _snapshot(self, c: ClientState, idx: int, s: SessionState, t_ms: float,
+                  state: dict, view: tuple):
+        self.snapshots += 1
+        if c.role != "host":
+            self._projection(c, t_ms, state)
+
+        if c.first_ms is None:
+            # Connect baseline: late joiners pick up the clue sequence and brake mid-way
+            c.first_ms = t_ms
+            if state.get("phase") in ("CLUE_LEVEL", "PAUSED_FOR_BRAKE"):
+                c.clue_level = state.get("clueLevelPoints")
+                if state.get("brakeOwnerPlayerId"):
+                    c.open_accepts.add(state["brakeOwnerPlayerId"])
+                    c.accepted_levels.add(c.clue_level)
+            c.last_view = view
+            return
+        if c.unicast_next:
+            c.unicast_next = False
+            c.last_view = view
+            return
+        self._group(c, idx, s, t_ms, view)
+        c.last_view = view
+
+    def _group(self, c: ClientState, idx: int, s: SessionState, t_ms: float, view: tuple):
+        """
+        Match a broadcast snapshot to the oldest open group this client is
+        missing.  Per client, broadcasts arrive in send order, so the oldest
+        such group is the one it should be part of; a different view there
+        is a desync.  Groups the client's previous snapshot already covered
+        (e.g. the reconnect broadcast that skips the resuming client) count
+        as received.
+        """
+        horizon = t_ms - self.window_ms
+        while s.groups and s.groups[0].opened_ms < horizon:
+            s.groups.pop(0)
+        self.grouped += 1
+        missing = [g for g in s.groups
+                   if idx not in g.members and g.opened_ms > c.first_ms and g.view != c.last_view]
+        for i, g in enumerate(missing):
+            if g.view == view:
+                for skipped in missing[:i]:
+                    self._flag("desync", c, t_ms, "skipped a snapshot broadcast others received "
+                               f"({', '.join(_view_diff(skipped.view, view))} differ)")
+                    skipped.members.add(idx)
+                g.members.add(idx)
+                return
+        if missing:
+            g = missing[0]
+            self._flag("desync", c, t_ms, f"{', '.join(_view_diff(g.view, view))} differ from the "
+                       f"broadcast {len(g.members)} other client(s) received")
+            g.members.add(idx)
+        s.groups.append(SnapshotGroup(view, t_ms, idx))
+
+    def _projection(self, c: ClientState, t_ms: float, state: dict):
+        """contracts/projections.md rules for a TV / PLAYER snapshot."""
+        dest = state.get("destination") or {}
+        revealed = bool(dest.get("revealed"))
+        if dest and not revealed and (dest.get("name") or dest.get("country") or dest.get("aliases")):
+            self._flag("destination_leak", c, t_ms, f"unrevealed destination {dest.get('name')!r}")
+
+        roster = [p.get("playerId") for p in state.get("players") or () if p.get("role") != "player"]
+        if roster:
+            self._flag("roster_leak", c, t_ms, f"snapshot players include non-players {roster}")
+
+        locked = state.get("lockedAnswers") or ()
+        if c.role == "player":
+            foreign = [a.get("playerId") for a in locked if a.get("playerId") != c.player_id]
+            if foreign:
+                self._flag("answer_leak", c, t_ms, f"lockedAnswers of other players {foreign}")
+        elif locked and not revealed:
+            self._flag("answer_leak", c, t_ms, f"{len(locked)} lockedAnswers before reveal")
+        elif any(a.get("answerText") for a in locked):
+            self._flag("answer_leak", c, t_ms, "lockedAnswers carry answerText")
+
+        fq = state.get("followupQuestion")
+        if fq and (fq.get("correctAnswer") is not None or fq.get("answersByPlayer")):
+            self._flag("followup_leak", c, t_ms, "followupQuestion carries correctAnswer / answersByPlayer")
+
+        audio = state.get("audioState")
+        if c.role == "player" and audio is not None:
+            self._flag("audio_leak", c, t_ms, "audioState sent to player")
+        elif c.role == "tv" and audio and "ttsManifest" in audio:
+            self._flag("audio_leak", c, t_ms, "ttsManifest sent to tv")
+
+    # -- output ---------------------------------------------------------------
+    def take_state(self) -> dict:
+        """Picklable counters for merging shards."""
+        return {"violations": self.violations, "samples": self.samples, "records": self.records,
+                "parsed": self.parsed, "snapshots": self.snapshots, "grouped": self.grouped,
+                "clients_seen": self.clients_seen, "sessions_seen": self.sessions_seen,
+                "peak_sessions": self.peak_sessions}
+
+    def merge_state(self, st: dict):
+        self.violations.update(st["violations"])
+        for rule, examples in st["samples"].items():
+            kept = self.samples.setdefault(rule, [])
+            kept.extend(examples[:self.examples - len(kept)])
+        self.records = max(self.records, st["records"])    # every shard reads every record
+        for name in ("parsed", "snapshots", "grouped", "clients_seen", "sessions_seen", "peak_sessions"):
+            setattr(self, name, getattr(self, name) + st[name])
+
+    def summary(self, wall_s: float) -> dict:
+        return {
+            "records":         self.records,
+            "frames_parsed":   self.parsed,
+            "snapshots":       self.snapshots,
+            "snapshots_grouped": self.grouped,
+            "clients":         self.clients_seen,
+            "sessions":        self.sessions_seen,
+            "peak_sessions":   self.peak_sessions,
+            "wall_s":          round(wall_s, 2),
+            "records_per_s":   round(self.records / wall_s) if wall_s else 0,
+            "violations":      {rule: self.violations[rule] for rule in RULES if self.violations[rule]},
+            "examples":        self.samples,
+        }
+
+def _verify_shard(paths: list[str], window_ms: float, examples: int, shard: int, shards: int) -> dict:
+    verifier = Verifier(window_ms, examples, shard, shards)
+    for path in paths:
+        verifier.feed_trace(path)
+    return verifier.take_state()
+
+def verify(paths: list[str], window_ms: float = SKEW_GROUP_MAX_AGE_MS,
+           examples: int = DEFAULT_EXAMPLES, workers: int = 1) -> dict:
+    """Check traces, sharding sessions over `workers` processes; returns the summary."""
+    t0 = time.monotonic()
+    verifier = Verifier(window_ms, examples)
+    if workers <= 1:
+        for path in paths:
+            verifier.feed_trace(path)
+    else:
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            for st in pool.starmap(_verify_shard, [(paths, window_ms, examples, shard, workers)
+                                                   for shard in range(workers)]):
+                verifier.merge_state(st)
+    return verifier.summary(time.monotonic() - t0)
+
+def format_report(summary: dict) -> str:
+    lines = [f"  Records:   {summary['records']} ({summary['frames_parsed']} frames parsed) "
+             f"in {summary['wall_s']} s — {summary['records_per_s']}/s",
+             f"  Clients:   {summary['clients']} in {summary['sessions']} sessions "
+             f"(peak {summary['peak_sessions']} live)",
+             f"  Snapshots: {summary['snapshots']} ({summary['snapshots_grouped']} cross-checked)",
+             ""]
+    if not summary["violations"]:
+        lines.append(f"  [PASS] no violations ({', '.join(RULES)})")
+        return "\n".join(lines)
+    lines.append(f"  [FAIL] {sum(summary['violations'].values())} violations")
+    for rule, n in summary["violations"].items():
+        lines.append(f"    {rule:<18}{n:>8}")
+        for ex in summary["examples"].get(rule, ()):
+            lines.append(f"      t={ex['t_s']}s {ex['client']} ({ex['role']}): {ex['detail']}")
+    return "\n".join(lines)
+
+# ---------------------------------------------------------------------------
+# ENTRY POINT
+# ---------------------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Check recorded traces for protocol violations and desyncs")
+    parser.add_argument("traces", nargs="+", help="trace files written with --record")
+    parser.add_argument("--window-ms", type=float, default=SKEW_GROUP_MAX_AGE_MS,
+                        help="how long a snapshot broadcast stays open for matching (default: %(default)s)")
+    parser.add_argument("--examples", type=int, default=DEFAULT_EXAMPLES,
+                        help="examples kept per rule (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes to shard sessions over; 0 = one per core (default: %(default)s)")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="also write the summary as JSON to this path")
+    return parser
+
+def main():
+    args = build_parser().parse_args()
+    workers = args.workers or os.cpu_count() or 1
+    print("=" * 70)
+    print("  TASK-601 — Trace verification")
+    print(f"  Traces: {', '.join(args.traces)} | workers={workers}")
+    print("=" * 70)
+
+    summary = verify(args.traces, args.window_ms, args.examples, workers)
+
+    print(format_report(summary))
+    print("=" * 70)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\n  Summary written to {args.json_path}")
+    sys.exit(1 if summary["violations"] else 0)
+
+if __name__ == "__main__":
+    main()
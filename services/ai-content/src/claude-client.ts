@@ -28,12 +28,13 @@ export interface ClaudeOptions {
   model?: ClaudeModel;
   maxTokens?: number;
   systemPrompt?: string;
+  retries?: number; // attempts, default CONFIG.MAX_RETRIES
 }
 
 /**
  * Get the actual model ID for a given model type
  */
-function getModelId(model: ClaudeModel): string {
+export function getModelId(model: ClaudeModel): string {
   switch (model) {
     case 'sonnet':
       return CONFIG.ANTHROPIC_MODEL; // claude-sonnet-4-5-20250929
@@ -63,12 +64,13 @@ export async function callClaude(
     model = 'sonnet',
     maxTokens = 4096,
     systemPrompt,
+    retries = CONFIG.MAX_RETRIES,
   } = options || {};
 
   const client = getClaudeClient();
   const modelId = getModelId(model);
 
-  for (let attempt = 1; attempt <= CONFIG.MAX_RETRIES; attempt++) {
+  for (let attempt = 1; attempt <= retries; attempt++) {
     try {
       const response = await client.messages.create({
         model: modelId,
@@ -94,7 +96,7 @@ export async function callClaude(
 
       throw new Error('Unexpected response type from Claude');
     } catch (error) {
-      if (attempt === CONFIG.MAX_RETRIES) {
+      if (attempt >= retries) {
         throw error;
       }
       // Exponential backoff: 2s, 4s, 8s
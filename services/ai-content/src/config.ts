@@ -11,6 +11,19 @@ export const CONFIG = {
   MAX_RETRIES: 3,
   TIMEOUT_MS: 60000, // 60 seconds per generation step
 
+  // Verification pipeline (fact, anti-leak and overlap checks)
+  VERIFY_CONCURRENCY: Math.max(1, parseInt(process.env.VERIFY_CONCURRENCY || '8', 10) || 1),
+  VERIFY_MAX_RETRIES: Math.max(1, parseInt(process.env.VERIFY_MAX_RETRIES || '3', 10) || 1),
+  VERIFY_RETRY_BASE_MS: parseInt(process.env.VERIFY_RETRY_BASE_MS || '1000', 10),
+  VERIFY_CACHE: process.env.VERIFY_CACHE !== 'false',
+  VERIFY_CACHE_DIR: process.env.VERIFY_CACHE_DIR || './data/verification-cache',
+  VERIFY_CACHE_MAX_ENTRIES: parseInt(process.env.VERIFY_CACHE_MAX_ENTRIES || '10000', 10),
+
+  // Generation job queue (POST /generate/jobs, /generate/batch)
+  GENERATION_WORKERS: Math.max(1, parseInt(process.env.GENERATION_WORKERS || '3', 10) || 1),
+  GENERATION_QUEUE_MAX: parseInt(process.env.GENERATION_QUEUE_MAX || '50', 10),
+  GENERATION_JOB_TTL_MS: parseInt(process.env.GENERATION_JOB_TTL_MS || '3600000', 10), // finished jobs, 1 hour
+
   // Anti-leak verification
   ANTI_LEAK_STRICT_MODE: false, // If true, reject rounds with potential leaks
 
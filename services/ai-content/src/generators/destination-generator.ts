@@ -5,7 +5,7 @@
  */
 
 import { callClaude, parseClaudeJSON } from '../claude-client';
-import { Destination } from '../types/content-pack';
+import { Destination, GenerationOptions } from '../types/content-pack';
 
 interface DestinationResponse {
   name: string;
@@ -30,7 +30,10 @@ Svara ENBART med JSON i detta format:
   "reasoning": "Kort motivering varför denna destination är bra för spelet"
 }`;
 
-export async function generateDestination(excludeDestinations?: string[]): Promise<Destination> {
+export async function generateDestination(
+  excludeDestinations?: string[],
+  options: GenerationOptions = {}
+): Promise<Destination> {
   let prompt = `Generera EN intressant destination för ett geografiskt quiz-spel.
 
 Destinationen ska:
@@ -41,6 +44,14 @@ Destinationen ska:
 Inkludera alias (alternativa namn/stavningar) som spelare kan använda.
 Exempel: Paris → ["paris", "paree", "ljusets stad"]`;
 
+  if (options.regions && options.regions.length > 0) {
+    prompt += `\n\nVIKTIGT: Destinationen MÅSTE ligga i någon av dessa regioner: ${options.regions.join(', ')}`;
+  }
+
+  if (options.theme) {
+    prompt += `\n\nTema: Destinationen ska passa temat "${options.theme}".`;
+  }
+
   // Add exclusion constraint if provided
   if (excludeDestinations && excludeDestinations.length > 0) {
     prompt += `\n\nVIKTIGT: Välj en ANNAN destination än dessa (de har redan genererats):\n${excludeDestinations.map(d => `- ${d}`).join('\n')}`;
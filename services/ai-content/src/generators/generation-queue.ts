@@ -0,0 +1,249 @@
+/**
+ * Generation Queue
+ *
+ * Runs content pack generation as jobs, so callers get a job ID right away
+ * instead of holding a request open for the whole generate/verify run.
+ *
+ * - At most CONFIG.GENERATION_WORKERS rounds are generated at once; further
+ *   jobs wait in FIFO order, up to CONFIG.GENERATION_QUEUE_MAX.
+ * - Jobs generated side by side exclude each other's destinations: every
+ *   destination a job picks is added to one shared exclusion list that all
+ *   jobs pass to generateRound. A job that fails (or moves on to another
+ *   destination on retry) releases what it no longer uses.
+ * - Finished packs are saved to ContentPackStorage by generateRound; the job
+ *   keeps the pack ID. Finished jobs are kept for CONFIG.GENERATION_JOB_TTL_MS
+ *   so late pollers still see the outcome.
+ */
+
+import { v4 as uuidv4 } from 'uuid';
+import { CONFIG } from '../config';
+import { GenerationOptions, GenerationProgress } from '../types/content-pack';
+import { generateRound } from './round-generator';
+
+export type GenerationJobStatus = 'queued' | 'generating' | 'completed' | 'failed';
+
+export type GenerationJobOptions = GenerationOptions;
+
+export interface GenerationJob {
+  jobId: string;
+  batchId: string; // shared by jobs submitted together
+  status: GenerationJobStatus;
+  currentStep: number;
+  totalSteps: number;
+  currentStepDescription?: string;
+  queuePosition?: number; // 1 = next to start; queued jobs only
+  destination?: string;
+  country?: string;
+  contentPackId?: string;
+  verified?: boolean;
+  error?: string;
+  createdAt: string;
+  startedAt?: string;
+  finishedAt?: string;
+}
+
+export interface GenerationQueueStats {
+  workers: number;
+  running: number;
+  queued: number;
+  maxQueued: number;
+  completed: number; // since start
+  failed: number; // since start
+}
+
+export class QueueFullError extends Error {
+  constructor(queued: number, requested: number) {
+    super(`Generation queue is full (${queued} queued, ${requested} requested, max ${CONFIG.GENERATION_QUEUE_MAX})`);
+    this.name = 'QueueFullError';
+  }
+}
+
+interface QueuedJob {
+  job: GenerationJob;
+  options: GenerationJobOptions;
+  settled: Promise<GenerationJob>;
+  settle: (job: GenerationJob) => void;
+}
+
+// Upper bound on remembered destinations shared between jobs
+const MAX_EXCLUDED_DESTINATIONS = 200;
+
+class GenerationQueue {
+  private readonly jobs = new Map<string, QueuedJob>();
+  private readonly waiting: QueuedJob[] = [];
+  private readonly excludeDestinations: string[] = [];
+  private running = 0;
+  private completed = 0;
+  private failed = 0;
+
+  /**
+   * Queues `count` jobs (one pack each). Throws QueueFullError when they do
+   * not fit.
+   */
+  submit(count: number, options: GenerationJobOptions = {}): GenerationJob[] {
+    if (this.waiting.length + count > CONFIG.GENERATION_QUEUE_MAX) {
+      throw new QueueFullError(this.waiting.length, count);
+    }
+    this.pruneFinished();
+
+    const batchId = uuidv4();
+    const created = new Date().toISOString();
+    const submitted: GenerationJob[] = [];
+    for (let i = 0; i < count; i++) {
+      let settle!: (job: GenerationJob) => void;
+      const settled = new Promise<GenerationJob>((resolve) => {
+        settle = resolve;
+      });
+      const job: GenerationJob = {
+        jobId: uuidv4(),
+        batchId,
+        status: 'queued',
+        currentStep: 0,
+        totalSteps: CONFIG.TOTAL_STEPS,
+        createdAt: created,
+      };
+      const queued = { job, options, settled, settle };
+      this.jobs.set(job.jobId, queued);
+      this.waiting.push(queued);
+      submitted.push(job);
+    }
+
+    console.log(`[generation-queue] Queued ${count} job(s) in batch ${batchId} (${this.waiting.length} waiting, ${this.running} running)`);
+    this.drain();
+    return submitted.map((job) => this.view(job));
+  }
+
+  get(jobId: string): GenerationJob | undefined {
+    const queued = this.jobs.get(jobId);
+    return queued && this.view(queued.job);
+  }
+
+  /**
+   * Jobs by ID (unknown IDs are skipped), or the most recent `limit` jobs
+   */
+  list(jobIds?: string[], limit = 100): GenerationJob[] {
+    if (jobIds) {
+      return jobIds.map((id) => this.get(id)).filter((job): job is GenerationJob => job !== undefined);
+    }
+    return Array.from(this.jobs.values())
+      .slice(-limit)
+      .reverse()
+      .map(({ job }) => this.view(job));
+  }
+
+  /**
+   * Resolves with the final state of each job once all have finished
+   */
+  waitFor(jobIds: string[]): Promise<GenerationJob[]> {
+    return Promise.all(
+      jobIds.map((id) => {
+        const queued = this.jobs.get(id);
+        if (!queued) throw new Error(`Unknown generation job: ${id}`);
+        return queued.settled;
+      })
+    );
+  }
+
+  stats(): GenerationQueueStats {
+    return {
+      workers: CONFIG.GENERATION_WORKERS,
+      running: this.running,
+      queued: this.waiting.length,
+      maxQueued: CONFIG.GENERATION_QUEUE_MAX,
+      completed: this.completed,
+      failed: this.failed,
+    };
+  }
+
+  private view(job: GenerationJob): GenerationJob {
+    if (job.status !== 'queued') return { ...job };
+    const position = this.waiting.findIndex((q) => q.job === job);
+    return { ...job, queuePosition: position + 1 };
+  }
+
+  private drain(): void {
+    while (this.running < CONFIG.GENERATION_WORKERS && this.waiting.length > 0) {
+      const next = this.waiting.shift()!;
+      this.running++;
+      void this.run(next).finally(() => {
+        this.running--;
+        this.drain();
+      });
+    }
+  }
+
+  private async run({ job, options, settle }: QueuedJob): Promise<void> {
+    job.status = 'generating';
+    job.startedAt = new Date().toISOString();
+    console.log(`[generation-queue] Job ${job.jobId} started`, options);
+    const claimed: string[] = [];
+
+    try {
+      const pack = await generateRound(
+        (progress: GenerationProgress) => {
+          job.currentStep = progress.currentStep;
+          job.totalSteps = progress.totalSteps;
+          job.currentStepDescription = progress.stepName;
+          if (progress.destination && progress.destination !== job.destination) {
+            job.destination = progress.destination;
+            if (this.exclude(progress.destination)) claimed.push(progress.destination);
+          }
+        },
+        CONFIG.MAX_RETRIES,
+        this.excludeDestinations,
+        options
+      );
+
+      job.status = 'completed';
+      job.destination = pack.destination.name;
+      job.country = pack.destination.country;
+      job.contentPackId = pack.roundId;
+      job.verified = pack.metadata.verified;
+      job.currentStep = job.totalSteps;
+      this.exclude(pack.destination.name);
+      this.release(claimed.filter((name) => name !== pack.destination.name));
+      this.completed++;
+      console.log(`[generation-queue] Job ${job.jobId} completed: ${pack.destination.name} (${pack.roundId})`);
+    } catch (error) {
+      job.status = 'failed';
+      job.error = (error as Error).message;
+      this.release(claimed);
+      this.failed++;
+      console.error(`[generation-queue] Job ${job.jobId} failed:`, error);
+    }
+
+    job.finishedAt = new Date().toISOString();
+    settle(this.view(job));
+  }
+
+  /**
+   * Adds a destination to the shared exclusion list; false if already there
+   */
+  private exclude(destination: string): boolean {
+    const lower = destination.toLowerCase();
+    if (this.excludeDestinations.some((d) => d.toLowerCase() === lower)) return false;
+    this.excludeDestinations.push(destination);
+    if (this.excludeDestinations.length > MAX_EXCLUDED_DESTINATIONS) {
+      this.excludeDestinations.shift();
+    }
+    return true;
+  }
+
+  private release(destinations: string[]): void {
+    for (const destination of destinations) {
+      const index = this.excludeDestinations.indexOf(destination);
+      if (index !== -1) this.excludeDestinations.splice(index, 1);
+    }
+  }
+
+  private pruneFinished(): void {
+    const cutoff = Date.now() - CONFIG.GENERATION_JOB_TTL_MS;
+    for (const [jobId, { job }] of this.jobs) {
+      if (job.finishedAt && Date.parse(job.finishedAt) < cutoff) {
+        this.jobs.delete(jobId);
+      }
+    }
+  }
+}
+
+export const generationQueue = new GenerationQueue();
@@ -6,7 +6,7 @@
  */
 
 import { v4 as uuidv4 } from 'uuid';
-import { ContentPack, GenerationProgress } from '../types/content-pack';
+import { ContentPack, GenerationOptions, GenerationProgress } from '../types/content-pack';
 import { CONFIG } from '../config';
 import { generateDestination } from './destination-generator';
 import { generateClues } from './clue-generator';
@@ -21,7 +21,7 @@ import {
   checkFollowupsForLeaks,
 } from '../verification/anti-leak-checker';
 import { checkFollowupOverlaps } from '../verification/overlap-checker';
-import { costTracker } from '../metrics/cost-tracker';
+import { CostTracker } from '../metrics/cost-tracker';
 import { polishClue, polishFollowup } from '../utils/swedish-polish';
 import { getContentPackStorage } from '../storage/content-pack-storage';
 
@@ -33,13 +33,28 @@ export type ProgressCallback = (progress: GenerationProgress) => void;
 export async function generateRound(
   onProgress?: ProgressCallback,
   maxRetries: number = 3,
-  excludeDestinations?: string[]
+  excludeDestinations?: string[],
+  options: GenerationOptions = {}
 ): Promise<ContentPack> {
   const roundId = uuidv4();
-  let attempt = 0;
 
-  // Start cost tracking
-  costTracker.startRound(roundId);
+  // Cost tracking: Claude calls made while generating this round are
+  // charged to it, even with other rounds generated alongside
+  const costs = new CostTracker(roundId);
+  return costs.run(() =>
+    generateRoundAttempts(roundId, costs, onProgress, maxRetries, excludeDestinations, options)
+  );
+}
+
+async function generateRoundAttempts(
+  roundId: string,
+  costs: CostTracker,
+  onProgress: ProgressCallback | undefined,
+  maxRetries: number,
+  excludeDestinations: string[] | undefined,
+  options: GenerationOptions
+): Promise<ContentPack> {
+  let attempt = 0;
 
   // Get storage instance
   const storage = getContentPackStorage();
@@ -65,7 +80,14 @@ export async function generateRound(
         roundId,
       });
 
-      const destination = await generateDestination(excludeDestinations);
+      const destination = await generateDestination(excludeDestinations, options);
+
+      // Rounds generated side by side share one exclusion list, so another
+      // round may have claimed this destination while the prompt was in flight
+      const taken = destination.name.toLowerCase();
+      if (excludeDestinations?.some((name) => name.toLowerCase() === taken)) {
+        throw new Error(`Destination "${destination.name}" is excluded or already being generated`);
+      }
 
       // Deduplication check: If destination already exists, return existing pack
       const existingPackId = storage.findExistingDestination(destination.name);
@@ -84,7 +106,8 @@ export async function generateRound(
         }
       }
 
-      // Step 3: Generate clues
+      // Steps 3 and 4: clues and followups only depend on the destination,
+      // so both are generated at once
       onProgress?.({
         currentStep: CONFIG.GENERATION_STEPS.GENERATE_CLUES,
         totalSteps: CONFIG.TOTAL_STEPS,
@@ -93,12 +116,14 @@ export async function generateRound(
         destination: destination.name,
       });
 
-      let clues = await generateClues(destination);
+      const cluesPromise = generateClues(destination);
+      const followupsPromise = generateFollowups(destination, 2);
+      // Observe both before awaiting so a failure in one is never unhandled
+      followupsPromise.catch(() => undefined);
 
       // Apply Swedish language polish to clues
-      clues = clues.map(polishClue);
+      const clues = (await cluesPromise).map(polishClue);
 
-      // Step 4: Generate followup questions
       onProgress?.({
         currentStep: CONFIG.GENERATION_STEPS.GENERATE_FOLLOWUPS,
         totalSteps: CONFIG.TOTAL_STEPS,
@@ -107,10 +132,8 @@ export async function generateRound(
         destination: destination.name,
       });
 
-      let followups = await generateFollowups(destination, 2);
-
       // Apply Swedish language polish to followups
-      followups = followups.map(polishFollowup);
+      const followups = (await followupsPromise).map(polishFollowup);
 
       // Step 5: Verify facts
       onProgress?.({
@@ -121,9 +144,12 @@ export async function generateRound(
         destination: destination.name,
       });
 
-      const destinationVerified = await verifyDestination(destination);
-      const cluesVerified = await verifyAllClues(clues, destination);
-      const followupsVerified = await verifyAllFollowups(followups, destination);
+      // All checks run at once, bounded by the verification pipeline's limit
+      const [destinationVerified, cluesVerified, followupsVerified] = await Promise.all([
+        verifyDestination(destination),
+        verifyAllClues(clues, destination),
+        verifyAllFollowups(followups, destination),
+      ]);
 
       // Check if any verification failed critically
       const hasCriticalFactError =
@@ -145,9 +171,11 @@ export async function generateRound(
         destination: destination.name,
       });
 
-      const clueLeakCheck = await checkCluesForLeaks(clues, destination);
-      const followupLeakCheck = await checkFollowupsForLeaks(followups, destination);
-      const overlapCheck = await checkFollowupOverlaps(followups, clues, destination);
+      const [clueLeakCheck, followupLeakCheck, overlapCheck] = await Promise.all([
+        checkCluesForLeaks(clues, destination),
+        checkFollowupsForLeaks(followups, destination),
+        checkFollowupOverlaps(followups, clues, destination),
+      ]);
 
       const antiLeakPassed = clueLeakCheck.passed && followupLeakCheck.passed;
       const overlapPassed = overlapCheck.passed;
@@ -221,7 +249,7 @@ export async function generateRound(
       storage.savePack(contentPack);
 
       // Save cost metrics
-      costTracker.saveMetrics();
+      costs.saveMetrics();
 
       return contentPack;
     } catch (error) {
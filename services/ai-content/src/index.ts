@@ -10,7 +10,7 @@ validateConfig();
 
 // Initialize content pack storage (creates directory if needed)
 const storage = getContentPackStorage();
-console.log(`[ai-content] Content packs storage: ${storage.getStorageDir()}`);
+console.log(`[ai-content] Content packs storage: ${storage.getStorageDir()} (${storage.getPackCount()} packs)`);
 
 const app = express();
 app.use(express.json());
@@ -2,10 +2,12 @@
  * Cost Tracker
  *
  * Tracks AI and TTS costs for content generation to enable cost optimization.
+ * Saved rounds go to an append-only log with per-day rollups and a per-round
+ * offset index (metrics-log.ts).
  */
 
-import fs from 'node:fs';
-import path from 'node:path';
+import { AsyncLocalStorage } from 'node:async_hooks';
+import { MetricsLog, CostRollup, DayRollup, emptyRollup } from './metrics-log';
 
 const METRICS_DIR = process.env.METRICS_DIR || '/tmp/pa-sparet-metrics';
 
@@ -49,13 +51,38 @@ export interface GenerationMetrics {
   ttsCost: number;
 }
 
+export interface AggregatedMetrics {
+  totalRounds: number;
+  totalCost: number;
+  averageCostPerRound: number;
+  claudeCalls: number;
+  ttsCacheHitRate: number;
+  modelBreakdown: CostRollup['modelBreakdown'];
+  ttsCost: number;
+  days: DayRollup[];
+}
+
+let metricsLog: MetricsLog | null = null;
+
+function getMetricsLog(): MetricsLog {
+  if (!metricsLog) {
+    metricsLog = new MetricsLog(METRICS_DIR);
+  }
+  return metricsLog;
+}
+
+// The round being generated in the current async context
+const roundScope = new AsyncLocalStorage<CostTracker>();
+
+/**
+ * Costs of one round. Rounds are generated side by side (generation queue
+ * workers, the pool script), so each has its own tracker; Claude and TTS
+ * calls made inside tracker.run() are charged to it.
+ */
 class CostTracker {
-  private currentMetrics: GenerationMetrics | null = null;
+  private currentMetrics: GenerationMetrics;
 
-  /**
-   * Start tracking a new round
-   */
-  startRound(roundId: string): void {
+  constructor(roundId: string) {
     this.currentMetrics = {
       roundId,
       timestamp: new Date().toISOString(),
@@ -73,6 +100,20 @@ class CostTracker {
     };
   }
 
+  /**
+   * Run fn as this round: usage tracked inside it, across awaits, lands here
+   */
+  run<T>(fn: () => Promise<T>): Promise<T> {
+    return roundScope.run(this, fn);
+  }
+
+  /**
+   * The tracker of the round running in the current async context
+   */
+  static current(): CostTracker | undefined {
+    return roundScope.getStore();
+  }
+
   /**
    * Track a Claude API call
    */
@@ -81,11 +122,6 @@ class CostTracker {
     inputTokens: number,
     outputTokens: number
   ): void {
-    if (!this.currentMetrics) {
-      console.warn('[cost-tracker] No active round, call startRound() first');
-      return;
-    }
-
     const pricing = PRICING.claude[model];
     const cost =
       (inputTokens / 1_000_000) * pricing.input +
@@ -107,11 +143,6 @@ class CostTracker {
    * Track a TTS generation
    */
   trackTTS(chars: number, fromCache: boolean): void {
-    if (!this.currentMetrics) {
-      console.warn('[cost-tracker] No active round, call startRound() first');
-      return;
-    }
-
     this.currentMetrics.ttsTotalChars += chars;
 
     if (fromCache) {
@@ -130,8 +161,6 @@ class CostTracker {
    * Recalculate total estimated cost
    */
   private recalculateTotalCost(): void {
-    if (!this.currentMetrics) return;
-
     const claudeCost =
       this.currentMetrics.modelBreakdown.sonnet.cost +
       this.currentMetrics.modelBreakdown.haiku.cost;
@@ -142,28 +171,19 @@ class CostTracker {
   /**
    * Get current metrics snapshot
    */
-  getCurrentMetrics(): GenerationMetrics | null {
-    return this.currentMetrics ? { ...this.currentMetrics } : null;
+  getCurrentMetrics(): GenerationMetrics {
+    return { ...this.currentMetrics };
   }
 
   /**
    * Save metrics to disk
    */
   saveMetrics(): void {
-    if (!this.currentMetrics) {
-      console.warn('[cost-tracker] No metrics to save');
-      return;
-    }
-
     try {
-      fs.mkdirSync(METRICS_DIR, { recursive: true });
-
-      const filename = `metrics-${this.currentMetrics.roundId}.json`;
-      const filepath = path.join(METRICS_DIR, filename);
+      const log = getMetricsLog();
+      log.append(this.currentMetrics);
 
-      fs.writeFileSync(filepath, JSON.stringify(this.currentMetrics, null, 2));
-
-      console.log(`[cost-tracker] Metrics saved to ${filepath}`);
+      console.log(`[cost-tracker] Metrics saved to ${log.getLogPath()}`);
       console.log(`[cost-tracker] Total cost: $${this.currentMetrics.estimatedCostUSD.toFixed(4)}`);
     } catch (error) {
       console.error('[cost-tracker] Failed to save metrics:', error);
@@ -175,15 +195,7 @@ class CostTracker {
    */
   static loadMetrics(roundId: string): GenerationMetrics | null {
     try {
-      const filename = `metrics-${roundId}.json`;
-      const filepath = path.join(METRICS_DIR, filename);
-
-      if (!fs.existsSync(filepath)) {
-        return null;
-      }
-
-      const content = fs.readFileSync(filepath, 'utf-8');
-      return JSON.parse(content);
+      return getMetricsLog().find(roundId);
     } catch (error) {
       console.error(`[cost-tracker] Failed to load metrics for ${roundId}:`, error);
       return null;
@@ -193,78 +205,52 @@ class CostTracker {
   /**
    * Get aggregated metrics for a date range
    */
-  static getAggregatedMetrics(
-    fromDate?: Date,
-    toDate?: Date
-  ): {
-    totalRounds: number;
-    totalCost: number;
-    averageCostPerRound: number;
-    claudeCalls: number;
-    ttsCacheHitRate: number;
-  } {
+  static getAggregatedMetrics(fromDate?: Date, toDate?: Date): AggregatedMetrics {
     try {
-      if (!fs.existsSync(METRICS_DIR)) {
-        return {
-          totalRounds: 0,
-          totalCost: 0,
-          averageCostPerRound: 0,
-          claudeCalls: 0,
-          ttsCacheHitRate: 0,
-        };
-      }
-
-      const files = fs.readdirSync(METRICS_DIR).filter((f) => f.startsWith('metrics-'));
-
-      let totalRounds = 0;
-      let totalCost = 0;
-      let totalClaudeCalls = 0;
-      let totalTTSHits = 0;
-      let totalTTSMisses = 0;
-
-      for (const file of files) {
-        const filepath = path.join(METRICS_DIR, file);
-        const content = fs.readFileSync(filepath, 'utf-8');
-        const metrics: GenerationMetrics = JSON.parse(content);
-
-        // Filter by date range if provided
-        if (fromDate && new Date(metrics.timestamp) < fromDate) continue;
-        if (toDate && new Date(metrics.timestamp) > toDate) continue;
-
-        totalRounds++;
-        totalCost += metrics.estimatedCostUSD;
-        totalClaudeCalls += metrics.claudeApiCalls;
-        totalTTSHits += metrics.ttsCacheHits;
-        totalTTSMisses += metrics.ttsCacheMisses;
-      }
-
-      const ttsCacheHitRate =
-        totalTTSHits + totalTTSMisses > 0
-          ? totalTTSHits / (totalTTSHits + totalTTSMisses)
-          : 0;
+      const { totals, days } = getMetricsLog().aggregate(fromDate, toDate);
+      const ttsLookups = totals.ttsCacheHits + totals.ttsCacheMisses;
 
       return {
-        totalRounds,
-        totalCost,
-        averageCostPerRound: totalRounds > 0 ? totalCost / totalRounds : 0,
-        claudeCalls: totalClaudeCalls,
-        ttsCacheHitRate,
+        totalRounds: totals.rounds,
+        totalCost: totals.cost,
+        averageCostPerRound: totals.rounds > 0 ? totals.cost / totals.rounds : 0,
+        claudeCalls: totals.claudeCalls,
+        ttsCacheHitRate: ttsLookups > 0 ? totals.ttsCacheHits / ttsLookups : 0,
+        modelBreakdown: totals.modelBreakdown,
+        ttsCost: totals.ttsCost,
+        days,
       };
     } catch (error) {
       console.error('[cost-tracker] Failed to get aggregated metrics:', error);
+      const empty = emptyRollup();
       return {
         totalRounds: 0,
         totalCost: 0,
         averageCostPerRound: 0,
         claudeCalls: 0,
         ttsCacheHitRate: 0,
+        modelBreakdown: empty.modelBreakdown,
+        ttsCost: 0,
+        days: [],
       };
     }
   }
 }
 
-// Singleton instance
-export const costTracker = new CostTracker();
+/**
+ * Charges usage to the round being generated in the current async context
+ * (see CostTracker.run); usage outside a round, e.g. POST /tts/batch, is
+ * not recorded
+ */
+export const costTracker = {
+  trackClaudeCall(model: 'sonnet' | 'haiku', inputTokens: number, outputTokens: number): void {
+    CostTracker.current()?.trackClaudeCall(model, inputTokens, outputTokens);
+  },
+
+  trackTTS(chars: number, fromCache: boolean): void {
+    CostTracker.current()?.trackTTS(chars, fromCache);
+  },
+};
 
 // Export class for static methods
 export { CostTracker };
@@ -0,0 +1,395 @@
+/**
+ * Metrics Log
+ *
+ * Storage behind CostTracker: every finished round is one line appended to
+ * `cost-metrics.jsonl`, and running totals per day and per model are kept
+ * next to it in `cost-rollups.json`. The rollups are updated from the log
+ * incrementally (only lines appended since the last update are read) and
+ * checkpointed together with the log offset they cover, so opening the log
+ * reads the checkpoint plus the lines after it, not every record.
+ *
+ * Aggregates over whole days come straight from the day rollups; a day cut
+ * by the requested range is read back from the log, limited to the byte
+ * range that day's records occupy.
+ *
+ * Looking up one round reads one line: the byte range of every record is
+ * appended to `cost-rounds.jsonl` at each checkpoint (only the records
+ * since the previous one), and that index is loaded on the first lookup.
+ */
+
+import fs from 'node:fs';
+import path from 'node:path';
+import { AppendLog } from '../storage/append-log';
+import { GenerationMetrics, ModelUsage } from './cost-tracker';
+
+const LOG_FILE = 'cost-metrics.jsonl';
+const ROLLUP_FILE = 'cost-rollups.json';
+const ROUND_INDEX_FILE = 'cost-rounds.jsonl';
+const ROLLUP_VERSION = 2;
+// Checkpoint the rollups after this many rounds saved by this process
+const CHECKPOINT_EVERY = 100;
+const DAY_MS = 24 * 60 * 60 * 1000;
+// Records per append to the round index (they are passed as arguments)
+const ROUND_INDEX_BATCH = 1000;
+
+export interface CostRollup {
+  rounds: number;
+  cost: number;
+  claudeCalls: number;
+  claudeTokens: number;
+  ttsChars: number;
+  ttsCacheHits: number;
+  ttsCacheMisses: number;
+  ttsCost: number;
+  modelBreakdown: {
+    sonnet: ModelUsage;
+    haiku: ModelUsage;
+  };
+}
+
+export interface DayRollup extends CostRollup {
+  date: string; // YYYY-MM-DD (UTC)
+}
+
+interface StoredDayRollup extends DayRollup {
+  // Byte range of the log holding this day's records (others may be mixed in)
+  firstOffset: number;
+  endOffset: number;
+}
+
+// Byte range of a round's record in the log: one line of the round index
+type RoundSpan = [roundId: string, offset: number, end: number];
+
+interface RollupCheckpoint {
+  version: number;
+  logIno: number;
+  logOffset: number;
+  roundIndexOffset: number; // round index bytes covering the log up to logOffset
+  updatedAt: string;
+  totals: CostRollup;
+  days: Record<string, StoredDayRollup>;
+}
+
+export function emptyRollup(): CostRollup {
+  return {
+    rounds: 0,
+    cost: 0,
+    claudeCalls: 0,
+    claudeTokens: 0,
+    ttsChars: 0,
+    ttsCacheHits: 0,
+    ttsCacheMisses: 0,
+    ttsCost: 0,
+    modelBreakdown: {
+      sonnet: { calls: 0, inputTokens: 0, outputTokens: 0, cost: 0 },
+      haiku: { calls: 0, inputTokens: 0, outputTokens: 0, cost: 0 },
+    },
+  };
+}
+
+export class MetricsLog {
+  private log: AppendLog<GenerationMetrics>;
+  private roundIndex: AppendLog<RoundSpan>;
+  private rollupPath: string;
+
+  private totals = emptyRollup();
+  private days = new Map<string, StoredDayRollup>();
+  private logOffset = 0;
+  private logIno = -1;
+  private savedSinceCheckpoint = 0;
+
+  // roundId -> [offset, end] of its latest record; null until the first find()
+  private rounds: Map<string, [number, number]> | null = null;
+  private unindexed: RoundSpan[] = []; // read since the last checkpoint
+  private roundIndexOffset = 0;
+  private rewriteRoundIndex = false;
+
+  constructor(private readonly metricsDir: string) {
+    this.log = new AppendLog(path.join(metricsDir, LOG_FILE));
+    this.roundIndex = new AppendLog(path.join(metricsDir, ROUND_INDEX_FILE));
+    this.rollupPath = path.join(metricsDir, ROLLUP_FILE);
+
+    this.migrateLegacyFiles();
+    const replayed = this.loadCheckpoint() ? this.refresh() : this.rebuild();
+    if (replayed > 0) this.checkpoint();
+  }
+
+  getLogPath(): string {
+    return this.log.getPath();
+  }
+
+  /**
+   * Appends one round; the rollups catch up on the next read or checkpoint
+   */
+  append(metrics: GenerationMetrics): void {
+    this.log.append(metrics);
+    if (++this.savedSinceCheckpoint >= CHECKPOINT_EVERY) {
+      this.refresh();
+      this.checkpoint();
+    }
+  }
+
+  /**
+   * Totals plus per-day rollups for rounds whose timestamp is within the range
+   */
+  aggregate(fromDate?: Date, toDate?: Date): { totals: CostRollup; days: DayRollup[] } {
+    this.refresh();
+
+    const from = fromDate?.getTime();
+    const to = toDate?.getTime();
+    const totals = emptyRollup();
+    const days: DayRollup[] = [];
+
+    for (const date of Array.from(this.days.keys()).sort()) {
+      const day = this.days.get(date)!;
+      const dayStart = Date.parse(`${date}T00:00:00.000Z`);
+      const dayEnd = dayStart + DAY_MS - 1;
+
+      if ((from !== undefined && dayEnd < from) || (to !== undefined && dayStart > to)) continue;
+
+      let rollup: CostRollup;
+      if ((from === undefined || dayStart >= from) && (to === undefined || dayEnd <= to)) {
+        rollup = day;
+      } else {
+        // Range starts or ends inside this day: count its records one by one
+        rollup = emptyRollup();
+        for (const { record } of this.log.read(day.firstOffset, day.endOffset).records) {
+          if (dayKey(record.timestamp) !== date) continue;
+          const time = new Date(record.timestamp).getTime();
+          if (from !== undefined && time < from) continue;
+          if (to !== undefined && time > to) continue;
+          addToRollup(rollup, record);
+        }
+        if (rollup.rounds === 0) continue;
+      }
+
+      mergeRollup(totals, rollup);
+      days.push({ ...cloneRollup(rollup), date });
+    }
+
+    return { totals, days };
+  }
+
+  /**
+   * The last record saved for a round
+   */
+  find(roundId: string): GenerationMetrics | null {
+    this.refresh();
+    const span = this.loadRounds().get(roundId);
+    if (!span) return null;
+    const record = this.log.read(span[0], span[1]).records[0]?.record;
+    return record?.roundId === roundId ? record : null;
+  }
+
+  /**
+   * Folds lines appended since the last read into the rollups; returns how many
+   */
+  private refresh(): number {
+    const stat = this.log.stat();
+    if (!stat) return 0;
+    // Replaced or truncated: the rollups no longer describe this file
+    if (stat.ino !== this.logIno || stat.size < this.logOffset) return this.rebuild();
+    if (stat.size === this.logOffset) return 0;
+
+    const { records, end, skipped } = this.log.read(this.logOffset);
+    if (skipped > 0) console.warn(`[cost-tracker] Skipped ${skipped} unreadable metrics lines`);
+    for (const { offset, end: recordEnd, record } of records) {
+      this.addRecord(record, offset, recordEnd);
+    }
+    this.logOffset = end;
+    return records.length;
+  }
+
+  private rebuild(): number {
+    this.totals = emptyRollup();
+    this.days.clear();
+    this.rounds = new Map();
+    this.unindexed = [];
+    this.rewriteRoundIndex = true;
+    this.logOffset = 0;
+    this.logIno = this.log.stat()?.ino ?? -1;
+    return this.refresh();
+  }
+
+  private addRecord(record: GenerationMetrics, offset: number, end: number): void {
+    addToRollup(this.totals, record);
+    const span: RoundSpan = [record.roundId, offset, end];
+    this.unindexed.push(span);
+    if (this.rounds) addSpan(this.rounds, span);
+
+    const date = dayKey(record.timestamp);
+    let day = this.days.get(date);
+    if (!day) {
+      day = { ...emptyRollup(), date, firstOffset: offset, endOffset: end };
+      this.days.set(date, day);
+    }
+    addToRollup(day, record);
+    day.firstOffset = Math.min(day.firstOffset, offset);
+    day.endOffset = Math.max(day.endOffset, end);
+  }
+
+  /**
+   * The round index as of the last checkpoint plus the records read since
+   */
+  private loadRounds(): Map<string, [number, number]> {
+    if (this.rounds) return this.rounds;
+
+    const rounds = new Map<string, [number, number]>();
+    const size = this.roundIndex.stat()?.size ?? 0;
+    if (size >= this.roundIndexOffset) {
+      for (const { record } of this.roundIndex.read(0, this.roundIndexOffset).records) {
+        addSpan(rounds, record);
+      }
+      for (const span of this.unindexed) addSpan(rounds, span);
+    } else {
+      // Index lost or cut short: scan the log once, rewrite it at the next checkpoint
+      console.warn(`[cost-tracker] ${ROUND_INDEX_FILE} is behind the rollups, rebuilding it`);
+      this.unindexed = this.log
+        .read(0, this.logOffset)
+        .records.map(({ offset, end, record }): RoundSpan => [record.roundId, offset, end]);
+      for (const span of this.unindexed) addSpan(rounds, span);
+      this.rewriteRoundIndex = true;
+    }
+    this.rounds = rounds;
+    return rounds;
+  }
+
+  private loadCheckpoint(): boolean {
+    try {
+      if (!fs.existsSync(this.rollupPath)) return false;
+      const checkpoint: RollupCheckpoint = JSON.parse(fs.readFileSync(this.rollupPath, 'utf-8'));
+      const stat = this.log.stat();
+      if (
+        checkpoint.version !== ROLLUP_VERSION ||
+        !stat ||
+        checkpoint.logIno !== stat.ino ||
+        checkpoint.logOffset > stat.size
+      ) {
+        return false;
+      }
+
+      this.totals = checkpoint.totals;
+      this.days = new Map(Object.entries(checkpoint.days));
+      this.roundIndexOffset = checkpoint.roundIndexOffset;
+      this.logOffset = checkpoint.logOffset;
+      this.logIno = checkpoint.logIno;
+      return true;
+    } catch (error) {
+      console.warn('[cost-tracker] Ignoring unreadable rollup checkpoint:', (error as Error).message);
+      return false;
+    }
+  }
+
+  private checkpoint(): void {
+    this.savedSinceCheckpoint = 0;
+    if (this.logIno === -1) return;
+
+    try {
+      // Index first, so the checkpoint never covers records it lacks
+      if (this.rewriteRoundIndex) {
+        this.roundIndex.replace(this.unindexed);
+      } else {
+        for (let i = 0; i < this.unindexed.length; i += ROUND_INDEX_BATCH) {
+          this.roundIndex.append(...this.unindexed.slice(i, i + ROUND_INDEX_BATCH));
+        }
+      }
+      this.unindexed = [];
+      this.rewriteRoundIndex = false;
+      this.roundIndexOffset = this.roundIndex.stat()?.size ?? 0;
+
+      const checkpoint: RollupCheckpoint = {
+        version: ROLLUP_VERSION,
+        logIno: this.logIno,
+        logOffset: this.logOffset,
+        roundIndexOffset: this.roundIndexOffset,
+        updatedAt: new Date().toISOString(),
+        totals: this.totals,
+        days: Object.fromEntries(this.days),
+      };
+      const tmp = `${this.rollupPath}.${process.pid}.tmp`;
+      fs.writeFileSync(tmp, JSON.stringify(checkpoint), 'utf-8');
+      fs.renameSync(tmp, this.rollupPath);
+    } catch (error) {
+      console.error('[cost-tracker] Failed to checkpoint rollups:', error);
+    }
+  }
+
+  /**
+   * Imports the per-round `metrics-<roundId>.json` files written before the
+   * log existed, once. The files are left in place.
+   */
+  private migrateLegacyFiles(): void {
+    if (this.log.exists() || !fs.existsSync(this.metricsDir)) return;
+
+    const files = fs
+      .readdirSync(this.metricsDir)
+      .filter((f) => f.startsWith('metrics-') && f.endsWith('.json'));
+    if (files.length === 0) return;
+
+    const records: GenerationMetrics[] = [];
+    for (const file of files) {
+      try {
+        records.push(JSON.parse(fs.readFileSync(path.join(this.metricsDir, file), 'utf-8')));
+      } catch (error) {
+        console.warn(`[cost-tracker] Skipping unreadable metrics file ${file}:`, (error as Error).message);
+      }
+    }
+    records.sort((a, b) => a.timestamp.localeCompare(b.timestamp));
+    this.log.replace(records);
+    console.log(`[cost-tracker] Migrated ${records.length} metrics files to ${LOG_FILE}`);
+  }
+}
+
+/**
+ * Keeps the later of two records for a round (another process may have
+ * indexed an older one after a newer one)
+ */
+function addSpan(rounds: Map<string, [number, number]>, [roundId, offset, end]: RoundSpan): void {
+  const existing = rounds.get(roundId);
+  if (!existing || existing[0] < offset) rounds.set(roundId, [offset, end]);
+}
+
+function dayKey(timestamp: string): string {
+  const time = new Date(timestamp);
+  return isNaN(time.getTime()) ? 'invalid' : time.toISOString().slice(0, 10);
+}
+
+function addToRollup(rollup: CostRollup, metrics: GenerationMetrics): void {
+  rollup.rounds++;
+  rollup.cost += metrics.estimatedCostUSD;
+  rollup.claudeCalls += metrics.claudeApiCalls;
+  rollup.claudeTokens += metrics.claudeTotalTokens;
+  rollup.ttsChars += metrics.ttsTotalChars;
+  rollup.ttsCacheHits += metrics.ttsCacheHits;
+  rollup.ttsCacheMisses += metrics.ttsCacheMisses;
+  rollup.ttsCost += metrics.ttsCost;
+  addModelUsage(rollup.modelBreakdown.sonnet, metrics.modelBreakdown?.sonnet);
+  addModelUsage(rollup.modelBreakdown.haiku, metrics.modelBreakdown?.haiku);
+}
+
+function mergeRollup(into: CostRollup, rollup: CostRollup): void {
+  into.rounds += rollup.rounds;
+  into.cost += rollup.cost;
+  into.claudeCalls += rollup.claudeCalls;
+  into.claudeTokens += rollup.claudeTokens;
+  into.ttsChars += rollup.ttsChars;
+  into.ttsCacheHits += rollup.ttsCacheHits;
+  into.ttsCacheMisses += rollup.ttsCacheMisses;
+  into.ttsCost += rollup.ttsCost;
+  addModelUsage(into.modelBreakdown.sonnet, rollup.modelBreakdown.sonnet);
+  addModelUsage(into.modelBreakdown.haiku, rollup.modelBreakdown.haiku);
+}
+
+function addModelUsage(into: ModelUsage, usage?: ModelUsage): void {
+  if (!usage) return;
+  into.calls += usage.calls;
+  into.inputTokens += usage.inputTokens;
+  into.outputTokens += usage.outputTokens;
+  into.cost += usage.cost;
+}
+
+function cloneRollup(rollup: CostRollup): CostRollup {
+  const clone = emptyRollup();
+  mergeRollup(clone, rollup);
+  return clone;
+}
@@ -6,12 +6,37 @@
 
 import { Router, Request, Response } from 'express';
 import { generateRound } from '../generators/round-generator';
-import { GenerationProgress, GenerationResponse } from '../types/content-pack';
+import { generationQueue, QueueFullError } from '../generators/generation-queue';
+import { GenerationOptions, GenerationProgress, GenerationResponse } from '../types/content-pack';
 import { CONFIG } from '../config';
 import { getContentPackStorage } from '../storage/content-pack-storage';
 
 const router = Router();
 
+// Prompts and polish are Swedish only
+const SUPPORTED_LANGUAGES = ['sv'];
+
+/**
+ * Validates the generation options in a request body; returns the options
+ * or an error message
+ */
+function parseGenerationOptions(body: any): GenerationOptions | string {
+  const { regions, theme, language } = body ?? {};
+  if (
+    regions !== undefined &&
+    (!Array.isArray(regions) || !regions.every((r: unknown) => typeof r === 'string' && r.trim().length > 0))
+  ) {
+    return 'regions must be an array of non-empty strings';
+  }
+  if (theme !== undefined && (typeof theme !== 'string' || theme.length > 200)) {
+    return 'theme must be a string of at most 200 characters';
+  }
+  if (language !== undefined && !SUPPORTED_LANGUAGES.includes(language)) {
+    return `language must be one of: ${SUPPORTED_LANGUAGES.join(', ')}`;
+  }
+  return { regions, theme: theme?.trim() || undefined, language };
+}
+
 /**
  * POST /generate/round
  *
@@ -67,7 +92,8 @@ router.post('/round', async (_req: Request, res: Response) => {
  * POST /generate/batch
  *
  * Generates multiple content packs in parallel (for multi-destination games).
- * Body: { count: 3-5, regions?: string[], language?: string }
+ * Runs on the generation queue and responds once every pack is done.
+ * Body: { count: 3-5, regions?: string[], language?: 'sv', theme?: string }
  * Returns: { packs: Array<{ id, name, country }> }
  */
 router.post('/batch', async (req: Request, res: Response) => {
@@ -79,7 +105,7 @@ router.post('/batch', async (req: Request, res: Response) => {
   }
 
   try {
-    const { count, regions, language } = req.body;
+    const { count } = req.body;
 
     // Validate count
     if (!count || typeof count !== 'number' || count < 3 || count > 5) {
@@ -90,43 +116,41 @@ router.post('/batch', async (req: Request, res: Response) => {
       return;
     }
 
-    console.log(`[generate] Generating ${count} content packs...`, { regions, language });
-
-    // Generate packs SEQUENTIALLY to avoid duplicates
-    const contentPacks = [];
-    const excludeDestinations: string[] = [];
+    const options = parseGenerationOptions(req.body);
+    if (typeof options === 'string') {
+      res.status(400).json({ error: 'Validation error', message: options });
+      return;
+    }
 
-    for (let i = 0; i < count; i++) {
-      console.log(`[generate] Generating pack ${i + 1}/${count} (excluding: ${excludeDestinations.join(', ')})`);
+    console.log(`[generate] Generating ${count} content packs...`, options);
 
-      const pack = await generateRound(
-        (progress) => {
-          console.log(
-            `[generate] Pack ${i + 1}/${count}: Step ${progress.currentStep}/${progress.totalSteps} - ${progress.stepName}`
-          );
-        },
-        3, // maxRetries
-        excludeDestinations // Pass previously generated destinations
-      );
+    // Jobs running side by side exclude each other's destinations
+    const jobs = generationQueue.submit(count, options);
+    const finished = await generationQueue.waitFor(jobs.map((job) => job.jobId));
 
-      contentPacks.push(pack);
-      excludeDestinations.push(pack.destination.name);
+    const failed = finished.find((job) => job.status === 'failed');
+    if (failed) {
+      throw new Error(failed.error ?? `Generation job ${failed.jobId} failed`);
     }
 
     // Return summary with basic info
-    const packsummary = contentPacks.map((pack) => ({
-      id: pack.roundId,
-      name: pack.destination.name,
-      country: pack.destination.country,
+    const packsummary = finished.map((job) => ({
+      id: job.contentPackId!,
+      name: job.destination!,
+      country: job.country!,
     }));
 
     console.log(`[generate] Batch generation complete: ${count} packs generated`);
     res.json({
       success: true,
       packs: packsummary,
-      count: contentPacks.length,
+      count: packsummary.length,
     });
   } catch (error) {
+    if (error instanceof QueueFullError) {
+      res.status(429).json({ success: false, error: error.message });
+      return;
+    }
     console.error('[generate] Failed to generate batch:', error);
     res.status(500).json({
       success: false,
@@ -135,6 +159,84 @@ router.post('/batch', async (req: Request, res: Response) => {
   }
 });
 
+/**
+ * POST /generate/jobs
+ *
+ * Queues content pack generation and returns the job IDs right away.
+ * Progress is polled with GET /generate/jobs/:jobId.
+ * Body: { count?: 1-5 (default 1), regions?: string[], language?: 'sv', theme?: string }
+ * Returns 202: { success, jobs: GenerationJob[], queue }
+ */
+router.post('/jobs', (req: Request, res: Response) => {
+  if (!CONFIG.ANTHROPIC_API_KEY) {
+    res.status(503).json({ success: false, error: 'ANTHROPIC_API_KEY not configured' });
+    return;
+  }
+
+  const { count = 1 } = req.body ?? {};
+  if (typeof count !== 'number' || !Number.isInteger(count) || count < 1 || count > 5) {
+    res.status(400).json({
+      error: 'Validation error',
+      message: 'count must be an integer between 1 and 5',
+    });
+    return;
+  }
+
+  const options = parseGenerationOptions(req.body);
+  if (typeof options === 'string') {
+    res.status(400).json({ error: 'Validation error', message: options });
+    return;
+  }
+
+  try {
+    const jobs = generationQueue.submit(count, options);
+    res.status(202).json({
+      success: true,
+      jobs,
+      queue: generationQueue.stats(),
+    });
+  } catch (error) {
+    if (error instanceof QueueFullError) {
+      res.status(429).json({ success: false, error: error.message });
+      return;
+    }
+    console.error('[generate] Failed to queue generation jobs:', error);
+    res.status(500).json({ success: false, error: (error as Error).message });
+  }
+});
+
+/**
+ * GET /generate/jobs
+ *
+ * Returns queue stats and jobs: the ones listed in ?ids=a,b,c (unknown IDs
+ * are left out), or the most recent ones.
+ */
+router.get('/jobs', (req: Request, res: Response) => {
+  const ids = typeof req.query.ids === 'string' ? req.query.ids.split(',').filter(Boolean) : undefined;
+  res.json({
+    success: true,
+    queue: generationQueue.stats(),
+    jobs: generationQueue.list(ids),
+  });
+});
+
+/**
+ * GET /generate/jobs/:jobId
+ *
+ * Returns one generation job.
+ */
+router.get('/jobs/:jobId', (req: Request, res: Response) => {
+  const job = generationQueue.get(req.params.jobId);
+  if (!job) {
+    res.status(404).json({
+      success: false,
+      error: `Generation job not found: ${req.params.jobId}`,
+    });
+    return;
+  }
+  res.json({ success: true, job });
+});
+
 /**
  * POST /generate/destination
  *
@@ -174,6 +276,7 @@ router.get('/status', (_req: Request, res: Response) => {
     model: CONFIG.ANTHROPIC_MODEL,
     antiLeakStrictMode: CONFIG.ANTI_LEAK_STRICT_MODE,
     maxRetries: CONFIG.MAX_RETRIES,
+    queue: generationQueue.stats(),
   });
 });
 
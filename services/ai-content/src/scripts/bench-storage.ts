@@ -0,0 +1,351 @@
+/**
+ * Storage Benchmark
+ *
+ * Measures the content pack index and the cost metrics log at scale, next to
+ * the whole-file formats they replaced (rewrite the index JSON on every save,
+ * one metrics file per round read back on every aggregate). Everything is
+ * written to a scratch directory that is removed afterwards.
+ *
+ * Reported: save latency for the first and last 1% of saves (flat means the
+ * save cost does not grow with the store), destination lookups, cold open,
+ * and metrics aggregates over everything, a date range cut mid-day, and
+ * single-round lookups.
+ *
+ * Usage:
+ *   npm run bench-storage
+ *   npm run bench-storage -- --packs 100000 --metrics 100000 --legacy 2000 --json bench.json
+ */
+
+import fs from 'node:fs';
+import os from 'node:os';
+import path from 'node:path';
+import { performance } from 'node:perf_hooks';
+import { ContentPackStorage } from '../storage/content-pack-storage';
+import { MetricsLog } from '../metrics/metrics-log';
+import { GenerationMetrics } from '../metrics/cost-tracker';
+import { ContentPack } from '../types/content-pack';
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const METRICS_DAYS = 365;
+const LOOKUPS = 1000;
+
+interface BenchArgs {
+  packs: number;
+  metrics: number;
+  legacy: number;
+  dir: string;
+  keep: boolean;
+  json?: string;
+}
+
+type Results = Record<string, Record<string, number | string>>;
+
+function parseArgs(): BenchArgs {
+  const args = process.argv.slice(2);
+  const parsed: BenchArgs = {
+    packs: 100000,
+    metrics: 100000,
+    legacy: 2000,
+    dir: path.join(os.tmpdir(), `pa-sparet-bench-${process.pid}`),
+    keep: false,
+  };
+
+  for (let i = 0; i < args.length; i++) {
+    if (args[i] === '--packs' && args[i + 1]) {
+      parsed.packs = parseInt(args[++i], 10);
+    } else if (args[i] === '--metrics' && args[i + 1]) {
+      parsed.metrics = parseInt(args[++i], 10);
+    } else if (args[i] === '--legacy' && args[i + 1]) {
+      parsed.legacy = parseInt(args[++i], 10);
+    } else if (args[i] === '--dir' && args[i + 1]) {
+      parsed.dir = args[++i];
+    } else if (args[i] === '--keep') {
+      parsed.keep = true;
+    } else if (args[i] === '--json' && args[i + 1]) {
+      parsed.json = args[++i];
+    }
+  }
+
+  return parsed;
+}
+
+function createPack(i: number): ContentPack {
+  const name = `Destination ${i}`;
+  return {
+    roundId: `bench-${i.toString().padStart(7, '0')}`,
+    destination: { name, country: `Land ${i % 200}`, aliases: [name.toLowerCase()] },
+    clues: ([10, 8, 6, 4, 2] as const).map((level) => ({ level, text: `Ledtråd på ${level} poäng för ${name}` })),
+    followups: [
+      { questionText: `Fråga om ${name}?`, options: ['A', 'B', 'C', 'D'], correctAnswer: 'A' },
+      { questionText: `Ännu en fråga om ${name}?`, options: ['A', 'B', 'C', 'D'], correctAnswer: 'C' },
+    ],
+    metadata: {
+      generatedAt: new Date().toISOString(),
+      verified: i % 10 !== 0,
+      antiLeakChecked: true,
+      overlapChecked: true,
+    },
+  };
+}
+
+function createMetrics(i: number, count: number, start: number): GenerationMetrics {
+  const sonnetIn = 2000 + (i % 500);
+  const haikuIn = 800 + (i % 300);
+  const sonnet = { calls: 6, inputTokens: sonnetIn, outputTokens: 900, cost: (sonnetIn * 3 + 900 * 15) / 1_000_000 };
+  const haiku = { calls: 10, inputTokens: haikuIn, outputTokens: 400, cost: (haikuIn * 1 + 400 * 5) / 1_000_000 };
+  const ttsCost = i % 4 === 0 ? 0.03 : 0;
+  return {
+    roundId: `bench-${i}`,
+    timestamp: new Date(start + Math.floor((i * METRICS_DAYS * DAY_MS) / count)).toISOString(),
+    claudeApiCalls: sonnet.calls + haiku.calls,
+    claudeTotalTokens: sonnetIn + 900 + haikuIn + 400,
+    ttsTotalChars: 1000,
+    ttsCacheHits: i % 4 === 0 ? 0 : 1,
+    ttsCacheMisses: i % 4 === 0 ? 1 : 0,
+    estimatedCostUSD: sonnet.cost + haiku.cost + ttsCost,
+    modelBreakdown: { sonnet, haiku },
+    ttsCost,
+  };
+}
+
+function time<T>(fn: () => T): [T, number] {
+  const start = performance.now();
+  const result = fn();
+  return [result, performance.now() - start];
+}
+
+function percentile(values: number[], p: number): number {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.min(sorted.length - 1, Math.floor((p / 100) * sorted.length))] ?? 0;
+}
+
+/**
+ * p50 / p99 of the first and last 1% of per-save latencies
+ */
+function saveStats(latencies: number[]): Record<string, number> {
+  const edge = Math.max(1, Math.floor(latencies.length / 100));
+  const first = latencies.slice(0, edge);
+  const last = latencies.slice(-edge);
+  return {
+    firstP50Ms: round(percentile(first, 50)),
+    firstP99Ms: round(percentile(first, 99)),
+    lastP50Ms: round(percentile(last, 50)),
+    lastP99Ms: round(percentile(last, 99)),
+    totalS: round(latencies.reduce((sum, ms) => sum + ms, 0) / 1000),
+  };
+}
+
+function round(value: number): number {
+  return Math.round(value * 1000) / 1000;
+}
+
+/**
+ * Saving packs through ContentPackStorage (append-only index)
+ */
+function benchPacks(dir: string, count: number): Record<string, number> {
+  const storage = new ContentPackStorage(dir);
+  const latencies: number[] = [];
+  for (let i = 0; i < count; i++) {
+    const pack = createPack(i);
+    latencies.push(time(() => storage.savePack(pack))[1]);
+  }
+
+  const lookups: number[] = [];
+  for (let i = 0; i < LOOKUPS; i++) {
+    const name = `destination ${Math.floor(Math.random() * count)}`;
+    lookups.push(time(() => storage.findExistingDestination(name))[1]);
+  }
+
+  const [reopened, openMs] = time(() => new ContentPackStorage(dir));
+  const [index, indexMs] = time(() => reopened.getIndex());
+  const indexBytes = fs.statSync(path.join(dir, 'content-packs-index.jsonl')).size;
+
+  return {
+    ...saveStats(latencies),
+    lookupP50Ms: round(percentile(lookups, 50)),
+    lookupP99Ms: round(percentile(lookups, 99)),
+    coldOpenMs: round(openMs),
+    getIndexMs: round(indexMs),
+    indexedPacks: index.totalPacks,
+    indexMB: round(indexBytes / 1e6),
+  };
+}
+
+/**
+ * The previous savePack: write the pack, then read, parse and rewrite the
+ * whole index
+ */
+function benchLegacyPacks(dir: string, count: number): Record<string, number> {
+  fs.mkdirSync(dir, { recursive: true });
+  const indexPath = path.join(dir, 'content-packs-index.json');
+  const latencies: number[] = [];
+
+  for (let i = 0; i < count; i++) {
+    const pack = createPack(i);
+    latencies.push(
+      time(() => {
+        const filename = `${pack.roundId}.json`;
+        fs.writeFileSync(path.join(dir, filename), JSON.stringify(pack, null, 2), 'utf-8');
+        const index = fs.existsSync(indexPath)
+          ? JSON.parse(fs.readFileSync(indexPath, 'utf-8'))
+          : { version: '1.0', lastUpdated: '', totalPacks: 0, packs: [] };
+        index.packs.push({
+          roundId: pack.roundId,
+          destination: pack.destination.name,
+          country: pack.destination.country,
+          generatedAt: pack.metadata.generatedAt,
+          verified: pack.metadata.verified,
+          antiLeakChecked: pack.metadata.antiLeakChecked,
+          filePath: filename,
+        });
+        index.lastUpdated = new Date().toISOString();
+        index.totalPacks = index.packs.length;
+        fs.writeFileSync(indexPath, JSON.stringify(index, null, 2), 'utf-8');
+      })[1]
+    );
+  }
+
+  const lookups: number[] = [];
+  for (let i = 0; i < LOOKUPS; i++) {
+    const name = `destination ${Math.floor(Math.random() * count)}`;
+    lookups.push(
+      time(() => {
+        const index = JSON.parse(fs.readFileSync(indexPath, 'utf-8'));
+        return index.packs.find((p: { destination: string }) => p.destination.toLowerCase().trim() === name);
+      })[1]
+    );
+  }
+
+  return {
+    ...saveStats(latencies),
+    lookupP50Ms: round(percentile(lookups, 50)),
+    lookupP99Ms: round(percentile(lookups, 99)),
+  };
+}
+
+/**
+ * Appending rounds to MetricsLog and querying its rollups
+ */
+function benchMetrics(dir: string, count: number, start: number): Record<string, number | string> {
+  const log = new MetricsLog(dir);
+  const latencies: number[] = [];
+  for (let i = 0; i < count; i++) {
+    const metrics = createMetrics(i, count, start);
+    latencies.push(time(() => log.append(metrics))[1]);
+  }
+
+  const [all, allMs] = time(() => log.aggregate());
+  // 30 days, starting and ending mid-day
+  const from = new Date(start + 100 * DAY_MS + 6 * 60 * 60 * 1000);
+  const to = new Date(from.getTime() + 30 * DAY_MS);
+  const [range, rangeMs] = time(() => log.aggregate(from, to));
+  const finds: number[] = [];
+  let found = 0;
+  for (let i = 0; i < LOOKUPS; i++) {
+    const [metrics, ms] = time(() => log.find(`bench-${Math.floor(Math.random() * count)}`));
+    finds.push(ms);
+    if (metrics) found++;
+  }
+
+  const [reopened, openMs] = time(() => new MetricsLog(dir));
+  const [, reopenedAllMs] = time(() => reopened.aggregate());
+  // First lookup after opening loads the round index
+  const [, coldFindMs] = time(() => reopened.find(`bench-${Math.floor(count / 2)}`));
+  fs.rmSync(path.join(dir, 'cost-rollups.json'));
+  const [, rebuildMs] = time(() => new MetricsLog(dir));
+
+  return {
+    ...saveStats(latencies),
+    aggregateAllMs: round(allMs),
+    aggregateRangeMs: round(rangeMs),
+    findRoundP50Ms: round(percentile(finds, 50)),
+    findRoundP99Ms: round(percentile(finds, 99)),
+    roundsFound: `${found}/${LOOKUPS}`,
+    coldOpenMs: round(openMs + reopenedAllMs),
+    coldFindRoundMs: round(coldFindMs),
+    rebuildWithoutCheckpointMs: round(rebuildMs),
+    rounds: all.totals.rounds,
+    rangeRounds: range.totals.rounds,
+    totalCost: round(all.totals.cost),
+    logMB: round(fs.statSync(path.join(dir, 'cost-metrics.jsonl')).size / 1e6),
+  };
+}
+
+/**
+ * The previous format: one file per round, all read back per aggregate
+ */
+function benchLegacyMetrics(dir: string, count: number, start: number): Record<string, number> {
+  fs.mkdirSync(dir, { recursive: true });
+  const latencies: number[] = [];
+  for (let i = 0; i < count; i++) {
+    const metrics = createMetrics(i, count, start);
+    latencies.push(
+      time(() =>
+        fs.writeFileSync(path.join(dir, `metrics-${metrics.roundId}.json`), JSON.stringify(metrics, null, 2))
+      )[1]
+    );
+  }
+
+  const [, allMs] = time(() => {
+    let totalCost = 0;
+    for (const file of fs.readdirSync(dir).filter((f) => f.startsWith('metrics-'))) {
+      totalCost += JSON.parse(fs.readFileSync(path.join(dir, file), 'utf-8')).estimatedCostUSD;
+    }
+    return totalCost;
+  });
+
+  return { ...saveStats(latencies), aggregateAllMs: round(allMs) };
+}
+
+function printSection(title: string, values: Record<string, number | string>): void {
+  console.log(`\n${title}`);
+  console.log('─'.repeat(60));
+  for (const [key, value] of Object.entries(values)) {
+    console.log(`  ${key.padEnd(30)} ${value}`);
+  }
+}
+
+function main() {
+  const args = parseArgs();
+  const start = Date.parse('2025-01-01T00:00:00.000Z');
+
+  console.log('⏱️  Storage Benchmark');
+  console.log('═'.repeat(60));
+  console.log(`  Packs: ${args.packs}  Metrics: ${args.metrics}  Legacy: ${args.legacy}`);
+  console.log(`  Directory: ${args.dir}`);
+
+  // The storage classes log every save
+  const log = console.log;
+  const results: Results = {};
+  try {
+    const run = (label: string, fn: () => Record<string, number | string>) => {
+      log(`  ... ${label}`);
+      console.log = () => undefined;
+      try {
+        results[label] = fn();
+      } finally {
+        console.log = log;
+      }
+    };
+
+    run('packs', () => benchPacks(path.join(args.dir, 'packs'), args.packs));
+    run('legacy packs', () => benchLegacyPacks(path.join(args.dir, 'legacy-packs'), args.legacy));
+    run('metrics', () => benchMetrics(path.join(args.dir, 'metrics'), args.metrics, start));
+    run('legacy metrics', () => benchLegacyMetrics(path.join(args.dir, 'legacy-metrics'), args.legacy, start));
+  } finally {
+    if (!args.keep) fs.rmSync(args.dir, { recursive: true, force: true });
+  }
+
+  printSection(`📦 Content pack index (${args.packs} packs)`, results['packs']);
+  printSection(`📦 Whole-file index, before (${args.legacy} packs)`, results['legacy packs']);
+  printSection(`💰 Metrics log (${args.metrics} rounds)`, results['metrics']);
+  printSection(`💰 File per round, before (${args.legacy} rounds)`, results['legacy metrics']);
+  console.log('\n' + '═'.repeat(60));
+
+  if (args.json) {
+    fs.writeFileSync(args.json, JSON.stringify({ settings: args, results }, null, 2));
+    console.log(`Results written to ${args.json}`);
+  }
+}
+
+main();
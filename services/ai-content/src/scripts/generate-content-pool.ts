@@ -12,6 +12,7 @@ import fs from 'node:fs';
 import path from 'node:path';
 import { generateRound } from '../generators/round-generator';
 import { getContentPackStorage } from '../storage/content-pack-storage';
+import { getVerificationStats, VerificationStats } from '../verification/verification-pipeline';
 
 const CONTENT_PACKS_DIR = process.env.CONTENT_PACKS_DIR || './data/content-packs';
 
@@ -22,6 +23,7 @@ interface GenerationStats {
   duration: number;
   averageTimePerPack: number;
   failedRounds: string[];
+  verification?: VerificationStats;
 }
 
 interface PoolMetadata {
@@ -162,6 +164,7 @@ async function generatePool(count: number, parallelism: number): Promise<Generat
 
   stats.duration = Date.now() - startTime;
   stats.averageTimePerPack = stats.successful > 0 ? stats.duration / stats.successful : 0;
+  stats.verification = getVerificationStats();
 
   metadata.totalPacks = stats.successful;
 
@@ -198,6 +201,16 @@ async function main() {
   console.log(`Success rate: ${((stats.successful / stats.totalRequested) * 100).toFixed(1)}%`);
   console.log('═'.repeat(50));
 
+  const verification = stats.verification!;
+  console.log('\n🔎 Verification:');
+  console.log('═'.repeat(50));
+  console.log(`Claude calls: ${verification.misses} (${verification.retries} retries, ${verification.errors} failed)`);
+  console.log(
+    `Cached verdicts: ${verification.hits + verification.diskHits + verification.coalesced} ` +
+      `(memory ${verification.hits}, disk ${verification.diskHits}, coalesced ${verification.coalesced})`
+  );
+  console.log('═'.repeat(50));
+
   if (stats.failed > 0) {
     console.log('\n⚠️  Failed rounds:');
     stats.failedRounds.forEach((error, i) => {
@@ -10,6 +10,8 @@
 
 import { CostTracker } from '../metrics/cost-tracker';
 
+const DAYS_SHOWN = 14;
+
 function parseArgs(): { from?: Date; to?: Date } {
   const args = process.argv.slice(2);
   let from: Date | undefined;
@@ -57,6 +59,26 @@ function main() {
     return;
   }
 
+  // Cost per model
+  console.log('\n🤖 Cost per Model:');
+  console.log('─'.repeat(60));
+  for (const [model, usage] of Object.entries(metrics.modelBreakdown)) {
+    const tokens = usage.inputTokens + usage.outputTokens;
+    console.log(`  ${model.padEnd(8)} ${String(usage.calls).padStart(7)} calls  ${String(tokens).padStart(11)} tokens  $${usage.cost.toFixed(2)}`);
+  }
+  console.log(`  ${'tts'.padEnd(8)} ${''.padStart(36)}$${metrics.ttsCost.toFixed(2)}`);
+
+  // Cost per day (most recent last)
+  console.log('\n📅 Cost per Day:');
+  console.log('─'.repeat(60));
+  const shownDays = metrics.days.slice(-DAYS_SHOWN);
+  if (metrics.days.length > shownDays.length) {
+    console.log(`  (last ${DAYS_SHOWN} of ${metrics.days.length} days)`);
+  }
+  for (const day of shownDays) {
+    console.log(`  ${day.date}  ${String(day.rounds).padStart(6)} rounds  $${day.cost.toFixed(2)}`);
+  }
+
   // Cost projections
   console.log('\n💰 Cost Projections:');
   console.log('─'.repeat(60));
@@ -0,0 +1,224 @@
+/**
+ * Append Log Tests
+ *
+ * Reads across chunk boundaries, torn last lines and compaction, against
+ * logs in a temporary directory. No API key needed.
+ *
+ * Run with: tsx src/storage/__tests__/append-log.test.ts
+ */
+
+import fs from 'node:fs';
+import os from 'node:os';
+import path from 'node:path';
+import { AppendLog } from '../append-log';
+
+interface Row {
+  id: number;
+  text: string;
+}
+
+const CHUNK = 1 << 20; // READ_CHUNK_BYTES in append-log.ts
+
+let failures = 0;
+
+function check(condition: boolean, message: string): void {
+  console.log(`  ${condition ? '✓' : '✗'} ${message}`);
+  if (!condition) failures++;
+}
+
+function lineOf(row: Row): string {
+  return `${JSON.stringify(row)}\n`;
+}
+
+/**
+ * Runs `fn` with a log in a fresh temporary directory
+ */
+function withLog(fn: (log: AppendLog<Row>, file: string) => void): void {
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'append-log-test-'));
+  try {
+    const file = path.join(dir, 'log.jsonl');
+    fn(new AppendLog<Row>(file), file);
+  } finally {
+    fs.rmSync(dir, { recursive: true, force: true });
+  }
+}
+
+function ids(rows: Array<{ record: Row }>): string {
+  return rows.map((r) => r.record.id).join(',');
+}
+
+function runTests() {
+  console.log('=== Append Log Tests ===\n');
+
+  console.log('Test 1: missing log reads as empty');
+  withLog((log) => {
+    const result = log.read();
+    check(result.records.length === 0 && result.end === 0 && result.skipped === 0, 'no records, end 0');
+    check(log.read(42).end === 42, 'end stays at start');
+  });
+
+  console.log('\nTest 2: records and offsets round-trip, incremental reads');
+  withLog((log, file) => {
+    log.append({ id: 1, text: 'a' }, { id: 2, text: 'Malmö' });
+    const first = log.read();
+    check(ids(first.records) === '1,2', 'both records read');
+    check(first.end === fs.statSync(file).size, 'end is the file size');
+    check(first.records[1].offset === first.records[0].end, 'records are contiguous');
+    check(first.records[1].end - first.records[1].offset === Buffer.byteLength(lineOf({ id: 2, text: 'Malmö' })), 'offsets count bytes, not characters');
+
+    log.append({ id: 3, text: 'c' });
+    const next = log.read(first.end);
+    check(ids(next.records) === '3', 'reading from end returns only the new record');
+    check(next.records[0].offset === first.end, 'new record starts at the previous end');
+  });
+
+  console.log('\nTest 3: read(start, stop) returns complete lines in range');
+  withLog((log) => {
+    log.append({ id: 1, text: 'a' }, { id: 2, text: 'b' }, { id: 3, text: 'c' });
+    const all = log.read().records;
+    check(ids(log.read(0, all[1].end).records) === '1,2', 'stop at a line end includes that line');
+    const partial = log.read(0, all[1].end - 1);
+    check(ids(partial.records) === '1', 'stop inside a line excludes it');
+    check(partial.end === all[0].end, 'end is after the last complete line');
+    check(ids(log.read(all[1].offset, all[2].end).records) === '2,3', 'start and stop together');
+    check(log.read(all[2].end, all[2].end).records.length === 0, 'empty range');
+  });
+
+  console.log('\nTest 4: torn last line is not read, then dropped by the next append');
+  withLog((log, file) => {
+    log.append({ id: 1, text: 'a' });
+    const complete = fs.statSync(file).size;
+    fs.appendFileSync(file, '{"id":2,"te');
+
+    const torn = log.read();
+    check(ids(torn.records) === '1', 'torn line is not returned');
+    check(torn.end === complete, 'end stops before the torn line');
+    check(torn.skipped === 0, 'torn line is not counted as skipped yet');
+
+    // A new writer (a restarted process) ends the torn line first
+    const warn = console.warn;
+    console.warn = () => undefined;
+    try {
+      new AppendLog<Row>(file).append({ id: 3, text: 'c' });
+    } finally {
+      console.warn = warn;
+    }
+    const repaired = log.read();
+    check(ids(repaired.records) === '1,3', 'record after the torn line is intact');
+    check(repaired.skipped === 1, 'torn line is skipped as one unparsable line');
+    const resumed = log.read(torn.end);
+    check(ids(resumed.records) === '3' && resumed.skipped === 1, 'incremental read from before the torn line');
+  });
+
+  console.log('\nTest 5: lines straddling the read chunk boundary');
+  withLog((log, file) => {
+    // Multibyte text so a chunk boundary can fall inside a character
+    const chars = Array.from('åäö€😀'.repeat(700));
+    const rows: Row[] = [];
+    let size = 0;
+    for (let id = 0; size < 2 * CHUNK + 5000; id++) {
+      const row = { id, text: chars.slice(0, 100 + ((id * 7919) % chars.length)).join('') };
+      rows.push(row);
+      size += Buffer.byteLength(lineOf(row));
+    }
+    log.append(...rows);
+
+    const result = log.read();
+    check(result.records.length === rows.length, `all ${rows.length} records read`);
+    check(result.skipped === 0, 'no line broken at a boundary');
+    check(result.records.every((r, i) => r.record.text === rows[i].text), 'multibyte text survives the boundaries');
+    check(result.end === fs.statSync(file).size, 'end is the file size');
+
+    const straddling = result.records.filter((r) => Math.floor(r.offset / CHUNK) !== Math.floor((r.end - 1) / CHUNK));
+    check(straddling.length >= 2, `${straddling.length} lines straddle a chunk boundary`);
+    const bytes = fs.readFileSync(file);
+    check(
+      result.records.every((r) => bytes.toString('utf-8', r.offset, r.end) === lineOf(r.record)),
+      'every offset range holds its line'
+    );
+
+    if (straddling.length === 0) return;
+    const { offset, end, record } = straddling[0];
+    check(log.read(offset).records.length === rows.length - record.id, 'read starting at a straddling line');
+    check(ids(log.read(offset, end).records) === String(record.id), 'range ending after a straddling line');
+  });
+
+  console.log('\nTest 6: line longer than a read chunk');
+  withLog((log) => {
+    const long = { id: 2, text: 'ö'.repeat(CHUNK) };
+    log.append({ id: 1, text: 'a' }, long, { id: 3, text: 'c' });
+    const result = log.read();
+    check(ids(result.records) === '1,2,3' && result.skipped === 0, 'all three records read');
+    check(result.records[1].record.text === long.text, 'long record intact');
+    check(ids(log.read(result.records[0].end, result.records[1].end - 1).records) === '', 'incomplete long line excluded');
+  });
+
+  console.log('\nTest 7: compaction keeps lines appended after the covered offset');
+  withLog((log, file) => {
+    log.append({ id: 1, text: 'old' }, { id: 1, text: 'new' }, { id: 2, text: 'b' });
+    const covered = log.read().end;
+    const ino = log.stat()!.ino;
+    // Another process appends after this one read the log
+    const other = new AppendLog<Row>(file);
+    other.append({ id: 3, text: 'c' }, { id: 4, text: 'd' });
+
+    const compacted = log.compact([{ id: 1, text: 'new' }, { id: 2, text: 'b' }], covered, ino);
+    check(compacted, 'compact succeeds');
+    const result = log.read();
+    check(ids(result.records) === '1,2,3,4', 'compacted records then the later appends');
+    check(result.records[0].record.text === 'new' && result.skipped === 0, 'replaced line is gone');
+    check(log.stat()!.ino !== ino, 'log was replaced (new inode)');
+    check(!fs.existsSync(`${file}.lock`), 'lock released');
+    check(fs.readdirSync(path.dirname(file)).length === 1, 'no temp files left');
+
+    other.append({ id: 5, text: 'e' });
+    check(ids(log.read().records) === '1,2,3,4,5', 'writers append to the new log');
+  });
+
+  console.log('\nTest 8: compaction refuses a held lock or a replaced log');
+  withLog((log, file) => {
+    log.append({ id: 1, text: 'a' }, { id: 1, text: 'b' });
+    const covered = log.read().end;
+    const ino = log.stat()!.ino;
+    const before = fs.readFileSync(file, 'utf-8');
+
+    fs.writeFileSync(`${file}.lock`, '');
+    check(!log.compact([{ id: 1, text: 'b' }], covered, ino), 'held lock: compact returns false');
+    check(fs.readFileSync(file, 'utf-8') === before, 'log untouched');
+    check(fs.existsSync(`${file}.lock`), 'other process keeps its lock');
+    fs.rmSync(`${file}.lock`);
+
+    check(!log.compact([{ id: 1, text: 'b' }], covered, ino + 1), 'wrong inode: compact returns false');
+    check(fs.readFileSync(file, 'utf-8') === before, 'log untouched');
+    check(!fs.existsSync(`${file}.lock`), 'lock released after refusing');
+  });
+
+  console.log('\nTest 9: compaction takes over a stale lock');
+  withLog((log, file) => {
+    log.append({ id: 1, text: 'a' }, { id: 1, text: 'b' });
+    const covered = log.read().end;
+    fs.writeFileSync(`${file}.lock`, '');
+    const old = new Date(Date.now() - 10 * 60_000);
+    fs.utimesSync(`${file}.lock`, old, old);
+
+    const warn = console.warn;
+    console.warn = () => undefined;
+    let compacted: boolean;
+    try {
+      compacted = log.compact([{ id: 1, text: 'b' }], covered, log.stat()!.ino);
+    } finally {
+      console.warn = warn;
+    }
+    check(compacted, 'compact succeeds');
+    check(ids(log.read().records) === '1' && log.read().records[0].record.text === 'b', 'log compacted');
+    check(!fs.existsSync(`${file}.lock`), 'lock released');
+  });
+
+  console.log(`\n=== Tests Complete: ${failures === 0 ? 'all passed' : `${failures} failed`} ===`);
+  if (failures > 0) process.exit(1);
+}
+
+// Run tests if executed directly
+if (require.main === module) {
+  runTests();
+}
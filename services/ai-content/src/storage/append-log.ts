@@ -0,0 +1,236 @@
+/**
+ * Append Log
+ *
+ * A JSON-lines file that is only ever appended to: one record per line,
+ * written with a single append so a save costs the same however long the
+ * log is. Readers keep the byte offset they have read up to and only read
+ * what was appended since, which also picks up records written by other
+ * processes (the server and the generation scripts share a directory).
+ *
+ * A process that dies mid-write leaves at most one line without its
+ * newline. Readers stop before such a line, and the next writer ends it
+ * first, so the torn record is dropped as one unparsable line instead of
+ * corrupting the record after it.
+ *
+ * Compaction rewrites the log under an exclusive `<log>.lock` file, and
+ * carries over lines other processes append while it runs.
+ */
+
+import fs from 'node:fs';
+import path from 'node:path';
+
+const READ_CHUNK_BYTES = 1 << 20;
+// A compaction lock older than this was left by a crashed process
+const STALE_LOCK_MS = 60_000;
+
+export interface LogRecord<T> {
+  offset: number; // byte offset of the line
+  end: number; // byte offset after its newline
+  record: T;
+}
+
+export interface LogReadResult<T> {
+  records: Array<LogRecord<T>>;
+  end: number; // offset after the last complete line
+  skipped: number; // lines that did not parse
+}
+
+export class AppendLog<T> {
+  private repaired = false;
+
+  constructor(private readonly filePath: string) {}
+
+  getPath(): string {
+    return this.filePath;
+  }
+
+  exists(): boolean {
+    return fs.existsSync(this.filePath);
+  }
+
+  /**
+   * Size and inode; a different inode means the log was replaced (compacted)
+   */
+  stat(): { size: number; ino: number; mtimeMs: number } | null {
+    try {
+      const stat = fs.statSync(this.filePath);
+      return { size: stat.size, ino: stat.ino, mtimeMs: stat.mtimeMs };
+    } catch {
+      return null;
+    }
+  }
+
+  /**
+   * Appends records, one line each, in one write
+   */
+  append(...records: T[]): void {
+    if (records.length === 0) return;
+    if (!this.repaired) this.repairTail();
+    fs.appendFileSync(this.filePath, records.map((r) => `${JSON.stringify(r)}\n`).join(''), 'utf-8');
+  }
+
+  /**
+   * Complete lines between two offsets (default: from `start` to the end)
+   */
+  read(start = 0, stop = Infinity): LogReadResult<T> {
+    const records: Array<LogRecord<T>> = [];
+    let skipped = 0;
+    let end = start;
+
+    let fd: number;
+    try {
+      fd = fs.openSync(this.filePath, 'r');
+    } catch (error) {
+      if ((error as NodeJS.ErrnoException).code === 'ENOENT') return { records, end, skipped };
+      throw error;
+    }
+
+    try {
+      const buffer = Buffer.alloc(READ_CHUNK_BYTES);
+      let pending = Buffer.alloc(0);
+      let position = start;
+      while (position < stop) {
+        const bytesRead = fs.readSync(fd, buffer, 0, Math.min(buffer.length, stop - position), position);
+        if (bytesRead === 0) break;
+        position += bytesRead;
+        const chunk = pending.length > 0 ? Buffer.concat([pending, buffer.subarray(0, bytesRead)]) : buffer.subarray(0, bytesRead);
+
+        let lineStart = 0;
+        let newline = chunk.indexOf(0x0a, lineStart);
+        while (newline !== -1) {
+          const line = chunk.toString('utf-8', lineStart, newline);
+          const lineEnd = end + (newline - lineStart) + 1;
+          if (line.length > 0) {
+            try {
+              records.push({ offset: end, end: lineEnd, record: JSON.parse(line) });
+            } catch {
+              skipped++;
+            }
+          }
+          end = lineEnd;
+          lineStart = newline + 1;
+          newline = chunk.indexOf(0x0a, lineStart);
+        }
+        // Copy: the read buffer is reused for the next chunk
+        pending = Buffer.from(chunk.subarray(lineStart));
+      }
+    } finally {
+      fs.closeSync(fd);
+    }
+
+    return { records, end, skipped };
+  }
+
+  /**
+   * Atomically replaces the whole log (migration)
+   */
+  replace(records: T[]): void {
+    fs.mkdirSync(path.dirname(this.filePath), { recursive: true });
+    const tmp = `${this.filePath}.${process.pid}.tmp`;
+    fs.writeFileSync(tmp, records.map((r) => `${JSON.stringify(r)}\n`).join(''), 'utf-8');
+    fs.renameSync(tmp, this.filePath);
+    this.repaired = true;
+  }
+
+  /**
+   * Rewrites the log as `records`, which must stand for its lines up to
+   * `coveredTo` in the file with inode `ino`. Lines appended after that,
+   * including by other processes while this runs, are kept after them.
+   * Returns false without writing when another process is compacting or
+   * the log was replaced since it was read.
+   */
+  compact(records: T[], coveredTo: number, ino: number): boolean {
+    const lockPath = `${this.filePath}.lock`;
+    if (!acquireLock(lockPath)) return false;
+
+    let fd: number | undefined;
+    try {
+      fd = fs.openSync(this.filePath, 'r');
+      if (fs.fstatSync(fd).ino !== ino) return false;
+
+      const tmp = `${this.filePath}.${process.pid}.tmp`;
+      fs.writeFileSync(tmp, records.map((r) => `${JSON.stringify(r)}\n`).join(''), 'utf-8');
+      // Appends that land before the rename...
+      const copied = copyLines(fd, coveredTo, tmp);
+      fs.renameSync(tmp, this.filePath);
+      // ...and those from writers that opened the old file just before it
+      copyLines(fd, copied, this.filePath);
+      this.repaired = true;
+      return true;
+    } finally {
+      if (fd !== undefined) fs.closeSync(fd);
+      fs.rmSync(lockPath, { force: true });
+    }
+  }
+
+  /**
+   * Ends a torn last line (left by a crashed writer) before appending after it
+   */
+  private repairTail(): void {
+    fs.mkdirSync(path.dirname(this.filePath), { recursive: true });
+    const stat = this.stat();
+    if (stat && stat.size > 0) {
+      const fd = fs.openSync(this.filePath, 'r');
+      const last = Buffer.alloc(1);
+      try {
+        fs.readSync(fd, last, 0, 1, stat.size - 1);
+      } finally {
+        fs.closeSync(fd);
+      }
+      if (last[0] !== 0x0a) {
+        console.warn(`[append-log] ${this.filePath} ends in a torn record, skipping it`);
+        fs.appendFileSync(this.filePath, '\n', 'utf-8');
+      }
+    }
+    this.repaired = true;
+  }
+}
+
+/**
+ * Creates the lock file exclusively; false if another process holds it
+ */
+function acquireLock(lockPath: string): boolean {
+  fs.mkdirSync(path.dirname(lockPath), { recursive: true });
+  for (let attempt = 0; attempt < 2; attempt++) {
+    try {
+      fs.closeSync(fs.openSync(lockPath, 'wx'));
+      return true;
+    } catch (error) {
+      if ((error as NodeJS.ErrnoException).code !== 'EEXIST') throw error;
+      try {
+        if (Date.now() - fs.statSync(lockPath).mtimeMs < STALE_LOCK_MS) return false;
+        console.warn(`[append-log] Removing stale lock ${lockPath}`);
+        fs.rmSync(lockPath, { force: true });
+      } catch {
+        // Released meanwhile: try again
+      }
+    }
+  }
+  return false;
+}
+
+/**
+ * Appends the complete lines of `fd` from `start` to the file at `target`;
+ * returns the offset after the last line copied
+ */
+function copyLines(fd: number, start: number, target: string): number {
+  const buffer = Buffer.alloc(READ_CHUNK_BYTES);
+  let position = start;
+  let copied = start;
+  let pending = Buffer.alloc(0);
+  for (;;) {
+    const bytesRead = fs.readSync(fd, buffer, 0, buffer.length, position);
+    if (bytesRead === 0) break;
+    position += bytesRead;
+    const chunk = Buffer.concat([pending, buffer.subarray(0, bytesRead)]);
+    const lastNewline = chunk.lastIndexOf(0x0a);
+    if (lastNewline === -1) {
+      pending = chunk;
+      continue;
+    }
+    fs.appendFileSync(target, chunk.subarray(0, lastNewline + 1));
+    copied += lastNewline + 1;
+    pending = Buffer.from(chunk.subarray(lastNewline + 1));
+  }
+  return copied;
+}
@@ -2,11 +2,26 @@
  * Content Pack Storage
  *
  * Manages persistent storage of generated content packs with indexing and deduplication.
+ *
+ * Each pack is its own `<roundId>.json` file (the backend's content pack
+ * loader reads them from the same directory). The index is an append-only
+ * log, `content-packs-index.jsonl`, with one entry line per save, so saving
+ * costs the same however many packs exist. The log is read once into
+ * memory and lookups are map hits; entries appended by other processes are
+ * picked up by reading only the bytes added since the last read.
  */
 
 import fs from 'node:fs';
 import path from 'node:path';
 import { ContentPack } from '../types/content-pack';
+import { AppendLog } from './append-log';
+
+const INDEX_LOG_FILE = 'content-packs-index.jsonl';
+// Whole-file index written before the append-only log; imported once
+const LEGACY_INDEX_FILE = 'content-packs-index.json';
+// Rewrite the log at startup when it holds this many times more lines than packs
+const COMPACT_RATIO = 2;
+const COMPACT_MIN_LINES = 1000;
 
 export interface ContentPackIndexEntry {
   roundId: string;
@@ -27,16 +42,28 @@ export interface ContentPackIndex {
 
 export class ContentPackStorage {
   private storageDir: string;
-  private indexPath: string;
+  private indexLog: AppendLog<ContentPackIndexEntry>;
+
+  // roundId → entry, in the order packs were first saved
+  private entries = new Map<string, ContentPackIndexEntry>();
+  // normalized destination → roundId of the first pack with it
+  private destinations = new Map<string, string>();
+  private logOffset = 0;
+  private logIno = -1;
+  private logLines = 0;
+  private lastUpdated = new Date().toISOString();
 
   constructor(storageDir?: string) {
     // Default to ./data/content-packs (relative to service root)
     // This ensures persistence across restarts (unlike /tmp)
     this.storageDir = storageDir || process.env.CONTENT_PACKS_DIR || './data/content-packs';
-    this.indexPath = path.join(this.storageDir, 'content-packs-index.json');
+    this.indexLog = new AppendLog(path.join(this.storageDir, INDEX_LOG_FILE));
 
     // Ensure storage directory exists
     this.ensureStorageDirectory();
+    this.migrateLegacyIndex();
+    this.reloadIndex();
+    this.compactIndex();
   }
 
   /**
@@ -50,44 +77,105 @@ export class ContentPackStorage {
   }
 
   /**
-   * Load the index from disk
+   * Import the whole-file index into the log, once
    */
-  private loadIndex(): ContentPackIndex {
-    if (!fs.existsSync(this.indexPath)) {
-      return {
-        version: '1.0',
-        lastUpdated: new Date().toISOString(),
-        totalPacks: 0,
-        packs: [],
-      };
-    }
+  private migrateLegacyIndex(): void {
+    const legacyPath = path.join(this.storageDir, LEGACY_INDEX_FILE);
+    if (this.indexLog.exists() || !fs.existsSync(legacyPath)) return;
 
     try {
-      const content = fs.readFileSync(this.indexPath, 'utf-8');
-      return JSON.parse(content);
+      const legacy: ContentPackIndex = JSON.parse(fs.readFileSync(legacyPath, 'utf-8'));
+      this.indexLog.replace(legacy.packs ?? []);
+      // Renamed, not deleted: it would otherwise be read as a pack by the backend
+      fs.renameSync(legacyPath, `${legacyPath}.migrated`);
+      console.log(`[content-pack-storage] Migrated ${legacy.packs?.length ?? 0} index entries to ${INDEX_LOG_FILE}`);
     } catch (error) {
-      console.error('[content-pack-storage] Failed to load index, creating new:', error);
-      return {
-        version: '1.0',
-        lastUpdated: new Date().toISOString(),
-        totalPacks: 0,
-        packs: [],
-      };
+      console.error('[content-pack-storage] Failed to migrate legacy index, starting a new one:', error);
+    }
+  }
+
+  /**
+   * Read the whole log into memory
+   */
+  private reloadIndex(): void {
+    this.entries.clear();
+    this.destinations.clear();
+    this.logOffset = 0;
+    this.logLines = 0;
+    this.logIno = this.indexLog.stat()?.ino ?? -1;
+    this.readIndexTail();
+  }
+
+  /**
+   * Apply entries appended since the last read (by this or another process)
+   */
+  private refreshIndex(): void {
+    const stat = this.indexLog.stat();
+    if (!stat) {
+      if (this.logIno !== -1) this.reloadIndex();
+      return;
+    }
+    // Replaced or truncated by another process: start over
+    if (stat.ino !== this.logIno || stat.size < this.logOffset) {
+      this.reloadIndex();
+      return;
+    }
+    if (stat.size > this.logOffset) this.readIndexTail();
+  }
+
+  private readIndexTail(): void {
+    const { records, end, skipped } = this.indexLog.read(this.logOffset);
+    if (skipped > 0) {
+      console.warn(`[content-pack-storage] Skipped ${skipped} unreadable index lines`);
+    }
+    for (const { record } of records) this.applyEntry(record);
+    this.logOffset = end;
+    this.logLines += records.length + skipped;
+    const stat = this.indexLog.stat();
+    if (stat) this.lastUpdated = new Date(stat.mtimeMs).toISOString();
+  }
+
+  private applyEntry(entry: ContentPackIndexEntry): void {
+    const previous = this.entries.get(entry.roundId);
+    // Map.set keeps an updated pack in its original position
+    this.entries.set(entry.roundId, entry);
+
+    const normalized = normalizeDestination(entry.destination);
+    if (previous) {
+      const previousNormalized = normalizeDestination(previous.destination);
+      if (previousNormalized !== normalized && this.destinations.get(previousNormalized) === entry.roundId) {
+        this.destinations.delete(previousNormalized);
+        // Another pack may still have the old destination
+        for (const other of this.entries.values()) {
+          if (normalizeDestination(other.destination) === previousNormalized) {
+            this.destinations.set(previousNormalized, other.roundId);
+            break;
+          }
+        }
+      }
+    }
+    if (!this.destinations.has(normalized)) {
+      this.destinations.set(normalized, entry.roundId);
     }
   }
 
   /**
-   * Save the index to disk
+   * Rewrite the log without superseded entries when they dominate it
    */
-  private saveIndex(index: ContentPackIndex): void {
-    index.lastUpdated = new Date().toISOString();
-    index.totalPacks = index.packs.length;
+  private compactIndex(): void {
+    if (this.logLines < COMPACT_MIN_LINES || this.logLines < this.entries.size * COMPACT_RATIO) return;
 
     try {
-      fs.writeFileSync(this.indexPath, JSON.stringify(index, null, 2), 'utf-8');
+      const lines = this.logLines;
+      // Only the entries read so far are rewritten; later lines are carried over
+      if (!this.indexLog.compact(Array.from(this.entries.values()), this.logOffset, this.logIno)) {
+        console.log('[content-pack-storage] Index log is being compacted by another process, skipping');
+        return;
+      }
+      this.reloadIndex();
+      console.log(`[content-pack-storage] Compacted index log: ${lines} → ${this.logLines} lines`);
     } catch (error) {
-      console.error('[content-pack-storage] Failed to save index:', error);
-      throw error;
+      console.error('[content-pack-storage] Failed to compact index log:', error);
     }
   }
 
@@ -98,20 +186,17 @@ export class ContentPackStorage {
     const filename = `${pack.roundId}.json`;
     const filepath = path.join(this.storageDir, filename);
 
-    // Save content pack file
+    // Save content pack file; written aside and renamed so readers (the
+    // backend watches this directory) never see a partial pack
     try {
-      fs.writeFileSync(filepath, JSON.stringify(pack, null, 2), 'utf-8');
+      const tmp = `${filepath}.${process.pid}.tmp`;
+      fs.writeFileSync(tmp, JSON.stringify(pack, null, 2), 'utf-8');
+      fs.renameSync(tmp, filepath);
     } catch (error) {
       console.error(`[content-pack-storage] Failed to save pack ${pack.roundId}:`, error);
       throw error;
     }
 
-    // Update index
-    const index = this.loadIndex();
-
-    // Check if pack already exists in index (avoid duplicates)
-    const existingIndex = index.packs.findIndex(p => p.roundId === pack.roundId);
-
     const entry: ContentPackIndexEntry = {
       roundId: pack.roundId,
       destination: pack.destination.name,
@@ -122,15 +207,18 @@ export class ContentPackStorage {
       filePath: filename,
     };
 
-    if (existingIndex >= 0) {
-      // Update existing entry
-      index.packs[existingIndex] = entry;
-    } else {
-      // Add new entry
-      index.packs.push(entry);
+    // Appending the entry replaces any earlier one for the same round
+    try {
+      this.indexLog.append(entry);
+    } catch (error) {
+      console.error('[content-pack-storage] Failed to save index:', error);
+      throw error;
     }
-
-    this.saveIndex(index);
+    // The offset is left alone: the next refresh reads this line back, and
+    // applying it twice is harmless, so appends from other processes in
+    // between are not skipped
+    this.applyEntry(entry);
+    this.lastUpdated = new Date().toISOString();
 
     console.log(`[content-pack-storage] Saved pack: ${pack.destination.name} (${pack.roundId})`);
   }
@@ -139,8 +227,11 @@ export class ContentPackStorage {
    * Load a content pack by ID
    */
   loadPack(roundId: string): ContentPack | null {
-    const index = this.loadIndex();
-    const entry = index.packs.find(p => p.roundId === roundId);
+    let entry = this.entries.get(roundId);
+    if (!entry) {
+      this.refreshIndex();
+      entry = this.entries.get(roundId);
+    }
 
     if (!entry) {
       return null;
@@ -167,29 +258,38 @@ export class ContentPackStorage {
    * Returns the existing pack ID if found, null otherwise
    */
   findExistingDestination(destinationName: string): string | null {
-    const index = this.loadIndex();
-    const normalized = destinationName.toLowerCase().trim();
-
-    const existing = index.packs.find(
-      p => p.destination.toLowerCase().trim() === normalized
-    );
-
-    return existing ? existing.roundId : null;
+    // Packs saved by another process (e.g. the pool script) count too
+    this.refreshIndex();
+    return this.destinations.get(normalizeDestination(destinationName)) ?? null;
   }
 
   /**
    * Get all packs from index (without loading full content)
    */
   getIndex(): ContentPackIndex {
-    return this.loadIndex();
+    this.refreshIndex();
+    return {
+      version: '1.0',
+      lastUpdated: this.lastUpdated,
+      totalPacks: this.entries.size,
+      packs: Array.from(this.entries.values()),
+    };
   }
 
   /**
    * Get list of all pack IDs
    */
   getAllPackIds(): string[] {
-    const index = this.loadIndex();
-    return index.packs.map(p => p.roundId);
+    this.refreshIndex();
+    return Array.from(this.entries.keys());
+  }
+
+  /**
+   * Number of packs in the index
+   */
+  getPackCount(): number {
+    this.refreshIndex();
+    return this.entries.size;
   }
 
   /**
@@ -200,6 +300,10 @@ export class ContentPackStorage {
   }
 }
 
+function normalizeDestination(name: string): string {
+  return name.toLowerCase().trim();
+}
+
 // Singleton instance
 let storageInstance: ContentPackStorage | null = null;
 
@@ -55,6 +55,15 @@ export interface ContentPack {
   };
 }
 
+/**
+ * What to generate (POST /generate/jobs and /generate/batch)
+ */
+export interface GenerationOptions {
+  regions?: string[];          // destination must be in one of these, e.g. ["Europe", "Nordic"]
+  theme?: string;              // free-text theme for the destination, e.g. "vinterstäder"
+  language?: string;           // only 'sv' is supported; all prompts are Swedish
+}
+
 /**
  * Progress tracking for generation process
  */
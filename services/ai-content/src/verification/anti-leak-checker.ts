@@ -5,8 +5,8 @@
  * Uses Claude to simulate a player trying to guess the destination.
  */
 
-import { callClaude, parseClaudeJSON } from '../claude-client';
 import { Clue, FollowupQuestion, Destination } from '../types/content-pack';
+import { verifyWithClaude } from './verification-pipeline';
 
 interface LeakCheckResponse {
   canGuess: boolean;
@@ -84,12 +84,11 @@ Svara med JSON enligt systemprompten.`;
 
   try {
     // Use Haiku for simple leak detection (cost optimization)
-    const response = await callClaude(prompt, {
+    const result = await verifyWithClaude<LeakCheckResponse>(prompt, {
       model: 'haiku',
       maxTokens: 1024,
       systemPrompt: SYSTEM_PROMPT,
     });
-    const result = parseClaudeJSON<LeakCheckResponse>(response);
 
     // Check if the guess is correct
     let leaks = false;
@@ -140,27 +139,27 @@ export async function checkCluesForLeaks(
 ): Promise<{ passed: boolean; results: Array<{ level: number; leaks: boolean; reason: string }> }> {
   console.log(`[anti-leak] Checking clues for leaks...`);
 
-  const results: Array<{ level: number; leaks: boolean; reason: string }> = [];
-  const previousClues: Clue[] = [];
-
-  for (const clue of clues) {
-    // Only check early clues (10, 8, 6) for leaks
-    // Levels 4 and 2 are expected to be easier
-    if (clue.level === 10 || clue.level === 8 || clue.level === 6) {
-      const result = await checkClueForLeak(clue, destination, previousClues);
-      results.push({
-        level: clue.level,
-        leaks: result.leaks,
-        reason: result.reason,
-      });
-
-      if (result.leaks) {
-        console.log(`[anti-leak] LEAK DETECTED at level ${clue.level}!`);
-      }
-    }
+  // Each check only needs the clues before it, not their verdicts, so all
+  // levels are checked at once. Only early clues (10, 8, 6) are checked;
+  // levels 4 and 2 are expected to be easier.
+  const checked = clues
+    .map((clue, index) => ({ clue, previousClues: clues.slice(0, index) }))
+    .filter(({ clue }) => clue.level === 10 || clue.level === 8 || clue.level === 6);
 
-    previousClues.push(clue);
-  }
+  const checks = await Promise.all(
+    checked.map(({ clue, previousClues }) => checkClueForLeak(clue, destination, previousClues))
+  );
+
+  const results = checked.map(({ clue }, i) => {
+    if (checks[i].leaks) {
+      console.log(`[anti-leak] LEAK DETECTED at level ${clue.level}!`);
+    }
+    return {
+      level: clue.level,
+      leaks: checks[i].leaks,
+      reason: checks[i].reason,
+    };
+  });
 
   const passed = results.every((r) => !r.leaks);
   console.log(`[anti-leak] Overall: ${passed ? 'PASSED' : 'FAILED'}`);
@@ -186,12 +185,11 @@ Svara med JSON enligt systemprompten.`;
 
   try {
     // Use Haiku for simple leak detection (cost optimization)
-    const response = await callClaude(prompt, {
+    const result = await verifyWithClaude<LeakCheckResponse>(prompt, {
       model: 'haiku',
       maxTokens: 1024,
       systemPrompt: SYSTEM_PROMPT,
     });
-    const result = parseClaudeJSON<LeakCheckResponse>(response);
 
     let leaks = false;
     let reason = result.reasoning;
@@ -229,20 +227,20 @@ export async function checkFollowupsForLeaks(
 ): Promise<{ passed: boolean; results: Array<{ questionText: string; leaks: boolean; reason: string }> }> {
   console.log(`[anti-leak] Checking followup questions for leaks...`);
 
-  const results: Array<{ questionText: string; leaks: boolean; reason: string }> = [];
+  const checks = await Promise.all(
+    followups.map((followup) => checkFollowupForLeak(followup, destination))
+  );
 
-  for (const followup of followups) {
-    const result = await checkFollowupForLeak(followup, destination);
-    results.push({
-      questionText: followup.questionText,
-      leaks: result.leaks,
-      reason: result.reason,
-    });
-
-    if (result.leaks) {
+  const results = followups.map((followup, i) => {
+    if (checks[i].leaks) {
       console.log(`[anti-leak] LEAK DETECTED in followup!`);
     }
-  }
+    return {
+      questionText: followup.questionText,
+      leaks: checks[i].leaks,
+      reason: checks[i].reason,
+    };
+  });
 
   const passed = results.every((r) => !r.leaks);
   console.log(`[anti-leak] Overall: ${passed ? 'PASSED' : 'FAILED'}`);
@@ -5,8 +5,8 @@
  * Uses Claude with extended context to verify claims.
  */
 
-import { callClaude, parseClaudeJSON } from '../claude-client';
 import { Clue, FollowupQuestion, Destination, VerificationResult } from '../types/content-pack';
+import { verifyWithClaude } from './verification-pipeline';
 
 interface FactCheckResponse {
   verified: boolean;
@@ -56,12 +56,11 @@ Svara med JSON enligt systemprompten.`;
 
   try {
     // Use Haiku for simple fact verification (cost optimization)
-    const response = await callClaude(prompt, {
+    const result = await verifyWithClaude<FactCheckResponse>(prompt, {
       model: 'haiku',
       maxTokens: 1024,
       systemPrompt: SYSTEM_PROMPT,
     });
-    const result = parseClaudeJSON<FactCheckResponse>(response);
 
     console.log(`[fact-checker] Clue [${clue.level}]: ${result.status} - ${result.reason}`);
 
@@ -103,12 +102,11 @@ Svara med JSON enligt systemprompten.`;
 
   try {
     // Use Haiku for simple fact verification (cost optimization)
-    const response = await callClaude(prompt, {
+    const result = await verifyWithClaude<FactCheckResponse>(prompt, {
       model: 'haiku',
       maxTokens: 1024,
       systemPrompt: SYSTEM_PROMPT,
     });
-    const result = parseClaudeJSON<FactCheckResponse>(response);
 
     console.log(`[fact-checker] Followup "${followup.questionText}": ${result.status} - ${result.reason}`);
 
@@ -137,13 +135,8 @@ export async function verifyAllClues(
 ): Promise<VerificationResult[]> {
   console.log(`[fact-checker] Verifying ${clues.length} clues...`);
 
-  const results: VerificationResult[] = [];
-  for (const clue of clues) {
-    const result = await verifyClue(clue, destination);
-    results.push(result);
-  }
-
-  return results;
+  // Independent checks: run together, results stay in clue order
+  return Promise.all(clues.map((clue) => verifyClue(clue, destination)));
 }
 
 /**
@@ -155,13 +148,8 @@ export async function verifyAllFollowups(
 ): Promise<VerificationResult[]> {
   console.log(`[fact-checker] Verifying ${followups.length} followup questions...`);
 
-  const results: VerificationResult[] = [];
-  for (const followup of followups) {
-    const result = await verifyFollowup(followup, destination);
-    results.push(result);
-  }
-
-  return results;
+  // Independent checks: run together, results stay in followup order
+  return Promise.all(followups.map((followup) => verifyFollowup(followup, destination)));
 }
 
 /**
@@ -184,12 +172,11 @@ Svara med JSON enligt systemprompten.`;
 
   try {
     // Use Haiku for simple fact verification (cost optimization)
-    const response = await callClaude(prompt, {
+    const result = await verifyWithClaude<FactCheckResponse>(prompt, {
       model: 'haiku',
       maxTokens: 1024,
       systemPrompt: SYSTEM_PROMPT,
     });
-    const result = parseClaudeJSON<FactCheckResponse>(response);
 
     console.log(`[fact-checker] Destination ${destination.name}: ${result.status} - ${result.reason}`);
 
@@ -5,8 +5,8 @@
  * Prevents questions like "What is the river called?" when "Seine" was mentioned in clues.
  */
 
-import { callClaude, parseClaudeJSON } from '../claude-client';
 import { Clue, FollowupQuestion, Destination } from '../types/content-pack';
+import { verifyWithClaude } from './verification-pipeline';
 
 interface OverlapCheckResponse {
   hasOverlap: boolean;
@@ -76,12 +76,11 @@ Svara med JSON enligt systemprompten.`;
 
   try {
     // Use Haiku for cost optimization (overlap detection is a simple task)
-    const response = await callClaude(prompt, {
+    const result = await verifyWithClaude<OverlapCheckResponse>(prompt, {
       model: 'haiku',
       maxTokens: 1024,
       systemPrompt: SYSTEM_PROMPT,
     });
-    const result = parseClaudeJSON<OverlapCheckResponse>(response);
 
     console.log(
       `[overlap-check] Followup "${followup.questionText}": ${result.hasOverlap ? 'OVERLAP!' : 'OK'} - ${result.reason}`
@@ -121,28 +120,24 @@ export async function checkFollowupOverlaps(
 }> {
   console.log(`[overlap-check] Checking followup questions for overlaps with clues...`);
 
-  const results: Array<{
-    questionText: string;
-    hasOverlap: boolean;
-    reason: string;
-    overlappingConcepts: string[];
-  }> = [];
-
-  for (const followup of followups) {
-    const result = await checkFollowupOverlap(followup, clues, destination);
-    results.push({
-      questionText: followup.questionText,
-      hasOverlap: result.hasOverlap,
-      reason: result.reason,
-      overlappingConcepts: result.overlappingConcepts,
-    });
+  const checks = await Promise.all(
+    followups.map((followup) => checkFollowupOverlap(followup, clues, destination))
+  );
 
+  const results = followups.map((followup, i) => {
+    const result = checks[i];
     if (result.hasOverlap) {
       console.log(
         `[overlap-check] OVERLAP DETECTED in followup! Concepts: ${result.overlappingConcepts.join(', ')}`
       );
     }
-  }
+    return {
+      questionText: followup.questionText,
+      hasOverlap: result.hasOverlap,
+      reason: result.reason,
+      overlappingConcepts: result.overlappingConcepts,
+    };
+  });
 
   const passed = results.every((r) => !r.hasOverlap);
   console.log(`[overlap-check] Overall: ${passed ? 'PASSED' : 'FAILED'}`);
@@ -0,0 +1,232 @@
+/**
+ * Verification Pipeline
+ *
+ * Runs the Claude calls behind the fact, anti-leak and overlap checks so a
+ * checker can start all of its checks at once:
+ * - at most CONFIG.VERIFY_CONCURRENCY calls in flight, shared by every pack
+ *   being generated in this process
+ * - retries with exponential backoff and jitter; a call waiting to retry
+ *   does not hold a slot
+ * - verdicts are memoized by a hash of model, system prompt and prompt (the
+ *   prompt embeds every input), in memory and as one JSON file per verdict
+ *   in CONFIG.VERIFY_CACHE_DIR, so re-verifying or regenerating a pack with
+ *   the same content does not call Claude again
+ *
+ * Only verdicts that parse are cached. Failures are thrown to the checker,
+ * which keeps its own fail-open / 'uncertain' handling.
+ */
+
+import crypto from 'node:crypto';
+import fs from 'node:fs';
+import path from 'node:path';
+import { callClaude, ClaudeOptions, getModelId, parseClaudeJSON } from '../claude-client';
+import { CONFIG } from '../config';
+
+// Bump when prompts keep their text but a cached verdict should no longer be trusted
+const CACHE_VERSION = 1;
+
+export interface VerificationStats {
+  hits: number; // memory
+  diskHits: number;
+  misses: number; // answered by Claude
+  coalesced: number; // joined an identical call already in flight
+  retries: number;
+  errors: number; // gave up after CONFIG.VERIFY_MAX_RETRIES
+  entries: number; // verdicts in memory
+}
+
+interface StoredVerdict {
+  model: string;
+  response: string;
+  createdAt: string;
+}
+
+const stats: Omit<VerificationStats, 'entries'> = {
+  hits: 0,
+  diskHits: 0,
+  misses: 0,
+  coalesced: 0,
+  retries: 0,
+  errors: 0,
+};
+
+// Least recently used first
+const verdicts = new Map<string, string>();
+const inFlight = new Map<string, Promise<string>>();
+
+let activeCalls = 0;
+const waitingCalls: Array<() => void> = [];
+
+/**
+ * Ask Claude for a verdict and parse it, going through the verdict cache
+ * and the concurrency limit.
+ */
+export async function verifyWithClaude<T>(
+  prompt: string,
+  options: ClaudeOptions,
+  parse: (response: string) => T = parseClaudeJSON
+): Promise<T> {
+  if (!CONFIG.VERIFY_CACHE) {
+    return parse(await callWithRetry(prompt, options, parse));
+  }
+
+  const key = verdictKey(prompt, options);
+  const cached = verdicts.get(key);
+  if (cached !== undefined) {
+    stats.hits++;
+    remember(key, cached);
+    return parse(cached);
+  }
+
+  const running = inFlight.get(key);
+  if (running) {
+    stats.coalesced++;
+    return parse(await running);
+  }
+
+  const resolving = resolveVerdict(key, prompt, options, parse);
+  inFlight.set(key, resolving);
+  try {
+    return parse(await resolving);
+  } finally {
+    inFlight.delete(key);
+  }
+}
+
+export function getVerificationStats(): VerificationStats {
+  return { ...stats, entries: verdicts.size };
+}
+
+function verdictKey(prompt: string, options: ClaudeOptions): string {
+  const model = getModelId(options.model ?? 'sonnet');
+  return crypto
+    .createHash('sha256')
+    .update(JSON.stringify([CACHE_VERSION, model, options.maxTokens ?? null, options.systemPrompt ?? '', prompt]))
+    .digest('hex');
+}
+
+async function resolveVerdict<T>(
+  key: string,
+  prompt: string,
+  options: ClaudeOptions,
+  parse: (response: string) => T
+): Promise<string> {
+  const stored = await readStored(key);
+  if (stored !== null && parses(stored, parse)) {
+    stats.diskHits++;
+    remember(key, stored);
+    return stored;
+  }
+
+  const response = await callWithRetry(prompt, options, parse);
+  remember(key, response);
+  writeStored(key, {
+    model: getModelId(options.model ?? 'sonnet'),
+    response,
+    createdAt: new Date().toISOString(),
+  });
+  return response;
+}
+
+/**
+ * One Claude call per attempt (the client's own retry loop is turned off so
+ * the backoff below runs outside the concurrency limit). A response that
+ * does not parse counts as a failed attempt.
+ */
+async function callWithRetry<T>(
+  prompt: string,
+  options: ClaudeOptions,
+  parse: (response: string) => T
+): Promise<string> {
+  for (let attempt = 1; ; attempt++) {
+    try {
+      const response = await withSlot(() => callClaude(prompt, { ...options, retries: 1 }));
+      parse(response);
+      stats.misses++;
+      return response;
+    } catch (error) {
+      if (attempt >= CONFIG.VERIFY_MAX_RETRIES) {
+        stats.errors++;
+        throw error;
+      }
+      stats.retries++;
+      await sleep(backoffMs(attempt));
+    }
+  }
+}
+
+async function withSlot<T>(fn: () => Promise<T>): Promise<T> {
+  if (activeCalls >= CONFIG.VERIFY_CONCURRENCY) {
+    // The finishing call hands its slot over, so activeCalls stays put
+    await new Promise<void>((resolve) => waitingCalls.push(resolve));
+  } else {
+    activeCalls++;
+  }
+  try {
+    return await fn();
+  } finally {
+    const next = waitingCalls.shift();
+    if (next) {
+      next();
+    } else {
+      activeCalls--;
+    }
+  }
+}
+
+/**
+ * Exponential backoff with jitter: attempt 1 waits 0.5-1x the base delay,
+ * attempt 2 1-2x, attempt 3 2-4x, ...
+ */
+function backoffMs(attempt: number): number {
+  const ceiling = CONFIG.VERIFY_RETRY_BASE_MS * 2 ** (attempt - 1);
+  return ceiling / 2 + Math.random() * (ceiling / 2);
+}
+
+function parses<T>(response: string, parse: (response: string) => T): boolean {
+  try {
+    parse(response);
+    return true;
+  } catch {
+    return false;
+  }
+}
+
+function remember(key: string, response: string): void {
+  verdicts.delete(key);
+  verdicts.set(key, response);
+  while (verdicts.size > Math.max(1, CONFIG.VERIFY_CACHE_MAX_ENTRIES)) {
+    // Evicted verdicts stay on disk
+    verdicts.delete(verdicts.keys().next().value!);
+  }
+}
+
+function pathFor(key: string): string {
+  return path.join(CONFIG.VERIFY_CACHE_DIR, `${key}.json`);
+}
+
+async function readStored(key: string): Promise<string | null> {
+  try {
+    const stored: StoredVerdict = JSON.parse(await fs.promises.readFile(pathFor(key), 'utf-8'));
+    return typeof stored.response === 'string' ? stored.response : null;
+  } catch {
+    return null;
+  }
+}
+
+function writeStored(key: string, stored: StoredVerdict): void {
+  // Write-then-rename so a concurrent reader never sees a partial file
+  const target = pathFor(key);
+  const tmp = `${target}.${process.pid}.tmp`;
+  fs.promises
+    .mkdir(CONFIG.VERIFY_CACHE_DIR, { recursive: true })
+    .then(() => fs.promises.writeFile(tmp, JSON.stringify(stored), 'utf-8'))
+    .then(() => fs.promises.rename(tmp, target))
+    .catch((error) => {
+      console.warn(`[verification-pipeline] Failed to store verdict ${key}: ${(error as Error).message}`);
+    });
+}
+
+function sleep(ms: number): Promise<void> {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
@@ -0,0 +1,50 @@
+/**
+ * Session partitioning for clustered mode (CLUSTER_WORKERS > 1).
+ *
+ * Every session lives in exactly one worker process. Ownership is a pure
+ * function of the session ID or of the join code, and a worker only hands
+ * out IDs and codes that hash to itself (see SessionStore), so the router
+ * (cluster/router.ts) sends REST calls, join-code lookups and WebSocket
+ * upgrades to the owning worker without any shared registry.
+ */
+
+export interface Partition {
+  index: number; // this worker, 0-based
+  count: number; // workers in the cluster (1 = not clustered)
+}
+
+/**
+ * 32-bit FNV-1a over UTF-16 code units.
+ */
+export function hashKey(key: string): number {
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < key.length; i++) {
+    hash ^= key.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash >>> 0;
+}
+
+/**
+ * Worker index owning a session ID or (upper-case) join code.
+ */
+export function ownerOf(key: string, count: number): number {
+  return count > 1 ? hashKey(key) % count : 0;
+}
+
+export function ownsKey(partition: Partition, key: string): boolean {
+  return ownerOf(key, partition.count) === partition.index;
+}
+
+/**
+ * This process's partition, set by the cluster primary when forking workers.
+ * A process that was not forked as a worker owns every key.
+ */
+export function getLocalPartition(env: Record<string, string | undefined> = process.env): Partition {
+  const index = parseInt(env.CLUSTER_WORKER_INDEX ?? '', 10);
+  const count = parseInt(env.CLUSTER_WORKERS ?? '', 10);
+  if (!Number.isInteger(index) || !Number.isInteger(count) || count < 2 || index < 0 || index >= count) {
+    return { index: 0, count: 1 };
+  }
+  return { index, count };
+}
@@ -0,0 +1,108 @@
+/**
+ * Clustered mode (CLUSTER_WORKERS > 1): the primary process.
+ *
+ * Forks one worker per partition. Worker N runs the normal server (its own
+ * SessionStore, timers and WebSocket server) on WORKER_HOST:basePort+N and
+ * only creates sessions that partition.ts maps to N. Once every worker is
+ * listening the router takes PORT. A worker that dies is forked again on
+ * the same index and port; its sessions are lost, as on a single-process
+ * restart.
+ */
+
+import cluster, { Worker } from 'cluster';
+import { Server as HTTPServer } from 'http';
+import { logger } from '../utils/logger';
+import { createRouter } from './router';
+
+const RESTART_DELAY_MS = 1000;
+const WORKER_READY = 'cluster:worker-ready';
+
+export interface ClusterOptions {
+  port: number; // public port (router)
+  workers: number;
+  workerBasePort: number; // worker N listens on workerBasePort + N
+}
+
+/**
+ * Called by a worker once its HTTP server listens. Workers listen with
+ * exclusive: true (no handle shared through the primary), so cluster's own
+ * 'listening' event never fires.
+ */
+export function notifyWorkerReady(): void {
+  process.send?.({ type: WORKER_READY });
+}
+
+export function startCluster({ port, workers, workerBasePort }: ClusterOptions): void {
+  const ports = Array.from({ length: workers }, (_, index) => workerBasePort + index);
+  const forked: (Worker | undefined)[] = new Array(workers);
+  const ready: boolean[] = new Array(workers).fill(false);
+  let router: HTTPServer | undefined;
+  let shuttingDown = false;
+
+  const startRouter = () => {
+    router = createRouter({ ports, isReady: (index) => ready[index] });
+    router.listen(port, () => {
+      logger.info('Cluster router started', {
+        port,
+        workers,
+        workerPorts: ports,
+        endpoints: {
+          http: `http://localhost:${port}`,
+          ws: `ws://localhost:${port}/ws`,
+          health: `http://localhost:${port}/health`,
+        },
+      });
+    });
+  };
+
+  const fork = (index: number) => {
+    const worker = cluster.fork({
+      CLUSTER_WORKERS: String(workers),
+      CLUSTER_WORKER_INDEX: String(index),
+      PORT: String(ports[index]),
+    });
+    forked[index] = worker;
+
+    worker.on('message', (message) => {
+      if (message?.type !== WORKER_READY) return;
+      ready[index] = true;
+      logger.info('Cluster worker listening', { index, pid: worker.process.pid, port: ports[index] });
+      if (!router && ready.every(Boolean)) {
+        startRouter();
+      }
+    });
+
+    worker.on('exit', (code, signal) => {
+      ready[index] = false;
+      forked[index] = undefined;
+      if (shuttingDown) {
+        if (forked.every((w) => w === undefined)) {
+          logger.info('All cluster workers stopped');
+          process.exit(0);
+        }
+        return;
+      }
+      logger.error('Cluster worker exited, restarting', { index, code, signal });
+      setTimeout(() => fork(index), RESTART_DELAY_MS);
+    });
+  };
+
+  const shutdown = (signal: string) => {
+    if (shuttingDown) return;
+    shuttingDown = true;
+    logger.info(`${signal} received, stopping cluster`);
+    router?.close(() => logger.info('Cluster router closed'));
+    forked.forEach((worker) => worker?.process.kill('SIGTERM'));
+    if (forked.every((w) => w === undefined)) {
+      process.exit(0);
+    }
+  };
+
+  process.on('SIGTERM', () => shutdown('SIGTERM'));
+  process.on('SIGINT', () => shutdown('SIGINT'));
+
+  logger.info('Starting cluster', { workers, workerBasePort });
+  for (let index = 0; index < workers; index++) {
+    fork(index);
+  }
+}
@@ -0,0 +1,210 @@
+/**
+ * Front-end router for clustered mode (runs in the primary process).
+ *
+ * Listens on PORT and forwards each request to the worker that owns its
+ * session (see partition.ts):
+ *
+ *   /v1/sessions/by-code/:joinCode    owner of the join code
+ *   /v1/sessions/:id[/...]            owner of the session ID
+ *   /ws (upgrade)                     owner of the token's sessionId
+ *   /health                           answered here (all workers)
+ *   /metrics                          merged over all workers; ?worker=N
+ *                                     for one worker's own snapshot
+ *   anything else                     round-robin (stateless routes)
+ *
+ * WebSocket upgrades are spliced at the TCP level: after the handshake the
+ * router only copies bytes, so a session's sockets all end up on one worker.
+ */
+
+import http, { IncomingMessage, ServerResponse } from 'http';
+import net from 'net';
+import { Duplex } from 'stream';
+import { logger } from '../utils/logger';
+import { mergeMetrics } from '../utils/metrics';
+import { getServerTimeMs, getUptimeSeconds } from '../utils/time';
+import { ownerOf } from './partition';
+
+export const WORKER_HOST = '127.0.0.1';
+
+const BY_CODE_PATH = /^\/v1\/sessions\/by-code\/([^/?#]+)/;
+const SESSION_PATH = /^\/v1\/sessions\/([^/?#]+)/;
+const METRICS_TIMEOUT_MS = 2000;
+
+export interface ClusterView {
+  ports: number[]; // worker index -> listening port
+  isReady(index: number): boolean;
+}
+
+/**
+ * Session ID from a WebSocket upgrade's JWT (Authorization header or
+ * ?token=). Not verified here — the worker verifies it.
+ */
+export function tokenSessionId(req: IncomingMessage): string | null {
+  const authHeader = req.headers.authorization;
+  let token = authHeader?.startsWith('Bearer ') ? authHeader.substring(7) : null;
+  if (!token) {
+    token = new URL(req.url || '', 'http://router').searchParams.get('token');
+  }
+  const payload = token?.split('.')[1];
+  if (!payload) return null;
+  try {
+    const claims = JSON.parse(Buffer.from(payload, 'base64url').toString('utf8'));
+    return typeof claims.sessionId === 'string' ? claims.sessionId : null;
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Owning worker for a request, or null when any worker can serve it.
+ */
+export function routeRequest(req: IncomingMessage, workers: number): number | null {
+  const pathname = (req.url || '/').split('?')[0];
+  const byCode = BY_CODE_PATH.exec(pathname);
+  if (byCode) {
+    return ownerOf(decodeURIComponent(byCode[1]).toUpperCase(), workers);
+  }
+  const session = SESSION_PATH.exec(pathname);
+  if (session) {
+    return ownerOf(decodeURIComponent(session[1]), workers);
+  }
+  if (pathname === '/ws') {
+    const sessionId = tokenSessionId(req);
+    return sessionId ? ownerOf(sessionId, workers) : null;
+  }
+  return null;
+}
+
+export function createRouter(cluster: ClusterView): http.Server {
+  const workers = cluster.ports.length;
+  const agent = new http.Agent({ keepAlive: true });
+  let next = 0;
+
+  const pick = (req: IncomingMessage): number => {
+    const owner = routeRequest(req, workers);
+    if (owner !== null) return owner;
+    next = (next + 1) % workers;
+    return next;
+  };
+
+  const server = http.createServer((req, res) => {
+    const pathname = (req.url || '/').split('?')[0];
+    if (pathname === '/health') {
+      sendHealth(res, cluster);
+    } else if (pathname === '/metrics') {
+      handleMetrics(req, res, cluster, agent);
+    } else {
+      proxyRequest(req, res, cluster.ports[pick(req)], agent);
+    }
+  });
+
+  server.on('upgrade', (req: IncomingMessage, socket: Duplex, head: Buffer) => {
+    proxyUpgrade(req, socket, head, cluster.ports[pick(req)]);
+  });
+
+  return server;
+}
+
+function sendJson(res: ServerResponse, status: number, body: unknown): void {
+  res.writeHead(status, { 'Content-Type': 'application/json' });
+  res.end(JSON.stringify(body));
+}
+
+function sendHealth(res: ServerResponse, cluster: ClusterView): void {
+  const ready = cluster.ports.filter((_port, index) => cluster.isReady(index)).length;
+  const allReady = ready === cluster.ports.length;
+  sendJson(res, allReady ? 200 : 503, {
+    status: allReady ? 'ok' : 'degraded',
+    uptime: getUptimeSeconds(),
+    timestamp: new Date().toISOString(),
+    serverTimeMs: getServerTimeMs(),
+    cluster: { workers: cluster.ports.length, ready },
+  });
+}
+
+function proxyRequest(req: IncomingMessage, res: ServerResponse, port: number, agent: http.Agent): void {
+  const upstream = http.request(
+    { host: WORKER_HOST, port, method: req.method, path: req.url, headers: req.headers, agent },
+    (upstreamRes) => {
+      res.writeHead(upstreamRes.statusCode ?? 502, upstreamRes.headers);
+      upstreamRes.pipe(res);
+    }
+  );
+  upstream.on('error', (error) => {
+    logger.warn('Cluster router: worker request failed', { port, url: req.url, error: error.message });
+    if (!res.headersSent) {
+      sendJson(res, 502, { error: 'Bad gateway', message: 'Worker unavailable' });
+    } else {
+      res.destroy();
+    }
+  });
+  req.pipe(upstream);
+}
+
+function proxyUpgrade(req: IncomingMessage, socket: Duplex, head: Buffer, port: number): void {
+  const upstream = net.connect(port, WORKER_HOST, () => {
+    const lines = [`${req.method} ${req.url} HTTP/${req.httpVersion}`];
+    for (let i = 0; i < req.rawHeaders.length; i += 2) {
+      lines.push(`${req.rawHeaders[i]}: ${req.rawHeaders[i + 1]}`);
+    }
+    upstream.write(lines.join('\r\n') + '\r\n\r\n');
+    if (head.length > 0) upstream.write(head);
+    socket.pipe(upstream).pipe(socket);
+  });
+  upstream.setNoDelay(true);
+  if (socket instanceof net.Socket) socket.setNoDelay(true);
+  upstream.on('error', (error) => {
+    logger.warn('Cluster router: worker upgrade failed', { port, error: error.message });
+    socket.destroy();
+  });
+  socket.on('error', () => upstream.destroy());
+  socket.on('close', () => upstream.destroy());
+  upstream.on('close', () => socket.destroy());
+}
+
+function fetchWorkerMetrics(port: number, agent: http.Agent): Promise<any> {
+  return new Promise((resolve, reject) => {
+    const req = http.get({ host: WORKER_HOST, port, path: '/metrics', agent }, (res) => {
+      let body = '';
+      res.setEncoding('utf8');
+      res.on('data', (chunk) => (body += chunk));
+      res.on('end', () => {
+        try {
+          resolve(JSON.parse(body));
+        } catch (error) {
+          reject(error);
+        }
+      });
+    });
+    req.setTimeout(METRICS_TIMEOUT_MS, () => req.destroy(new Error('timeout')));
+    req.on('error', reject);
+  });
+}
+
+function handleMetrics(req: IncomingMessage, res: ServerResponse, cluster: ClusterView, agent: http.Agent): void {
+  const worker = new URL(req.url || '', 'http://router').searchParams.get('worker');
+  if (worker === null) {
+    void sendMergedMetrics(res, cluster, agent);
+    return;
+  }
+  const index = Number(worker);
+  if (!Number.isInteger(index) || index < 0 || index >= cluster.ports.length) {
+    sendJson(res, 400, {
+      error: 'Validation error',
+      message: `worker must be an integer in [0, ${cluster.ports.length - 1}]`,
+    });
+    return;
+  }
+  req.url = '/metrics';
+  proxyRequest(req, res, cluster.ports[index], agent);
+}
+
+async function sendMergedMetrics(res: ServerResponse, cluster: ClusterView, agent: http.Agent): Promise<void> {
+  try {
+    const snapshots = await Promise.all(cluster.ports.map((port) => fetchWorkerMetrics(port, agent)));
+    sendJson(res, 200, mergeMetrics(snapshots));
+  } catch (error) {
+    logger.warn('Cluster router: metrics scrape failed', { error: (error as Error).message });
+    sendJson(res, 502, { error: 'Bad gateway', message: 'Worker metrics unavailable' });
+  }
+}
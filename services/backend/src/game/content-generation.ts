@@ -0,0 +1,295 @@
+/**
+ * Content generation jobs on ai-content (POST /generate/jobs).
+ *
+ * ai-content queues each requested pack as a job and answers right away;
+ * this module submits jobs, maps their status to the shape the host app
+ * polls (GenerationStatus in ContentPackModels.swift) and, for jobs started
+ * from a session, follows them and pushes CONTENT_GENERATION_PROGRESS to the
+ * session's host.
+ *
+ * Following is one poll per session (GET /generate/jobs?ids=...) on a timer
+ * owned by this module, kept off the session scheduler so it does not count
+ * as a session deadline on /metrics; it stops at the first poll after the
+ * session is deleted. A finished
+ * pack is read into the content pack index before the host hears about it,
+ * so it is selectable as soon as the event arrives. ai-content must write
+ * its packs to this backend's CONTENT_PACKS_DIR.
+ */
+import axios from 'axios';
+import { sessionStore } from '../store/session-store';
+import { ContentGenerationProgressPayload } from '../types/events';
+import { buildContentGenerationProgressEvent } from '../utils/event-builder';
+import { logger } from '../utils/logger';
+import { sendEvent } from '../utils/metrics';
+import { refreshContentPack } from './content-pack-loader';
+
+const SUBMIT_TIMEOUT_MS = 10000;
+const STATUS_TIMEOUT_MS = 5000;
+const POLL_MS = Math.max(100, parseInt(process.env.GENERATION_POLL_MS || '1000', 10) || 1000);
+// A job still unfinished after this long is reported failed
+const WATCH_TIMEOUT_MS = parseInt(process.env.GENERATION_WATCH_TIMEOUT_MS || '900000', 10);
+
+export type GenerationStatus = ContentGenerationProgressPayload;
+
+export interface GenerationOptions {
+  regions?: string[];
+  language?: string;
+  theme?: string;
+}
+
+/**
+ * A job as returned by ai-content's /generate/jobs routes
+ */
+interface AIGenerationJob {
+  jobId: string;
+  status: 'queued' | 'generating' | 'completed' | 'failed';
+  currentStep: number;
+  totalSteps: number;
+  currentStepDescription?: string;
+  queuePosition?: number;
+  destination?: string;
+  contentPackId?: string;
+  error?: string;
+}
+
+interface WatchGroup {
+  jobIds: string[];
+  onSettled?: (statuses: GenerationStatus[]) => void | Promise<void>;
+}
+
+interface GenerationWatch {
+  jobs: Map<string, { status: GenerationStatus; lastSent: string; startedAt: number }>;
+  groups: WatchGroup[];
+}
+
+const watches = new Map<string, GenerationWatch>();
+// Sessions with a poll pending or running
+const polling = new Set<string>();
+
+/**
+ * ai-content base URL for generation (the TTS client's AI_CONTENT_URL unless
+ * AI_CONTENT_SERVICE_URL points elsewhere)
+ */
+export function getAIContentServiceUrl(): string {
+  return process.env.AI_CONTENT_SERVICE_URL || process.env.AI_CONTENT_URL || 'http://localhost:3001';
+}
+
+/**
+ * Queues `count` packs on ai-content. Axios errors (including ai-content's
+ * 429 for a full queue) are thrown to the caller.
+ */
+export async function submitGeneration(
+  count: number,
+  options: GenerationOptions = {}
+): Promise<GenerationStatus[]> {
+  const response = await axios.post(
+    `${getAIContentServiceUrl()}/generate/jobs`,
+    { count, ...options, language: options.language || 'sv' },
+    { timeout: SUBMIT_TIMEOUT_MS }
+  );
+  const jobs: AIGenerationJob[] = response.data.jobs ?? [];
+  logger.info('Content generation queued', {
+    count,
+    generateIds: jobs.map((job) => job.jobId),
+    queue: response.data.queue,
+  });
+  return jobs.map(toGenerationStatus);
+}
+
+/**
+ * Current status of one job; null when ai-content does not know it
+ */
+export async function getGenerationStatus(generateId: string): Promise<GenerationStatus | null> {
+  try {
+    const response = await axios.get(
+      `${getAIContentServiceUrl()}/generate/jobs/${encodeURIComponent(generateId)}`,
+      { timeout: STATUS_TIMEOUT_MS }
+    );
+    return toGenerationStatus(response.data.job);
+  } catch (error: any) {
+    if (error.response?.status === 404) return null;
+    throw error;
+  }
+}
+
+/**
+ * Follows jobs started for a session: the host gets a
+ * CONTENT_GENERATION_PROGRESS event whenever a job's status or step changes,
+ * and onSettled runs once every job in jobIds has completed or failed.
+ */
+export function watchGeneration(
+  sessionId: string,
+  initial: GenerationStatus[],
+  onSettled?: WatchGroup['onSettled']
+): void {
+  let watch = watches.get(sessionId);
+  if (!watch) {
+    watch = { jobs: new Map(), groups: [] };
+    watches.set(sessionId, watch);
+  }
+  const now = Date.now();
+  for (const status of initial) {
+    watch.jobs.set(status.generateId, { status, lastSent: '', startedAt: now });
+  }
+  watch.groups.push({ jobIds: initial.map((status) => status.generateId), onSettled });
+
+  publish(sessionId, watch);
+  if (!polling.has(sessionId)) {
+    polling.add(sessionId);
+    schedulePoll(sessionId);
+  }
+}
+
+function schedulePoll(sessionId: string): void {
+  const timer = setTimeout(() => {
+    poll(sessionId).catch((error) => {
+      polling.delete(sessionId);
+      logger.error('Content generation poll failed', { sessionId, error: error.message });
+    });
+  }, POLL_MS);
+  // Polling alone must not keep the process alive
+  timer.unref();
+}
+
+async function poll(sessionId: string): Promise<void> {
+  const watch = watches.get(sessionId);
+  if (!watch || !sessionStore.getSession(sessionId)) {
+    watches.delete(sessionId);
+    polling.delete(sessionId);
+    return;
+  }
+
+  const pending = Array.from(watch.jobs.entries())
+    .filter(([, job]) => !isSettled(job.status))
+    .map(([id]) => id);
+
+  if (pending.length > 0) {
+    try {
+      const response = await axios.get(`${getAIContentServiceUrl()}/generate/jobs`, {
+        params: { ids: pending.join(',') },
+        timeout: STATUS_TIMEOUT_MS,
+      });
+      const found = new Map<string, AIGenerationJob>(
+        (response.data.jobs ?? []).map((job: AIGenerationJob) => [job.jobId, job])
+      );
+      for (const id of pending) {
+        const job = found.get(id);
+        // Unknown to ai-content: it restarted or already dropped the job
+        watch.jobs.get(id)!.status = job
+          ? toGenerationStatus(job)
+          : failedStatus(id, watch.jobs.get(id)!.status, 'Generation job not found');
+      }
+    } catch (error: any) {
+      // Keep polling: ai-content may be busy or restarting
+      logger.warn('Failed to poll content generation status', {
+        sessionId,
+        jobs: pending.length,
+        error: error.message,
+      });
+    }
+
+    const now = Date.now();
+    for (const id of pending) {
+      const job = watch.jobs.get(id)!;
+      if (!isSettled(job.status) && now - job.startedAt > WATCH_TIMEOUT_MS) {
+        job.status = failedStatus(id, job.status, 'Generation timed out');
+      }
+    }
+
+    // Make finished packs selectable before the host hears about them
+    await Promise.all(
+      pending.map(async (id) => {
+        const { status } = watch.jobs.get(id)!;
+        if (status.status === 'completed' && status.contentPackId) {
+          await refreshContentPack(status.contentPackId).catch((error) => {
+            logger.warn('Failed to index generated content pack', {
+              contentPackId: status.contentPackId,
+              error: error.message,
+            });
+          });
+        }
+      })
+    );
+  }
+
+  // Completion handlers (e.g. setting the game plan) run before the host
+  // hears that the last job finished
+  await settleGroups(sessionId, watch);
+  publish(sessionId, watch);
+
+  if (Array.from(watch.jobs.values()).every((job) => isSettled(job.status))) {
+    watches.delete(sessionId);
+    polling.delete(sessionId);
+  } else {
+    schedulePoll(sessionId);
+  }
+}
+
+/**
+ * Sends CONTENT_GENERATION_PROGRESS to the host for every job that changed
+ * since the last event
+ */
+function publish(sessionId: string, watch: GenerationWatch): void {
+  const session = sessionStore.getSession(sessionId);
+  if (!session) return;
+
+  const hosts = Array.from(session.connections.values()).filter(
+    (connection) => connection.role === 'host' && connection.ws.readyState === 1
+  );
+  watch.jobs.forEach((job) => {
+    const key = `${job.status.status}:${job.status.currentStep}:${job.status.currentStepDescription ?? ''}`;
+    if (key === job.lastSent) return;
+    job.lastSent = key;
+    const event = buildContentGenerationProgressEvent(sessionId, job.status);
+    hosts.forEach((connection) => sendEvent(connection.ws, event));
+  });
+}
+
+async function settleGroups(sessionId: string, watch: GenerationWatch): Promise<void> {
+  const settled = watch.groups.filter((group) =>
+    group.jobIds.every((id) => isSettled(watch.jobs.get(id)!.status))
+  );
+  if (settled.length === 0) return;
+  watch.groups = watch.groups.filter((group) => !settled.includes(group));
+
+  for (const group of settled) {
+    if (!group.onSettled) continue;
+    try {
+      await group.onSettled(group.jobIds.map((id) => watch.jobs.get(id)!.status));
+    } catch (error: any) {
+      logger.error('Content generation completion handler failed', {
+        sessionId,
+        generateIds: group.jobIds,
+        error: error.message,
+      });
+    }
+  }
+}
+
+function isSettled(status: GenerationStatus): boolean {
+  return status.status === 'completed' || status.status === 'failed';
+}
+
+function failedStatus(generateId: string, last: GenerationStatus, error: string): GenerationStatus {
+  return { ...last, generateId, status: 'failed', error };
+}
+
+/**
+ * ai-content job → GenerationStatus. A queued job reports as generating,
+ * step 0, with its place in the queue as the step description.
+ */
+function toGenerationStatus(job: AIGenerationJob): GenerationStatus {
+  const queued = job.status === 'queued';
+  return {
+    generateId: job.jobId,
+    status: queued ? 'generating' : job.status,
+    currentStep: job.currentStep,
+    totalSteps: job.totalSteps,
+    currentStepDescription: queued
+      ? `Väntar i kö${job.queuePosition ? ` (plats ${job.queuePosition})` : ''}`
+      : job.currentStepDescription,
+    ...(job.contentPackId ? { contentPackId: job.contentPackId } : {}),
+    ...(job.destination ? { destination: job.destination } : {}),
+    ...(job.error ? { error: job.error } : {}),
+  };
+}
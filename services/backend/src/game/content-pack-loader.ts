@@ -1,6 +1,14 @@
 /**
  * Content Pack Loader
  * Loads and caches AI-generated content packs from disk
+ *
+ * - Index: metadata of every pack in CONTENT_PACKS_DIR (destination,
+ *   verified flags, clue/followup counts), built at startup and kept current
+ *   by a directory watcher plus a periodic mtime rescan. Listing and
+ *   existence checks are answered from memory.
+ * - Cache: bounded LRU of normalized packs (CONTENT_PACK_CACHE_SIZE); hot
+ *   paths warm it with loadContentPackAsync() so the synchronous
+ *   loadContentPack() used by the state machine is a cache hit.
  */
 
 import * as fs from 'fs';
@@ -61,8 +69,58 @@ export interface NormalizedContentPack {
   };
 }
 
-// In-memory cache for loaded content packs
+/**
+ * Pack metadata held in the index and returned by the listing endpoint
+ */
+export interface ContentPackSummary {
+  roundId: string;
+  destinationName: string;
+  destinationCountry: string;
+  generatedAt: string;
+  verified: boolean;
+  antiLeakChecked: boolean;
+  clueCount: number;
+  followupCount: number;
+}
+
+export interface ContentPackQuery {
+  offset?: number;
+  limit?: number; // omitted = everything from offset
+  verified?: boolean;
+  q?: string; // case-insensitive match on roundId, destination name or country
+}
+
+export interface ContentPackPage {
+  packs: ContentPackSummary[];
+  total: number; // packs matching the filter
+  offset: number;
+  nextOffset: number | null;
+  errors: Array<{ packId: string; error: string }>; // unreadable packs matching q
+}
+
+interface IndexEntry {
+  summary?: ContentPackSummary;
+  error?: string;
+  searchKey: string;
+  mtimeMs: number;
+  size: number;
+}
+
+const PACK_SUFFIX = '.json';
+const INDEX_READ_CONCURRENCY = 32;
+const WATCH_DEBOUNCE_MS = 50;
+
+// Normalized packs, least recently used first
 const contentPackCache = new Map<string, NormalizedContentPack>();
+const pendingLoads = new Map<string, Promise<NormalizedContentPack>>();
+
+const packIndex = new Map<string, IndexEntry>();
+let sortedIds: string[] | null = null; // listing order, rebuilt after changes
+let indexBuild: Promise<void> | null = null;
+let indexReady = false;
+let watcher: fs.FSWatcher | null = null;
+let rescanTimer: NodeJS.Timeout | null = null;
+const watchDebounce = new Map<string, NodeJS.Timeout>();
 
 /**
  * Gets the content packs directory from environment or default
@@ -71,6 +129,19 @@ function getContentPacksDir(): string {
   return process.env.CONTENT_PACKS_DIR || '/tmp/pa-sparet-content-packs';
 }
 
+function getCacheSize(): number {
+  const size = parseInt(process.env.CONTENT_PACK_CACHE_SIZE || '100', 10);
+  return size >= 1 ? size : 1;
+}
+
+function getRescanMs(): number {
+  return parseInt(process.env.CONTENT_PACK_RESCAN_MS || '60000', 10);
+}
+
+function packPathFor(roundId: string): string {
+  return path.join(getContentPacksDir(), `${roundId}${PACK_SUFFIX}`);
+}
+
 /**
  * Maps content pack clue level (10, 8, 6, 4, 2) to points
  */
@@ -129,31 +200,12 @@ function normalizeContentPack(raw: ContentPack): NormalizedContentPack {
 }
 
 /**
- * Loads a content pack from disk by roundId
- * Returns cached version if available
- * @throws Error if pack not found or invalid
+ * Parses and validates a pack file's contents
+ * @throws Error if the JSON or its structure is invalid
  */
-export function loadContentPack(roundId: string): NormalizedContentPack {
-  // Check cache first
-  if (contentPackCache.has(roundId)) {
-    logger.debug('Content pack loaded from cache', { roundId });
-    return contentPackCache.get(roundId)!;
-  }
-
-  const contentPacksDir = getContentPacksDir();
-  const packPath = path.join(contentPacksDir, `${roundId}.json`);
-
-  logger.info('Loading content pack from disk', { roundId, packPath });
-
-  // Check if file exists
-  if (!fs.existsSync(packPath)) {
-    throw new Error(`Content pack not found: ${roundId}`);
-  }
-
-  // Read and parse JSON
+function parseContentPack(roundId: string, fileContent: string): NormalizedContentPack {
   let raw: ContentPack;
   try {
-    const fileContent = fs.readFileSync(packPath, 'utf-8');
     raw = JSON.parse(fileContent);
   } catch (error: any) {
     logger.error('Failed to parse content pack JSON', {
@@ -171,9 +223,8 @@ export function loadContentPack(roundId: string): NormalizedContentPack {
   }
 
   // Normalize and validate
-  let normalized: NormalizedContentPack;
   try {
-    normalized = normalizeContentPack(raw);
+    return normalizeContentPack(raw);
   } catch (error: any) {
     logger.error('Failed to normalize content pack', {
       roundId,
@@ -181,52 +232,416 @@ export function loadContentPack(roundId: string): NormalizedContentPack {
     });
     throw new Error(`Invalid content pack structure: ${error.message}`);
   }
+}
+
+function cacheGet(roundId: string): NormalizedContentPack | undefined {
+  const pack = contentPackCache.get(roundId);
+  if (pack) {
+    // Re-insert to mark as most recently used
+    contentPackCache.delete(roundId);
+    contentPackCache.set(roundId, pack);
+  }
+  return pack;
+}
 
-  // Cache for future use
-  contentPackCache.set(roundId, normalized);
+function cacheSet(roundId: string, pack: NormalizedContentPack): void {
+  contentPackCache.delete(roundId);
+  contentPackCache.set(roundId, pack);
+  const maxSize = getCacheSize();
+  while (contentPackCache.size > maxSize) {
+    contentPackCache.delete(contentPackCache.keys().next().value!);
+  }
+}
 
+function onPackLoaded(roundId: string, pack: NormalizedContentPack): void {
+  cacheSet(roundId, pack);
   logger.info('Content pack loaded successfully', {
     roundId,
-    destination: normalized.name,
-    clueCount: normalized.clues.length,
-    followupCount: normalized.followupQuestions.length,
-    verified: normalized.metadata?.verified,
+    destination: pack.name,
+    clueCount: pack.clues.length,
+    followupCount: pack.followupQuestions.length,
+    verified: pack.metadata?.verified,
   });
+}
 
+/**
+ * Loads a content pack from disk by roundId
+ * Returns cached version if available
+ * @throws Error if pack not found or invalid
+ */
+export function loadContentPack(roundId: string): NormalizedContentPack {
+  const cached = cacheGet(roundId);
+  if (cached) {
+    logger.debug('Content pack loaded from cache', { roundId });
+    return cached;
+  }
+
+  const packPath = packPathFor(roundId);
+
+  logger.info('Loading content pack from disk', { roundId, packPath });
+
+  let fileContent: string;
+  try {
+    fileContent = fs.readFileSync(packPath, 'utf-8');
+  } catch (error: any) {
+    if (error.code === 'ENOENT') {
+      throw new Error(`Content pack not found: ${roundId}`);
+    }
+    throw error;
+  }
+
+  const normalized = parseContentPack(roundId, fileContent);
+  onPackLoaded(roundId, normalized);
   return normalized;
 }
 
 /**
- * Lists all available content pack IDs
+ * Non-blocking loadContentPack(): reads the file asynchronously on a cache
+ * miss (concurrent loads of one pack share the read). Used to warm the cache
+ * before the synchronous callers need the pack.
+ * @throws Error if pack not found or invalid
  */
-export function listContentPacks(): string[] {
-  const contentPacksDir = getContentPacksDir();
+export function loadContentPackAsync(roundId: string): Promise<NormalizedContentPack> {
+  const cached = cacheGet(roundId);
+  if (cached) {
+    return Promise.resolve(cached);
+  }
 
-  logger.debug('Listing content packs', { contentPacksDir });
+  let pending = pendingLoads.get(roundId);
+  if (!pending) {
+    const packPath = packPathFor(roundId);
+    logger.info('Loading content pack from disk', { roundId, packPath });
 
-  // Check if directory exists
-  if (!fs.existsSync(contentPacksDir)) {
-    logger.warn('Content packs directory does not exist', { contentPacksDir });
-    return [];
+    pending = fs.promises
+      .readFile(packPath, 'utf-8')
+      .catch((error: any) => {
+        if (error.code === 'ENOENT') {
+          throw new Error(`Content pack not found: ${roundId}`);
+        }
+        throw error;
+      })
+      .then((fileContent) => {
+        const normalized = parseContentPack(roundId, fileContent);
+        onPackLoaded(roundId, normalized);
+        return normalized;
+      })
+      .finally(() => pendingLoads.delete(roundId));
+    pendingLoads.set(roundId, pending);
   }
+  return pending;
+}
+
+/**
+ * Fire-and-forget cache warm-up; failures surface on the later load
+ */
+export function prefetchContentPack(roundId: string): void {
+  loadContentPackAsync(roundId).catch(() => undefined);
+}
+
+// ---------------------------------------------------------------------------
+// Index
+// ---------------------------------------------------------------------------
 
-  // Read all JSON files
+function toSummary(pack: NormalizedContentPack): ContentPackSummary {
+  return {
+    roundId: pack.id,
+    destinationName: pack.name,
+    destinationCountry: pack.country,
+    generatedAt: pack.metadata?.generatedAt || new Date().toISOString(),
+    verified: pack.metadata?.verified || false,
+    antiLeakChecked: pack.metadata?.antiLeakChecked || false,
+    clueCount: pack.clues.length,
+    followupCount: pack.followupQuestions.length,
+  };
+}
+
+function setIndexEntry(roundId: string, entry: IndexEntry): void {
+  packIndex.set(roundId, entry);
+  sortedIds = null;
+}
+
+function removeIndexEntry(roundId: string): void {
+  contentPackCache.delete(roundId);
+  if (packIndex.delete(roundId)) {
+    sortedIds = null;
+  }
+}
+
+/**
+ * (Re)reads one pack file into the index unless its mtime and size are
+ * unchanged. A changed file also drops the cached normalized pack.
+ */
+async function indexPackFile(roundId: string): Promise<void> {
+  const packPath = packPathFor(roundId);
+  let stat: fs.Stats;
   try {
-    const files = fs.readdirSync(contentPacksDir);
-    const jsonFiles = files.filter((f) => f.endsWith('.json'));
-    const roundIds = jsonFiles.map((f) => f.replace('.json', ''));
+    stat = await fs.promises.stat(packPath);
+  } catch (error: any) {
+    if (error.code === 'ENOENT') {
+      removeIndexEntry(roundId);
+      return;
+    }
+    throw error;
+  }
 
-    logger.debug('Content packs found', {
-      count: roundIds.length,
-      roundIds,
-    });
+  const existing = packIndex.get(roundId);
+  if (existing && existing.mtimeMs === stat.mtimeMs && existing.size === stat.size) {
+    return;
+  }
+  contentPackCache.delete(roundId);
 
-    return roundIds;
+  let entry: IndexEntry;
+  try {
+    const pack = parseContentPack(roundId, await fs.promises.readFile(packPath, 'utf-8'));
+    const summary = toSummary(pack);
+    entry = {
+      summary,
+      searchKey: `${roundId}\n${summary.destinationName}\n${summary.destinationCountry}`.toLowerCase(),
+      mtimeMs: stat.mtimeMs,
+      size: stat.size,
+    };
   } catch (error: any) {
-    logger.error('Failed to list content packs', {
-      contentPacksDir,
+    if (error.code === 'ENOENT') {
+      removeIndexEntry(roundId);
+      return;
+    }
+    entry = {
       error: error.message,
+      searchKey: roundId.toLowerCase(),
+      mtimeMs: stat.mtimeMs,
+      size: stat.size,
+    };
+  }
+  setIndexEntry(roundId, entry);
+}
+
+/**
+ * Brings the index in line with the directory: new and changed files are
+ * (re)read, entries for removed files dropped.
+ */
+async function scanContentPacksDir(): Promise<void> {
+  const contentPacksDir = getContentPacksDir();
+  let files: string[];
+  try {
+    files = await fs.promises.readdir(contentPacksDir);
+  } catch (error: any) {
+    if (error.code !== 'ENOENT') {
+      logger.error('Failed to list content packs', {
+        contentPacksDir,
+        error: error.message,
+      });
+      return;
+    }
+    files = [];
+  }
+
+  const roundIds = files
+    .filter((f) => f.endsWith(PACK_SUFFIX))
+    .map((f) => f.slice(0, -PACK_SUFFIX.length));
+  const present = new Set(roundIds);
+  for (const roundId of [...packIndex.keys()]) {
+    if (!present.has(roundId)) removeIndexEntry(roundId);
+  }
+
+  let next = 0;
+  const worker = async () => {
+    while (next < roundIds.length) {
+      const roundId = roundIds[next++];
+      try {
+        await indexPackFile(roundId);
+      } catch (error: any) {
+        logger.error('Failed to index content pack', { roundId, error: error.message });
+      }
+    }
+  };
+  await Promise.all(
+    Array.from({ length: Math.min(INDEX_READ_CONCURRENCY, roundIds.length) }, worker)
+  );
+
+  startWatcher();
+}
+
+/**
+ * Watches the directory for added, changed and removed packs. Retried on
+ * every rescan while the directory is missing or the watch failed.
+ */
+function startWatcher(): void {
+  if (watcher) return;
+  const contentPacksDir = getContentPacksDir();
+  try {
+    watcher = fs.watch(contentPacksDir, { persistent: false }, (_event, filename) => {
+      if (!filename) {
+        // Platform did not say which file: fall back to a full scan
+        void scanContentPacksDir();
+        return;
+      }
+      const name = filename.toString();
+      if (!name.endsWith(PACK_SUFFIX)) return;
+      const roundId = name.slice(0, -PACK_SUFFIX.length);
+
+      // Writers emit several events per file; settle before re-reading
+      clearTimeout(watchDebounce.get(roundId));
+      watchDebounce.set(
+        roundId,
+        setTimeout(() => {
+          watchDebounce.delete(roundId);
+          indexPackFile(roundId).catch((error) => {
+            logger.error('Failed to index content pack', { roundId, error: error.message });
+          });
+        }, WATCH_DEBOUNCE_MS)
+      );
+    });
+    watcher.on('error', (error) => {
+      logger.warn('Content packs watcher failed, relying on rescans', {
+        contentPacksDir,
+        error: error.message,
+      });
+      watcher?.close();
+      watcher = null;
+    });
+  } catch (error: any) {
+    if (error.code !== 'ENOENT') {
+      logger.warn('Cannot watch content packs directory, relying on rescans', {
+        contentPacksDir,
+        error: error.message,
+      });
+    }
+  }
+}
+
+/**
+ * Builds the content pack index and starts watching the directory.
+ * Idempotent; the returned promise resolves once the first scan is done.
+ */
+export function initContentPackIndex(): Promise<void> {
+  if (indexBuild) return indexBuild;
+
+  const startedAt = Date.now();
+  indexBuild = scanContentPacksDir().then(() => {
+    indexReady = true;
+    logger.info('Content pack index built', {
+      contentPacksDir: getContentPacksDir(),
+      packCount: packIndex.size,
+      durationMs: Date.now() - startedAt,
+    });
+
+    const rescanMs = getRescanMs();
+    if (rescanMs > 0) {
+      rescanTimer = setInterval(() => void scanContentPacksDir(), rescanMs);
+      rescanTimer.unref();
+    }
+  });
+  return indexBuild;
+}
+
+/**
+ * Stops watching and forgets the index (tests, hot-reloading)
+ */
+export function closeContentPackIndex(): void {
+  watcher?.close();
+  watcher = null;
+  if (rescanTimer) clearInterval(rescanTimer);
+  rescanTimer = null;
+  watchDebounce.forEach((timer) => clearTimeout(timer));
+  watchDebounce.clear();
+  packIndex.clear();
+  sortedIds = null;
+  indexBuild = null;
+  indexReady = false;
+}
+
+/**
+ * Re-reads one pack into the index right away, for writers that need the
+ * listing to reflect their change before the watcher fires
+ */
+export async function refreshContentPack(roundId: string): Promise<void> {
+  await indexPackFile(roundId);
+}
+
+/**
+ * Drops a pack from the index and cache (after deleting its file)
+ */
+export function forgetContentPack(roundId: string): void {
+  removeIndexEntry(roundId);
+}
+
+/**
+ * Indexed metadata for a pack; undefined if unknown or unreadable
+ */
+export function getContentPackSummary(roundId: string): ContentPackSummary | undefined {
+  return packIndex.get(roundId)?.summary;
+}
+
+function listingOrder(): string[] {
+  if (!sortedIds) {
+    // Newest first, roundId as tie-breaker for stable pages
+    sortedIds = [...packIndex.keys()].sort((a, b) => {
+      const ga = packIndex.get(a)!.summary?.generatedAt ?? '';
+      const gb = packIndex.get(b)!.summary?.generatedAt ?? '';
+      if (ga !== gb) return ga < gb ? 1 : -1;
+      return a < b ? -1 : a > b ? 1 : 0;
     });
+  }
+  return sortedIds;
+}
+
+/**
+ * Filtered, paginated listing from the index (newest first)
+ */
+export function queryContentPacks(query: ContentPackQuery = {}): ContentPackPage {
+  const offset = Math.max(0, query.offset ?? 0);
+  const limit = query.limit ?? Infinity;
+  const q = query.q?.trim().toLowerCase();
+
+  const packs: ContentPackSummary[] = [];
+  const errors: Array<{ packId: string; error: string }> = [];
+  let total = 0;
+  for (const roundId of listingOrder()) {
+    const entry = packIndex.get(roundId)!;
+    if (q && !entry.searchKey.includes(q)) continue;
+    if (!entry.summary) {
+      errors.push({ packId: roundId, error: entry.error! });
+      continue;
+    }
+    if (query.verified !== undefined && entry.summary.verified !== query.verified) continue;
+    if (total >= offset && packs.length < limit) {
+      packs.push(entry.summary);
+    }
+    total++;
+  }
+
+  const end = offset + packs.length;
+  return {
+    packs,
+    total,
+    offset,
+    nextOffset: end < total ? end : null,
+    errors,
+  };
+}
+
+/**
+ * Lists all available content pack IDs
+ */
+export function listContentPacks(): string[] {
+  if (indexReady) {
+    return [...listingOrder()];
+  }
+
+  const contentPacksDir = getContentPacksDir();
+  logger.debug('Listing content packs before the index is built', { contentPacksDir });
+  try {
+    return fs
+      .readdirSync(contentPacksDir)
+      .filter((f) => f.endsWith(PACK_SUFFIX))
+      .map((f) => f.slice(0, -PACK_SUFFIX.length));
+  } catch (error: any) {
+    if (error.code !== 'ENOENT') {
+      logger.error('Failed to list content packs', {
+        contentPacksDir,
+        error: error.message,
+      });
+    }
     return [];
   }
 }
@@ -235,13 +650,17 @@ export function listContentPacks(): string[] {
  * Checks if a content pack exists
  */
 export function contentPackExists(roundId: string): boolean {
-  if (contentPackCache.has(roundId)) {
+  if (packIndex.has(roundId) || contentPackCache.has(roundId)) {
     return true;
   }
 
-  const contentPacksDir = getContentPacksDir();
-  const packPath = path.join(contentPacksDir, `${roundId}.json`);
-  return fs.existsSync(packPath);
+  // Written since the last index update (watcher not fired yet) or index
+  // not built: ask the disk and pick the pack up
+  const exists = fs.existsSync(packPathFor(roundId));
+  if (exists && indexReady) {
+    void refreshContentPack(roundId).catch(() => undefined);
+  }
+  return exists;
 }
 
 /**
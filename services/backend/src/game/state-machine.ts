@@ -12,8 +12,9 @@ import {
   isAnswerCorrect,
   isFollowupAnswerCorrect,
 } from './content-hardcoded';
-import { loadContentPack, NormalizedContentPack } from './content-pack-loader';
+import { loadContentPack, NormalizedContentPack, prefetchContentPack } from './content-pack-loader';
 import { getServerTimeMs } from '../utils/time';
+import { scaleMs } from '../utils/time-scale';
 
 /**
  * Converts a NormalizedContentPack to Destination format
@@ -104,6 +105,12 @@ export function startNewDestination(
     session.state.contentPackId = null;
   }
 
+  // Warm the cache for the game plan's next destination
+  const upcoming = session.gamePlan?.destinations[session.gamePlan.currentIndex + 1];
+  if (upcoming) {
+    prefetchContentPack(upcoming.contentPackId);
+  }
+
   logger.info('Starting destination', {
     sessionId: session.sessionId,
     destinationId: destination.id,
@@ -436,7 +443,7 @@ export function pullBrake(
   }
 
   const lastBrakeTime = session._brakeTimestamps.get(playerId);
-  if (lastBrakeTime && serverTimeMs - lastBrakeTime < RATE_LIMIT_MS) {
+  if (lastBrakeTime && serverTimeMs - lastBrakeTime < scaleMs(session, RATE_LIMIT_MS)) {
     logger.warn('Brake rate limited', {
       sessionId: session.sessionId,
       playerId,
@@ -623,7 +630,7 @@ export function startFollowupSequence(session: Session): {
     timer: {
       timerId: `fq-0-${session.sessionId}`,
       startAtServerMs: now,
-      durationMs: FOLLOWUP_TIMER_MS,
+      durationMs: scaleMs(session, FOLLOWUP_TIMER_MS),
     },
   };
 
@@ -637,7 +644,7 @@ export function startFollowupSequence(session: Session): {
     question,
     currentQuestionIndex: 0,
     totalQuestions: destination.followupQuestions.length,
-    timerDurationMs: FOLLOWUP_TIMER_MS,
+    timerDurationMs: scaleMs(session, FOLLOWUP_TIMER_MS),
     startAtServerMs: now,
   };
 }
@@ -778,7 +785,7 @@ export function scoreFollowupQuestion(session: Session): {
       timer: {
         timerId: `fq-${nextIdx}-${session.sessionId}`,
         startAtServerMs: now,
-        durationMs: FOLLOWUP_TIMER_MS,
+        durationMs: scaleMs(session, FOLLOWUP_TIMER_MS),
       },
     };
   } else {
@@ -0,0 +1,400 @@
+/**
+ * Cross-session TTS clip cache in front of ai-content.
+ *
+ * Clips are content-addressed: the key is a hash of the normalized text and
+ * the voice, so the same clue read or banter line requested by any session
+ * is synthesized once. Entries live in a bounded LRU in memory
+ * (TTS_CLIP_CACHE_MAX_ENTRIES) and as one small JSON file each in
+ * TTS_CLIP_CACHE_DIR, which survives restarts and is shared by cluster
+ * workers. It must not be ai-content's TTS_CACHE_DIR: that one is served
+ * publicly and the startup trim here deletes files from it. Concurrent
+ * requests for a key that is already being synthesized wait for that
+ * synthesis instead of starting another.
+ *
+ * The clips themselves stay on ai-content, so a stored URL can go dead (its
+ * /tmp cache wiped, PUBLIC_BASE_URL changed). Entries therefore expire after
+ * TTS_CLIP_CACHE_TTL_MS, are checked with a HEAD at most every
+ * CHECK_INTERVAL_MS while in use (404/410 drops them), and are dropped once
+ * ai-content hands out clips under another origin.
+ *
+ * Only successful clips are cached. Hits, misses, coalesced requests,
+ * evictions, stale entries and upstream synthesis time are reported on
+ * /metrics (tts).
+ */
+
+import { createHash } from 'crypto';
+import * as fs from 'fs';
+import * as path from 'path';
+import { performance } from 'perf_hooks';
+import { logger } from '../utils/logger';
+import {
+  observeTtsSynthesis,
+  recordTtsCache,
+  setTtsCacheEntries,
+} from '../utils/metrics';
+
+export interface TtsClip {
+  assetId: string;
+  url: string;
+  durationMs: number;
+}
+
+export interface TtsRequest {
+  text: string;
+  voiceId?: string; // undefined = ai-content's default voice
+}
+
+/**
+ * Synthesizes the requests (in order) upstream. null = no clip for that
+ * request (non-OK answer, dropped batch line); rejects when ai-content is
+ * unreachable.
+ */
+export type SynthesizeFn = (requests: TtsRequest[]) => Promise<Array<TtsClip | null>>;
+
+interface StoredClip {
+  text: string;
+  voiceId: string | null;
+  clip: TtsClip;
+  storedAt?: number; // epoch ms; missing in entries written before expiry
+}
+
+interface CachedClip {
+  clip: TtsClip;
+  storedAt: number;
+  checkedAt: number; // last time ai-content was seen serving the URL; 0 = never
+}
+
+interface PendingClip {
+  key: string;
+  request: TtsRequest; // normalized text
+  settle: (clip: TtsClip | null, error?: unknown) => void;
+}
+
+const DEFAULT_VOICE_KEY = 'default';
+// A clip URL in use is confirmed with ai-content at most this often
+const CHECK_INTERVAL_MS = 5 * 60 * 1000;
+const CHECK_TIMEOUT_MS = 2000;
+
+function isEnabled(): boolean {
+  return process.env.TTS_CLIP_CACHE !== 'false';
+}
+
+function getCacheDir(): string {
+  return process.env.TTS_CLIP_CACHE_DIR || '/tmp/pa-sparet-tts-clip-cache';
+}
+
+function getMaxEntries(): number {
+  const max = parseInt(process.env.TTS_CLIP_CACHE_MAX_ENTRIES || '5000', 10);
+  return max >= 1 ? max : 1;
+}
+
+function getTtlMs(): number {
+  const ttl = parseInt(process.env.TTS_CLIP_CACHE_TTL_MS || '86400000', 10);
+  return ttl >= 1 ? ttl : 1;
+}
+
+function originOf(url: string): string | null {
+  try {
+    return new URL(url).origin;
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Whitespace differences (template line breaks, double spaces) do not
+ * change the spoken clip
+ */
+export function normalizeTtsText(text: string): string {
+  return text.normalize('NFC').replace(/\s+/g, ' ').trim();
+}
+
+export function ttsCacheKey(request: TtsRequest): string {
+  return createHash('sha256')
+    .update(`${request.voiceId ?? DEFAULT_VOICE_KEY}\0${normalizeTtsText(request.text)}`)
+    .digest('hex');
+}
+
+class TtsClipCache {
+  // Least recently used first
+  private readonly clips = new Map<string, CachedClip>();
+  private readonly inFlight = new Map<string, Promise<TtsClip | null>>();
+  private readonly checking = new Map<string, Promise<boolean>>();
+  // Origin of the clip URLs ai-content answered with last
+  private upstreamOrigin: string | null = null;
+  private loading: Promise<void> | null = null;
+  private writes = 0;
+
+  /**
+   * Loads the on-disk store into memory (newest entries first, up to the
+   * bound). Idempotent.
+   */
+  init(): Promise<void> {
+    if (!this.loading) {
+      this.loading = this.load().catch((error) => {
+        logger.warn('TTS clip cache: failed to load store, starting empty', {
+          cacheDir: getCacheDir(),
+          error: error.message,
+        });
+      });
+    }
+    return this.loading;
+  }
+
+  /**
+   * Clips for the requests, in order: cached ones directly, the rest via
+   * one synthesize() call for everything not already in flight.
+   */
+  async resolve(requests: TtsRequest[], synthesize: SynthesizeFn): Promise<Array<TtsClip | null>> {
+    if (!isEnabled()) {
+      return synthesize(requests.map((r) => ({ ...r, text: normalizeTtsText(r.text) })));
+    }
+
+    const keys = requests.map((request) => ttsCacheKey(request));
+    // Drops entries whose clip is gone before they are handed out
+    await Promise.all(
+      Array.from(new Set(keys)).map((key) => {
+        const cached = this.clips.get(key);
+        return cached ? this.usable(key, cached) : true;
+      })
+    );
+
+    const results: Array<Promise<TtsClip | null>> = [];
+    const pending: PendingClip[] = [];
+
+    requests.forEach((request, i) => {
+      const key = keys[i];
+      const cached = this.clips.get(key);
+      if (cached) {
+        this.touch(key, cached);
+        recordTtsCache('hit');
+        results.push(Promise.resolve(cached.clip));
+        return;
+      }
+      const running = this.inFlight.get(key);
+      if (running) {
+        recordTtsCache('coalesced');
+        results.push(running);
+        return;
+      }
+
+      let settle!: (clip: TtsClip | null, error?: unknown) => void;
+      const promise = new Promise<TtsClip | null>((resolve, reject) => {
+        settle = (clip, error) => (error === undefined ? resolve(clip) : reject(error));
+      });
+      this.inFlight.set(key, promise);
+      results.push(promise);
+      pending.push({
+        key,
+        request: { ...request, text: normalizeTtsText(request.text) },
+        settle: (clip, error) => {
+          this.inFlight.delete(key);
+          settle(clip, error);
+        },
+      });
+    });
+
+    // Subscribe before filling so a failed synthesis is never unhandled
+    const all = Promise.all(results);
+    if (pending.length > 0) {
+      await this.fill(pending, synthesize);
+    }
+    return all;
+  }
+
+  private async fill(pending: PendingClip[], synthesize: SynthesizeFn): Promise<void> {
+    // Another worker (or a previous run) may have stored the clip
+    const stored = await Promise.all(
+      pending.map(async (p) => {
+        const cached = await this.readStored(p.key);
+        return cached && (await this.usable(p.key, cached)) ? cached : null;
+      })
+    );
+    const misses = pending.filter((p, i) => {
+      const cached = stored[i];
+      if (!cached) return true;
+      recordTtsCache('diskHit');
+      this.remember(p.key, cached);
+      p.settle(cached.clip);
+      return false;
+    });
+    if (misses.length === 0) return;
+
+    const startedAt = performance.now();
+    let clips: Array<TtsClip | null>;
+    try {
+      clips = await synthesize(misses.map((m) => m.request));
+    } catch (error) {
+      recordTtsCache('error', misses.length);
+      misses.forEach((m) => m.settle(null, error));
+      return;
+    } finally {
+      observeTtsSynthesis(performance.now() - startedAt);
+    }
+
+    misses.forEach((m, i) => {
+      const clip = clips[i] ?? null;
+      if (clip) {
+        recordTtsCache('miss');
+        this.upstreamOrigin = originOf(clip.url) ?? this.upstreamOrigin;
+        const now = Date.now();
+        this.remember(m.key, { clip, storedAt: now, checkedAt: now });
+        this.writeStored(m.key, { text: m.request.text, voiceId: m.request.voiceId ?? null, clip, storedAt: now });
+      } else {
+        recordTtsCache('error');
+      }
+      m.settle(clip);
+    });
+  }
+
+  /**
+   * Whether a cached clip may still be handed out: not expired, served from
+   * the origin ai-content currently uses, and not missing upstream. Entries
+   * that fail are dropped from memory and disk.
+   */
+  private async usable(key: string, cached: CachedClip): Promise<boolean> {
+    const origin = originOf(cached.clip.url);
+    if (
+      Date.now() - cached.storedAt > getTtlMs() ||
+      (this.upstreamOrigin !== null && origin !== this.upstreamOrigin)
+    ) {
+      this.drop(key, cached);
+      return false;
+    }
+    if (Date.now() - cached.checkedAt < CHECK_INTERVAL_MS) return true;
+
+    let check = this.checking.get(key);
+    if (!check) {
+      check = this.checkUpstream(cached.clip.url).finally(() => this.checking.delete(key));
+      this.checking.set(key, check);
+    }
+    if (await check) {
+      cached.checkedAt = Date.now();
+      return true;
+    }
+    this.drop(key, cached);
+    return false;
+  }
+
+  /**
+   * false only when ai-content says the clip is gone; an unreachable
+   * ai-content keeps serving cached clips
+   */
+  private async checkUpstream(url: string): Promise<boolean> {
+    const controller = new AbortController();
+    const timeout = setTimeout(() => controller.abort(), CHECK_TIMEOUT_MS);
+    try {
+      const res = await fetch(url, { method: 'HEAD', signal: controller.signal });
+      return res.status !== 404 && res.status !== 410;
+    } catch {
+      return true;
+    } finally {
+      clearTimeout(timeout);
+    }
+  }
+
+  private drop(key: string, cached: CachedClip): void {
+    // Only if a fresher clip has not replaced it meanwhile
+    if (this.clips.get(key) === cached) {
+      this.clips.delete(key);
+      setTtsCacheEntries(this.clips.size);
+    }
+    recordTtsCache('stale');
+    fs.promises.unlink(this.pathFor(key)).catch(() => undefined);
+  }
+
+  private touch(key: string, cached: CachedClip): void {
+    this.clips.delete(key);
+    this.clips.set(key, cached);
+  }
+
+  private remember(key: string, cached: CachedClip): void {
+    this.touch(key, cached);
+    const maxEntries = getMaxEntries();
+    while (this.clips.size > maxEntries) {
+      const oldest = this.clips.keys().next().value!;
+      this.clips.delete(oldest);
+      recordTtsCache('evictions');
+      fs.promises.unlink(this.pathFor(oldest)).catch(() => undefined);
+    }
+    setTtsCacheEntries(this.clips.size);
+  }
+
+  private pathFor(key: string): string {
+    return path.join(getCacheDir(), `${key}.json`);
+  }
+
+  private async readStored(key: string): Promise<CachedClip | null> {
+    try {
+      const stored: StoredClip = JSON.parse(await fs.promises.readFile(this.pathFor(key), 'utf-8'));
+      if (!stored.clip?.url) return null;
+      // Entries from before expiry count as stored at the epoch, i.e. expired
+      return { clip: stored.clip, storedAt: stored.storedAt ?? 0, checkedAt: 0 };
+    } catch {
+      return null;
+    }
+  }
+
+  private writeStored(key: string, stored: StoredClip): void {
+    // Write-then-rename so concurrent readers never see a partial file
+    const target = this.pathFor(key);
+    // A dropped clip can be rewritten while its previous write is pending
+    const tmp = `${target}.${process.pid}.${++this.writes}.tmp`;
+    fs.promises
+      .mkdir(getCacheDir(), { recursive: true })
+      .then(() => fs.promises.writeFile(tmp, JSON.stringify(stored), 'utf-8'))
+      .then(() => fs.promises.rename(tmp, target))
+      .catch((error) => {
+        logger.warn('TTS clip cache: failed to store clip', { key, error: error.message });
+      });
+  }
+
+  private async load(): Promise<void> {
+    if (!isEnabled()) return;
+    const cacheDir = getCacheDir();
+    await fs.promises.mkdir(cacheDir, { recursive: true });
+
+    const files = (await fs.promises.readdir(cacheDir)).filter((f) => f.endsWith('.json'));
+    const entries = await Promise.all(
+      files.map(async (file) => {
+        try {
+          const stat = await fs.promises.stat(path.join(cacheDir, file));
+          return { key: file.slice(0, -'.json'.length), mtimeMs: stat.mtimeMs };
+        } catch {
+          return null;
+        }
+      })
+    );
+    const byAge = entries
+      .filter((e): e is { key: string; mtimeMs: number } => e !== null)
+      .sort((a, b) => a.mtimeMs - b.mtimeMs);
+
+    // Oldest beyond the bound are evicted from disk too
+    const keep = byAge.slice(-getMaxEntries());
+    for (const { key } of byAge.slice(0, byAge.length - keep.length)) {
+      fs.promises.unlink(this.pathFor(key)).catch(() => undefined);
+    }
+    const ttlMs = getTtlMs();
+    let expired = 0;
+    for (const { key } of keep) {
+      const cached = await this.readStored(key);
+      if (!cached) continue;
+      if (Date.now() - cached.storedAt > ttlMs) {
+        expired++;
+        fs.promises.unlink(this.pathFor(key)).catch(() => undefined);
+        continue;
+      }
+      this.clips.set(key, cached);
+    }
+    setTtsCacheEntries(this.clips.size);
+
+    logger.info('TTS clip cache loaded', {
+      cacheDir,
+      entries: this.clips.size,
+      evicted: byAge.length - keep.length,
+      expired,
+    });
+  }
+}
+
+export const ttsClipCache = new TtsClipCache();
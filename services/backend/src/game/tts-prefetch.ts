@@ -3,10 +3,14 @@
  * Result stored on session._ttsManifest for audio-director to consume.
  * Silent no-op if ai-content is unreachable — audio-director skips TTS
  * events gracefully when manifest is absent.
+ *
+ * Every clip goes through the cross-session clip cache (tts-clip-cache.ts):
+ * ai-content is only asked for text no session has synthesized yet.
  */
 import { Session } from '../store/session-store';
 import { TtsManifestEntry } from '../types/state';
 import { logger } from '../utils/logger';
+import { SynthesizeFn, TtsClip, ttsClipCache } from './tts-clip-cache';
 
 // Import förbättrade script templates med SSML breaks
 import {
@@ -48,6 +52,67 @@ async function fetchWithTimeout(input: FetchInput, init: FetchInit, timeoutMs: n
   }
 }
 
+/**
+ * One POST /tts per request
+ */
+const synthesizeSingle: SynthesizeFn = (requests) =>
+  Promise.all(
+    requests.map(async (request) => {
+      const res = await fetchWithTimeout(`${getAIContentUrl()}/tts`, {
+        method:  'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body:    JSON.stringify(request),
+      }, DEFAULT_TTS_TIMEOUT_MS);
+
+      if (!res.ok) {
+        logger.warn('TTS: ai-content /tts non-OK', { status: res.status });
+        return null;
+      }
+
+      const data = await res.json() as { assetId: string; url: string; durationMs: number };
+      return { assetId: data.assetId, url: data.url, durationMs: data.durationMs };
+    })
+  );
+
+/**
+ * One POST /tts/batch for all requests (ai-content paces the lines itself);
+ * lines it drops come back as null
+ */
+function synthesizeBatch(roundId: string): SynthesizeFn {
+  return async (requests) => {
+    const voiceLines = requests.map((request, i) => ({ ...request, phraseId: `line_${i}` }));
+    const res = await fetchWithTimeout(`${getAIContentUrl()}/tts/batch`, {
+      method:  'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body:    JSON.stringify({ roundId, voiceLines }),
+    }, DEFAULT_TTS_TIMEOUT_MS);
+
+    if (!res.ok) {
+      logger.warn('TTS: ai-content /tts/batch non-OK', { roundId, status: res.status });
+      return requests.map(() => null);
+    }
+
+    const data = await res.json() as { clips: TtsManifestEntry[] };
+    const byPhrase = new Map(data.clips.map((clip) => [clip.phraseId, clip]));
+    return voiceLines.map((line) => {
+      const clip = byPhrase.get(line.phraseId);
+      if (!clip) return null;
+      // url = <ai-content>/cache/<assetId>.<ext>
+      const assetId = (clip.url.split('/').pop() ?? '').replace(/\.[^.]*$/, '');
+      return { assetId, url: clip.url, durationMs: clip.durationMs };
+    });
+  };
+}
+
+/**
+ * A single clip through the shared cache. null = ai-content answered
+ * without a clip; throws when it is unreachable.
+ */
+async function synthesizeClip(text: string): Promise<TtsClip | null> {
+  const [clip] = await ttsClipCache.resolve([{ text }], synthesizeSingle);
+  return clip;
+}
+
 // ── banter phrase pool — nu med förbättrade templates från script-templates.ts
 // Keys = phraseId prefixes that audio-director.ts searches via startsWith().
 // Values = Swedish texts with SSML breaks for natural timing.
@@ -73,7 +138,8 @@ function buildBanterLines(): Array<{ phraseId: string; text: string }> {
 /**
  * Generates a single voice_clue_<level> TTS clip on-demand.
  * Uses script-templates.ts buildClueRead() for natural phrasing with SSML breaks.
- * POSTs to ai-content /tts, and adds the clip to session._ttsManifest.
+ * Synthesized via the shared clip cache (POST /tts on a miss), and added to
+ * session._ttsManifest.
  * Returns the clip entry (or null on failure).
  */
 export async function generateClueVoice(
@@ -85,21 +151,15 @@ export async function generateClueVoice(
   const text = buildClueRead(clueLevel, clueText);
 
   try {
-    const res = await fetchWithTimeout(`${getAIContentUrl()}/tts`, {
-      method:  'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body:    JSON.stringify({ text }),
-    }, DEFAULT_TTS_TIMEOUT_MS);
+    const data = await synthesizeClip(text);
 
-    if (!res.ok) {
+    if (!data) {
       logger.warn('generateClueVoice: ai-content non-OK', {
-        sessionId: session.sessionId, clueLevel, status: res.status,
+        sessionId: session.sessionId, clueLevel,
       });
       return null;
     }
 
-    const data = await res.json() as { assetId: string; url: string; durationMs: number };
-
     const entry: TtsManifestEntry = {
       clipId:        `voice_clue_${clueLevel}`,
       phraseId:      `voice_clue_${clueLevel}`,
@@ -137,7 +197,8 @@ export async function generateClueVoice(
 /**
  * Generates a voice_question_<index> TTS clip on-demand.
  * Uses script-templates.ts buildQuestionRead() for natural phrasing with SSML breaks.
- * POSTs to ai-content /tts, and adds the clip to session._ttsManifest.
+ * Synthesized via the shared clip cache (POST /tts on a miss), and added to
+ * session._ttsManifest.
  * Returns the clip entry (or null on failure).
  */
 export async function generateQuestionVoice(
@@ -149,21 +210,15 @@ export async function generateQuestionVoice(
   const { text } = buildQuestionRead(questionText);
 
   try {
-    const res = await fetchWithTimeout(`${getAIContentUrl()}/tts`, {
-      method:  'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body:    JSON.stringify({ text }),
-    }, DEFAULT_TTS_TIMEOUT_MS);
+    const data = await synthesizeClip(text);
 
-    if (!res.ok) {
+    if (!data) {
       logger.warn('generateQuestionVoice: ai-content non-OK', {
-        sessionId: session.sessionId, questionIndex, status: res.status,
+        sessionId: session.sessionId, questionIndex,
       });
       return null;
     }
 
-    const data = await res.json() as { assetId: string; url: string; durationMs: number };
-
     const entry: TtsManifestEntry = {
       clipId:        `voice_question_${questionIndex}`,
       phraseId:      `voice_question_${questionIndex}`,
@@ -193,7 +248,7 @@ export async function generateQuestionVoice(
 /**
  * Generates a one-off TTS clip for the followup-intro bridge phrase
  * Uses script-templates.ts buildFollowupIntro() for natural phrasing with SSML breaks.
- * Follows the same POST /tts pattern as generateClueVoice / generateQuestionVoice.
+ * Goes through the clip cache like generateClueVoice / generateQuestionVoice.
  * Returns the manifest entry (or null when ai-content is unreachable).
  */
 export async function generateFollowupIntroVoice(
@@ -205,23 +260,17 @@ export async function generateFollowupIntroVoice(
   const estimatedDurationMs = estimateDuration(text);
 
   try {
-    const res = await fetchWithTimeout(`${getAIContentUrl()}/tts`, {
-      method:  'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body:    JSON.stringify({ text }),
-    }, DEFAULT_TTS_TIMEOUT_MS);
+    const data = await synthesizeClip(text);
 
-    if (!res.ok) {
+    if (!data) {
       logger.warn('generateFollowupIntroVoice: ai-content non-OK', {
-        sessionId: session.sessionId, status: res.status,
+        sessionId: session.sessionId,
       });
       // Return a synthetic entry with the estimated duration so the caller
       // can still schedule the pause even without a real clip.
       return { clipId: 'voice_followup_intro', phraseId: 'voice_followup_intro', url: '', durationMs: estimatedDurationMs, generatedAtMs: Date.now() };
     }
 
-    const data = await res.json() as { assetId: string; url: string; durationMs: number };
-
     const entry: TtsManifestEntry = {
       clipId:        'voice_followup_intro',
       phraseId:      'voice_followup_intro',
@@ -254,24 +303,37 @@ export async function prefetchRoundTts(session: Session): Promise<void> {
   const voiceLines = buildBanterLines();
 
   try {
-    const res = await fetchWithTimeout(`${getAIContentUrl()}/tts/batch`, {
-      method:  'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body:    JSON.stringify({ roundId, voiceLines }),
-    }, DEFAULT_TTS_TIMEOUT_MS);
+    // Lines already synthesized for any session come from the cache; one
+    // /tts/batch covers the rest
+    const clips = await ttsClipCache.resolve(
+      voiceLines.map(({ text }) => ({ text })),
+      synthesizeBatch(roundId)
+    );
+
+    const manifest: TtsManifestEntry[] = [];
+    voiceLines.forEach((line, i) => {
+      const clip = clips[i];
+      if (!clip) return;
+      manifest.push({
+        clipId:        `${line.phraseId}_${roundId}`,
+        phraseId:      line.phraseId,
+        url:           clip.url,
+        durationMs:    clip.durationMs,
+        generatedAtMs: Date.now(),
+      });
+    });
 
-    if (!res.ok) {
+    if (manifest.length === 0) {
       logger.warn('prefetchRoundTts: ai-content non-OK', {
-        sessionId: session.sessionId, status: res.status,
+        sessionId: session.sessionId,
       });
       return;
     }
 
-    const data = await res.json() as { clips: TtsManifestEntry[] };
-    (session as any)._ttsManifest = data.clips;
+    (session as any)._ttsManifest = manifest;
 
     logger.info('prefetchRoundTts: manifest stored', {
-      sessionId: session.sessionId, clipCount: data.clips.length,
+      sessionId: session.sessionId, clipCount: manifest.length,
     });
   } catch (err) {
     logger.warn('prefetchRoundTts: ai-content unreachable — audio text-only', {
@@ -2,8 +2,13 @@
  * Entry point for På Spåret Party Backend
  */
 
+import cluster from 'cluster';
 import dotenv from 'dotenv';
 import { createServer as createHTTPServer } from 'http';
+import { notifyWorkerReady, startCluster } from './cluster/primary';
+import { WORKER_HOST } from './cluster/router';
+import { initContentPackIndex } from './game/content-pack-loader';
+import { ttsClipCache } from './game/tts-clip-cache';
 import { createServer, createWebSocketServer } from './server';
 import { logger } from './utils/logger';
 
@@ -12,55 +17,85 @@ dotenv.config();
 
 const PORT = parseInt(process.env.PORT || '3000', 10);
 const NODE_ENV = process.env.NODE_ENV || 'development';
+// Worker processes (clustered mode, see cluster/primary.ts); 1 = single process
+const CLUSTER_WORKERS = parseInt(process.env.CLUSTER_WORKERS || '1', 10);
+const CLUSTER_WORKER_BASE_PORT = parseInt(process.env.CLUSTER_WORKER_BASE_PORT || String(PORT + 100), 10);
 
-// Create Express app
-const app = createServer();
-
-// Create HTTP server
-const httpServer = createHTTPServer(app);
-
-// Create WebSocket server
-const wss = createWebSocketServer(httpServer);
-
-// Start server
-httpServer.listen(PORT, () => {
-  logger.info(`Backend server started`, {
-    port: PORT,
-    env: NODE_ENV,
-    endpoints: {
-      http: `http://localhost:${PORT}`,
-      ws: `ws://localhost:${PORT}/ws`,
-      health: `http://localhost:${PORT}/health`,
-    },
+function startServer() {
+  // Index content packs in the background; listing requests wait for it
+  initContentPackIndex().catch((error) => {
+    logger.error('Failed to build content pack index', { error: error.message });
   });
-});
+  void ttsClipCache.init();
 
-// Graceful shutdown
-process.on('SIGTERM', () => {
-  logger.info('SIGTERM received, shutting down gracefully');
+  // Create Express app
+  const app = createServer();
 
-  wss.close(() => {
-    logger.info('WebSocket server closed');
-  });
+  // Create HTTP server
+  const httpServer = createHTTPServer(app);
 
-  httpServer.close(() => {
-    logger.info('HTTP server closed');
-    process.exit(0);
-  });
-});
+  // Create WebSocket server
+  const wss = createWebSocketServer(httpServer);
+
+  const onListening = () => {
+    logger.info(`Backend server started`, {
+      port: PORT,
+      env: NODE_ENV,
+      ...(cluster.isWorker
+        ? { clusterWorker: process.env.CLUSTER_WORKER_INDEX }
+        : {
+            endpoints: {
+              http: `http://localhost:${PORT}`,
+              ws: `ws://localhost:${PORT}/ws`,
+              health: `http://localhost:${PORT}/health`,
+            },
+          }),
+    });
+  };
+
+  // Start server (cluster workers only take traffic from the router)
+  if (cluster.isWorker) {
+    httpServer.listen({ port: PORT, host: WORKER_HOST, exclusive: true }, () => {
+      onListening();
+      notifyWorkerReady();
+    });
+  } else {
+    httpServer.listen(PORT, onListening);
+  }
 
-process.on('SIGINT', () => {
-  logger.info('SIGINT received, shutting down gracefully');
+  // Graceful shutdown
+  process.on('SIGTERM', () => {
+    logger.info('SIGTERM received, shutting down gracefully');
 
-  wss.close(() => {
-    logger.info('WebSocket server closed');
+    wss.close(() => {
+      logger.info('WebSocket server closed');
+    });
+
+    httpServer.close(() => {
+      logger.info('HTTP server closed');
+      process.exit(0);
+    });
   });
 
-  httpServer.close(() => {
-    logger.info('HTTP server closed');
-    process.exit(0);
+  process.on('SIGINT', () => {
+    logger.info('SIGINT received, shutting down gracefully');
+
+    wss.close(() => {
+      logger.info('WebSocket server closed');
+    });
+
+    httpServer.close(() => {
+      logger.info('HTTP server closed');
+      process.exit(0);
+    });
   });
-});
+}
+
+if (cluster.isPrimary && CLUSTER_WORKERS > 1) {
+  startCluster({ port: PORT, workers: CLUSTER_WORKERS, workerBasePort: CLUSTER_WORKER_BASE_PORT });
+} else {
+  startServer();
+}
 
 // Handle uncaught errors
 process.on('uncaughtException', (error) => {
@@ -6,69 +6,85 @@
 import { Router, Request, Response } from 'express';
 import { logger } from '../utils/logger';
 import {
-  listContentPacks,
-  loadContentPack,
   contentPackExists,
+  forgetContentPack,
+  initContentPackIndex,
+  loadContentPackAsync,
+  queryContentPacks,
+  refreshContentPack,
 } from '../game/content-pack-loader';
-import axios from 'axios';
+import {
+  GenerationOptions,
+  getGenerationStatus,
+  submitGeneration,
+  watchGeneration,
+} from '../game/content-generation';
+import { sessionStore } from '../store/session-store';
 import * as fs from 'fs';
 import * as path from 'path';
 
 const router = Router();
 
+// Upper bound for ?limit= on the pack listing
+const MAX_PAGE_SIZE = 500;
+
 /**
- * Gets AI Content Service URL from environment
+ * Parses a non-negative integer query parameter
  */
-function getAIContentServiceUrl(): string {
-  return process.env.AI_CONTENT_SERVICE_URL || 'http://localhost:3002';
+function parseCount(value: unknown): number | undefined | null {
+  if (value === undefined) return undefined;
+  const n = Number(value);
+  return Number.isInteger(n) && n >= 0 ? n : null;
 }
 
 /**
  * GET /v1/content/packs
- * Lists all available content packs with metadata
+ * Lists content packs with metadata from the in-memory index (newest first)
  * Returns ContentPackInfo format expected by iOS Host
+ * Query: limit?, offset?, verified? (true|false), q? (destination/country/roundId)
  */
-router.get('/v1/content/packs', (_req: Request, res: Response) => {
+router.get('/v1/content/packs', async (req: Request, res: Response) => {
   try {
-    const packIds = listContentPacks();
+    const limit = parseCount(req.query.limit);
+    const offset = parseCount(req.query.offset);
+    const verified = req.query.verified;
+    const q = req.query.q;
+    if (
+      limit === null ||
+      limit === 0 ||
+      offset === null ||
+      (verified !== undefined && verified !== 'true' && verified !== 'false') ||
+      (q !== undefined && typeof q !== 'string')
+    ) {
+      return res.status(400).json({
+        error: 'Invalid query',
+        message: 'limit must be a positive integer, offset a non-negative integer, verified true or false',
+      });
+    }
 
-    logger.info('Loading content packs with metadata', {
-      count: packIds.length,
+    await initContentPackIndex();
+    const page = queryContentPacks({
+      limit: limit === undefined ? undefined : Math.min(limit, MAX_PAGE_SIZE),
+      offset,
+      verified: verified === undefined ? undefined : verified === 'true',
+      q: typeof q === 'string' ? q : undefined,
     });
 
-    // Load each pack to extract metadata
-    const packs = [];
-    const errors = [];
-
-    for (const id of packIds) {
-      try {
-        const pack = loadContentPack(id);
-        packs.push({
-          roundId: pack.id,
-          destinationName: pack.name,
-          destinationCountry: pack.country,
-          generatedAt: pack.metadata?.generatedAt || new Date().toISOString(),
-          verified: pack.metadata?.verified || false,
-          antiLeakChecked: pack.metadata?.antiLeakChecked || false,
-        });
-      } catch (error: any) {
-        logger.error('Failed to load content pack for listing', {
-          packId: id,
-          error: error.message,
-        });
-        errors.push({ packId: id, error: error.message });
-      }
-    }
-
-    logger.info('Listed content packs', {
-      successCount: packs.length,
-      errorCount: errors.length,
+    logger.debug('Listed content packs', {
+      count: page.packs.length,
+      total: page.total,
+      offset: page.offset,
+      errorCount: page.errors.length,
     });
 
     return res.status(200).json({
-      packs,
-      count: packs.length,
-      errors: errors.length > 0 ? errors : undefined,
+      packs: page.packs,
+      count: page.packs.length,
+      total: page.total,
+      offset: page.offset,
+      nextOffset: page.nextOffset,
+      // Unreadable packs are reported with the first page
+      errors: page.offset === 0 && page.errors.length > 0 ? page.errors : undefined,
     });
   } catch (error: any) {
     logger.error('Failed to list content packs', {
@@ -85,7 +101,7 @@ router.get('/v1/content/packs', (_req: Request, res: Response) => {
  * GET /v1/content/packs/:id
  * Gets a specific content pack (for preview)
  */
-router.get('/v1/content/packs/:id', (req: Request, res: Response) => {
+router.get('/v1/content/packs/:id', async (req: Request, res: Response) => {
   try {
     const packId = req.params.id;
 
@@ -98,7 +114,7 @@ router.get('/v1/content/packs/:id', (req: Request, res: Response) => {
     }
 
     // Load the pack
-    const pack = loadContentPack(packId);
+    const pack = await loadContentPackAsync(packId);
 
     logger.info('Content pack retrieved', {
       packId,
@@ -128,125 +144,144 @@ router.get('/v1/content/packs/:id', (req: Request, res: Response) => {
 });
 
 /**
- * POST /v1/content/generate
- * Starts content pack generation via ai-content service
- * Body: { theme?: string, language?: string }
- * Returns: { generateId: string, status: string }
+ * Parses the body shared by the generate routes
  */
-router.post('/v1/content/generate', async (req: Request, res: Response) => {
-  try {
-    const { theme, language } = req.body;
-
-    const aiContentUrl = getAIContentServiceUrl();
-    const generateEndpoint = `${aiContentUrl}/generate/round`;
+function parseGenerateBody(body: any): { count: number; options: GenerationOptions } | null {
+  const { count = 1, theme, language, regions } = body ?? {};
+  if (typeof count !== 'number' || !Number.isInteger(count) || count < 1 || count > 5) {
+    return null;
+  }
+  if (regions !== undefined && (!Array.isArray(regions) || !regions.every((r: unknown) => typeof r === 'string'))) {
+    return null;
+  }
+  if (theme !== undefined && typeof theme !== 'string') {
+    return null;
+  }
+  return { count, options: { theme, language, regions } };
+}
 
-    logger.info('Initiating content generation', {
-      aiContentUrl: generateEndpoint,
-      theme,
-      language,
+/**
+ * Responds to a failed call to ai-content
+ */
+function sendGenerationError(res: Response, error: any, action: string): Response {
+  logger.error(`Failed to ${action}`, {
+    error: error.message,
+    response: error.response?.data,
+  });
+
+  if (error.response) {
+    // Forward error from ai-content service (429 = generation queue full)
+    return res.status(error.response.status).json({
+      error: 'Content generation failed',
+      message: error.response.data?.error || error.response.data?.message || error.message,
     });
+  }
 
-    // Proxy request to ai-content service
-    const response = await axios.post(
-      generateEndpoint,
-      {
-        theme,
-        language: language || 'sv',
-      },
-      {
-        timeout: 10000, // 10s timeout for initial request
-      }
-    );
-
-    const { roundId, status } = response.data;
+  return res.status(500).json({
+    error: 'Internal server error',
+    message: `Failed to ${action}: ${error.message}`,
+  });
+}
 
-    logger.info('Content generation started', {
-      roundId,
-      status,
+/**
+ * POST /v1/content/generate
+ * Queues content pack generation on the ai-content service
+ * Body: { count?: 1-5, theme?: string, language?: string, regions?: string[] }
+ * Returns 202: { generateId: string (first job), generateIds: string[], status: string }
+ */
+router.post('/v1/content/generate', async (req: Request, res: Response) => {
+  const parsed = parseGenerateBody(req.body);
+  if (!parsed) {
+    return res.status(400).json({
+      error: 'Validation error',
+      message: 'count must be an integer between 1 and 5, regions an array of strings, theme a string',
     });
+  }
+
+  try {
+    const jobs = await submitGeneration(parsed.count, parsed.options);
 
     return res.status(202).json({
-      generateId: roundId,
-      status,
-      roundId, // Also return roundId for clarity
+      generateId: jobs[0]?.generateId,
+      generateIds: jobs.map((job) => job.generateId),
+      status: jobs[0]?.status ?? 'generating',
     });
   } catch (error: any) {
-    logger.error('Failed to initiate content generation', {
-      error: error.message,
-      response: error.response?.data,
+    return sendGenerationError(res, error, 'start content generation');
+  }
+});
+
+/**
+ * POST /v1/sessions/:sessionId/content/generate
+ * Queues content pack generation for a session; the host receives
+ * CONTENT_GENERATION_PROGRESS events until every pack is done
+ * Body: { count?: 1-5, theme?: string, language?: string, regions?: string[] }
+ * Returns 202: { generateIds: string[], jobs: GenerationStatus[] }
+ */
+router.post('/v1/sessions/:sessionId/content/generate', async (req: Request, res: Response) => {
+  const sessionId = req.params.sessionId;
+  if (!sessionStore.getSession(sessionId)) {
+    return res.status(404).json({
+      error: 'Not found',
+      message: 'Session not found',
     });
+  }
 
-    if (error.response) {
-      // Forward error from ai-content service
-      return res.status(error.response.status).json({
-        error: 'Content generation failed',
-        message: error.response.data?.message || error.message,
-      });
-    }
+  const parsed = parseGenerateBody(req.body);
+  if (!parsed) {
+    return res.status(400).json({
+      error: 'Validation error',
+      message: 'count must be an integer between 1 and 5, regions an array of strings, theme a string',
+    });
+  }
 
-    return res.status(500).json({
-      error: 'Internal server error',
-      message: `Failed to start content generation: ${error.message}`,
+  try {
+    const jobs = await submitGeneration(parsed.count, parsed.options);
+    watchGeneration(sessionId, jobs);
+
+    return res.status(202).json({
+      generateIds: jobs.map((job) => job.generateId),
+      jobs,
     });
+  } catch (error: any) {
+    return sendGenerationError(res, error, 'start content generation');
   }
 });
 
 /**
  * GET /v1/content/generate/:id/status
  * Polls content generation status
- * Returns: { status: "generating" | "completed" | "failed", currentStep?, totalSteps?, contentPackId? }
+ * Returns: { generateId, status: "generating" | "completed" | "failed", currentStep, totalSteps,
+ *            currentStepDescription?, contentPackId?, destination?, error? }
  */
 router.get(
   '/v1/content/generate/:id/status',
   async (req: Request, res: Response) => {
+    const generateId = req.params.id;
     try {
-      const generateId = req.params.id;
-
-      const aiContentUrl = getAIContentServiceUrl();
-      const statusEndpoint = `${aiContentUrl}/generate/round/${generateId}/status`;
-
-      logger.debug('Polling content generation status', {
-        generateId,
-        statusEndpoint,
-      });
-
-      // Proxy request to ai-content service
-      const response = await axios.get(statusEndpoint, {
-        timeout: 5000, // 5s timeout
-      });
-
-      const { status, currentStep, totalSteps, roundId } = response.data;
-
-      logger.debug('Content generation status retrieved', {
-        generateId,
-        status,
-        currentStep,
-        totalSteps,
-      });
-
-      return res.status(200).json({
-        status,
-        currentStep,
-        totalSteps,
-        contentPackId: roundId,
-      });
-    } catch (error: any) {
-      logger.error('Failed to get content generation status', {
-        generateId: req.params.id,
-        error: error.message,
-      });
-
-      if (error.response?.status === 404) {
+      const status = await getGenerationStatus(generateId);
+      if (!status) {
         return res.status(404).json({
           error: 'Not found',
           message: 'Generation task not found',
         });
       }
 
-      return res.status(500).json({
-        error: 'Internal server error',
-        message: `Failed to get generation status: ${error.message}`,
+      // List a finished pack before the host tries to select it
+      if (status.status === 'completed' && status.contentPackId) {
+        await refreshContentPack(status.contentPackId);
+      }
+
+      logger.debug('Content generation status retrieved', {
+        generateId,
+        status: status.status,
+        currentStep: status.currentStep,
+        totalSteps: status.totalSteps,
       });
+
+      return res.status(200).json(status);
+    } catch (error: any) {
+      return sendGenerationError(res, error, 'get generation status');
     }
   }
 );
@@ -255,7 +290,7 @@ router.get(
  * DELETE /v1/content/packs/:id
  * Deletes a content pack from disk
  */
-router.delete('/v1/content/packs/:id', (req: Request, res: Response) => {
+router.delete('/v1/content/packs/:id', async (req: Request, res: Response) => {
   try {
     const packId = req.params.id;
 
@@ -272,7 +307,8 @@ router.delete('/v1/content/packs/:id', (req: Request, res: Response) => {
       process.env.CONTENT_PACKS_DIR || '/tmp/pa-sparet-content-packs';
     const packPath = path.join(contentPacksDir, `${packId}.json`);
 
-    fs.unlinkSync(packPath);
+    await fs.promises.unlink(packPath);
+    forgetContentPack(packId);
 
     logger.info('Content pack deleted', { packId });
 
@@ -294,7 +330,7 @@ router.delete('/v1/content/packs/:id', (req: Request, res: Response) => {
  * Imports a content pack from JSON
  * Body: ContentPack JSON structure
  */
-router.post('/v1/content/packs/import', (req: Request, res: Response) => {
+router.post('/v1/content/packs/import', async (req: Request, res: Response) => {
   try {
     const contentPack = req.body;
 
@@ -340,12 +376,13 @@ router.post('/v1/content/packs/import', (req: Request, res: Response) => {
       process.env.CONTENT_PACKS_DIR || '/tmp/pa-sparet-content-packs';
 
     // Ensure directory exists
-    if (!fs.existsSync(contentPacksDir)) {
-      fs.mkdirSync(contentPacksDir, { recursive: true });
-    }
+    await fs.promises.mkdir(contentPacksDir, { recursive: true });
 
     const packPath = path.join(contentPacksDir, `${contentPack.roundId}.json`);
-    fs.writeFileSync(packPath, JSON.stringify(contentPack, null, 2), 'utf-8');
+    await fs.promises.writeFile(packPath, JSON.stringify(contentPack, null, 2), 'utf-8');
+
+    // List it right away rather than when the directory watcher fires
+    await refreshContentPack(contentPack.roundId);
 
     logger.info('Content pack imported', {
       packId: contentPack.roundId,
@@ -6,17 +6,67 @@
 import { Router, Request, Response } from 'express';
 import { logger } from '../utils/logger';
 import { sessionStore, GamePlan, DestinationConfig } from '../store/session-store';
-import { loadContentPack, contentPackExists } from '../game/content-pack-loader';
+import { loadContentPack, contentPackExists, prefetchContentPack } from '../game/content-pack-loader';
+import {
+  GenerationStatus,
+  getAIContentServiceUrl,
+  submitGeneration,
+  watchGeneration,
+} from '../game/content-generation';
 import axios from 'axios';
 import { getServerTimeMs } from '../utils/time';
 
 const router = Router();
 
 /**
- * Gets AI Content Service URL from environment
+ * Creates an AI-sourced GamePlan over the given content packs, in order
  */
-function getAIContentServiceUrl(): string {
-  return process.env.AI_CONTENT_SERVICE_URL || 'http://localhost:3002';
+function buildAIGamePlan(contentPackIds: string[]): GamePlan {
+  const destinations: DestinationConfig[] = contentPackIds.map((contentPackId, index) => ({
+    contentPackId,
+    sourceType: 'ai' as const,
+    order: index + 1,
+  }));
+
+  return {
+    destinations,
+    currentIndex: 0,
+    mode: 'ai',
+    createdAt: getServerTimeMs(),
+    generatedBy: 'ai-content',
+  };
+}
+
+/**
+ * Sets the game plan once the jobs of an async generate-ai request have
+ * finished. Failed jobs are left out; nothing is set when none completed or
+ * the session has left LOBBY in the meantime.
+ */
+function applyGeneratedGamePlan(sessionId: string, statuses: GenerationStatus[]): void {
+  const session = sessionStore.getSession(sessionId);
+  const packIds = statuses
+    .filter((status) => status.status === 'completed' && status.contentPackId)
+    .map((status) => status.contentPackId!);
+
+  if (!session || session.state.phase !== 'LOBBY' || packIds.length === 0) {
+    logger.warn('AI game plan not applied', {
+      sessionId,
+      phase: session?.state.phase,
+      completed: packIds.length,
+      requested: statuses.length,
+    });
+    return;
+  }
+
+  session.gamePlan = buildAIGamePlan(packIds);
+  packIds.forEach((packId) => prefetchContentPack(packId));
+
+  logger.info('AI game plan created', {
+    sessionId,
+    destinationCount: packIds.length,
+    failed: statuses.length - packIds.length,
+    packIds,
+  });
 }
 
 /**
@@ -88,17 +138,21 @@ function parseDestinationPrompt(prompt: string): { count?: number; regions?: str
 /**
  * POST /v1/sessions/:sessionId/game-plan/generate-ai
  * Creates a game plan by generating multiple destinations via AI
- * Body: { numDestinations?: 1-5, regions?: string[], prompt?: string }
+ * Body: { numDestinations?: 1-5, regions?: string[], prompt?: string, async?: boolean }
  * - If prompt is provided, it will be parsed to extract count and regions
  * - Otherwise, numDestinations and regions will be used directly
  * Returns: { gamePlan: GamePlan, destinations: DestinationSummary[] }
+ * - With async: true the destinations are queued as generation jobs and the
+ *   route returns 202 { generateIds } right away. The host receives
+ *   CONTENT_GENERATION_PROGRESS events; the game plan is set (from the packs
+ *   that completed) before the event for the last job goes out.
  */
 router.post(
   '/v1/sessions/:sessionId/game-plan/generate-ai',
   async (req: Request, res: Response) => {
     try {
       const sessionId = req.params.sessionId;
-      const { numDestinations, regions, prompt } = req.body;
+      const { numDestinations, regions, prompt, async: runAsync } = req.body;
 
       // Validate session exists
       const session = sessionStore.getSession(sessionId);
@@ -156,6 +210,19 @@ router.post(
         prompt: prompt || undefined,
       });
 
+      if (runAsync === true) {
+        const jobs = await submitGeneration(count, {
+          regions: targetRegions || [],
+          language: 'sv',
+        });
+        watchGeneration(sessionId, jobs, (statuses) => applyGeneratedGamePlan(sessionId, statuses));
+
+        return res.status(202).json({
+          generateIds: jobs.map((job) => job.generateId),
+          jobs,
+        });
+      }
+
       // Call ai-content service to generate batch
       const aiContentUrl = getAIContentServiceUrl();
       const batchEndpoint = `${aiContentUrl}/generate/batch`;
@@ -186,29 +253,13 @@ router.post(
         });
       }
 
-      // Create GamePlan
-      const destinations: DestinationConfig[] = packs.map(
-        (pack: any, index: number) => ({
-          contentPackId: pack.id,
-          sourceType: 'ai' as const,
-          order: index + 1,
-        })
-      );
-
-      const gamePlan: GamePlan = {
-        destinations,
-        currentIndex: 0,
-        mode: 'ai',
-        createdAt: getServerTimeMs(),
-        generatedBy: 'ai-content',
-      };
-
-      // Save to session
+      // Create GamePlan and save to session
+      const gamePlan = buildAIGamePlan(packs.map((pack: any) => pack.id));
       session.gamePlan = gamePlan;
 
       logger.info('AI game plan created', {
         sessionId,
-        destinationCount: destinations.length,
+        destinationCount: gamePlan.destinations.length,
         packIds: packs.map((p: any) => p.id),
       });
 
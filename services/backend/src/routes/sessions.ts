@@ -6,6 +6,7 @@ import { Router, Request, Response } from 'express';
 import { sessionStore } from '../store/session-store';
 import { signToken } from '../utils/auth';
 import { logger } from '../utils/logger';
+import { isTimeScaleRequestAllowed, MAX_TIME_SCALE, parseTimeScale } from '../utils/time-scale';
 
 const router = Router();
 
@@ -19,10 +20,32 @@ function getPublicBaseUrl(): string {
 /**
  * POST /v1/sessions
  * Creates a new session
+ *
+ * Optional body: { timeScale } — accelerated-clock test mode, only when
+ * ALLOW_TIME_SCALE=true (see utils/time-scale.ts)
  */
-router.post('/v1/sessions', (_req: Request, res: Response) => {
+router.post('/v1/sessions', (req: Request, res: Response) => {
   try {
-    const session = sessionStore.createSession();
+    const requestedScale = req.body?.timeScale;
+    let timeScale: number | undefined;
+    if (requestedScale !== undefined) {
+      if (!isTimeScaleRequestAllowed()) {
+        return res.status(403).json({
+          error: 'Forbidden',
+          message: 'timeScale requires ALLOW_TIME_SCALE=true on the server',
+        });
+      }
+      const parsed = parseTimeScale(requestedScale);
+      if (parsed === null) {
+        return res.status(400).json({
+          error: 'Validation error',
+          message: `timeScale must be a number between 1 and ${MAX_TIME_SCALE}`,
+        });
+      }
+      timeScale = parsed;
+    }
+
+    const session = sessionStore.createSession({ timeScale });
 
     const hostAuthToken = signToken({
       sessionId: session.sessionId,
@@ -42,6 +65,7 @@ router.post('/v1/sessions', (_req: Request, res: Response) => {
     logger.info('Session created via REST API', {
       sessionId: session.sessionId,
       joinCode: session.joinCode,
+      timeScale: session.timeScale,
     });
 
     return res.status(201).json({
@@ -51,6 +75,7 @@ router.post('/v1/sessions', (_req: Request, res: Response) => {
       hostAuthToken,
       wsUrl,
       joinUrlTemplate,
+      timeScale: session.timeScale,
     });
   } catch (error) {
     logger.error('Failed to create session', { error });
@@ -7,9 +7,23 @@ import cors from 'cors';
 import path from 'path';
 import { WebSocketServer, WebSocket } from 'ws';
 import { Server as HTTPServer } from 'http';
+import { performance } from 'perf_hooks';
 import { logger } from './utils/logger';
 import { getServerTimeMs, getUptimeSeconds } from './utils/time';
+import { scaleMs } from './utils/time-scale';
+import {
+  collectMetrics,
+  recordSnapshotBroadcast,
+  sendEvent,
+  sendFrame,
+  setCompressionInfo,
+  startEventLoopMonitor,
+} from './utils/metrics';
+import { sessionScheduler } from './utils/session-scheduler';
+import { SnapshotFrames } from './utils/snapshot-frames';
+import { DeltaChannel, nextSnapshotSeq, wantsDeltaSnapshots } from './utils/state-delta';
 import { authenticateWSConnection } from './utils/ws-auth';
+import { describeCompression, getPerMessageDeflateOptions } from './utils/ws-compression';
 import { sessionStore } from './store/session-store';
 import {
   buildWelcomeEvent,
@@ -40,7 +54,13 @@ import sessionRoutes from './routes/sessions';
 import contentRoutes from './routes/content';
 import gamePlanRoutes from './routes/game-plan';
 import { startGame, nextClue, pullBrake, submitAnswer, releaseBrake, startFollowupSequence, submitFollowupAnswer, lockFollowupAnswers, scoreFollowupQuestion, hasMoreDestinations, advanceToNextDestination, getCurrentDestinationInfo } from './game/state-machine';
-import { contentPackExists, loadContentPack } from './game/content-pack-loader';
+import {
+  contentPackExists,
+  getContentPackSummary,
+  loadContentPack,
+  loadContentPackAsync,
+  prefetchContentPack,
+} from './game/content-pack-loader';
 import {
   onRoundIntro,
   onGameStart,
@@ -82,6 +102,14 @@ async function safeGenerateTts<T>(
   }
 }
 
+/**
+ * Pacing delay for a session, compressed in accelerated-clock test mode
+ * (see utils/time-scale.ts).
+ */
+function pace(sessionId: string, ms: number): number {
+  return scaleMs(sessionStore.getSession(sessionId), ms);
+}
+
 export function createServer() {
   const app = express();
 
@@ -102,6 +130,12 @@ export function createServer() {
     });
   });
 
+  // Hot-path metrics (send counts/bytes, projection cost, timers, event-loop lag)
+  startEventLoopMonitor();
+  app.get('/metrics', (_req: Request, res: Response) => {
+    res.status(200).json(collectMetrics(sessionStore.getAllSessions(), sessionScheduler.pending()));
+  });
+
   // API Routes
   app.use(sessionRoutes);
   app.use(contentRoutes);
@@ -124,12 +158,17 @@ export function createServer() {
 }
 
 export function createWebSocketServer(server: HTTPServer) {
+  const perMessageDeflate = getPerMessageDeflateOptions();
   const wss = new WebSocketServer({
     server,
     path: '/ws',
+    perMessageDeflate,
   });
+  setCompressionInfo(describeCompression(perMessageDeflate));
 
-  logger.info('WebSocket server created on path /ws');
+  logger.info('WebSocket server created on path /ws', {
+    compression: describeCompression(perMessageDeflate),
+  });
 
   wss.on('connection', async (ws: WebSocket, req) => {
     const ip = req.socket.remoteAddress;
@@ -197,12 +236,19 @@ export function createWebSocketServer(server: HTTPServer) {
       role.toUpperCase(),
       actualPlayerId
     );
-    ws.send(JSON.stringify(welcomeEvent));
-
-    // Send STATE_SNAPSHOT with role-based projection
-    const projectedState = projectState(session.state, role, actualPlayerId);
-    const snapshotEvent = buildStateSnapshotEvent(sessionId, projectedState);
-    ws.send(JSON.stringify(snapshotEvent));
+    sendEvent(ws, welcomeEvent);
+
+    // Send STATE_SNAPSHOT with role-based projection (versioned for delta mode)
+    const connection = sessionStore.getConnection(sessionId, actualPlayerId)!;
+    if (wantsDeltaSnapshots(req)) {
+      connection.delta = new DeltaChannel();
+      const state = new SnapshotFrames(sessionId, session.state).stateFor(role, actualPlayerId);
+      sendEvent(ws, connection.delta.full(sessionId, nextSnapshotSeq(session), state));
+    } else {
+      const projectedState = projectState(session.state, role, actualPlayerId);
+      const snapshotEvent = buildStateSnapshotEvent(sessionId, projectedState);
+      sendEvent(ws, snapshotEvent);
+    }
 
     logger.info('Sent WELCOME and STATE_SNAPSHOT', {
       sessionId,
@@ -255,7 +301,7 @@ export function createWebSocketServer(server: HTTPServer) {
           'VALIDATION_ERROR',
           'Invalid message format'
         );
-        ws.send(JSON.stringify(errorEvent));
+        sendEvent(ws, errorEvent);
       }
     });
 
@@ -320,20 +366,10 @@ export function createWebSocketServer(server: HTTPServer) {
         if (player) {
           player.disconnectedAt = getServerTimeMs();
 
-          // Initialize disconnect timers map if needed
-          if (!updatedSession._disconnectTimers) {
-            updatedSession._disconnectTimers = new Map();
-          }
-
-          // Clear any existing timer for this player
-          const existingTimer = updatedSession._disconnectTimers.get(actualPlayerId);
-          if (existingTimer) {
-            clearTimeout(existingTimer);
-          }
-
-          // Schedule cleanup after 60 second grace period
+          // Schedule cleanup after 60 second grace period (replaces any
+          // earlier timer for this player)
           const GRACE_PERIOD_MS = 60000;
-          const cleanupTimer = setTimeout(() => {
+          sessionScheduler.schedule(sessionId, 'disconnect', () => {
             const sess = sessionStore.getSession(sessionId);
             if (!sess) return;
 
@@ -352,13 +388,8 @@ export function createWebSocketServer(server: HTTPServer) {
               // Broadcast PLAYER_LEFT with reason 'timeout'
               const leftEvent = buildPlayerLeftEvent(sessionId, actualPlayerId, 'timeout');
               sessionStore.broadcastEventToSession(sessionId, leftEvent);
-
-              // Clean up timer reference
-              sess._disconnectTimers?.delete(actualPlayerId);
             }
-          }, GRACE_PERIOD_MS);
-
-          updatedSession._disconnectTimers.set(actualPlayerId, cleanupTimer);
+          }, GRACE_PERIOD_MS, { slot: `disconnect:${actualPlayerId}` });
 
           logger.info('Player/host/tv marked as disconnected with grace period', {
             sessionId,
@@ -419,6 +450,14 @@ function handleClientMessage(
       handleResumeSession(ws, sessionId, playerId, role, payload);
       break;
 
+    case 'STATE_ACK':
+      handleStateAck(ws, sessionId, playerId, payload);
+      break;
+
+    case 'STATE_RESYNC':
+      handleStateResync(ws, sessionId, playerId);
+      break;
+
     case 'HOST_START_GAME':
       handleHostStartGame(ws, sessionId, playerId, role);
       break;
@@ -458,7 +497,7 @@ function handleClientMessage(
         'VALIDATION_ERROR',
         `Unknown message type: ${type}`
       );
-      ws.send(JSON.stringify(unknownEvent));
+      sendEvent(ws, unknownEvent);
   }
 }
 
@@ -486,7 +525,7 @@ function handleResumeSession(
       'UNAUTHORIZED',
       'Player ID mismatch'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -499,7 +538,7 @@ function handleResumeSession(
       'INVALID_SESSION',
       'Session not found'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -517,16 +556,11 @@ function handleResumeSession(
     });
 
     // Cancel the grace period cleanup timer
-    if (session._disconnectTimers) {
-      const timer = session._disconnectTimers.get(playerId);
-      if (timer) {
-        clearTimeout(timer);
-        session._disconnectTimers.delete(playerId);
-        logger.info('RESUME_SESSION: Cancelled grace period timer', {
-          sessionId,
-          playerId,
-        });
-      }
+    if (sessionScheduler.cancel(sessionId, `disconnect:${playerId}`)) {
+      logger.info('RESUME_SESSION: Cancelled grace period timer', {
+        sessionId,
+        playerId,
+      });
     }
 
     // Clear disconnectedAt timestamp
@@ -549,7 +583,7 @@ function handleResumeSession(
           connPlayerId
         );
         const snapshotEvent = buildStateSnapshotEvent(sessionId, projectedState);
-        connection.ws.send(JSON.stringify(snapshotEvent));
+        sendEvent(connection.ws, snapshotEvent);
       }
     });
 
@@ -568,7 +602,64 @@ function handleResumeSession(
   // Send STATE_SNAPSHOT with role-based projection
   const projectedState = projectState(session.state, role as any, playerId);
   const snapshotEvent = buildStateSnapshotEvent(sessionId, projectedState);
-  ws.send(JSON.stringify(snapshotEvent));
+  sendEvent(ws, snapshotEvent);
+}
+
+/**
+ * Returns the delta channel of the sending connection, or replies with an
+ * error if this connection did not opt in with ?snapshots=delta
+ */
+function getDeltaChannel(ws: WebSocket, sessionId: string, playerId: string): DeltaChannel | undefined {
+  const connection = sessionStore.getConnection(sessionId, playerId);
+  if (!connection || connection.ws !== ws || !connection.delta) {
+    const errorEvent = buildErrorEvent(
+      sessionId,
+      'VALIDATION_ERROR',
+      'Delta snapshots not enabled on this connection'
+    );
+    sendEvent(ws, errorEvent);
+    return undefined;
+  }
+  return connection.delta;
+}
+
+/**
+ * Handles STATE_ACK event (delta mode): the acknowledged version becomes the
+ * base for the next STATE_PATCH
+ */
+function handleStateAck(
+  ws: WebSocket,
+  sessionId: string,
+  playerId: string,
+  payload: any
+): void {
+  const delta = getDeltaChannel(ws, sessionId, playerId);
+  if (!delta) return;
+
+  if (typeof payload?.seq !== 'number' || !delta.ack(payload.seq)) {
+    // Stale or unknown version: harmless, the next patch uses the previous base
+    logger.debug('STATE_ACK: Unknown snapshot version', { sessionId, playerId, seq: payload?.seq });
+  }
+}
+
+/**
+ * Handles STATE_RESYNC event (delta mode): full versioned snapshot, either
+ * after a version gap or for the client to verify its patched state
+ */
+function handleStateResync(ws: WebSocket, sessionId: string, playerId: string): void {
+  const delta = getDeltaChannel(ws, sessionId, playerId);
+  if (!delta) return;
+
+  const session = sessionStore.getSession(sessionId)!;
+  const connection = sessionStore.getConnection(sessionId, playerId)!;
+  const event =
+    delta.resync(sessionId) ??
+    delta.full(
+      sessionId,
+      nextSnapshotSeq(session),
+      new SnapshotFrames(sessionId, session.state).stateFor(connection.role, playerId)
+    );
+  sendEvent(ws, event);
 }
 
 /**
@@ -592,7 +683,7 @@ async function handleHostStartGame(
       'UNAUTHORIZED',
       'Only host can start game'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -605,7 +696,7 @@ async function handleHostStartGame(
       'INVALID_SESSION',
       'Session not found'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -620,10 +711,19 @@ async function handleHostStartGame(
       'INVALID_PHASE',
       'Game already started'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
+  // startGame() loads the pack synchronously; have it in the cache first so
+  // the event loop does not block on disk (a failed load falls back to
+  // hardcoded content inside startGame)
+  const selectedPackId = session.state.contentPackId;
+  if (selectedPackId) {
+    await loadContentPackAsync(selectedPackId).catch(() => undefined);
+    if (session.state.phase !== 'LOBBY') return; // started meanwhile
+  }
+
   try {
     // Start game - this loads destination and first clue into state
     const gameData = startGame(session);
@@ -665,7 +765,7 @@ async function handleHostStartGame(
     });
 
     // ── Delayed transition: ROUND_INTRO → CLUE_LEVEL ─────────────────
-    setTimeout(async () => {
+    sessionScheduler.schedule(sessionId, 'intro', async () => {
       // Re-fetch session — it must still exist and still be in ROUND_INTRO
       const sess = sessionStore.getSession(sessionId);
       if (!sess || sess.state.phase !== 'ROUND_INTRO') {
@@ -713,7 +813,7 @@ async function handleHostStartGame(
           sess.state.roundIndex || 0,
           gameData.clueIndex,
           clueClip?.durationMs ?? 0,
-          getClueTimerDuration(gameData.clueLevelPoints),
+          pace(sessionId, getClueTimerDuration(gameData.clueLevelPoints)),
           sess.state.clueTimerEnd ?? undefined
         );
         sessionStore.broadcastEventToSession(sessionId, clueEvent);
@@ -728,7 +828,7 @@ async function handleHostStartGame(
           error: innerError.message,
         });
       }
-    }, introDelayMs);
+    }, pace(sessionId, introDelayMs), { phase: 'ROUND_INTRO' });
 
   } catch (error: any) {
     logger.error('HOST_START_GAME: Failed to start game', {
@@ -740,7 +840,7 @@ async function handleHostStartGame(
       'INTERNAL_ERROR',
       `Failed to start game: ${error.message}`
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
   }
 }
 
@@ -765,7 +865,7 @@ async function handleHostNextClue(
       'UNAUTHORIZED',
       'Only host can advance clues'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -778,7 +878,7 @@ async function handleHostNextClue(
       'INVALID_SESSION',
       'Session not found'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -795,7 +895,7 @@ async function handleHostNextClue(
       'INVALID_PHASE',
       'Not in clue phase'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -810,9 +910,7 @@ async function handleHostNextClue(
     session._isAdvancingClue = true;
 
     // Clear any pending auto-advance timer — manual override takes priority
-    if (session._clueTimer) {
-      clearTimeout(session._clueTimer);
-      session._clueTimer = undefined;
+    if (sessionScheduler.cancel(sessionId, 'clue')) {
       session.state.clueTimerEnd = null;
       logger.info('HOST_NEXT_CLUE: Cleared pending clue auto-advance timer', { sessionId });
     }
@@ -867,7 +965,7 @@ async function handleHostNextClue(
       );
 
       // Wait 800 ms after music fade before broadcasting snapshot
-      await new Promise((resolve) => setTimeout(resolve, 800));
+      await sessionScheduler.sleep(sessionId, 'pacing', pace(sessionId, 800));
 
       // Broadcast STATE_SNAPSHOT to all clients
       broadcastStateSnapshot(sessionId);
@@ -885,7 +983,7 @@ async function handleHostNextClue(
         PRE_REVEAL_PAUSE_MS,
         totalWaitMs: banterDurationMs + PRE_REVEAL_PAUSE_MS,
       });
-      await new Promise((resolve) => setTimeout(resolve, banterDurationMs + PRE_REVEAL_PAUSE_MS));
+      await sessionScheduler.sleep(sessionId, 'pacing', pace(sessionId, banterDurationMs + PRE_REVEAL_PAUSE_MS));
 
       // Broadcast DESTINATION_REVEAL event
       logger.info('Broadcasting DESTINATION_REVEAL', {
@@ -908,7 +1006,7 @@ async function handleHostNextClue(
 
       // Wait 4000 ms — celebration pause (let destination name sit on screen)
       const REVEAL_CELEBRATION_MS = 4000;
-      await new Promise((resolve) => setTimeout(resolve, REVEAL_CELEBRATION_MS));
+      await sessionScheduler.sleep(sessionId, 'pacing', pace(sessionId, REVEAL_CELEBRATION_MS));
 
       // Build and broadcast DESTINATION_RESULTS event
       const results = session.state.lockedAnswers.map((answer) => {
@@ -936,7 +1034,7 @@ async function handleHostNextClue(
 
       // Wait 6000 ms — results hold (time to review who was right/wrong)
       const RESULTS_HOLD_MS = 6000;
-      await new Promise((resolve) => setTimeout(resolve, RESULTS_HOLD_MS));
+      await sessionScheduler.sleep(sessionId, 'pacing', pace(sessionId, RESULTS_HOLD_MS));
 
       // Audio: correct/incorrect banter
       const anyCorrect = results.some((r) => r.isCorrect);
@@ -983,7 +1081,7 @@ async function handleHostNextClue(
 
         // 4) Wait for clip to finish + 1500 ms breathing window, then present first followup
         const INTRO_BREATHING_MS = 2500; // 2.5s — natural pause before followup
-        setTimeout(async () => {
+        sessionScheduler.schedule(sessionId, 'intro', async () => {
           const sess = sessionStore.getSession(sessionId);
           if (!sess || sess.state.phase !== 'FOLLOWUP_QUESTION') {
             logger.debug('handleHostNextClue: FOLLOWUP_INTRO timer fired but phase changed, ignoring', { sessionId });
@@ -1007,7 +1105,7 @@ async function handleHostNextClue(
           fqAudioEvents.forEach((e) => sessionStore.broadcastEventToSession(sessionId, e));
 
           scheduleFollowupTimer(sessionId, followupStart.timerDurationMs);
-        }, introDurationMs + INTRO_BREATHING_MS);
+        }, pace(sessionId, introDurationMs + INTRO_BREATHING_MS), { phase: 'FOLLOWUP_QUESTION' });
       } else {
         const scoreboardEvent = buildScoreboardUpdateEvent(
           sessionId,
@@ -1060,7 +1158,7 @@ async function handleHostNextClue(
         session.state.roundIndex || 0,
         result.clueIndex!,
         clueClip?.durationMs ?? 0,
-        getClueTimerDuration(result.clueLevelPoints!),
+        pace(sessionId, getClueTimerDuration(result.clueLevelPoints!)),
         session.state.clueTimerEnd ?? undefined
       );
       sessionStore.broadcastEventToSession(sessionId, clueEvent);
@@ -1085,7 +1183,7 @@ async function handleHostNextClue(
       'INTERNAL_ERROR',
       `Failed to advance clue: ${error.message}`
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
   } finally {
     // Clear advancing flag
     const sess = sessionStore.getSession(sessionId);
@@ -1117,7 +1215,7 @@ function handleBrakePull(
       'UNAUTHORIZED',
       'Only players can pull brake'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -1130,7 +1228,7 @@ function handleBrakePull(
       'INVALID_SESSION',
       'Session not found'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -1166,9 +1264,7 @@ function handleBrakePull(
       );
 
       // Clear clue auto-advance timer — game is paused for brake
-      if (session._clueTimer) {
-        clearTimeout(session._clueTimer);
-        session._clueTimer = undefined;
+      if (sessionScheduler.cancel(sessionId, 'clue')) {
         session.state.clueTimerEnd = null;
         logger.info('BRAKE_PULL: Cleared pending clue auto-advance timer', { sessionId });
       }
@@ -1194,7 +1290,7 @@ function handleBrakePull(
         result.reason!,
         result.winnerPlayerId
       );
-      ws.send(JSON.stringify(rejectedEvent));
+      sendEvent(ws, rejectedEvent);
     }
   } catch (error: any) {
     logger.error('BRAKE_PULL: Failed to process brake', {
@@ -1207,7 +1303,7 @@ function handleBrakePull(
       'INTERNAL_ERROR',
       `Failed to process brake: ${error.message}`
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
   }
 }
 
@@ -1223,33 +1319,33 @@ function handleBrakeAnswerSubmit(
 ): void {
   // Only players can submit answers
   if (role !== 'player') {
-    ws.send(JSON.stringify(buildErrorEvent(sessionId, 'UNAUTHORIZED', 'Only players can submit answers')));
+    sendEvent(ws, buildErrorEvent(sessionId, 'UNAUTHORIZED', 'Only players can submit answers'));
     return;
   }
 
   const session = sessionStore.getSession(sessionId);
   if (!session) {
-    ws.send(JSON.stringify(buildErrorEvent(sessionId, 'INVALID_SESSION', 'Session not found')));
+    sendEvent(ws, buildErrorEvent(sessionId, 'INVALID_SESSION', 'Session not found'));
     return;
   }
 
   // Must be in PAUSED_FOR_BRAKE
   if (session.state.phase !== 'PAUSED_FOR_BRAKE') {
-    ws.send(JSON.stringify(buildErrorEvent(sessionId, 'INVALID_PHASE', 'Game is not paused for brake')));
+    sendEvent(ws, buildErrorEvent(sessionId, 'INVALID_PHASE', 'Game is not paused for brake'));
     return;
   }
 
   // Must be the brake owner
   if (session.state.brakeOwnerPlayerId !== playerId) {
     logger.warn('BRAKE_ANSWER_SUBMIT: Not brake owner', { sessionId, playerId, brakeOwner: session.state.brakeOwnerPlayerId });
-    ws.send(JSON.stringify(buildErrorEvent(sessionId, 'UNAUTHORIZED', 'Only the brake owner can submit an answer')));
+    sendEvent(ws, buildErrorEvent(sessionId, 'UNAUTHORIZED', 'Only the brake owner can submit an answer'));
     return;
   }
 
   // Validate payload
   const answerText = payload?.answerText;
   if (!answerText || typeof answerText !== 'string' || answerText.trim().length === 0 || answerText.length > 200) {
-    ws.send(JSON.stringify(buildErrorEvent(sessionId, 'VALIDATION_ERROR', 'answerText must be 1-200 characters')));
+    sendEvent(ws, buildErrorEvent(sessionId, 'VALIDATION_ERROR', 'answerText must be 1-200 characters'));
     return;
   }
 
@@ -1286,7 +1382,7 @@ function handleBrakeAnswerSubmit(
     );
 
     // Wait 1 200 ms to let the lock moment land before auto-advancing
-    setTimeout(() => {
+    sessionScheduler.schedule(sessionId, 'pacing', () => {
       const sess = sessionStore.getSession(sessionId);
       if (!sess || sess.state.phase !== 'CLUE_LEVEL') {
         logger.debug('Answer-lock delay expired but phase changed, ignoring', { sessionId });
@@ -1294,11 +1390,11 @@ function handleBrakeAnswerSubmit(
       }
       // Auto-advance to next clue (or reveal) now that the answer is locked
       autoAdvanceClue(sessionId);
-    }, 1200);
+    }, pace(sessionId, 1200), { phase: 'CLUE_LEVEL' });
 
   } catch (error: any) {
     logger.error('BRAKE_ANSWER_SUBMIT: Failed', { sessionId, playerId, error: error.message });
-    ws.send(JSON.stringify(buildErrorEvent(sessionId, 'INTERNAL_ERROR', error.message)));
+    sendEvent(ws, buildErrorEvent(sessionId, 'INTERNAL_ERROR', error.message));
   }
 }
 
@@ -1325,7 +1421,7 @@ function handleHostSelectContentPack(
       'UNAUTHORIZED',
       'Only host can select content pack'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -1338,7 +1434,7 @@ function handleHostSelectContentPack(
       'INVALID_SESSION',
       'Session not found'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -1353,7 +1449,7 @@ function handleHostSelectContentPack(
       'INVALID_PHASE',
       'Cannot select content pack during active game'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -1370,7 +1466,7 @@ function handleHostSelectContentPack(
       'VALIDATION_ERROR',
       'contentPackId must be a string or null'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -1387,14 +1483,21 @@ function handleHostSelectContentPack(
         'INVALID_CONTENT_PACK',
         `Content pack not found: ${contentPackId}`
       );
-      ws.send(JSON.stringify(errorEvent));
+      sendEvent(ws, errorEvent);
       return;
     }
 
-    // Load pack to get destination name for confirmation event
+    // Destination name for the confirmation event: from the index, else
+    // load the pack (not indexed yet, or invalid → error below)
     try {
-      const pack = loadContentPack(contentPackId);
-      destinationName = pack.name;
+      const summary = getContentPackSummary(contentPackId);
+      if (summary) {
+        destinationName = summary.destinationName;
+        // Warm the cache so HOST_START_GAME does not read the file
+        prefetchContentPack(contentPackId);
+      } else {
+        destinationName = loadContentPack(contentPackId).name;
+      }
     } catch (error: any) {
       logger.error('HOST_SELECT_CONTENT_PACK: Failed to load content pack', {
         sessionId,
@@ -1406,7 +1509,7 @@ function handleHostSelectContentPack(
         'INTERNAL_ERROR',
         `Failed to load content pack: ${error.message}`
       );
-      ws.send(JSON.stringify(errorEvent));
+      sendEvent(ws, errorEvent);
       return;
     }
   }
@@ -1456,7 +1559,7 @@ async function handleNextDestination(
       'UNAUTHORIZED',
       'Only host can advance to next destination'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -1469,7 +1572,7 @@ async function handleNextDestination(
       'INVALID_SESSION',
       'Session not found'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -1483,7 +1586,7 @@ async function handleNextDestination(
       'INVALID_OPERATION',
       'No game plan exists for this session'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -1498,7 +1601,7 @@ async function handleNextDestination(
       'INVALID_PHASE',
       `Cannot advance destination from phase: ${session.state.phase}`
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -1514,15 +1617,13 @@ async function handleNextDestination(
       'INVALID_OPERATION',
       'No more destinations available'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
   try {
     // Clear scoreboard auto-advance timer if host manually triggers
-    if (session._scoreboardTimer) {
-      clearTimeout(session._scoreboardTimer);
-      session._scoreboardTimer = undefined;
+    if (sessionScheduler.cancel(sessionId, 'scoreboard')) {
       logger.info('NEXT_DESTINATION: Cleared scoreboard auto-advance timer', { sessionId });
     }
     // Clear locked answers from previous destination
@@ -1540,7 +1641,7 @@ async function handleNextDestination(
         'INTERNAL_ERROR',
         'Failed to load next destination'
       );
-      ws.send(JSON.stringify(errorEvent));
+      sendEvent(ws, errorEvent);
       return;
     }
 
@@ -1555,7 +1656,7 @@ async function handleNextDestination(
         'INTERNAL_ERROR',
         'Failed to get destination info'
       );
-      ws.send(JSON.stringify(errorEvent));
+      sendEvent(ws, errorEvent);
       return;
     }
 
@@ -1570,7 +1671,7 @@ async function handleNextDestination(
         'INTERNAL_ERROR',
         'No destination loaded'
       );
-      ws.send(JSON.stringify(errorEvent));
+      sendEvent(ws, errorEvent);
       return;
     }
 
@@ -1651,7 +1752,7 @@ async function handleNextDestination(
         session.state.roundIndex || 0,
         0, // clueIndex
         clueClip?.durationMs ?? 0,
-        getClueTimerDuration(firstCluePoints),
+        pace(sessionId, getClueTimerDuration(firstCluePoints)),
         session.state.clueTimerEnd ?? undefined
       );
       sessionStore.broadcastEventToSession(sessionId, clueEvent);
@@ -1692,7 +1793,7 @@ async function handleNextDestination(
       });
 
       // Delayed transition: ROUND_INTRO → CLUE_LEVEL
-      setTimeout(async () => {
+      sessionScheduler.schedule(sessionId, 'intro', async () => {
         const sess = sessionStore.getSession(sessionId);
         if (!sess || sess.state.phase !== 'ROUND_INTRO') {
           logger.debug('NEXT_DESTINATION: ROUND_INTRO timer fired but phase changed, ignoring', { sessionId });
@@ -1747,7 +1848,7 @@ async function handleNextDestination(
             sess.state.roundIndex || 0,
             0, // clueIndex
             clueClip?.durationMs ?? 0,
-            getClueTimerDuration(firstCluePoints),
+            pace(sessionId, getClueTimerDuration(firstCluePoints)),
             sess.state.clueTimerEnd ?? undefined
           );
           sessionStore.broadcastEventToSession(sessionId, clueEvent);
@@ -1762,7 +1863,7 @@ async function handleNextDestination(
             error: innerError.message,
           });
         }
-      }, introDelayMs);
+      }, pace(sessionId, introDelayMs), { phase: 'ROUND_INTRO' });
     }
 
   } catch (error: any) {
@@ -1775,7 +1876,7 @@ async function handleNextDestination(
       'INTERNAL_ERROR',
       `Failed to advance destination: ${error.message}`
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
   }
 }
 
@@ -1801,7 +1902,7 @@ function handleEndGame(
       'UNAUTHORIZED',
       'Only host can end game'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -1814,7 +1915,7 @@ function handleEndGame(
       'INVALID_SESSION',
       'Session not found'
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
@@ -1832,28 +1933,24 @@ function handleEndGame(
       'INVALID_PHASE',
       `Cannot end game from phase: ${session.state.phase}`
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
     return;
   }
 
   try {
     // Clear all active timers
-    if (session._scoreboardTimer) {
-      clearTimeout(session._scoreboardTimer);
-      session._scoreboardTimer = undefined;
+    if (sessionScheduler.cancel(sessionId, 'scoreboard')) {
       logger.info('END_GAME: Cleared scoreboard auto-advance timer', { sessionId });
     }
-    if (session._clueTimer) {
-      clearTimeout(session._clueTimer);
-      session._clueTimer = undefined;
+    if (sessionScheduler.cancel(sessionId, 'clue')) {
       session.state.clueTimerEnd = null;
       logger.info('END_GAME: Cleared clue auto-advance timer', { sessionId });
     }
-    if (session._followupTimer) {
-      clearTimeout(session._followupTimer);
-      session._followupTimer = undefined;
+    if (sessionScheduler.cancel(sessionId, 'followup')) {
       logger.info('END_GAME: Cleared followup timer', { sessionId });
     }
+    // ...and anything else still pending for the phase being left (intro holds)
+    sessionScheduler.cancelSession(sessionId, { phase: session.state.phase });
     // Calculate destinations completed
     const destInfo = getCurrentDestinationInfo(session);
     const destinationsCompleted = destInfo ? destInfo.index : 1;
@@ -1897,7 +1994,7 @@ function handleEndGame(
       'INTERNAL_ERROR',
       `Failed to end game: ${error.message}`
     );
-    ws.send(JSON.stringify(errorEvent));
+    sendEvent(ws, errorEvent);
   }
 }
 
@@ -1925,7 +2022,7 @@ function broadcastBrakeAnswerLocked(
       remainingClues,
       connection.role === 'host' ? answerText : undefined
     );
-    connection.ws.send(JSON.stringify(event));
+    sendEvent(connection.ws, event);
   });
 
   logger.info('Broadcasted BRAKE_ANSWER_LOCKED', { sessionId, playerId, lockedAtLevelPoints });
@@ -1941,18 +2038,24 @@ function broadcastStateSnapshot(sessionId: string): void {
     return;
   }
 
-  // Send projected state to each connected client based on their role
+  // Send projected state to each connected client based on their role.
+  // Projections and serialization are shared per role within this broadcast.
+  const start = performance.now();
+  const frames = new SnapshotFrames(sessionId, session.state);
+  const seq = nextSnapshotSeq(session);
+  let recipients = 0;
   session.connections.forEach((connection, connPlayerId) => {
     if (connection.ws.readyState === 1) { // WebSocket.OPEN
-      const projectedState = projectState(
-        session.state,
-        connection.role as any,
-        connPlayerId
-      );
-      const snapshotEvent = buildStateSnapshotEvent(sessionId, projectedState);
-      connection.ws.send(JSON.stringify(snapshotEvent));
+      if (connection.delta) {
+        const state = frames.stateFor(connection.role, connPlayerId);
+        sendEvent(connection.ws, connection.delta.next(sessionId, seq, state));
+      } else {
+        sendFrame(connection.ws, 'STATE_SNAPSHOT', frames.frameFor(connection.role, connPlayerId));
+      }
+      recipients++;
     }
   });
+  recordSnapshotBroadcast(performance.now() - start, recipients);
 
   logger.debug('Broadcasted STATE_SNAPSHOT to all clients', {
     sessionId,
@@ -1975,37 +2078,37 @@ function handleFollowupAnswerSubmit(
   payload: any
 ): void {
   if (role !== 'player') {
-    ws.send(JSON.stringify(buildErrorEvent(sessionId, 'UNAUTHORIZED', 'Only players can submit answers')));
+    sendEvent(ws, buildErrorEvent(sessionId, 'UNAUTHORIZED', 'Only players can submit answers'));
     return;
   }
 
   const session = sessionStore.getSession(sessionId);
   if (!session) {
-    ws.send(JSON.stringify(buildErrorEvent(sessionId, 'INVALID_SESSION', 'Session not found')));
+    sendEvent(ws, buildErrorEvent(sessionId, 'INVALID_SESSION', 'Session not found'));
     return;
   }
 
   if (session.state.phase !== 'FOLLOWUP_QUESTION') {
-    ws.send(JSON.stringify(buildErrorEvent(sessionId, 'INVALID_PHASE', 'Not in follow-up question phase')));
+    sendEvent(ws, buildErrorEvent(sessionId, 'INVALID_PHASE', 'Not in follow-up question phase'));
     return;
   }
 
   const answerText = payload?.answerText;
   if (!answerText || typeof answerText !== 'string' || answerText.trim().length === 0 || answerText.length > 200) {
-    ws.send(JSON.stringify(buildErrorEvent(sessionId, 'VALIDATION_ERROR', 'answerText must be 1-200 characters')));
+    sendEvent(ws, buildErrorEvent(sessionId, 'VALIDATION_ERROR', 'answerText must be 1-200 characters'));
     return;
   }
 
   const accepted = submitFollowupAnswer(session, playerId, answerText);
   if (!accepted) {
-    ws.send(JSON.stringify(buildErrorEvent(sessionId, 'VALIDATION_ERROR', 'Answer already submitted or timer expired')));
+    sendEvent(ws, buildErrorEvent(sessionId, 'VALIDATION_ERROR', 'Answer already submitted or timer expired'));
     return;
   }
 
   // Send updated STATE_SNAPSHOT only to this player so they see answeredByMe = true
   const projectedState = projectState(session.state, 'player', playerId);
   const snapshotEvent = buildStateSnapshotEvent(sessionId, projectedState);
-  ws.send(JSON.stringify(snapshotEvent));
+  sendEvent(ws, snapshotEvent);
 
   logger.info('FOLLOWUP_ANSWER_SUBMIT accepted', {
     sessionId,
@@ -2044,7 +2147,7 @@ function broadcastFollowupQuestionPresent(
       data.startAtServerMs,
       connection.role === 'host' ? data.question.correctAnswer : undefined
     );
-    connection.ws.send(JSON.stringify(event));
+    sendEvent(connection.ws, event);
   });
 
   logger.info('Broadcasted FOLLOWUP_QUESTION_PRESENT', {
@@ -2074,7 +2177,7 @@ function broadcastFollowupAnswersLocked(sessionId: string, currentQuestionIndex:
       lockedCount,
       connection.role === 'host' ? answersByPlayer : undefined
     );
-    connection.ws.send(JSON.stringify(event));
+    sendEvent(connection.ws, event);
   });
 
   logger.info('Broadcasted FOLLOWUP_ANSWERS_LOCKED', { sessionId, currentQuestionIndex, lockedCount });
@@ -2113,21 +2216,15 @@ function scheduleClueTimer(sessionId: string): void {
   const session = sessionStore.getSession(sessionId);
   if (!session) return;
 
-  // Clear any existing timer so we never have two racing
-  if (session._clueTimer) {
-    clearTimeout(session._clueTimer);
-    session._clueTimer = undefined;
-  }
-
   // Look up TTS duration from the round manifest
   const manifest: any[] | undefined = (session as any)._ttsManifest;
   const currentLevel = session.state.clueLevelPoints; // 10 | 8 | 6 | 4 | 2 | null
   const discussionDelayMs = currentLevel ? DISCUSSION_DELAY_BY_LEVEL[currentLevel] : 12_000;
   const clip = manifest?.find((c: any) => c.phraseId === `voice_clue_${currentLevel}`);
   const ttsDuration: number = clip?.durationMs ?? 0;
-  const totalDelay = ttsDuration > 0
+  const totalDelay = scaleMs(session, ttsDuration > 0
     ? ttsDuration + discussionDelayMs
-    : CLUE_FALLBACK_DURATION_MS;
+    : CLUE_FALLBACK_DURATION_MS);
 
   // Set clueTimerEnd in state so clients can display countdown
   const now = getServerTimeMs();
@@ -2138,7 +2235,8 @@ function scheduleClueTimer(sessionId: string): void {
 
   logger.info('Clue timer scheduled', { sessionId, currentLevel, ttsDuration, discussionDelayMs, totalDelay, timerEnd: session.state.clueTimerEnd });
 
-  const timeoutId = setTimeout(() => {
+  // The 'clue' slot holds one timer, so this replaces any earlier one
+  sessionScheduler.schedule(sessionId, 'clue', () => {
     // Guard: session must still exist and be in CLUE_LEVEL
     const sess = sessionStore.getSession(sessionId);
     if (!sess || sess.state.phase !== 'CLUE_LEVEL') {
@@ -2147,9 +2245,7 @@ function scheduleClueTimer(sessionId: string): void {
     }
     logger.info('Clue timer fired — auto-advancing', { sessionId, fromLevel: sess.state.clueLevelPoints });
     autoAdvanceClue(sessionId);
-  }, totalDelay);
-
-  session._clueTimer = timeoutId;
+  }, totalDelay, { slot: 'clue', phase: 'CLUE_LEVEL' });
 }
 
 /**
@@ -2187,8 +2283,8 @@ async function autoAdvanceClue(sessionId: string): Promise<void> {
   session._isAdvancingClue = true;
 
   try {
-    // Clear the timer reference since it's firing now
-    session._clueTimer = undefined;
+    // Drop the clue deadline (already gone when it is what fired)
+    sessionScheduler.cancel(sessionId, 'clue');
     session.state.clueTimerEnd = null;
 
     // If somehow still in brake phase, release it first (safety mirror)
@@ -2221,7 +2317,7 @@ async function autoAdvanceClue(sessionId: string): Promise<void> {
       );
 
       // Wait 800 ms after music fade before broadcasting snapshot
-      await new Promise((resolve) => setTimeout(resolve, 800));
+      await sessionScheduler.sleep(sessionId, 'pacing', pace(sessionId, 800));
 
       // Broadcast STATE_SNAPSHOT to all clients
       broadcastStateSnapshot(sessionId);
@@ -2239,7 +2335,7 @@ async function autoAdvanceClue(sessionId: string): Promise<void> {
         PRE_REVEAL_PAUSE_MS,
         totalWaitMs: banterDurationMs + PRE_REVEAL_PAUSE_MS,
       });
-      await new Promise((resolve) => setTimeout(resolve, banterDurationMs + PRE_REVEAL_PAUSE_MS));
+      await sessionScheduler.sleep(sessionId, 'pacing', pace(sessionId, banterDurationMs + PRE_REVEAL_PAUSE_MS));
 
       // Broadcast DESTINATION_REVEAL event
       logger.info('Broadcasting DESTINATION_REVEAL', {
@@ -2262,7 +2358,7 @@ async function autoAdvanceClue(sessionId: string): Promise<void> {
 
       // Wait 4000 ms — celebration pause (let destination name sit on screen)
       const REVEAL_CELEBRATION_MS = 4000;
-      await new Promise((resolve) => setTimeout(resolve, REVEAL_CELEBRATION_MS));
+      await sessionScheduler.sleep(sessionId, 'pacing', pace(sessionId, REVEAL_CELEBRATION_MS));
 
       // Build and broadcast DESTINATION_RESULTS event
       const results = session.state.lockedAnswers.map((answer) => {
@@ -2290,7 +2386,7 @@ async function autoAdvanceClue(sessionId: string): Promise<void> {
 
       // Wait 6000 ms — results hold (time to review who was right/wrong)
       const RESULTS_HOLD_MS = 6000;
-      await new Promise((resolve) => setTimeout(resolve, RESULTS_HOLD_MS));
+      await sessionScheduler.sleep(sessionId, 'pacing', pace(sessionId, RESULTS_HOLD_MS));
 
       // Audio: correct/incorrect banter
       const anyCorrect = results.some((r) => r.isCorrect);
@@ -2337,7 +2433,7 @@ async function autoAdvanceClue(sessionId: string): Promise<void> {
 
         // 4) Wait for clip to finish + 1500 ms breathing window, then present first followup
         const INTRO_BREATHING_MS = 2500; // 2.5s — natural pause before followup
-        setTimeout(async () => {
+        sessionScheduler.schedule(sessionId, 'intro', async () => {
           const sess = sessionStore.getSession(sessionId);
           if (!sess || sess.state.phase !== 'FOLLOWUP_QUESTION') {
             logger.debug('autoAdvanceClue: FOLLOWUP_INTRO timer fired but phase changed, ignoring', { sessionId });
@@ -2361,7 +2457,7 @@ async function autoAdvanceClue(sessionId: string): Promise<void> {
           fqAudioEvents.forEach((e) => sessionStore.broadcastEventToSession(sessionId, e));
 
           scheduleFollowupTimer(sessionId, followupStart.timerDurationMs);
-        }, introDurationMs + INTRO_BREATHING_MS);
+        }, pace(sessionId, introDurationMs + INTRO_BREATHING_MS), { phase: 'FOLLOWUP_QUESTION' });
       } else {
         const scoreboardEvent = buildScoreboardUpdateEvent(
           sessionId,
@@ -2414,7 +2510,7 @@ async function autoAdvanceClue(sessionId: string): Promise<void> {
         session.state.roundIndex || 0,
         result.clueIndex!,
         clueClip?.durationMs ?? 0,
-        getClueTimerDuration(result.clueLevelPoints!),
+        pace(sessionId, getClueTimerDuration(result.clueLevelPoints!)),
         session.state.clueTimerEnd ?? undefined
       );
       sessionStore.broadcastEventToSession(sessionId, clueEvent);
@@ -2431,7 +2527,7 @@ async function autoAdvanceClue(sessionId: string): Promise<void> {
           sessionStore.broadcastEventToSession(sessionId, e)
         );
         // Wait 500 ms for banter clip to start before playing clue voice
-        await new Promise((resolve) => setTimeout(resolve, 500));
+        await sessionScheduler.sleep(sessionId, 'pacing', pace(sessionId, 500));
       }
 
       // Emit clue voice after banter (if any)
@@ -2478,7 +2574,7 @@ function scheduleFollowupTimer(sessionId: string, durationMs: number): void {
   const session = sessionStore.getSession(sessionId);
   if (!session) return;
 
-  const timeoutId = setTimeout(async () => {
+  sessionScheduler.schedule(sessionId, 'followup', async () => {
     const sess = sessionStore.getSession(sessionId);
     if (!sess || !sess.state.followupQuestion) return;
 
@@ -2505,7 +2601,7 @@ function scheduleFollowupTimer(sessionId: string, durationMs: number): void {
     if (nextQuestionIndex !== null && sess.state.followupQuestion) {
       // ── 3 s pause so FOLLOWUP_RESULTS stays visible before next question ──
       const BETWEEN_FOLLOWUPS_MS = 3000;
-      setTimeout(async () => {
+      sessionScheduler.schedule(sessionId, 'followup', async () => {
         const s = sessionStore.getSession(sessionId);
         if (!s || !s.state.followupQuestion || s.state.phase !== 'FOLLOWUP_QUESTION') {
           logger.debug('scheduleFollowupTimer: between-followups pause expired but phase changed, ignoring', { sessionId });
@@ -2543,7 +2639,7 @@ function scheduleFollowupTimer(sessionId: string, durationMs: number): void {
         );
 
         scheduleFollowupTimer(sessionId, nextFq.timer!.durationMs);
-      }, BETWEEN_FOLLOWUPS_MS);
+      }, pace(sessionId, BETWEEN_FOLLOWUPS_MS), { slot: 'followup', phase: 'FOLLOWUP_QUESTION' });
     } else {
       // Last followup — hold FOLLOWUP_RESULTS for 3s before transitioning (breathing room)
       const endAudioEvents = onFollowupSequenceEnd(sess);
@@ -2555,7 +2651,7 @@ function scheduleFollowupTimer(sessionId: string, durationMs: number): void {
       const FOLLOWUP_COMPLETION_MS = 3000; // 3s breathing room before scoreboard
       console.log(`[Followup] Holding FOLLOWUP_RESULTS for ${FOLLOWUP_COMPLETION_MS}ms before transition...`);
 
-      setTimeout(() => {
+      sessionScheduler.schedule(sessionId, 'followup', () => {
         const s = sessionStore.getSession(sessionId);
         if (!s || s.state.phase !== 'FOLLOWUP_QUESTION') return;
 
@@ -2576,12 +2672,9 @@ function scheduleFollowupTimer(sessionId: string, durationMs: number): void {
           // Last destination — go straight to FINAL_RESULTS (skip SCOREBOARD)
           transitionToFinalResults(sessionId);
         }
-      }, FOLLOWUP_COMPLETION_MS);
+      }, pace(sessionId, FOLLOWUP_COMPLETION_MS), { slot: 'followup', phase: 'FOLLOWUP_QUESTION' });
     }
-  }, durationMs);
-
-  // Store handle so we could cancel on session teardown if needed
-  (sessionStore.getSession(sessionId) as any)._followupTimer = timeoutId;
+  }, durationMs, { slot: 'followup', phase: 'FOLLOWUP_QUESTION' });
 
   logger.info('Followup timer scheduled', { sessionId, durationMs });
 }
@@ -2604,19 +2697,15 @@ function scheduleScoreboardTimer(sessionId: string): void {
     return;
   }
 
-  // Clear any existing timer
-  if (session._scoreboardTimer) {
-    clearTimeout(session._scoreboardTimer);
-  }
-
   const SCOREBOARD_AUTO_ADVANCE_MS = 12000; // 12 seconds — see standings properly
 
   logger.info('Scoreboard auto-advance timer scheduled', {
     sessionId,
-    delayMs: SCOREBOARD_AUTO_ADVANCE_MS,
+    delayMs: scaleMs(session, SCOREBOARD_AUTO_ADVANCE_MS),
   });
 
-  const timeoutId = setTimeout(async () => {
+  // The 'scoreboard' slot holds one timer, so this replaces any earlier one
+  sessionScheduler.schedule(sessionId, 'scoreboard', async () => {
     const sess = sessionStore.getSession(sessionId);
     if (!sess || sess.state.phase !== 'SCOREBOARD') {
       logger.debug('Scoreboard timer fired but phase is not SCOREBOARD, ignoring', { sessionId });
@@ -2728,7 +2817,7 @@ function scheduleScoreboardTimer(sessionId: string): void {
           sess.state.roundIndex || 0,
           0, // clueIndex
           clueClip?.durationMs ?? 0,
-          getClueTimerDuration(firstCluePoints),
+          pace(sessionId, getClueTimerDuration(firstCluePoints)),
           sess.state.clueTimerEnd ?? undefined
         );
         sessionStore.broadcastEventToSession(sessionId, clueEvent);
@@ -2769,7 +2858,7 @@ function scheduleScoreboardTimer(sessionId: string): void {
         });
 
         // Delayed transition: ROUND_INTRO → CLUE_LEVEL
-        setTimeout(async () => {
+        sessionScheduler.schedule(sessionId, 'intro', async () => {
           const s = sessionStore.getSession(sessionId);
           if (!s || s.state.phase !== 'ROUND_INTRO') {
             logger.debug('Scoreboard auto-advance: ROUND_INTRO timer fired but phase changed, ignoring', { sessionId });
@@ -2820,7 +2909,7 @@ function scheduleScoreboardTimer(sessionId: string): void {
               s.state.roundIndex || 0,
               0, // clueIndex
               clueClip?.durationMs ?? 0,
-              getClueTimerDuration(firstCluePoints),
+              pace(sessionId, getClueTimerDuration(firstCluePoints)),
               s.state.clueTimerEnd ?? undefined
             );
             sessionStore.broadcastEventToSession(sessionId, clueEvent);
@@ -2835,7 +2924,7 @@ function scheduleScoreboardTimer(sessionId: string): void {
               error: innerError.message,
             });
           }
-        }, introDelayMs);
+        }, pace(sessionId, introDelayMs), { phase: 'ROUND_INTRO' });
       }
 
     } catch (error: any) {
@@ -2844,9 +2933,7 @@ function scheduleScoreboardTimer(sessionId: string): void {
         error: error.message,
       });
     }
-  }, SCOREBOARD_AUTO_ADVANCE_MS);
-
-  session._scoreboardTimer = timeoutId;
+  }, scaleMs(session, SCOREBOARD_AUTO_ADVANCE_MS), { slot: 'scoreboard', phase: 'SCOREBOARD' });
 }
 
 /**
@@ -2905,11 +2992,11 @@ function transitionToFinalResults(sessionId: string): void {
 
   // Schedule delayed SFX/UI events
   audioResult.scheduled.forEach(({ event, delayMs }) => {
-    setTimeout(() => {
+    sessionScheduler.schedule(sessionId, 'finale', () => {
       const sess = sessionStore.getSession(sessionId);
       if (!sess || sess.state.phase !== 'FINAL_RESULTS') return;
       sessionStore.broadcastEventToSession(sessionId, event);
-    }, delayMs);
+    }, scaleMs(session, delayMs), { phase: 'FINAL_RESULTS' });
   });
 
   // Server-driven staged podium reveals (3rd → 2nd → 1st) + full standings
@@ -2924,7 +3011,7 @@ function transitionToFinalResults(sessionId: string): void {
   ];
 
   stageSchedule.forEach(({ delayMs, effectId, sfxId }) => {
-    setTimeout(() => {
+    sessionScheduler.schedule(sessionId, 'finale', () => {
       const sess = sessionStore.getSession(sessionId);
       if (!sess || sess.state.phase !== 'FINAL_RESULTS') return;
       if (sfxId) {
@@ -2939,16 +3026,16 @@ function transitionToFinalResults(sessionId: string): void {
         serverTimeMs: getServerTimeMs(),
         payload: { effectId, intensity: effectId === 'confetti' ? 'high' : 'med', durationMs: 3500 },
       });
-    }, delayMs);
+    }, scaleMs(session, delayMs), { phase: 'FINAL_RESULTS' });
   });
 
   // Transition to ROUND_END at t=11.0 s
-  setTimeout(() => {
+  sessionScheduler.schedule(sessionId, 'finale', () => {
     const sess = sessionStore.getSession(sessionId);
     if (!sess || sess.state.phase !== 'FINAL_RESULTS') return;
 
     logger.info('FINAL_RESULTS ceremony complete, transitioning to ROUND_END', { sessionId });
     sess.state.phase = 'ROUND_END';
     broadcastStateSnapshot(sessionId);
-  }, 11000);
+  }, scaleMs(session, 11000), { phase: 'FINAL_RESULTS' });
 }
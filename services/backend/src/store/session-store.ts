@@ -4,10 +4,15 @@
 
 import { v4 as uuidv4 } from 'uuid';
 import { WebSocket } from 'ws';
+import { getLocalPartition, ownsKey } from '../cluster/partition';
 import { GameState, Player } from '../types/state';
 import { generateJoinCode } from '../utils/join-code';
 import { logger } from '../utils/logger';
 import { getServerTimeMs } from '../utils/time';
+import { getDefaultTimeScale } from '../utils/time-scale';
+import type { DeltaChannel } from '../utils/state-delta';
+import { eventTypeOf, recordSend, stringifyEvent } from '../utils/metrics';
+import { sessionScheduler } from '../utils/session-scheduler';
 
 export interface WSConnection {
   ws: WebSocket;
@@ -15,6 +20,8 @@ export interface WSConnection {
   playerId: string;
   role: 'host' | 'player' | 'tv';
   connectedAt: number;
+  // Delta STATE_SNAPSHOT history (opt-in, see utils/state-delta.ts)
+  delta?: DeltaChannel;
 }
 
 /**
@@ -47,17 +54,13 @@ export interface Session {
   connections: Map<string, WSConnection>; // playerId -> connection
   // Game plan for multi-destination games
   gamePlan?: GamePlan;
+  // Pacing compression factor (1 = real time) — see utils/time-scale.ts
+  timeScale: number;
+  // Last STATE_SNAPSHOT version handed out (delta-mode connections)
+  _snapshotSeq?: number;
   // Internal state for brake fairness and rate limiting
   _brakeTimestamps?: Map<string, number>; // playerId -> last brake timestamp
   _brakeFairness?: Map<string, { playerId: string; timestamp: number }>; // clue_key -> first brake (DEPRECATED - use state.brakeFairness)
-  // Grace period cleanup timers for disconnected players
-  _disconnectTimers?: Map<string, NodeJS.Timeout>; // playerId -> cleanup timer
-  // Clue auto-advance timer (graduated per level)
-  _clueTimer?: NodeJS.Timeout; // Timer handle for auto-advance
-  // Scoreboard auto-advance timer (multi-destination only)
-  _scoreboardTimer?: NodeJS.Timeout; // Timer handle for auto-advance to next destination
-  // Followup auto-advance timer
-  _followupTimer?: NodeJS.Timeout; // Timer handle for followup sequence
   // Clue start time tracking for speed bonus calculation
   _clueStartTime?: number; // Timestamp when current clue level started (for speed bonus)
   // Join flow lock to prevent race conditions
@@ -69,12 +72,14 @@ export interface Session {
 class SessionStore {
   private sessions: Map<string, Session> = new Map();
   private joinCodeToSessionId: Map<string, string> = new Map();
+  // Clustered mode: only session IDs / join codes routed to this worker
+  private readonly partition = getLocalPartition();
 
   /**
    * Creates a new session with a unique join code
    */
-  createSession(): Session {
-    const sessionId = uuidv4();
+  createSession(options: { timeScale?: number } = {}): Session {
+    const sessionId = this.generateOwnedSessionId();
     const hostId = uuidv4();
     const joinCode = this.generateUniqueJoinCode();
     const now = getServerTimeMs();
@@ -115,6 +120,7 @@ class SessionStore {
       state: initialState,
       createdAt: now,
       connections: new Map(),
+      timeScale: options.timeScale ?? getDefaultTimeScale(),
     };
 
     this.sessions.set(sessionId, session);
@@ -124,6 +130,7 @@ class SessionStore {
       sessionId,
       joinCode,
       hostId,
+      timeScale: session.timeScale,
     });
 
     return session;
@@ -272,27 +279,10 @@ class SessionStore {
       return;
     }
 
-    // Clear clue timer
-    if (session._clueTimer) {
-      clearTimeout(session._clueTimer);
-      session._clueTimer = undefined;
-      logger.debug('Cleaned up clue timer', { sessionId });
-    }
-
-    // Clear scoreboard timer
-    if (session._scoreboardTimer) {
-      clearTimeout(session._scoreboardTimer);
-      session._scoreboardTimer = undefined;
-      logger.debug('Cleaned up scoreboard timer', { sessionId });
-    }
-
-    // Clear all disconnect timers
-    if (session._disconnectTimers) {
-      session._disconnectTimers.forEach((timer, playerId) => {
-        clearTimeout(timer);
-        logger.debug('Cleaned up disconnect timer', { sessionId, playerId });
-      });
-      session._disconnectTimers.clear();
+    // Cancel every pending timer (clue, followup, scoreboard, grace periods, pacing)
+    const cancelledTimers = sessionScheduler.cancelSession(sessionId);
+    if (cancelledTimers > 0) {
+      logger.debug('Cancelled session timers', { sessionId, cancelledTimers });
     }
 
     // Close all WebSocket connections
@@ -474,6 +464,8 @@ class SessionStore {
       }
     });
 
+    recordSend(eventTypeOf(data), Buffer.byteLength(data), sentCount);
+
     logger.debug('Broadcast to session', {
       sessionId,
       sentCount,
@@ -486,7 +478,7 @@ class SessionStore {
    * Sends the same event to all clients (does not apply projections)
    */
   broadcastEventToSession(sessionId: string, event: any, excludePlayerId?: string): void {
-    this.broadcastToSession(sessionId, JSON.stringify(event), excludePlayerId);
+    this.broadcastToSession(sessionId, stringifyEvent(event), excludePlayerId);
   }
 
   /**
@@ -499,6 +491,7 @@ class SessionStore {
     }
 
     connection.ws.send(data);
+    recordSend(eventTypeOf(data), Buffer.byteLength(data));
     return true;
   }
 
@@ -506,14 +499,26 @@ class SessionStore {
    * Generates a unique join code that doesn't conflict with existing sessions
    */
   private generateUniqueJoinCode(maxAttempts = 10): string {
-    for (let i = 0; i < maxAttempts; i++) {
+    // Codes owned by other workers are skipped, so scale the budget
+    for (let i = 0; i < maxAttempts * this.partition.count; i++) {
       const code = generateJoinCode();
-      if (!this.joinCodeToSessionId.has(code)) {
+      if (ownsKey(this.partition, code) && !this.joinCodeToSessionId.has(code)) {
         return code;
       }
     }
     throw new Error('Failed to generate unique join code after multiple attempts');
   }
+
+  /**
+   * Random session ID that the cluster router maps to this worker.
+   */
+  private generateOwnedSessionId(): string {
+    let sessionId = uuidv4();
+    while (!ownsKey(this.partition, sessionId)) {
+      sessionId = uuidv4();
+    }
+    return sessionId;
+  }
 }
 
 // Singleton instance
@@ -41,6 +41,22 @@ export interface ResumeSessionPayload {
 export interface StateSnapshotPayload {
   state: any; // Will be defined based on state.schema.json
   missedEvents?: EventEnvelope[];
+  seq?: number; // delta-mode connections only
+}
+
+// Delta snapshots (opt-in: /ws?snapshots=delta)
+
+export type PatchPath = Array<string | number>;
+export type PatchOp = [PatchPath, unknown] | [PatchPath]; // set | delete
+
+export interface StatePatchPayload {
+  seq: number;
+  baseSeq: number;
+  ops: PatchOp[];
+}
+
+export interface StateAckPayload {
+  seq: number;
 }
 
 // Lobby Events
@@ -247,6 +263,17 @@ export interface UiEffectTriggerPayload {
   params?: Record<string, unknown>;
 }
 
+export interface ContentGenerationProgressPayload {
+  generateId: string;
+  status: 'generating' | 'completed' | 'failed';
+  currentStep: number;
+  totalSteps: number;
+  currentStepDescription?: string;
+  contentPackId?: string;
+  destination?: string;
+  error?: string;
+}
+
 // Error Event
 
 export interface ErrorPayload {
@@ -261,6 +288,9 @@ export type EventType =
   | 'WELCOME'
   | 'RESUME_SESSION'
   | 'STATE_SNAPSHOT'
+  | 'STATE_PATCH'
+  | 'STATE_ACK'
+  | 'STATE_RESYNC'
   | 'PLAYER_JOINED'
   | 'PLAYER_LEFT'
   | 'LOBBY_UPDATED'
@@ -290,4 +320,5 @@ export type EventType =
   | 'VOICE_LINE'
   | 'HOST_MUSIC_GAIN_SET'
   | 'FINAL_RESULTS_PRESENT'
+  | 'CONTENT_GENERATION_PROGRESS'
   | 'ERROR';
@@ -2,7 +2,7 @@
  * Event envelope builder utilities
  */
 
-import { EventEnvelope } from '../types/events';
+import { ContentGenerationProgressPayload, EventEnvelope, PatchOp } from '../types/events';
 import { getServerTimeMs } from './time';
 
 /**
@@ -52,6 +52,30 @@ export function buildStateSnapshotEvent(
   });
 }
 
+/**
+ * Creates a versioned STATE_SNAPSHOT for a delta-mode connection
+ * (see utils/state-delta.ts)
+ */
+export function buildVersionedSnapshotEvent(
+  sessionId: string,
+  state: any,
+  seq: number
+): EventEnvelope {
+  return buildEvent('STATE_SNAPSHOT', sessionId, { state, seq });
+}
+
+/**
+ * Creates a STATE_PATCH event: `ops` turn snapshot `baseSeq` into `seq`
+ */
+export function buildStatePatchEvent(
+  sessionId: string,
+  seq: number,
+  baseSeq: number,
+  ops: PatchOp[]
+): EventEnvelope {
+  return buildEvent('STATE_PATCH', sessionId, { seq, baseSeq, ops });
+}
+
 /**
  * Creates an ERROR event
  */
@@ -443,3 +467,14 @@ export function buildAnswerCountUpdateEvent(
     totalPlayers,
   });
 }
+
+/**
+ * Creates a CONTENT_GENERATION_PROGRESS event
+ * Sent to the host while a content pack it requested is being generated
+ */
+export function buildContentGenerationProgressEvent(
+  sessionId: string,
+  progress: ContentGenerationProgressPayload
+): EventEnvelope<ContentGenerationProgressPayload> {
+  return buildEvent('CONTENT_GENERATION_PROGRESS', sessionId, progress);
+}
@@ -0,0 +1,460 @@
+/**
+ * In-process metrics for the WebSocket hot paths, served on GET /metrics.
+ *
+ * - sends: frames and bytes per event type for everything the server writes
+ * - timings: JSON.stringify and projectState() per call (snapshot broadcasts
+ *   project once per role, see SnapshotFrames), and the whole
+ *   broadcastStateSnapshot() fan-out
+ * - pending session timers per session and kind (pacing delays, clue /
+ *   followup / scoreboard timers, reconnect grace periods) and how late
+ *   each kind fires against its deadline
+ * - TTS clip cache hits / misses / coalesced requests and upstream
+ *   synthesis time (see game/tts-clip-cache.ts)
+ * - event-loop lag, sampled every LAG_SAMPLE_MS
+ * - permessage-deflate settings and how many open connections negotiated it
+ *
+ * Counters and timing buckets are cumulative since process start, so a
+ * scraper diffs two snapshots to get rates and windowed percentiles.
+ * In clustered mode the router serves mergeMetrics() over all workers.
+ */
+
+import { performance } from 'perf_hooks';
+import type { WebSocket } from 'ws';
+import type { Session } from '../store/session-store';
+import type { PendingTimers } from './session-scheduler';
+
+const LAG_SAMPLE_MS = 100;
+const BUCKETS_PER_OCTAVE = 4; // ~19% bucket width
+const MAX_BUCKET = 40 * BUCKETS_PER_OCTAVE; // 2^40 µs ≈ 12 days
+const TOP_TIMER_SESSIONS = 10;
+
+/**
+ * Log-bucketed duration histogram (microsecond resolution).
+ */
+class Timing {
+  count = 0;
+  totalMs = 0;
+  maxMs = 0;
+  private buckets = new Map<number, number>();
+
+  observe(ms: number): void {
+    this.count++;
+    this.totalMs += ms;
+    if (ms > this.maxMs) this.maxMs = ms;
+    const us = Math.max(1, ms * 1000);
+    const bucket = Math.min(MAX_BUCKET, Math.floor(Math.log2(us) * BUCKETS_PER_OCTAVE));
+    this.buckets.set(bucket, (this.buckets.get(bucket) ?? 0) + 1);
+  }
+
+  private percentile(q: number): number {
+    if (this.count === 0) return 0;
+    const target = Math.max(1, Math.ceil(q * this.count));
+    let seen = 0;
+    for (const bucket of [...this.buckets.keys()].sort((a, b) => a - b)) {
+      seen += this.buckets.get(bucket)!;
+      if (seen >= target) return Math.min(bucketUpperMs(bucket), this.maxMs);
+    }
+    return this.maxMs;
+  }
+
+  toJSON() {
+    return {
+      count: this.count,
+      totalMs: round(this.totalMs),
+      meanMs: this.count ? round(this.totalMs / this.count) : 0,
+      p50Ms: round(this.percentile(0.5)),
+      p99Ms: round(this.percentile(0.99)),
+      maxMs: round(this.maxMs),
+      // [upper edge ms, count] — lets a scraper diff two snapshots
+      buckets: [...this.buckets.entries()]
+        .sort((a, b) => a[0] - b[0])
+        .map(([bucket, n]) => [round(bucketUpperMs(bucket)), n]),
+    };
+  }
+}
+
+function bucketUpperMs(bucket: number): number {
+  return Math.pow(2, (bucket + 1) / BUCKETS_PER_OCTAVE) / 1000;
+}
+
+function round(ms: number): number {
+  return Math.round(ms * 1000) / 1000;
+}
+
+export type TimingName = 'stringify' | 'projectState' | 'snapshotBroadcast' | 'eventLoopLag';
+
+const timings: Record<TimingName, Timing> = {
+  stringify: new Timing(),
+  projectState: new Timing(),
+  snapshotBroadcast: new Timing(),
+  eventLoopLag: new Timing(),
+};
+
+const sends = new Map<string, { count: number; bytes: number }>();
+let snapshotBroadcasts = 0;
+let snapshotRecipients = 0;
+let compressionInfo: object = { enabled: false };
+
+// ============================================================================
+// SENDS
+// ============================================================================
+
+const TYPE_PREFIX = /^\{"type":"([^"]+)"/;
+
+/**
+ * Event type of an already serialized event (builders put `type` first).
+ */
+export function eventTypeOf(data: string): string {
+  return TYPE_PREFIX.exec(data)?.[1] ?? 'UNKNOWN';
+}
+
+/**
+ * Counts `count` frames of `bytes` each for an event type.
+ */
+export function recordSend(eventType: string, bytes: number, count = 1): void {
+  const entry = sends.get(eventType);
+  if (entry) {
+    entry.count += count;
+    entry.bytes += bytes * count;
+  } else {
+    sends.set(eventType, { count, bytes: bytes * count });
+  }
+}
+
+/**
+ * JSON.stringify with its cost recorded.
+ */
+export function stringifyEvent(event: unknown): string {
+  const start = performance.now();
+  const data = JSON.stringify(event);
+  timings.stringify.observe(performance.now() - start);
+  return data;
+}
+
+/**
+ * Serializes, sends and counts one event on a single socket.
+ */
+export function sendEvent(ws: WebSocket, event: { type: string }): void {
+  sendFrame(ws, event.type, stringifyEvent(event));
+}
+
+/**
+ * Sends and counts an already serialized event.
+ */
+export function sendFrame(ws: WebSocket, eventType: string, data: string): void {
+  ws.send(data);
+  recordSend(eventType, Buffer.byteLength(data));
+}
+
+// ============================================================================
+// TIMINGS
+// ============================================================================
+
+export function observeTiming(name: TimingName, ms: number): void {
+  timings[name].observe(ms);
+}
+
+/**
+ * Records one broadcastStateSnapshot() fan-out.
+ */
+export function recordSnapshotBroadcast(ms: number, recipients: number): void {
+  timings.snapshotBroadcast.observe(ms);
+  snapshotBroadcasts++;
+  snapshotRecipients += recipients;
+}
+
+/**
+ * Effective /ws compression settings, reported as-is on /metrics.
+ */
+export function setCompressionInfo(info: object): void {
+  compressionInfo = info;
+}
+
+let lagMonitor: NodeJS.Timeout | undefined;
+
+/**
+ * Samples event-loop lag: how late a LAG_SAMPLE_MS interval fires.
+ */
+export function startEventLoopMonitor(): void {
+  if (lagMonitor) return;
+  let expected = performance.now() + LAG_SAMPLE_MS;
+  lagMonitor = setInterval(() => {
+    const now = performance.now();
+    timings.eventLoopLag.observe(Math.max(0, now - expected));
+    expected = now + LAG_SAMPLE_MS;
+  }, LAG_SAMPLE_MS);
+  lagMonitor.unref();
+}
+
+// ============================================================================
+// SESSION TIMERS
+// ============================================================================
+
+const timerDrift = new Map<string, Timing>();
+
+/**
+ * Records how late a session timer fired against its deadline
+ * (see session-scheduler.ts).
+ */
+export function observeTimerDrift(kind: string, ms: number): void {
+  let timing = timerDrift.get(kind);
+  if (!timing) {
+    timing = new Timing();
+    timerDrift.set(kind, timing);
+  }
+  timing.observe(ms);
+}
+
+// ============================================================================
+// TTS CLIP CACHE
+// ============================================================================
+
+export type TtsCacheOutcome =
+  | 'hit' // served from memory
+  | 'diskHit' // read from the shared on-disk store
+  | 'miss' // synthesized by ai-content
+  | 'coalesced' // joined an identical in-flight synthesis
+  | 'error'; // synthesis failed or returned no clip
+
+const ttsCache: Record<TtsCacheOutcome | 'evictions' | 'stale', number> = {
+  hit: 0,
+  diskHit: 0,
+  miss: 0,
+  coalesced: 0,
+  error: 0,
+  evictions: 0,
+  stale: 0, // dropped: expired, other origin, or gone upstream
+};
+let ttsCacheEntries = 0;
+const ttsSynthesis = new Timing();
+
+export function recordTtsCache(outcome: TtsCacheOutcome | 'evictions' | 'stale', clips = 1): void {
+  ttsCache[outcome] += clips;
+}
+
+export function setTtsCacheEntries(entries: number): void {
+  ttsCacheEntries = entries;
+}
+
+/**
+ * One upstream ai-content call (a single clip or a batch of misses).
+ */
+export function observeTtsSynthesis(ms: number): void {
+  ttsSynthesis.observe(ms);
+}
+
+// ============================================================================
+// SNAPSHOT
+// ============================================================================
+
+/**
+ * Everything above plus live sessions / connections, as served on /metrics.
+ * Sessions are identified by an 8-char id prefix only (full ids let anyone join).
+ */
+export function collectMetrics(sessions: Session[], timers: PendingTimers) {
+  const byPhase: Record<string, number> = {};
+  const byRole: Record<string, number> = {};
+  let connections = 0;
+  let compressed = 0;
+  for (const session of sessions) {
+    byPhase[session.state.phase] = (byPhase[session.state.phase] ?? 0) + 1;
+    session.connections.forEach((connection) => {
+      if (connection.ws.readyState !== 1) return;
+      connections++;
+      byRole[connection.role] = (byRole[connection.role] ?? 0) + 1;
+      if (connection.ws.extensions.includes('permessage-deflate')) compressed++;
+    });
+  }
+
+  const sendsByType: Record<string, { count: number; bytes: number }> = {};
+  let sendCount = 0;
+  let sendBytes = 0;
+  [...sends.keys()].sort().forEach((type) => {
+    const entry = sends.get(type)!;
+    sendsByType[type] = { ...entry };
+    sendCount += entry.count;
+    sendBytes += entry.bytes;
+  });
+
+  const timerCounts = [...timers.bySession.entries()].map(([sessionId, pending]) => ({
+    session: sessionId.slice(0, 8),
+    pending,
+  }));
+  timerCounts.sort((a, b) => b.pending - a.pending);
+
+  const cpu = process.cpuUsage();
+  const memory = process.memoryUsage();
+
+  return {
+    serverTimeMs: Date.now(),
+    uptimeS: Math.round(process.uptime()),
+    sessions: { live: sessions.length, byPhase },
+    connections: { open: connections, byRole, compressed },
+    compression: compressionInfo,
+    sends: { count: sendCount, bytes: sendBytes, byType: sendsByType },
+    snapshots: { broadcasts: snapshotBroadcasts, recipients: snapshotRecipients },
+    timings: {
+      stringify: timings.stringify.toJSON(),
+      projectState: timings.projectState.toJSON(),
+      snapshotBroadcast: timings.snapshotBroadcast.toJSON(),
+    },
+    timers: {
+      pending: timerCounts.reduce((sum, t) => sum + t.pending, 0),
+      sessions: timerCounts.length,
+      maxPerSession: timerCounts[0]?.pending ?? 0,
+      top: timerCounts.slice(0, TOP_TIMER_SESSIONS),
+      byKind: { ...timers.byKind } as Record<string, number>,
+      // fire time minus deadline, per timer kind
+      drift: Object.fromEntries(
+        [...timerDrift.keys()].sort().map((kind) => [kind, timerDrift.get(kind)!.toJSON()])
+      ),
+    },
+    tts: { ...ttsCache, entries: ttsCacheEntries, synthesis: ttsSynthesis.toJSON() },
+    eventLoop: { sampleMs: LAG_SAMPLE_MS, lag: timings.eventLoopLag.toJSON() },
+    process: {
+      cpuUserMs: Math.round(cpu.user / 1000),
+      cpuSystemMs: Math.round(cpu.system / 1000),
+      rssBytes: memory.rss,
+      heapUsedBytes: memory.heapUsed,
+    },
+  };
+}
+
+type MetricsSnapshot = ReturnType<typeof collectMetrics>;
+type TimingSnapshot = ReturnType<Timing['toJSON']>;
+
+function addCounts<T extends Record<string, number>>(into: Record<string, number>, from: T): void {
+  for (const [key, n] of Object.entries(from)) {
+    into[key] = (into[key] ?? 0) + n;
+  }
+}
+
+/**
+ * Sums timing histograms from several processes (bucket edges are identical).
+ */
+function mergeTimings(parts: TimingSnapshot[]): TimingSnapshot {
+  const byEdge = new Map<number, number>();
+  let count = 0;
+  let totalMs = 0;
+  let maxMs = 0;
+  for (const part of parts) {
+    count += part.count;
+    totalMs += part.totalMs;
+    maxMs = Math.max(maxMs, part.maxMs);
+    for (const [edge, n] of part.buckets) {
+      byEdge.set(edge, (byEdge.get(edge) ?? 0) + n);
+    }
+  }
+  const buckets = [...byEdge.entries()].sort((a, b) => a[0] - b[0]);
+  const percentile = (q: number) => {
+    if (count === 0) return 0;
+    const target = Math.max(1, Math.ceil(q * count));
+    let seen = 0;
+    for (const [edge, n] of buckets) {
+      seen += n;
+      if (seen >= target) return Math.min(edge, maxMs);
+    }
+    return maxMs;
+  };
+  return {
+    count,
+    totalMs: round(totalMs),
+    meanMs: count ? round(totalMs / count) : 0,
+    p50Ms: round(percentile(0.5)),
+    p99Ms: round(percentile(0.99)),
+    maxMs: round(maxMs),
+    buckets,
+  };
+}
+
+/**
+ * One /metrics snapshot for a whole cluster: counters, histograms and
+ * process usage summed over workers, plus a per-worker breakdown.
+ */
+export function mergeMetrics(workers: MetricsSnapshot[]) {
+  const byPhase: Record<string, number> = {};
+  const byRole: Record<string, number> = {};
+  const byType: Record<string, { count: number; bytes: number }> = {};
+  const top: { session: string; pending: number }[] = [];
+  const timersByKind: Record<string, number> = {};
+  const drift: Record<string, TimingSnapshot[]> = {};
+  for (const worker of workers) {
+    addCounts(byPhase, worker.sessions.byPhase);
+    addCounts(byRole, worker.connections.byRole);
+    for (const [type, entry] of Object.entries(worker.sends.byType)) {
+      const merged = (byType[type] ??= { count: 0, bytes: 0 });
+      merged.count += entry.count;
+      merged.bytes += entry.bytes;
+    }
+    top.push(...worker.timers.top);
+    addCounts(timersByKind, worker.timers.byKind);
+    for (const [kind, timing] of Object.entries(worker.timers.drift)) {
+      (drift[kind] ??= []).push(timing);
+    }
+  }
+  top.sort((a, b) => b.pending - a.pending);
+  const sum = (fn: (w: MetricsSnapshot) => number) => workers.reduce((total, w) => total + fn(w), 0);
+  const timing = (name: keyof MetricsSnapshot['timings']) => mergeTimings(workers.map((w) => w.timings[name]));
+
+  return {
+    serverTimeMs: Date.now(),
+    uptimeS: Math.min(...workers.map((w) => w.uptimeS)),
+    sessions: { live: sum((w) => w.sessions.live), byPhase },
+    connections: {
+      open: sum((w) => w.connections.open),
+      byRole,
+      compressed: sum((w) => w.connections.compressed),
+    },
+    compression: workers[0]?.compression ?? compressionInfo,
+    sends: { count: sum((w) => w.sends.count), bytes: sum((w) => w.sends.bytes), byType },
+    snapshots: {
+      broadcasts: sum((w) => w.snapshots.broadcasts),
+      recipients: sum((w) => w.snapshots.recipients),
+    },
+    timings: {
+      stringify: timing('stringify'),
+      projectState: timing('projectState'),
+      snapshotBroadcast: timing('snapshotBroadcast'),
+    },
+    timers: {
+      pending: sum((w) => w.timers.pending),
+      sessions: sum((w) => w.timers.sessions),
+      maxPerSession: Math.max(0, ...workers.map((w) => w.timers.maxPerSession)),
+      top: top.slice(0, TOP_TIMER_SESSIONS),
+      byKind: timersByKind,
+      drift: Object.fromEntries(
+        Object.keys(drift)
+          .sort()
+          .map((kind) => [kind, mergeTimings(drift[kind])])
+      ),
+    },
+    tts: {
+      hit: sum((w) => w.tts.hit),
+      diskHit: sum((w) => w.tts.diskHit),
+      miss: sum((w) => w.tts.miss),
+      coalesced: sum((w) => w.tts.coalesced),
+      error: sum((w) => w.tts.error),
+      evictions: sum((w) => w.tts.evictions),
+      stale: sum((w) => w.tts.stale),
+      // workers share one on-disk store, their memory holds overlapping sets
+      entries: Math.max(0, ...workers.map((w) => w.tts.entries)),
+      synthesis: mergeTimings(workers.map((w) => w.tts.synthesis)),
+    },
+    eventLoop: { sampleMs: LAG_SAMPLE_MS, lag: mergeTimings(workers.map((w) => w.eventLoop.lag)) },
+    process: {
+      cpuUserMs: sum((w) => w.process.cpuUserMs),
+      cpuSystemMs: sum((w) => w.process.cpuSystemMs),
+      rssBytes: sum((w) => w.process.rssBytes),
+      heapUsedBytes: sum((w) => w.process.heapUsedBytes),
+    },
+    cluster: {
+      workers: workers.map((w, index) => ({
+        index,
+        sessions: w.sessions.live,
+        connections: w.connections.open,
+        cpuMs: w.process.cpuUserMs + w.process.cpuSystemMs,
+        eventLoopP99Ms: w.eventLoop.lag.p99Ms,
+      })),
+    },
+  };
+}
@@ -0,0 +1,190 @@
+/**
+ * Session scheduler: the one place that owns every session deadline in the
+ * process — clue and followup timers, scoreboard auto-advance, reconnect
+ * grace periods and the pacing holds between reveal steps.
+ *
+ * Each timer is registered under its session with a kind (reported on
+ * /metrics) and optionally
+ * - a slot ('clue', 'disconnect:<playerId>', ...): at most one timer per
+ *   slot, scheduling into an occupied slot replaces the old timer
+ * - the phase it belongs to, so cancelSession() can drop one phase's timers
+ *
+ * Every fire records its drift (how late it ran against its deadline) per
+ * kind. Callbacks that throw or reject are logged, not propagated.
+ */
+
+import { performance } from 'perf_hooks';
+import type { GamePhase } from '../types/state';
+import { logger } from './logger';
+import { observeTimerDrift } from './metrics';
+
+export type TimerKind =
+  | 'clue' // clue auto-advance deadline
+  | 'followup' // followup question deadline and the step after it
+  | 'scoreboard' // scoreboard auto-advance to the next destination
+  | 'intro' // ROUND_INTRO / followup intro → next phase
+  | 'pacing' // awaited holds between reveal / results steps
+  | 'finale' // final-results ceremony events
+  | 'disconnect'; // reconnect grace period
+
+export interface ScheduleOptions {
+  slot?: string;
+  phase?: GamePhase;
+}
+
+export interface CancelFilter {
+  phase?: GamePhase;
+  kind?: TimerKind;
+}
+
+/**
+ * Pending timers as reported on /metrics.
+ */
+export interface PendingTimers {
+  bySession: Map<string, number>;
+  byKind: Partial<Record<TimerKind, number>>;
+}
+
+export interface ScheduledTimer {
+  sessionId: string;
+  kind: TimerKind;
+  slot?: string;
+  phase?: GamePhase;
+  dueAt: number; // performance.now() deadline
+  handle: NodeJS.Timeout;
+}
+
+class SessionScheduler {
+  private readonly sessions = new Map<string, Set<ScheduledTimer>>();
+
+  /**
+   * Runs fn after ms. Returns a handle for cancelTimer().
+   */
+  schedule(
+    sessionId: string,
+    kind: TimerKind,
+    fn: () => void | Promise<void>,
+    ms: number,
+    options: ScheduleOptions = {}
+  ): ScheduledTimer {
+    if (options.slot) this.cancel(sessionId, options.slot);
+
+    // setTimeout treats anything below 1 ms as 1 ms
+    const delayMs = ms >= 1 ? ms : 1;
+    const timer: ScheduledTimer = {
+      sessionId,
+      kind,
+      slot: options.slot,
+      phase: options.phase,
+      dueAt: performance.now() + delayMs,
+      handle: setTimeout(() => this.fire(timer, fn), delayMs),
+    };
+    let timers = this.sessions.get(sessionId);
+    if (!timers) {
+      timers = new Set();
+      this.sessions.set(sessionId, timers);
+    }
+    timers.add(timer);
+    return timer;
+  }
+
+  /**
+   * Awaitable pause. Never resolves if cancelled (the session went away or
+   * left the phase), so the awaiting step simply stops.
+   */
+  sleep(sessionId: string, kind: TimerKind, ms: number, options: ScheduleOptions = {}): Promise<void> {
+    return new Promise((resolve) => {
+      this.schedule(sessionId, kind, resolve, ms, options);
+    });
+  }
+
+  has(sessionId: string, slot: string): boolean {
+    return this.findSlot(sessionId, slot) !== undefined;
+  }
+
+  /**
+   * Cancels the timer in a slot. Returns whether one was pending.
+   */
+  cancel(sessionId: string, slot: string): boolean {
+    const timer = this.findSlot(sessionId, slot);
+    if (!timer) return false;
+    this.cancelTimer(timer);
+    return true;
+  }
+
+  cancelTimer(timer: ScheduledTimer): void {
+    clearTimeout(timer.handle);
+    this.forget(timer);
+  }
+
+  /**
+   * Cancels a session's timers — all of them, or only those matching the
+   * filter. Returns how many were cancelled.
+   */
+  cancelSession(sessionId: string, filter: CancelFilter = {}): number {
+    const timers = this.sessions.get(sessionId);
+    if (!timers) return 0;
+    let cancelled = 0;
+    for (const timer of [...timers]) {
+      if (filter.phase !== undefined && timer.phase !== filter.phase) continue;
+      if (filter.kind !== undefined && timer.kind !== filter.kind) continue;
+      this.cancelTimer(timer);
+      cancelled++;
+    }
+    return cancelled;
+  }
+
+  pending(): PendingTimers {
+    const bySession = new Map<string, number>();
+    const byKind: Partial<Record<TimerKind, number>> = {};
+    this.sessions.forEach((timers, sessionId) => {
+      bySession.set(sessionId, timers.size);
+      timers.forEach((timer) => {
+        byKind[timer.kind] = (byKind[timer.kind] ?? 0) + 1;
+      });
+    });
+    return { bySession, byKind };
+  }
+
+  private findSlot(sessionId: string, slot: string): ScheduledTimer | undefined {
+    const timers = this.sessions.get(sessionId);
+    if (!timers) return undefined;
+    for (const timer of timers) {
+      if (timer.slot === slot) return timer;
+    }
+    return undefined;
+  }
+
+  private forget(timer: ScheduledTimer): void {
+    const timers = this.sessions.get(timer.sessionId);
+    if (!timers) return;
+    timers.delete(timer);
+    if (timers.size === 0) this.sessions.delete(timer.sessionId);
+  }
+
+  private fire(timer: ScheduledTimer, fn: () => void | Promise<void>): void {
+    this.forget(timer);
+    // libuv fires on whole-millisecond loop time, a hair early is on time
+    observeTimerDrift(timer.kind, Math.max(0, performance.now() - timer.dueAt));
+    try {
+      const result = fn();
+      if (result instanceof Promise) {
+        result.catch((error) => this.logFailure(timer, error));
+      }
+    } catch (error) {
+      this.logFailure(timer, error);
+    }
+  }
+
+  private logFailure(timer: ScheduledTimer, error: unknown): void {
+    logger.error('Session timer callback failed', {
+      sessionId: timer.sessionId,
+      kind: timer.kind,
+      slot: timer.slot,
+      error: error instanceof Error ? error.message : String(error),
+      stack: error instanceof Error ? error.stack : undefined,
+    });
+  }
+}
+
+export const sessionScheduler = new SessionScheduler();
@@ -0,0 +1,136 @@
+/**
+ * Serialized STATE_SNAPSHOT frames for one broadcastStateSnapshot() call.
+ *
+ * HOST and TV frames are identical for every connection of that role, so
+ * each is projected and stringified once. PLAYER connections share one
+ * projection that is stringified once into a template; per player only the
+ * own lockedAnswers and followupQuestion.answeredByMe are serialized and
+ * spliced in.
+ *
+ * stateFor() gives the same projections as JSON-normalized copies for
+ * delta-mode connections (see state-delta.ts), shared the same way.
+ */
+
+import { randomUUID } from 'crypto';
+import { performance } from 'perf_hooks';
+import { GameState } from '../types/state';
+import { Role } from '../types/events';
+import { buildStateSnapshotEvent } from './event-builder';
+import { observeTiming, stringifyEvent } from './metrics';
+import {
+  answeredFollowup,
+  ownLockedAnswers,
+  projectSharedState,
+  projectState,
+} from './state-projection';
+
+// Slot markers in the PLAYER template
+const LOCKED_SLOT = 'L';
+const ANSWERED_SLOT = 'A';
+
+export class SnapshotFrames {
+  private readonly frames = new Map<Role, string>();
+  private playerTemplate?: string[];
+  private sharedPlayer?: GameState;
+  private readonly states = new Map<Role, GameState>();
+
+  constructor(
+    private readonly sessionId: string,
+    private readonly state: GameState
+  ) {}
+
+  frameFor(role: Role, playerId: string): string {
+    if (role === 'player') {
+      return this.playerFrame(playerId);
+    }
+    let frame = this.frames.get(role);
+    if (frame === undefined) {
+      frame = this.serialize(this.project(() => projectState(this.state, role)));
+      this.frames.set(role, frame);
+    }
+    return frame;
+  }
+
+  /**
+   * Projection for one connection as a read-only, JSON-normalized copy.
+   */
+  stateFor(role: Role, playerId: string): GameState {
+    if (role !== 'player') {
+      let state = this.states.get(role);
+      if (state === undefined) {
+        state = JSON.parse(this.frameFor(role, playerId)).payload.state as GameState;
+        this.states.set(role, state);
+      }
+      return state;
+    }
+    let shared = this.states.get('player');
+    if (shared === undefined) {
+      this.playerTemplate ??= this.buildPlayerTemplate();
+      shared = JSON.parse(JSON.stringify(this.sharedPlayer)) as GameState;
+      this.states.set('player', shared);
+    }
+    return {
+      ...shared,
+      lockedAnswers: JSON.parse(JSON.stringify(ownLockedAnswers(this.state, playerId))),
+      ...(shared.followupQuestion
+        ? {
+            followupQuestion: {
+              ...shared.followupQuestion,
+              answeredByMe: answeredFollowup(this.state, playerId),
+            },
+          }
+        : {}),
+    };
+  }
+
+  private playerFrame(playerId: string): string {
+    const parts = (this.playerTemplate ??= this.buildPlayerTemplate());
+    if (parts.length === 1) {
+      return parts[0];
+    }
+    // Odd indices are slot names, even indices literal JSON
+    let frame = '';
+    for (let i = 0; i < parts.length; i++) {
+      if (i % 2 === 0) {
+        frame += parts[i];
+      } else if (parts[i] === LOCKED_SLOT) {
+        frame += JSON.stringify(ownLockedAnswers(this.state, playerId));
+      } else {
+        frame += answeredFollowup(this.state, playerId) ? 'true' : 'false';
+      }
+    }
+    return frame;
+  }
+
+  /**
+   * Serializes the shared PLAYER projection with unguessable string markers
+   * in the per-player slots, then splits on them.
+   */
+  private buildPlayerTemplate(): string[] {
+    const shared = this.project(() => projectSharedState(this.state, 'player'));
+    this.sharedPlayer = shared;
+    const nonce = randomUUID();
+    const marker = (slot: string) => `\u0000${nonce}:${slot}`;
+    const template: any = {
+      ...shared,
+      lockedAnswers: marker(LOCKED_SLOT),
+      ...(shared.followupQuestion
+        ? { followupQuestion: { ...shared.followupQuestion, answeredByMe: marker(ANSWERED_SLOT) } }
+        : {}),
+    };
+    // JSON.stringify escapes the marker as "\u0000<nonce>:<slot>"
+    const slot = new RegExp(`"\\\\u0000${nonce}:(${LOCKED_SLOT}|${ANSWERED_SLOT})"`);
+    return this.serialize(template).split(slot);
+  }
+
+  private project(fn: () => GameState): GameState {
+    const start = performance.now();
+    const projected = fn();
+    observeTiming('projectState', performance.now() - start);
+    return projected;
+  }
+
+  private serialize(state: GameState): string {
+    return stringifyEvent(buildStateSnapshotEvent(this.sessionId, state));
+  }
+}
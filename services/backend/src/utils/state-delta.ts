@@ -0,0 +1,149 @@
+/**
+ * Delta STATE_SNAPSHOT protocol (opt-in per connection: /ws?snapshots=delta)
+ *
+ * Every snapshot broadcast gets the next per-session `seq`. A delta-mode
+ * connection receives STATE_PATCH { seq, baseSeq, ops } against the newest
+ * snapshot it has acknowledged with STATE_ACK { seq }, or a full
+ * STATE_SNAPSHOT { state, seq } when it has acknowledged nothing yet (new
+ * connection / reconnect), when DELTA_WINDOW snapshots are unacknowledged,
+ * or when it asks with STATE_RESYNC (version gap, periodic verification).
+ *
+ * Ops are [path, value] (set) or [path] (delete). Arrays that change length
+ * are replaced whole; equal-length arrays are diffed element-wise.
+ */
+
+import { IncomingMessage } from 'http';
+import { EventEnvelope, PatchOp, PatchPath } from '../types/events';
+import type { Session } from '../store/session-store';
+import { buildStatePatchEvent, buildVersionedSnapshotEvent } from './event-builder';
+
+const DELTA_WINDOW = 16;     // unacknowledged snapshots before falling back to full
+const MAX_PATCH_OPS = 64;    // beyond this a full snapshot is cheaper to apply
+
+/**
+ * True when the client opted in with ?snapshots=delta on the WS URL.
+ */
+export function wantsDeltaSnapshots(req: IncomingMessage): boolean {
+  const url = new URL(req.url || '', `http://${req.headers.host}`);
+  return url.searchParams.get('snapshots') === 'delta';
+}
+
+export function nextSnapshotSeq(session: Session): number {
+  session._snapshotSeq = (session._snapshotSeq ?? 0) + 1;
+  return session._snapshotSeq;
+}
+
+/**
+ * Ops that turn `prev` into `next` (both JSON values, never mutated).
+ */
+export function diffState(
+  prev: unknown,
+  next: unknown,
+  path: PatchPath = [],
+  ops: PatchOp[] = []
+): PatchOp[] {
+  if (prev === next) {
+    return ops;
+  }
+  if (Array.isArray(prev) && Array.isArray(next)) {
+    if (prev.length !== next.length) {
+      ops.push([path, next]);
+      return ops;
+    }
+    for (let i = 0; i < next.length; i++) {
+      diffState(prev[i], next[i], [...path, i], ops);
+    }
+    return ops;
+  }
+  if (isObject(prev) && isObject(next)) {
+    for (const key of Object.keys(next)) {
+      if (key in prev) {
+        diffState(prev[key], next[key], [...path, key], ops);
+      } else {
+        ops.push([[...path, key], next[key]]);
+      }
+    }
+    for (const key of Object.keys(prev)) {
+      if (!(key in next)) {
+        ops.push([[...path, key]]);
+      }
+    }
+    return ops;
+  }
+  ops.push([path, next]);
+  return ops;
+}
+
+function isObject(value: unknown): value is Record<string, unknown> {
+  return typeof value === 'object' && value !== null && !Array.isArray(value);
+}
+
+/**
+ * Per-connection snapshot history for a delta-mode client.
+ *
+ * States handed to next()/full() must be JSON-normalized copies that
+ * nobody mutates afterwards (see SnapshotFrames.stateFor).
+ */
+export class DeltaChannel {
+  private acked?: { seq: number; state: unknown };
+  private readonly sent = new Map<number, unknown>(); // unacknowledged, oldest first
+  private lastSent?: { seq: number; state: unknown };
+
+  /**
+   * STATE_PATCH against the acknowledged base, or a full snapshot.
+   */
+  next(sessionId: string, seq: number, state: unknown): EventEnvelope {
+    const base = this.acked;
+    if (!base || this.sent.size >= DELTA_WINDOW) {
+      return this.full(sessionId, seq, state);
+    }
+    const ops = diffState(base.state, state);
+    this.remember(seq, state);
+    if (ops.length > MAX_PATCH_OPS) {
+      return buildVersionedSnapshotEvent(sessionId, state, seq);
+    }
+    return buildStatePatchEvent(sessionId, seq, base.seq, ops);
+  }
+
+  full(sessionId: string, seq: number, state: unknown): EventEnvelope {
+    this.remember(seq, state);
+    return buildVersionedSnapshotEvent(sessionId, state, seq);
+  }
+
+  /**
+   * Full snapshot of the newest version sent, so the client can compare it
+   * with its patched copy; undefined before the first snapshot.
+   */
+  resync(sessionId: string): EventEnvelope | undefined {
+    if (!this.lastSent) {
+      return undefined;
+    }
+    const { seq, state } = this.lastSent;
+    return this.full(sessionId, seq, state);
+  }
+
+  /**
+   * Makes `seq` the diff base; false if it was never sent or already dropped.
+   */
+  ack(seq: number): boolean {
+    const state = this.sent.get(seq);
+    if (state === undefined) {
+      return false;
+    }
+    this.acked = { seq, state };
+    for (const sentSeq of this.sent.keys()) {
+      if (sentSeq <= seq) {
+        this.sent.delete(sentSeq);
+      }
+    }
+    return true;
+  }
+
+  private remember(seq: number, state: unknown): void {
+    this.sent.set(seq, state);
+    this.lastSent = { seq, state };
+    if (this.sent.size > DELTA_WINDOW) {
+      this.sent.delete(this.sent.keys().next().value as number);
+    }
+  }
+}
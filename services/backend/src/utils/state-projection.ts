@@ -3,7 +3,7 @@
  * Implements rules from contracts/projections.md
  */
 
-import { GameState } from '../types/state';
+import { GameState, LockedAnswer } from '../types/state';
 import { Role } from '../types/events';
 import { logger } from './logger';
 
@@ -25,11 +25,33 @@ export function projectState(
     return fullState;
   }
 
+  const projected = projectSharedState(fullState, role);
+  if (role !== 'player') {
+    return projected;
+  }
+
+  if (!playerId) {
+    logger.warn('projectState: PLAYER role but no playerId provided');
+    return projected;
+  }
+  return specializePlayerState(projected, fullState, playerId);
+}
+
+/**
+ * The part of a role's projection that is the same for every connection of
+ * that role. For PLAYER this has no locked answers and answeredByMe=false;
+ * specializePlayerState() fills in the per-player slice.
+ */
+export function projectSharedState(fullState: GameState, role: Role): GameState {
+  if (role === 'host') {
+    return fullState;
+  }
+
   // Create shallow copy for modification
   const projected: GameState = {
     ...fullState,
     destination: fullState.destination ? { ...fullState.destination } : undefined,
-    lockedAnswers: [...fullState.lockedAnswers],
+    lockedAnswers: [],
   };
 
   // Filter destination for PLAYER and TV (unless revealed)
@@ -43,39 +65,19 @@ export function projectState(
   }
 
   // Filter players: TV and PLAYER only see role=player entries
-  // Also strip internal fields like disconnectedAt for all roles
-  if (role === 'tv' || role === 'player') {
-    projected.players = fullState.players
-      .filter((p) => p.role === 'player')
-      .map(({ disconnectedAt, ...player }) => player);
-  } else if (role === 'host') {
-    // HOST sees all players but still strip internal disconnectedAt field
-    projected.players = fullState.players.map(({ disconnectedAt, ...player }) => player);
-  }
+  // Also strip internal fields like disconnectedAt
+  projected.players = fullState.players
+    .filter((p) => p.role === 'player')
+    .map(({ disconnectedAt, ...player }) => player);
 
-  // Filter locked answers based on role
-  if (role === 'player') {
-    // PLAYER: only see own answers (answerText visible for own entries)
-    if (!playerId) {
-      logger.warn('projectState: PLAYER role but no playerId provided');
-      projected.lockedAnswers = [];
-    } else {
-      projected.lockedAnswers = fullState.lockedAnswers.filter(
-        (answer) => answer.playerId === playerId
-      );
-    }
-  } else if (role === 'tv') {
-    // TV: hide all answer text until destination is revealed
-    if (projected.destination?.revealed) {
-      // After reveal, TV can see answers but never answerText
-      projected.lockedAnswers = fullState.lockedAnswers.map(({ answerText: _, ...rest }) => ({
-        ...rest,
-        answerText: '',
-      }));
-    } else {
-      // Before reveal, hide answer text (but could show count)
-      projected.lockedAnswers = [];
-    }
+  // TV: hide all answer text until destination is revealed
+  // (PLAYER locked answers are per-player, see specializePlayerState)
+  if (role === 'tv' && projected.destination?.revealed) {
+    // After reveal, TV can see answers but never answerText
+    projected.lockedAnswers = fullState.lockedAnswers.map(({ answerText: _, ...rest }) => ({
+      ...rest,
+      answerText: '',
+    }));
   }
 
   // Filter audioState per projections.md §Audio State Projection
@@ -88,27 +90,50 @@ export function projectState(
 
   // Filter followupQuestion secrets
   if (fullState.followupQuestion) {
-    if (role === 'player') {
-      projected.followupQuestion = {
-        ...fullState.followupQuestion,
-        correctAnswer: null,
-        answersByPlayer: [],
-        answeredByMe: playerId
-          ? fullState.followupQuestion.answersByPlayer.some((a) => a.playerId === playerId)
-          : false,
-      };
-    } else if (role === 'tv') {
-      projected.followupQuestion = {
-        ...fullState.followupQuestion,
-        correctAnswer: null,
-        answersByPlayer: [],
-      };
-    }
+    projected.followupQuestion = {
+      ...fullState.followupQuestion,
+      correctAnswer: null,
+      answersByPlayer: [],
+      ...(role === 'player' ? { answeredByMe: false } : {}),
+    };
   }
 
   return projected;
 }
 
+/**
+ * PLAYER projection for one player: own locked answers and answeredByMe
+ * on top of the shared PLAYER projection.
+ */
+export function specializePlayerState(
+  shared: GameState,
+  fullState: GameState,
+  playerId: string
+): GameState {
+  return {
+    ...shared,
+    lockedAnswers: ownLockedAnswers(fullState, playerId),
+    ...(shared.followupQuestion
+      ? {
+          followupQuestion: {
+            ...shared.followupQuestion,
+            answeredByMe: answeredFollowup(fullState, playerId),
+          },
+        }
+      : {}),
+  };
+}
+
+export function ownLockedAnswers(fullState: GameState, playerId: string): LockedAnswer[] {
+  return fullState.lockedAnswers.filter((answer) => answer.playerId === playerId);
+}
+
+export function answeredFollowup(fullState: GameState, playerId: string): boolean {
+  return fullState.followupQuestion
+    ? fullState.followupQuestion.answersByPlayer.some((a) => a.playerId === playerId)
+    : false;
+}
+
 /**
  * Counts locked answers without exposing content
  * Useful for TV display before reveal
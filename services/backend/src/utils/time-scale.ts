@@ -0,0 +1,48 @@
+/**
+ * Accelerated-clock test mode.
+ *
+ * Server pacing (intro/reveal/results holds, clue and followup timers,
+ * scoreboard auto-advance, final-results ceremony) is divided by a time
+ * scale so a full game loop runs in well under a second for load and soak
+ * testing.  The scale is per session, defaulting to the TIME_SCALE env
+ * var (1 = real time).  Clients may request a scale when creating a
+ * session only if ALLOW_TIME_SCALE=true.
+ *
+ * Not scaled: the reconnect grace period and network timeouts (TTS
+ * fetches), which guard real-world behaviour rather than pace the game.
+ */
+
+export const MAX_TIME_SCALE = 1000;
+
+/**
+ * Parses a time scale; returns null unless it is a finite number in
+ * [1, MAX_TIME_SCALE].
+ */
+export function parseTimeScale(value: unknown): number | null {
+  const scale = typeof value === 'string' ? Number(value) : value;
+  if (typeof scale !== 'number' || !Number.isFinite(scale)) return null;
+  if (scale < 1 || scale > MAX_TIME_SCALE) return null;
+  return scale;
+}
+
+/**
+ * Process-wide default from TIME_SCALE (evaluated at runtime, not module load time)
+ */
+export function getDefaultTimeScale(): number {
+  return parseTimeScale(process.env.TIME_SCALE) ?? 1;
+}
+
+/**
+ * Whether POST /v1/sessions may set timeScale (test deployments only)
+ */
+export function isTimeScaleRequestAllowed(): boolean {
+  return process.env.ALLOW_TIME_SCALE === 'true';
+}
+
+/**
+ * Compresses a pacing delay by the session's time scale.
+ */
+export function scaleMs(session: { timeScale?: number } | undefined, ms: number): number {
+  const scale = session?.timeScale ?? 1;
+  return scale === 1 ? ms : Math.round(ms / scale);
+}
@@ -0,0 +1,97 @@
+/**
+ * Per-message compression (permessage-deflate, RFC 7692) for /ws.
+ *
+ * Off unless WS_COMPRESSION=true. It is negotiated per connection, so
+ * clients that do not offer it keep receiving plain frames. Unset tunables
+ * fall back to the ws library defaults.
+ *
+ *   WS_COMPRESSION_THRESHOLD      messages smaller than this (bytes) are sent
+ *                                 uncompressed (ws default 1024)
+ *   WS_COMPRESSION_LEVEL          zlib level 1-9 (zlib default 6)
+ *   WS_COMPRESSION_MEM_LEVEL      zlib memLevel 1-9 (8)
+ *   WS_COMPRESSION_SERVER_NO_CONTEXT_TAKEOVER
+ *   WS_COMPRESSION_CLIENT_NO_CONTEXT_TAKEOVER
+ *                                 'true' resets the deflate / inflate context
+ *                                 per message: worse ratio, no per-connection
+ *                                 dictionary kept between messages
+ *   WS_COMPRESSION_SERVER_MAX_WINDOW_BITS
+ *   WS_COMPRESSION_CLIENT_MAX_WINDOW_BITS
+ *                                 8-15 (15); each step down halves the window
+ *   WS_COMPRESSION_CONCURRENCY    concurrent zlib jobs (ws default 10)
+ *
+ * Memory per compressing connection with context takeover is roughly
+ * 2^(windowBits+2) + 2^(memLevel+9) bytes (256 KiB at 15/8).
+ */
+
+import type { PerMessageDeflateOptions } from 'ws';
+
+type Env = Record<string, string | undefined>;
+
+function intInRange(env: Env, name: string, min: number, max: number): number | undefined {
+  const raw = env[name];
+  if (raw === undefined || raw === '') return undefined;
+  const value = Number(raw);
+  if (!Number.isInteger(value) || value < min || value > max) {
+    throw new Error(`${name} must be an integer in [${min}, ${max}], got '${raw}'`);
+  }
+  return value;
+}
+
+function flag(env: Env, name: string): boolean | undefined {
+  const raw = env[name];
+  if (raw === undefined || raw === '') return undefined;
+  return raw === 'true';
+}
+
+/**
+ * perMessageDeflate option for the WebSocketServer (false = disabled).
+ * Throws on out-of-range tunables so a bad deploy fails at startup.
+ */
+export function getPerMessageDeflateOptions(env: Env = process.env): PerMessageDeflateOptions | false {
+  if (env.WS_COMPRESSION !== 'true') {
+    return false;
+  }
+  const options: PerMessageDeflateOptions = {};
+  const threshold = intInRange(env, 'WS_COMPRESSION_THRESHOLD', 0, 64 * 1024 * 1024);
+  const level = intInRange(env, 'WS_COMPRESSION_LEVEL', 1, 9);
+  const memLevel = intInRange(env, 'WS_COMPRESSION_MEM_LEVEL', 1, 9);
+  const serverNoContextTakeover = flag(env, 'WS_COMPRESSION_SERVER_NO_CONTEXT_TAKEOVER');
+  const clientNoContextTakeover = flag(env, 'WS_COMPRESSION_CLIENT_NO_CONTEXT_TAKEOVER');
+  const serverMaxWindowBits = intInRange(env, 'WS_COMPRESSION_SERVER_MAX_WINDOW_BITS', 8, 15);
+  const clientMaxWindowBits = intInRange(env, 'WS_COMPRESSION_CLIENT_MAX_WINDOW_BITS', 8, 15);
+  const concurrencyLimit = intInRange(env, 'WS_COMPRESSION_CONCURRENCY', 1, 1024);
+
+  if (threshold !== undefined) options.threshold = threshold;
+  if (level !== undefined || memLevel !== undefined) {
+    options.zlibDeflateOptions = {
+      ...(level !== undefined ? { level } : {}),
+      ...(memLevel !== undefined ? { memLevel } : {}),
+    };
+  }
+  if (serverNoContextTakeover !== undefined) options.serverNoContextTakeover = serverNoContextTakeover;
+  if (clientNoContextTakeover !== undefined) options.clientNoContextTakeover = clientNoContextTakeover;
+  if (serverMaxWindowBits !== undefined) options.serverMaxWindowBits = serverMaxWindowBits;
+  if (clientMaxWindowBits !== undefined) options.clientMaxWindowBits = clientMaxWindowBits;
+  if (concurrencyLimit !== undefined) options.concurrencyLimit = concurrencyLimit;
+  return options;
+}
+
+/**
+ * Effective settings (library defaults filled in) for logs and /metrics.
+ */
+export function describeCompression(options: PerMessageDeflateOptions | false) {
+  if (!options) {
+    return { enabled: false };
+  }
+  return {
+    enabled: true,
+    threshold: options.threshold ?? 1024,
+    level: options.zlibDeflateOptions?.level ?? 6,
+    memLevel: options.zlibDeflateOptions?.memLevel ?? 8,
+    serverNoContextTakeover: options.serverNoContextTakeover ?? false,
+    clientNoContextTakeover: options.clientNoContextTakeover ?? false,
+    serverMaxWindowBits: options.serverMaxWindowBits ?? 15,
+    clientMaxWindowBits: options.clientMaxWindowBits ?? 15,
+    concurrencyLimit: options.concurrencyLimit ?? 10,
+  };
+}
@@ -9,6 +9,10 @@ import { runGameFlowTests } from './specs/game-flow.test';
 import { runStateMachineTests } from './specs/state-machine.test';
 import { runBrakeFairnessTests } from './specs/brake-fairness.test';
 import { runScoringTests } from './specs/scoring.test';
+import { runSessionSchedulerTests } from './specs/session-scheduler.test';
+import { runStateDeltaTests } from './specs/state-delta.test';
+import { runPartitionTests } from './specs/partition.test';
+import { runContentPackQueryTests } from './specs/content-pack-query.test';
 
 interface SuiteResult {
   name: string;
@@ -47,6 +51,10 @@ async function main() {
   results.push(await runSuite('State Machine Transitions', runStateMachineTests));
   results.push(await runSuite('Brake Fairness', runBrakeFairnessTests));
   results.push(await runSuite('Scoring', runScoringTests));
+  results.push(await runSuite('Session Scheduler', runSessionSchedulerTests));
+  results.push(await runSuite('Delta State Snapshots', runStateDeltaTests));
+  results.push(await runSuite('Cluster Partitioning', runPartitionTests));
+  results.push(await runSuite('Content Pack Query', runContentPackQueryTests));
 
   // Print final summary
   console.log('\n');
@@ -11,6 +11,10 @@
 
 import { runWebSocketTests } from './specs/websocket.test';
 import { runGameFlowTests } from './specs/game-flow.test';
+import { runSessionSchedulerTests } from './specs/session-scheduler.test';
+import { runStateDeltaTests } from './specs/state-delta.test';
+import { runPartitionTests } from './specs/partition.test';
+import { runContentPackQueryTests } from './specs/content-pack-query.test';
 
 interface SuiteResult {
   name: string;
@@ -47,6 +51,10 @@ async function main() {
   // Run stable test suites only
   results.push(await runSuite('WebSocket Connection & Auth', runWebSocketTests));
   results.push(await runSuite('Game Flow', runGameFlowTests));
+  results.push(await runSuite('Session Scheduler', runSessionSchedulerTests));
+  results.push(await runSuite('Delta State Snapshots', runStateDeltaTests));
+  results.push(await runSuite('Cluster Partitioning', runPartitionTests));
+  results.push(await runSuite('Content Pack Query', runContentPackQueryTests));
 
   // Print final summary
   console.log('\n');
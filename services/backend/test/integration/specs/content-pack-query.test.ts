@@ -0,0 +1,307 @@
+/**
+ * Content pack index and listing tests (no server needed)
+ */
+
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+import { TestRunner, suite, test } from '../helpers/test-runner';
+import { assert, assertEqual } from '../helpers/assertions';
+import {
+  ContentPackQuery,
+  closeContentPackIndex,
+  forgetContentPack,
+  getContentPackSummary,
+  initContentPackIndex,
+  queryContentPacks,
+  refreshContentPack,
+} from '../../../src/game/content-pack-loader';
+
+interface Fixture {
+  roundId: string;
+  name: string;
+  country: string;
+  generatedAt: string;
+  verified: boolean;
+}
+
+// Listing order is newest first, roundId breaking ties
+const FIXTURES: Fixture[] = [
+  { roundId: 'round-paris', name: 'Paris', country: 'Frankrike', generatedAt: '2026-01-05T10:00:00.000Z', verified: true },
+  { roundId: 'round-lyon', name: 'Lyon', country: 'Frankrike', generatedAt: '2026-01-04T10:00:00.000Z', verified: false },
+  { roundId: 'round-oslo-a', name: 'Oslo', country: 'Norge', generatedAt: '2026-01-03T10:00:00.000Z', verified: true },
+  { roundId: 'round-oslo-b', name: 'Oslo', country: 'Norge', generatedAt: '2026-01-03T10:00:00.000Z', verified: false },
+  { roundId: 'round-malmo', name: 'Malmö', country: 'Sverige', generatedAt: '2026-01-02T10:00:00.000Z', verified: true },
+  { roundId: 'round-goteborg', name: 'Göteborg', country: 'Sverige', generatedAt: '2026-01-01T10:00:00.000Z', verified: true },
+  { roundId: 'round-rom', name: 'Rom', country: 'Italien', generatedAt: '2025-12-31T10:00:00.000Z', verified: false },
+];
+const ORDER = FIXTURES.map((f) => f.roundId);
+
+function packJson(fixture: Fixture): string {
+  return JSON.stringify({
+    roundId: fixture.roundId,
+    destination: { name: fixture.name, country: fixture.country, aliases: [] },
+    clues: [10, 8, 6, 4, 2].map((level) => ({ level, text: `Ledtråd ${level}` })),
+    followups: [{ questionText: 'Fråga?', options: null, correctAnswer: 'Svar' }],
+    metadata: { generatedAt: fixture.generatedAt, verified: fixture.verified, antiLeakChecked: true },
+  });
+}
+
+function writePack(dir: string, fixture: Fixture): void {
+  fs.writeFileSync(path.join(dir, `${fixture.roundId}.json`), packJson(fixture));
+}
+
+/**
+ * Builds a fresh index over a temp directory holding `fixtures` (plus any
+ * extra raw files) and runs `fn` against it
+ */
+async function withIndex(
+  fixtures: Fixture[],
+  fn: (dir: string) => Promise<void>,
+  rawFiles: Record<string, string> = {}
+): Promise<void> {
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'content-pack-query-'));
+  const saved = { dir: process.env.CONTENT_PACKS_DIR, rescan: process.env.CONTENT_PACK_RESCAN_MS };
+  try {
+    for (const fixture of fixtures) writePack(dir, fixture);
+    for (const [name, content] of Object.entries(rawFiles)) {
+      fs.writeFileSync(path.join(dir, name), content);
+    }
+    process.env.CONTENT_PACKS_DIR = dir;
+    process.env.CONTENT_PACK_RESCAN_MS = '0';
+    closeContentPackIndex();
+    await initContentPackIndex();
+    await fn(dir);
+  } finally {
+    closeContentPackIndex();
+    restoreEnv('CONTENT_PACKS_DIR', saved.dir);
+    restoreEnv('CONTENT_PACK_RESCAN_MS', saved.rescan);
+    fs.rmSync(dir, { recursive: true, force: true });
+  }
+}
+
+function restoreEnv(name: string, value: string | undefined): void {
+  if (value === undefined) {
+    delete process.env[name];
+  } else {
+    process.env[name] = value;
+  }
+}
+
+function ids(query: ContentPackQuery = {}): string[] {
+  return queryContentPacks(query).packs.map((p) => p.roundId);
+}
+
+/**
+ * Follows nextOffset from offset 0 and returns every page
+ */
+function allPages(query: ContentPackQuery): string[][] {
+  const pages: string[][] = [];
+  let offset: number | null = 0;
+  while (offset !== null) {
+    const page = queryContentPacks({ ...query, offset });
+    pages.push(page.packs.map((p) => p.roundId));
+    assert(pages.length <= ORDER.length + 1, 'Paging does not terminate');
+    offset = page.nextOffset;
+  }
+  return pages;
+}
+
+export async function runContentPackQueryTests(): Promise<void> {
+  const runner = new TestRunner();
+
+  await runner.runSuite(suite('Content Pack Query', [
+    test('Lists every pack newest first, roundId breaking ties', async () => {
+      await withIndex(FIXTURES, async () => {
+        const page = queryContentPacks();
+        assertEqual(page.packs.map((p) => p.roundId).join(','), ORDER.join(','), 'Listing order');
+        assertEqual(page.total, ORDER.length, 'total');
+        assertEqual(page.offset, 0, 'offset');
+        assertEqual(page.nextOffset, null, 'Single page has no next page');
+        assertEqual(page.errors.length, 0, 'No unreadable packs');
+      });
+    }),
+
+    test('Summaries carry the pack metadata', async () => {
+      await withIndex(FIXTURES, async () => {
+        const summary = queryContentPacks({ q: 'round-malmo' }).packs[0];
+        assertEqual(summary.destinationName, 'Malmö', 'destinationName');
+        assertEqual(summary.destinationCountry, 'Sverige', 'destinationCountry');
+        assertEqual(summary.generatedAt, '2026-01-02T10:00:00.000Z', 'generatedAt');
+        assertEqual(summary.verified, true, 'verified');
+        assertEqual(summary.antiLeakChecked, true, 'antiLeakChecked');
+        assertEqual(summary.clueCount, 5, 'clueCount');
+        assertEqual(summary.followupCount, 1, 'followupCount');
+        assertEqual(getContentPackSummary('round-malmo'), summary, 'getContentPackSummary returns the indexed summary');
+      });
+    }),
+
+    test('limit and offset cut the listing into pages', async () => {
+      await withIndex(FIXTURES, async () => {
+        const first = queryContentPacks({ limit: 3 });
+        assertEqual(first.packs.map((p) => p.roundId).join(','), ORDER.slice(0, 3).join(','), 'First page');
+        assertEqual(first.total, ORDER.length, 'total counts every match, not the page');
+        assertEqual(first.nextOffset, 3, 'nextOffset');
+
+        const middle = queryContentPacks({ limit: 3, offset: 3 });
+        assertEqual(middle.packs.map((p) => p.roundId).join(','), ORDER.slice(3, 6).join(','), 'Second page');
+        assertEqual(middle.offset, 3, 'offset echoed');
+        assertEqual(middle.nextOffset, 6, 'nextOffset');
+
+        const last = queryContentPacks({ limit: 3, offset: 6 });
+        assertEqual(last.packs.map((p) => p.roundId).join(','), ORDER.slice(6).join(','), 'Last page is short');
+        assertEqual(last.nextOffset, null, 'Last page has no next page');
+
+        assertEqual(ids({ offset: 5 }).join(','), ORDER.slice(5).join(','), 'No limit: everything from offset');
+      });
+    }),
+
+    test('Following nextOffset visits every pack exactly once', async () => {
+      await withIndex(FIXTURES, async () => {
+        for (const limit of [1, 2, 3, 6, 7, 100]) {
+          const pages = allPages({ limit });
+          assertEqual(pages.flat().join(','), ORDER.join(','), `limit ${limit}`);
+          assertEqual(pages.length, Math.ceil(ORDER.length / limit), `Page count for limit ${limit}`);
+        }
+      });
+    }),
+
+    test('An offset at or past the end gives an empty last page', async () => {
+      await withIndex(FIXTURES, async () => {
+        for (const offset of [ORDER.length, ORDER.length + 5]) {
+          const page = queryContentPacks({ offset, limit: 2 });
+          assertEqual(page.packs.length, 0, `offset ${offset}`);
+          assertEqual(page.total, ORDER.length, 'total is unaffected by offset');
+          assertEqual(page.nextOffset, null, 'No next page');
+        }
+        assertEqual(queryContentPacks({ offset: -3, limit: 1 }).offset, 0, 'Negative offset is clamped');
+      });
+    }),
+
+    test('verified filters on the pack flag', async () => {
+      await withIndex(FIXTURES, async () => {
+        const verified = FIXTURES.filter((f) => f.verified).map((f) => f.roundId);
+        const unverified = FIXTURES.filter((f) => !f.verified).map((f) => f.roundId);
+
+        const page = queryContentPacks({ verified: true });
+        assertEqual(page.packs.map((p) => p.roundId).join(','), verified.join(','), 'verified=true');
+        assertEqual(page.total, verified.length, 'total counts the filtered packs');
+        assertEqual(ids({ verified: false }).join(','), unverified.join(','), 'verified=false');
+
+        const pages = allPages({ verified: true, limit: 2 });
+        assertEqual(pages.flat().join(','), verified.join(','), 'Paging over the filtered listing');
+        assertEqual(queryContentPacks({ verified: true, limit: 2, offset: 2 }).nextOffset, null, 'Offsets count filtered packs');
+      });
+    }),
+
+    test('q matches roundId, destination and country, case-insensitively', async () => {
+      await withIndex(FIXTURES, async () => {
+        assertEqual(ids({ q: 'OSLO' }).join(','), 'round-oslo-a,round-oslo-b', 'Destination name');
+        assertEqual(ids({ q: 'frankrike' }).join(','), 'round-paris,round-lyon', 'Country');
+        assertEqual(ids({ q: 'oslo-b' }).join(','), 'round-oslo-b', 'roundId');
+        assertEqual(ids({ q: 'MALMÖ' }).join(','), 'round-malmo', 'Non-ASCII case folding');
+        assertEqual(ids({ q: '  sverige ' }).join(','), 'round-malmo,round-goteborg', 'Surrounding whitespace is ignored');
+        assertEqual(ids({ q: 'atlantis' }).length, 0, 'No match');
+        assertEqual(ids({ q: '   ' }).join(','), ORDER.join(','), 'Blank q matches everything');
+      });
+    }),
+
+    test('q does not match across fields', async () => {
+      await withIndex(FIXTURES, async () => {
+        // searchKey joins the fields with newlines
+        assertEqual(ids({ q: 'parisfrankrike' }).length, 0, 'Name and country run together');
+        assertEqual(ids({ q: 'paris frankrike' }).length, 0, 'Name and country with a space');
+      });
+    }),
+
+    test('Filters combine with each other and with paging', async () => {
+      await withIndex(FIXTURES, async () => {
+        const page = queryContentPacks({ q: 'oslo', verified: false });
+        assertEqual(page.packs.map((p) => p.roundId).join(','), 'round-oslo-b', 'q and verified');
+        assertEqual(page.total, 1, 'total');
+
+        const first = queryContentPacks({ q: 'round', verified: true, limit: 2 });
+        assertEqual(first.packs.map((p) => p.roundId).join(','), 'round-paris,round-oslo-a', 'First filtered page');
+        assertEqual(first.total, 4, 'total');
+        assertEqual(first.nextOffset, 2, 'nextOffset');
+        const second = queryContentPacks({ q: 'round', verified: true, limit: 2, offset: 2 });
+        assertEqual(second.packs.map((p) => p.roundId).join(','), 'round-malmo,round-goteborg', 'Second filtered page');
+        assertEqual(second.nextOffset, null, 'No third page');
+      });
+    }),
+
+    test('Unreadable packs are reported as errors, not counted', async () => {
+      const rawFiles = {
+        'round-broken.json': '{ not json',
+        'round-short.json': JSON.stringify({ ...JSON.parse(packJson(FIXTURES[0])), roundId: 'round-short', clues: [] }),
+        'notes.txt': 'ignored',
+      };
+      await withIndex(FIXTURES, async () => {
+        const page = queryContentPacks({ limit: 2 });
+        assertEqual(page.total, ORDER.length, 'Broken packs are not in total');
+        assertEqual(page.packs.map((p) => p.roundId).join(','), ORDER.slice(0, 2).join(','), 'Broken packs take no slot on the page');
+        const errors = page.errors.map((e) => e.packId).sort();
+        assertEqual(errors.join(','), 'round-broken,round-short', 'Both broken packs reported');
+        assert(page.errors.every((e) => e.error.length > 0), 'Errors carry a message');
+
+        assertEqual(queryContentPacks({ q: 'broken' }).errors.map((e) => e.packId).join(','), 'round-broken', 'q filters errors by roundId');
+        assertEqual(queryContentPacks({ q: 'paris' }).errors.length, 0, 'Non-matching errors are left out');
+        assertEqual(getContentPackSummary('round-broken'), undefined, 'No summary for a broken pack');
+      }, rawFiles);
+    }),
+
+    test('refreshContentPack picks up added and changed packs', async () => {
+      await withIndex(FIXTURES.slice(1), async (dir) => {
+        assertEqual(queryContentPacks().total, ORDER.length - 1, 'Before the write');
+
+        writePack(dir, FIXTURES[0]);
+        await refreshContentPack(FIXTURES[0].roundId);
+        assertEqual(ids({ limit: 1 }).join(','), 'round-paris', 'New newest pack heads the listing');
+        assertEqual(queryContentPacks().total, ORDER.length, 'total');
+
+        writePack(dir, { ...FIXTURES[6], verified: true, generatedAt: '2026-02-01T10:00:00.000Z' });
+        await refreshContentPack('round-rom');
+        assertEqual(ids({ limit: 1 }).join(','), 'round-rom', 'Changed generatedAt reorders the listing');
+        assertEqual(ids({ verified: true }).includes('round-rom'), true, 'Changed verified flag is filtered on');
+      });
+    }),
+
+    test('Removed packs leave the listing', async () => {
+      await withIndex(FIXTURES, async (dir) => {
+        forgetContentPack('round-paris');
+        assertEqual(ids().includes('round-paris'), false, 'forgetContentPack');
+
+        fs.unlinkSync(path.join(dir, 'round-lyon.json'));
+        await refreshContentPack('round-lyon');
+        assertEqual(ids().includes('round-lyon'), false, 'Refreshing a deleted file drops it');
+        assertEqual(queryContentPacks().total, ORDER.length - 2, 'total');
+        assertEqual(getContentPackSummary('round-lyon'), undefined, 'No summary left');
+      });
+    }),
+
+    test('A missing packs directory lists nothing', async () => {
+      await withIndex([], async (dir) => {
+        fs.rmSync(dir, { recursive: true, force: true });
+        closeContentPackIndex();
+        await initContentPackIndex();
+        const page = queryContentPacks({ limit: 10 });
+        assertEqual(page.packs.length, 0, 'packs');
+        assertEqual(page.total, 0, 'total');
+        assertEqual(page.nextOffset, null, 'nextOffset');
+      });
+    }),
+  ]));
+
+  runner.printSummary();
+
+  if (!runner.allPassed()) {
+    process.exit(1);
+  }
+}
+
+if (require.main === module) {
+  runContentPackQueryTests().catch(error => {
+    console.error('Test runner error:', error);
+    process.exit(1);
+  });
+}
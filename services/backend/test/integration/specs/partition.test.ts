@@ -0,0 +1,177 @@
+/**
+ * Cluster partitioning tests (no server needed)
+ */
+
+import { IncomingMessage } from 'http';
+import { v4 as uuidv4 } from 'uuid';
+import { TestRunner, suite, test } from '../helpers/test-runner';
+import { assert, assertEqual } from '../helpers/assertions';
+import { getLocalPartition, hashKey, ownerOf, ownsKey } from '../../../src/cluster/partition';
+import { routeRequest } from '../../../src/cluster/router';
+import { generateJoinCode } from '../../../src/utils/join-code';
+
+const SAMPLE_KEYS = 20000;
+
+function request(url: string, headers: Record<string, string> = {}): IncomingMessage {
+  return { url, headers } as unknown as IncomingMessage;
+}
+
+function unsignedToken(claims: object): string {
+  const encode = (value: object) => Buffer.from(JSON.stringify(value)).toString('base64url');
+  return `${encode({ alg: 'HS256', typ: 'JWT' })}.${encode(claims)}.signature`;
+}
+
+/**
+ * Keys per worker for `count` workers
+ */
+function spread(keys: string[], count: number): number[] {
+  const perWorker = new Array<number>(count).fill(0);
+  for (const key of keys) perWorker[ownerOf(key, count)]++;
+  return perWorker;
+}
+
+export async function runPartitionTests(): Promise<void> {
+  const runner = new TestRunner();
+
+  await runner.runSuite(suite('Cluster Partitioning', [
+    test('hashKey is 32-bit FNV-1a', async () => {
+      assertEqual(hashKey(''), 0x811c9dc5, 'Empty key is the offset basis');
+      assertEqual(hashKey('a'), 0xe40c292c, 'FNV-1a("a")');
+      assertEqual(hashKey('foobar'), 0xbf9cf968, 'FNV-1a("foobar")');
+    }),
+
+    test('hashKey is an unsigned 32-bit integer and stable', async () => {
+      for (let i = 0; i < 1000; i++) {
+        const key = uuidv4();
+        const hash = hashKey(key);
+        assert(Number.isInteger(hash) && hash >= 0 && hash <= 0xffffffff, `Hash out of range for ${key}: ${hash}`);
+        assertEqual(hashKey(key), hash, 'Same key, same hash');
+      }
+    }),
+
+    test('hashKey hashes UTF-16 code units, without normalizing', async () => {
+      assert(hashKey('Å') !== hashKey('A'), 'Non-ASCII keys hash differently');
+      assert(hashKey('\u00c5') !== hashKey('A\u030a'), 'Composed and decomposed forms are different keys');
+    }),
+
+    test('Without a cluster every key is owned by worker 0', async () => {
+      for (const count of [0, 1]) {
+        for (let i = 0; i < 100; i++) {
+          assertEqual(ownerOf(uuidv4(), count), 0, `count ${count}`);
+        }
+      }
+      assert(ownsKey({ index: 0, count: 1 }, 'ANY123'), 'Single partition owns everything');
+    }),
+
+    test('Exactly one worker owns each key', async () => {
+      for (const count of [2, 3, 4, 7, 8]) {
+        for (let i = 0; i < 500; i++) {
+          const key = i % 2 === 0 ? uuidv4() : generateJoinCode();
+          const owner = ownerOf(key, count);
+          assert(owner >= 0 && owner < count, `Owner ${owner} out of range for ${count} workers`);
+          const owners = Array.from({ length: count }, (_, index) => index).filter((index) => ownsKey({ index, count }, key));
+          assertEqual(owners.length, 1, `${key} with ${count} workers`);
+          assertEqual(owners[0], owner, 'ownsKey agrees with ownerOf');
+        }
+      }
+    }),
+
+    test('Session IDs spread evenly over workers', async () => {
+      const keys = Array.from({ length: SAMPLE_KEYS }, () => uuidv4());
+      for (const count of [2, 3, 4, 8]) {
+        const mean = SAMPLE_KEYS / count;
+        spread(keys, count).forEach((n, index) => {
+          assert(Math.abs(n - mean) < mean * 0.1, `Worker ${index}/${count} got ${n} of ${SAMPLE_KEYS} session IDs`);
+        });
+      }
+    }),
+
+    test('Join codes spread evenly over workers', async () => {
+      const keys = Array.from({ length: SAMPLE_KEYS }, () => generateJoinCode());
+      for (const count of [2, 3, 4, 8]) {
+        const mean = SAMPLE_KEYS / count;
+        spread(keys, count).forEach((n, index) => {
+          assert(Math.abs(n - mean) < mean * 0.1, `Worker ${index}/${count} got ${n} of ${SAMPLE_KEYS} join codes`);
+        });
+      }
+    }),
+
+    test('getLocalPartition reads the worker environment', async () => {
+      assertEqual(
+        JSON.stringify(getLocalPartition({ CLUSTER_WORKER_INDEX: '2', CLUSTER_WORKERS: '4' })),
+        JSON.stringify({ index: 2, count: 4 }),
+        'Forked worker'
+      );
+      assertEqual(
+        JSON.stringify(getLocalPartition({ CLUSTER_WORKER_INDEX: '0', CLUSTER_WORKERS: '2' })),
+        JSON.stringify({ index: 0, count: 2 }),
+        'First worker'
+      );
+    }),
+
+    test('getLocalPartition owns everything when not a valid worker', async () => {
+      const single = JSON.stringify({ index: 0, count: 1 });
+      const invalid: Array<Record<string, string | undefined>> = [
+        {},
+        { CLUSTER_WORKERS: '4' },
+        { CLUSTER_WORKER_INDEX: '1' },
+        { CLUSTER_WORKER_INDEX: '1', CLUSTER_WORKERS: '1' },
+        { CLUSTER_WORKER_INDEX: '4', CLUSTER_WORKERS: '4' },
+        { CLUSTER_WORKER_INDEX: '-1', CLUSTER_WORKERS: '4' },
+        { CLUSTER_WORKER_INDEX: 'x', CLUSTER_WORKERS: '4' },
+      ];
+      for (const env of invalid) {
+        assertEqual(JSON.stringify(getLocalPartition(env)), single, JSON.stringify(env));
+      }
+    }),
+
+    test('Router sends session routes to the owner of the session ID', async () => {
+      for (let i = 0; i < 200; i++) {
+        const sessionId = uuidv4();
+        const owner = ownerOf(sessionId, 4);
+        assertEqual(routeRequest(request(`/v1/sessions/${sessionId}`), 4), owner, 'GET session');
+        assertEqual(routeRequest(request(`/v1/sessions/${sessionId}/join?x=1`), 4), owner, 'Sub-route with query');
+      }
+    }),
+
+    test('Router sends join-code lookups to the owner of the upper-case code', async () => {
+      for (let i = 0; i < 200; i++) {
+        const code = generateJoinCode();
+        const owner = ownerOf(code, 4);
+        assertEqual(routeRequest(request(`/v1/sessions/by-code/${code}`), 4), owner, 'Upper-case code');
+        assertEqual(routeRequest(request(`/v1/sessions/by-code/${code.toLowerCase()}`), 4), owner, 'Codes are case-insensitive');
+      }
+    }),
+
+    test('Router sends WebSocket upgrades to the owner of the token\'s session', async () => {
+      for (let i = 0; i < 200; i++) {
+        const sessionId = uuidv4();
+        const token = unsignedToken({ sessionId, playerId: 'p1', role: 'player' });
+        const owner = ownerOf(sessionId, 3);
+        assertEqual(routeRequest(request(`/ws?token=${token}`), 3), owner, 'Token in query');
+        assertEqual(routeRequest(request('/ws', { authorization: `Bearer ${token}` }), 3), owner, 'Token in header');
+      }
+      assertEqual(routeRequest(request('/ws'), 3), null, 'No token: any worker');
+      assertEqual(routeRequest(request('/ws?token=garbage'), 3), null, 'Unreadable token: any worker');
+    }),
+
+    test('Router leaves stateless routes to any worker', async () => {
+      for (const url of ['/health', '/v1/sessions', '/v1/content/packs', '/metrics']) {
+        assertEqual(routeRequest(request(url), 4), null, url);
+      }
+    }),
+  ]));
+
+  runner.printSummary();
+
+  if (!runner.allPassed()) {
+    process.exit(1);
+  }
+}
+
+if (require.main === module) {
+  runPartitionTests().catch(error => {
+    console.error('Test runner error:', error);
+    process.exit(1);
+  });
+}
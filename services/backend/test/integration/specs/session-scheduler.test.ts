@@ -0,0 +1,281 @@
+/**
+ * Session scheduler tests (no server needed)
+ */
+
+import { TestRunner, suite, test } from '../helpers/test-runner';
+import { assert, assertEqual } from '../helpers/assertions';
+import { sessionScheduler, TimerKind } from '../../../src/utils/session-scheduler';
+import { collectMetrics } from '../../../src/utils/metrics';
+
+let sessionCounter = 0;
+
+function newSessionId(): string {
+  return `scheduler-test-${++sessionCounter}`;
+}
+
+function wait(ms: number): Promise<void> {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+function pendingFor(sessionId: string): number {
+  return sessionScheduler.pending().bySession.get(sessionId) ?? 0;
+}
+
+function driftCount(kind: TimerKind): number {
+  const drift = collectMetrics([], sessionScheduler.pending()).timers.drift as Record<string, { count: number }>;
+  return drift[kind]?.count ?? 0;
+}
+
+export async function runSessionSchedulerTests(): Promise<void> {
+  const runner = new TestRunner();
+
+  await runner.runSuite(suite('Session Scheduler', [
+    test('Fires once after the delay and forgets the timer', async () => {
+      const sessionId = newSessionId();
+      let fired = 0;
+
+      sessionScheduler.schedule(sessionId, 'clue', () => { fired++; }, 20);
+      assertEqual(pendingFor(sessionId), 1, 'Timer should be pending');
+      assertEqual(fired, 0, 'Should not fire early');
+
+      await wait(60);
+      assertEqual(fired, 1, 'Should fire exactly once');
+      assertEqual(pendingFor(sessionId), 0, 'Fired timer should be forgotten');
+      assert(!sessionScheduler.pending().bySession.has(sessionId), 'Empty session should be dropped');
+    }),
+
+    test('Scheduling into an occupied slot replaces the old timer', async () => {
+      const sessionId = newSessionId();
+      const fired: string[] = [];
+
+      sessionScheduler.schedule(sessionId, 'clue', () => { fired.push('first'); }, 20, { slot: 'clue' });
+      sessionScheduler.schedule(sessionId, 'clue', () => { fired.push('second'); }, 30, { slot: 'clue' });
+      sessionScheduler.schedule(sessionId, 'clue', () => { fired.push('other-slot'); }, 20, { slot: 'other' });
+      assertEqual(pendingFor(sessionId), 2, 'One timer per slot');
+      assert(sessionScheduler.has(sessionId, 'clue'), 'Slot should be occupied');
+
+      await wait(80);
+      assertEqual(fired.sort().join(','), 'other-slot,second', 'Only the replacing timer fires in the slot');
+      assert(!sessionScheduler.has(sessionId, 'clue'), 'Slot should be free after firing');
+    }),
+
+    test('Slots are per session', async () => {
+      const a = newSessionId();
+      const b = newSessionId();
+      let fired = 0;
+
+      sessionScheduler.schedule(a, 'disconnect', () => { fired++; }, 20, { slot: 'disconnect:p1' });
+      sessionScheduler.schedule(b, 'disconnect', () => { fired++; }, 20, { slot: 'disconnect:p1' });
+
+      await wait(60);
+      assertEqual(fired, 2, 'Same slot name in two sessions should not collide');
+    }),
+
+    test('cancel() clears a slot and reports whether it was pending', async () => {
+      const sessionId = newSessionId();
+      let fired = false;
+
+      sessionScheduler.schedule(sessionId, 'scoreboard', () => { fired = true; }, 20, { slot: 'scoreboard' });
+      assertEqual(sessionScheduler.cancel(sessionId, 'scoreboard'), true, 'Pending slot should be cancelled');
+      assertEqual(sessionScheduler.cancel(sessionId, 'scoreboard'), false, 'Empty slot has nothing to cancel');
+      assertEqual(sessionScheduler.cancel(newSessionId(), 'scoreboard'), false, 'Unknown session has nothing to cancel');
+
+      await wait(50);
+      assertEqual(fired, false, 'Cancelled timer should not fire');
+    }),
+
+    test('cancelTimer() cancels by handle', async () => {
+      const sessionId = newSessionId();
+      let fired = false;
+
+      const timer = sessionScheduler.schedule(sessionId, 'pacing', () => { fired = true; }, 20);
+      sessionScheduler.cancelTimer(timer);
+      assertEqual(pendingFor(sessionId), 0, 'Cancelled timer should be forgotten');
+
+      await wait(50);
+      assertEqual(fired, false, 'Cancelled timer should not fire');
+    }),
+
+    test('cancelSession() cancels every timer of the session only', async () => {
+      const sessionId = newSessionId();
+      const other = newSessionId();
+      let fired = 0;
+      let otherFired = 0;
+
+      sessionScheduler.schedule(sessionId, 'clue', () => { fired++; }, 20, { slot: 'clue' });
+      sessionScheduler.schedule(sessionId, 'pacing', () => { fired++; }, 20);
+      sessionScheduler.schedule(sessionId, 'disconnect', () => { fired++; }, 20, { slot: 'disconnect:p1' });
+      sessionScheduler.schedule(other, 'clue', () => { otherFired++; }, 20, { slot: 'clue' });
+
+      assertEqual(sessionScheduler.cancelSession(sessionId), 3, 'Should report all cancelled timers');
+      assertEqual(pendingFor(sessionId), 0, 'Session should have no timers left');
+      assertEqual(sessionScheduler.cancelSession(sessionId), 0, 'Second cancel finds nothing');
+
+      await wait(50);
+      assertEqual(fired, 0, 'Cancelled timers should not fire');
+      assertEqual(otherFired, 1, 'Other sessions should be untouched');
+    }),
+
+    test('cancelSession() with a phase drops only that phase', async () => {
+      const sessionId = newSessionId();
+      const fired: string[] = [];
+
+      sessionScheduler.schedule(sessionId, 'clue', () => { fired.push('clue'); }, 20, { phase: 'CLUE_LEVEL' });
+      sessionScheduler.schedule(sessionId, 'pacing', () => { fired.push('reveal'); }, 20, { phase: 'REVEAL_DESTINATION' });
+      sessionScheduler.schedule(sessionId, 'disconnect', () => { fired.push('unphased'); }, 20);
+
+      assertEqual(sessionScheduler.cancelSession(sessionId, { phase: 'CLUE_LEVEL' }), 1, 'Only the phase timer is cancelled');
+
+      await wait(50);
+      assertEqual(fired.sort().join(','), 'reveal,unphased', 'Timers of other phases and unphased ones still fire');
+    }),
+
+    test('cancelSession() with a kind drops only that kind', async () => {
+      const sessionId = newSessionId();
+      const fired: string[] = [];
+
+      sessionScheduler.schedule(sessionId, 'finale', () => { fired.push('finale-1'); }, 20, { phase: 'FINAL_RESULTS' });
+      sessionScheduler.schedule(sessionId, 'finale', () => { fired.push('finale-2'); }, 20, { phase: 'FINAL_RESULTS' });
+      sessionScheduler.schedule(sessionId, 'pacing', () => { fired.push('pacing'); }, 20, { phase: 'FINAL_RESULTS' });
+
+      assertEqual(sessionScheduler.cancelSession(sessionId, { kind: 'finale' }), 2, 'Both finale timers are cancelled');
+
+      await wait(50);
+      assertEqual(fired.join(','), 'pacing', 'Only the other kind fires');
+    }),
+
+    test('cancelSession() with a phase and a kind needs both to match', async () => {
+      const sessionId = newSessionId();
+      const fired: string[] = [];
+
+      sessionScheduler.schedule(sessionId, 'pacing', () => { fired.push('question-pacing'); }, 20, { phase: 'FOLLOWUP_QUESTION' });
+      sessionScheduler.schedule(sessionId, 'pacing', () => { fired.push('reveal-pacing'); }, 20, { phase: 'REVEAL_DESTINATION' });
+      sessionScheduler.schedule(sessionId, 'followup', () => { fired.push('question-followup'); }, 20, { phase: 'FOLLOWUP_QUESTION' });
+
+      assertEqual(
+        sessionScheduler.cancelSession(sessionId, { phase: 'FOLLOWUP_QUESTION', kind: 'pacing' }),
+        1,
+        'Only the timer matching both is cancelled'
+      );
+
+      await wait(50);
+      assertEqual(fired.sort().join(','), 'question-followup,reveal-pacing', 'The others still fire');
+    }),
+
+    test('sleep() resolves after the delay', async () => {
+      const sessionId = newSessionId();
+      const startedAt = Date.now();
+
+      await sessionScheduler.sleep(sessionId, 'pacing', 20);
+      assert(Date.now() - startedAt >= 15, 'Should not resolve early');
+      assertEqual(pendingFor(sessionId), 0, 'Nothing left pending');
+    }),
+
+    test('A cancelled sleep() never resolves', async () => {
+      const sessionId = newSessionId();
+      let resumed = false;
+
+      const step = (async () => {
+        await sessionScheduler.sleep(sessionId, 'pacing', 20, { phase: 'REVEAL_DESTINATION' });
+        resumed = true;
+      })();
+      void step;
+
+      assertEqual(sessionScheduler.cancelSession(sessionId, { phase: 'REVEAL_DESTINATION' }), 1, 'Sleep is a pending timer');
+
+      await wait(60);
+      assertEqual(resumed, false, 'The awaiting step should stop');
+      assertEqual(pendingFor(sessionId), 0, 'Nothing left pending');
+    }),
+
+    test('Sub-millisecond delays still fire', async () => {
+      const sessionId = newSessionId();
+      let fired = 0;
+
+      sessionScheduler.schedule(sessionId, 'pacing', () => { fired++; }, 0);
+      sessionScheduler.schedule(sessionId, 'pacing', () => { fired++; }, -5);
+
+      await wait(30);
+      assertEqual(fired, 2, 'Zero and negative delays fire after 1 ms');
+    }),
+
+    test('Callbacks that throw or reject do not stop other timers', async () => {
+      const sessionId = newSessionId();
+      let fired = false;
+
+      sessionScheduler.schedule(sessionId, 'intro', () => { throw new Error('sync failure (expected)'); }, 10);
+      sessionScheduler.schedule(sessionId, 'intro', async () => { throw new Error('async failure (expected)'); }, 10);
+      sessionScheduler.schedule(sessionId, 'intro', () => { fired = true; }, 20);
+
+      await wait(60);
+      assertEqual(fired, true, 'Later timer should still fire');
+      assertEqual(pendingFor(sessionId), 0, 'Failed timers are forgotten too');
+    }),
+
+    test('Pending timers are counted per session and kind', async () => {
+      const sessionId = newSessionId();
+
+      const before = sessionScheduler.pending().byKind.followup ?? 0;
+      sessionScheduler.schedule(sessionId, 'followup', () => undefined, 1000, { slot: 'followup' });
+      sessionScheduler.schedule(sessionId, 'followup', () => undefined, 1000, { slot: 'followup-next' });
+      sessionScheduler.schedule(sessionId, 'clue', () => undefined, 1000);
+
+      const pending = sessionScheduler.pending();
+      assertEqual(pending.bySession.get(sessionId), 3, 'Three timers in the session');
+      assertEqual(pending.byKind.followup, before + 2, 'Two followup timers');
+
+      sessionScheduler.cancelSession(sessionId);
+      assertEqual(sessionScheduler.pending().byKind.followup ?? 0, before, 'Counts drop on cancel');
+    }),
+
+    test('Each fire records its drift under its kind; cancelled timers do not', async () => {
+      const sessionId = newSessionId();
+      const pacingBefore = driftCount('pacing');
+      const finaleBefore = driftCount('finale');
+
+      for (let i = 0; i < 3; i++) {
+        sessionScheduler.schedule(sessionId, 'pacing', () => undefined, 5);
+      }
+      const cancelled = sessionScheduler.schedule(sessionId, 'pacing', () => undefined, 5);
+      sessionScheduler.cancelTimer(cancelled);
+      await sessionScheduler.sleep(sessionId, 'finale', 5);
+      await wait(30);
+
+      assertEqual(driftCount('pacing'), pacingBefore + 3, 'Three pacing fires');
+      assertEqual(driftCount('finale'), finaleBefore + 1, 'Sleeps count as fires');
+
+      const drift = collectMetrics([], sessionScheduler.pending()).timers.drift as Record<
+        string,
+        { count: number; meanMs: number; maxMs: number }
+      >;
+      assert(drift.pacing.meanMs >= 0, 'Drift is never negative');
+      assert(drift.pacing.maxMs < 1000, 'Drift should be the lateness, not the delay');
+    }),
+
+    test('Drift reflects a blocked event loop', async () => {
+      const sessionId = newSessionId();
+
+      sessionScheduler.schedule(sessionId, 'scoreboard', () => undefined, 5);
+      // Hold the loop past the deadline
+      const busyUntil = Date.now() + 60;
+      while (Date.now() < busyUntil) { /* spin */ }
+      await wait(20);
+
+      const after = collectMetrics([], sessionScheduler.pending()).timers.drift as Record<string, { maxMs: number }>;
+      assert(after.scoreboard.maxMs >= 40, `Late fire should show as drift (max ${after.scoreboard.maxMs}ms)`);
+    }),
+  ]));
+
+  runner.printSummary();
+
+  if (!runner.allPassed()) {
+    process.exit(1);
+  }
+}
+
+if (require.main === module) {
+  runSessionSchedulerTests().catch(error => {
+    console.error('Test runner error:', error);
+    process.exit(1);
+  });
+}
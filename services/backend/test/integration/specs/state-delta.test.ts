@@ -0,0 +1,487 @@
+/**
+ * Delta STATE_SNAPSHOT tests (no server needed)
+ *
+ * Drives DeltaChannel the way broadcastStateSnapshot() does and checks that
+ * a client applying the patches ends up with exactly projectState() for its
+ * role, in every phase. The client side mirrors docs/e2e_delta.py.
+ */
+
+import { TestRunner, suite, test } from '../helpers/test-runner';
+import { assert, assertEqual } from '../helpers/assertions';
+import { DeltaChannel, diffState } from '../../../src/utils/state-delta';
+import { SnapshotFrames } from '../../../src/utils/snapshot-frames';
+import { projectState } from '../../../src/utils/state-projection';
+import { EventEnvelope, PatchOp, Role } from '../../../src/types/events';
+import { GamePhase, GameState } from '../../../src/types/state';
+
+const SESSION_ID = 'delta-test-session';
+const T0 = 1739184000000;
+
+// ---------------------------------------------------------------------------
+// Client side
+// ---------------------------------------------------------------------------
+
+/**
+ * Applies ops without mutating `state` (copy-on-write along patched paths)
+ */
+function applyPatch(state: unknown, ops: PatchOp[]): unknown {
+  let root: any = Array.isArray(state) ? [...state] : { ...(state as object) };
+  const owned = new Set<unknown>([root]);
+  for (const op of ops) {
+    const path = op[0];
+    if (path.length === 0) {
+      root = op[1];
+      owned.add(root);
+      continue;
+    }
+    let node = root;
+    for (const key of path.slice(0, -1)) {
+      let child = node[key];
+      if (!owned.has(child)) {
+        child = Array.isArray(child) ? [...child] : { ...child };
+        owned.add(child);
+        node[key] = child;
+      }
+      node = child;
+    }
+    const last = path[path.length - 1];
+    if (op.length === 1) {
+      delete node[last];
+    } else {
+      node[last] = op[1];
+    }
+  }
+  return root;
+}
+
+/**
+ * One delta-mode connection: keeps every version it could be patched
+ * against, acknowledges what it applies and resyncs on a version gap.
+ */
+class DeltaClient {
+  readonly channel = new DeltaChannel();
+  readonly states = new Map<number, unknown>();
+  state: unknown;
+  fulls = 0;
+  patches = 0;
+  gaps = 0;
+
+  constructor(readonly role: Role, readonly playerId: string) {}
+
+  /**
+   * Handles one event from the server; false on a version gap
+   */
+  receive(event: EventEnvelope): boolean {
+    const payload = event.payload as any;
+    if (event.type === 'STATE_SNAPSHOT') {
+      this.fulls++;
+      this.state = payload.state;
+    } else {
+      assertEqual(event.type, 'STATE_PATCH', 'Delta connections get STATE_SNAPSHOT or STATE_PATCH');
+      const base = this.states.get(payload.baseSeq);
+      if (base === undefined) {
+        this.gaps++;
+        return false;
+      }
+      this.patches++;
+      this.state = applyPatch(base, payload.ops);
+    }
+    this.states.set(payload.seq, this.state);
+    this.channel.ack(payload.seq);
+    return true;
+  }
+
+  /**
+   * What the server does for one broadcast, including STATE_RESYNC after a gap
+   */
+  deliver(seq: number, frames: SnapshotFrames): void {
+    const event = this.channel.next(SESSION_ID, seq, frames.stateFor(this.role, this.playerId));
+    if (!this.receive(event)) {
+      const resync = this.channel.resync(SESSION_ID);
+      assert(resync !== undefined, 'Resync should answer once a snapshot was sent');
+      assert(this.receive(resync!), 'A resync snapshot always applies');
+    }
+  }
+}
+
+// ---------------------------------------------------------------------------
+// Fixtures
+// ---------------------------------------------------------------------------
+
+const PLAYER_IDS = ['player-1', 'player-2', 'player-3'];
+
+function lobbyState(): GameState {
+  return {
+    version: 1,
+    phase: 'LOBBY',
+    sessionId: SESSION_ID,
+    joinCode: 'ABC123',
+    players: [
+      { playerId: 'host-1', name: 'Host', role: 'host', isConnected: true, joinedAtMs: T0, score: 0 },
+      { playerId: 'tv-1', name: 'TV', role: 'tv', isConnected: true, joinedAtMs: T0, score: 0 },
+    ],
+    clueLevelPoints: null,
+    clueText: null,
+    brakeOwnerPlayerId: null,
+    lockedAnswers: [],
+    followupQuestion: null,
+    scoreboard: [],
+  };
+}
+
+/**
+ * A whole round as the state machine moves through it: every phase, brakes,
+ * locked answers, a disconnect, followups and the finale.
+ */
+function gameTimeline(): GameState[] {
+  const timeline: GameState[] = [];
+  let state = lobbyState();
+  const step = (change: (s: GameState) => void) => {
+    state = structuredClone(state);
+    change(state);
+    state.version++;
+    timeline.push(state);
+  };
+
+  timeline.push(state);
+  PLAYER_IDS.forEach((playerId, i) =>
+    step((s) => {
+      s.players.push({ playerId, name: `Player ${i + 1}`, role: 'player', isConnected: true, joinedAtMs: T0 + i, score: 0 });
+    })
+  );
+
+  step((s) => {
+    s.phase = 'PREPARING_ROUND';
+    s.contentPackId = 'pack-1';
+  });
+  step((s) => {
+    s.phase = 'ROUND_INTRO';
+    s.roundIndex = 0;
+    s.destination = { name: 'Tokyo', country: 'Japan', aliases: ['tokio'], revealed: false };
+    s.audioState = {
+      currentTrackId: 'travel-music',
+      isPlaying: true,
+      gainDb: -6,
+      activeVoiceClip: { clipId: 'intro', url: 'http://tts/intro.mp3', startAtServerMs: T0, durationMs: 3000, text: 'Välkommen' },
+      ttsManifest: [
+        { clipId: 'intro', phraseId: 'intro', url: 'http://tts/intro.mp3', durationMs: 3000, generatedAtMs: T0 },
+        { clipId: 'clue-10', phraseId: 'clue_10', url: 'http://tts/clue10.mp3', durationMs: 5000, generatedAtMs: T0 },
+      ],
+    };
+  });
+
+  const levels: Array<10 | 8 | 6 | 4 | 2> = [10, 8, 6, 4, 2];
+  levels.forEach((points, i) => {
+    step((s) => {
+      s.phase = 'CLUE_LEVEL';
+      s.clueLevelPoints = points;
+      s.clueText = `Ledtråd på ${points} poäng`;
+      s.clueTimerEnd = T0 + 60000 * (i + 1);
+      s.timer = { timerId: `clue-${points}`, startAtServerMs: T0 + 60000 * i, durationMs: 60000 };
+      s.brakeOwnerPlayerId = null;
+      s.audioState!.activeVoiceClip = { clipId: `clue-${points}`, url: `http://tts/clue${points}.mp3`, startAtServerMs: T0, durationMs: 5000, text: s.clueText };
+    });
+    if (i < PLAYER_IDS.length) {
+      const playerId = PLAYER_IDS[i];
+      step((s) => {
+        s.phase = 'PAUSED_FOR_BRAKE';
+        s.brakeOwnerPlayerId = playerId;
+        s.timer = null;
+      });
+      step((s) => {
+        s.lockedAnswers.push({ playerId, answerText: i === 1 ? 'Osaka' : 'Tokyo', lockedAtLevelPoints: points, lockedAtMs: T0 + i });
+      });
+    }
+  });
+
+  step((s) => {
+    const player = s.players.find((p) => p.playerId === 'player-3')!;
+    player.isConnected = false;
+    player.disconnectedAt = T0 + 1000;
+  });
+
+  step((s) => {
+    s.phase = 'REVEAL_DESTINATION';
+    s.destination!.revealed = true;
+    s.clueText = null;
+    s.clueTimerEnd = null;
+    s.timer = null;
+    s.audioState!.activeVoiceClip = null;
+    s.lockedAnswers.forEach((answer) => {
+      answer.isCorrect = answer.answerText === 'Tokyo';
+      answer.pointsAwarded = answer.isCorrect ? answer.lockedAtLevelPoints : 0;
+    });
+    s.players.forEach((p) => {
+      p.score = s.lockedAnswers.find((a) => a.playerId === p.playerId)?.pointsAwarded ?? 0;
+    });
+  });
+
+  [0, 1].forEach((index) => {
+    step((s) => {
+      s.phase = 'FOLLOWUP_QUESTION';
+      s.followupQuestion = {
+        questionText: `Följdfråga ${index + 1}`,
+        options: index === 0 ? ['Chiyoda', 'Shibuya', 'Shinjuku'] : null,
+        currentQuestionIndex: index,
+        totalQuestions: 2,
+        correctAnswer: index === 0 ? 'Chiyoda' : '1964',
+        answersByPlayer: [],
+        timer: { timerId: `followup-${index}`, startAtServerMs: T0, durationMs: 15000 },
+      };
+    });
+    ['player-1', 'player-2'].forEach((playerId) =>
+      step((s) => {
+        s.followupQuestion!.answersByPlayer.push({ playerId, playerName: playerId, answerText: 'Chiyoda' });
+      })
+    );
+  });
+
+  step((s) => {
+    s.players.find((p) => p.playerId === 'player-3')!.isConnected = true;
+    delete s.players.find((p) => p.playerId === 'player-3')!.disconnectedAt;
+  });
+  step((s) => {
+    s.phase = 'SCOREBOARD';
+    s.followupQuestion = null;
+    s.scoreboard = s.players
+      .filter((p) => p.role === 'player')
+      .map((p) => ({ playerId: p.playerId, name: p.name, score: p.score }))
+      .sort((a, b) => b.score - a.score)
+      .map((entry, i) => ({ ...entry, rank: i + 1 }));
+  });
+  step((s) => {
+    s.phase = 'ROUND_END';
+    s.destination = undefined;
+    s.lockedAnswers = [];
+  });
+  step((s) => {
+    s.phase = 'FINAL_RESULTS';
+    s.scoreboard[0].speedBonus = 2;
+    s.audioState!.currentTrackId = 'finale';
+  });
+
+  return timeline;
+}
+
+function connections(): DeltaClient[] {
+  return [
+    new DeltaClient('host', 'host-1'),
+    new DeltaClient('tv', 'tv-1'),
+    ...PLAYER_IDS.map((playerId) => new DeltaClient('player', playerId)),
+  ];
+}
+
+function expectedState(state: GameState, client: DeltaClient): unknown {
+  return JSON.parse(JSON.stringify(projectState(state, client.role, client.playerId)));
+}
+
+/**
+ * First path where two JSON values differ (key order ignored), or null
+ */
+function firstDifference(actual: unknown, expected: unknown, path = '$'): string | null {
+  if (actual === expected) return null;
+  if (Array.isArray(actual) && Array.isArray(expected)) {
+    if (actual.length !== expected.length) return `${path}: length ${actual.length} ≠ ${expected.length}`;
+    for (let i = 0; i < actual.length; i++) {
+      const difference = firstDifference(actual[i], expected[i], `${path}[${i}]`);
+      if (difference) return difference;
+    }
+    return null;
+  }
+  if (
+    typeof actual === 'object' && actual !== null && !Array.isArray(actual) &&
+    typeof expected === 'object' && expected !== null && !Array.isArray(expected)
+  ) {
+    const a = actual as Record<string, unknown>;
+    const e = expected as Record<string, unknown>;
+    for (const key of new Set([...Object.keys(a), ...Object.keys(e)])) {
+      if (!(key in a)) return `${path}.${key}: missing`;
+      if (!(key in e)) return `${path}.${key}: unexpected`;
+      const difference = firstDifference(a[key], e[key], `${path}.${key}`);
+      if (difference) return difference;
+    }
+    return null;
+  }
+  return `${path}: ${JSON.stringify(actual)} ≠ ${JSON.stringify(expected)}`;
+}
+
+function assertMatchesProjection(client: DeltaClient, state: GameState, context: string): void {
+  const difference = firstDifference(client.state, expectedState(state, client));
+  assert(difference === null, `${client.role} ${client.playerId} ${context}: ${difference}`);
+}
+
+export async function runStateDeltaTests(): Promise<void> {
+  const runner = new TestRunner();
+
+  await runner.runSuite(suite('Delta State Snapshots', [
+    test('The timeline covers every phase', async () => {
+      const phases = new Set(gameTimeline().map((s) => s.phase));
+      const all: GamePhase[] = [
+        'LOBBY', 'PREPARING_ROUND', 'ROUND_INTRO', 'CLUE_LEVEL', 'PAUSED_FOR_BRAKE',
+        'REVEAL_DESTINATION', 'FOLLOWUP_QUESTION', 'SCOREBOARD', 'FINAL_RESULTS', 'ROUND_END',
+      ];
+      for (const phase of all) {
+        assert(phases.has(phase), `Timeline should reach ${phase}`);
+      }
+    }),
+
+    test('diffState ops turn the previous projection into the next, for every role and phase', async () => {
+      const timeline = gameTimeline();
+      for (const client of connections()) {
+        for (let i = 1; i < timeline.length; i++) {
+          const prev = expectedState(timeline[i - 1], client);
+          const next = expectedState(timeline[i], client);
+          const prevCopy = JSON.stringify(prev);
+          const patched = applyPatch(prev, diffState(prev, next));
+          assertEqual(JSON.stringify(prev), prevCopy, 'diff and apply must not mutate the base');
+          const difference = firstDifference(patched, next);
+          assert(difference === null, `${client.role} ${client.playerId} ${timeline[i].phase} #${i}: ${difference}`);
+        }
+      }
+    }),
+
+    test('Patched client state equals projectState() after every broadcast', async () => {
+      const timeline = gameTimeline();
+      const clients = connections();
+      timeline.forEach((state, i) => {
+        const frames = new SnapshotFrames(SESSION_ID, state);
+        for (const client of clients) {
+          client.deliver(i + 1, frames);
+          assertMatchesProjection(client, state, `${state.phase} #${i}`);
+        }
+      });
+      for (const client of clients) {
+        assertEqual(client.fulls, 1, `${client.role} ${client.playerId}: only the first snapshot is full`);
+        assertEqual(client.patches, timeline.length - 1, `${client.role} ${client.playerId}: the rest are patches`);
+      }
+    }),
+
+    test('Players never receive another player\'s locked answer in a patch', async () => {
+      const timeline = gameTimeline();
+      const client = new DeltaClient('player', 'player-2');
+      let ownAnswerSent = false;
+      timeline.forEach((state, i) => {
+        const event = client.channel.next(SESSION_ID, i + 1, new SnapshotFrames(SESSION_ID, state).stateFor('player', 'player-2'));
+        const text = JSON.stringify(event.payload);
+        ownAnswerSent ||= text.includes('"playerId":"player-2","answerText"');
+        if (!state.destination?.revealed) {
+          assert(!text.includes('"playerId":"player-1","answerText"'), `player-1's answer leaked in ${state.phase}`);
+        }
+        client.receive(event);
+      });
+      assert(ownAnswerSent, 'The player\'s own locked answer is sent');
+    }),
+
+    test('A client that lost its history resyncs on the next patch', async () => {
+      const timeline = gameTimeline();
+      const clients = connections();
+      const half = Math.floor(timeline.length / 2);
+      timeline.forEach((state, i) => {
+        if (i === half) {
+          // e.g. the app was backgrounded and dropped its version store
+          clients.forEach((client) => client.states.clear());
+        }
+        const frames = new SnapshotFrames(SESSION_ID, state);
+        for (const client of clients) {
+          client.deliver(i + 1, frames);
+          assertMatchesProjection(client, state, `after gap, ${state.phase} #${i}`);
+        }
+      });
+      for (const client of clients) {
+        assertEqual(client.gaps, 1, 'One gap per client');
+        assertEqual(client.fulls, 2, 'The first snapshot and the resync are full');
+      }
+    }),
+
+    test('Patches lost in transit are covered by the next one', async () => {
+      const timeline = gameTimeline();
+      const clients = connections();
+      timeline.forEach((state, i) => {
+        const frames = new SnapshotFrames(SESSION_ID, state);
+        for (const client of clients) {
+          const event = client.channel.next(SESSION_ID, i + 1, frames.stateFor(client.role, client.playerId));
+          // Every third broadcast never arrives (and is never acknowledged)
+          if (i > 0 && i % 3 === 0 && i !== timeline.length - 1) continue;
+          assert(client.receive(event), 'The base of every patch is a version the client acknowledged');
+          assertMatchesProjection(client, state, `${state.phase} #${i}`);
+        }
+      });
+    }),
+
+    test('A resync answers with the newest version sent', async () => {
+      const timeline = gameTimeline();
+      const client = new DeltaClient('tv', 'tv-1');
+      assertEqual(client.channel.resync(SESSION_ID), undefined, 'Nothing to resync before the first snapshot');
+
+      timeline.slice(0, 5).forEach((state, i) => client.deliver(i + 1, new SnapshotFrames(SESSION_ID, state)));
+      const resync = client.channel.resync(SESSION_ID)!;
+      assertEqual(resync.type, 'STATE_SNAPSHOT', 'Resync is a full snapshot');
+      assertEqual((resync.payload as any).seq, 5, 'Resync carries the newest seq');
+      const difference = firstDifference((resync.payload as any).state, expectedState(timeline[4], client));
+      assert(difference === null, `Resync state: ${difference}`);
+    }),
+
+    test('Without acknowledgements the server falls back to full snapshots', async () => {
+      const timeline = gameTimeline();
+      const channel = new DeltaChannel();
+      const types: string[] = [];
+      timeline.forEach((state, i) => {
+        const event = channel.next(SESSION_ID, i + 1, new SnapshotFrames(SESSION_ID, state).stateFor('host', 'host-1'));
+        types.push(event.type);
+        if (i === 0) channel.ack(1);
+      });
+      assert(timeline.length > 18, 'Timeline should be longer than the delta window');
+      assertEqual(types.slice(1, 17).every((type) => type === 'STATE_PATCH'), true, 'Patches within the window');
+      assertEqual(types[17], 'STATE_SNAPSHOT', 'Full snapshot once 16 versions are unacknowledged');
+    }),
+
+    test('Unknown acknowledgements are refused and keep the base', async () => {
+      const timeline = gameTimeline();
+      const channel = new DeltaChannel();
+      channel.full(SESSION_ID, 1, new SnapshotFrames(SESSION_ID, timeline[0]).stateFor('player', 'player-1'));
+      assertEqual(channel.ack(99), false, 'A seq never sent is refused');
+      assertEqual(channel.ack(1), true, 'A seq sent is accepted');
+      assertEqual(channel.ack(1), false, 'An acknowledged seq is no longer pending');
+
+      const event = channel.next(SESSION_ID, 2, new SnapshotFrames(SESSION_ID, timeline[1]).stateFor('player', 'player-1'));
+      assertEqual(event.type, 'STATE_PATCH', 'Patched against the acknowledged base');
+      assertEqual((event.payload as any).baseSeq, 1, 'Base is the acknowledged seq');
+    }),
+
+    test('Large changes are sent as a full snapshot', async () => {
+      const base = gameTimeline()[0];
+      const crowded = structuredClone(base);
+      for (let i = 0; i < 100; i++) {
+        crowded.players.push({ playerId: `p${i}`, name: `P${i}`, role: 'player', isConnected: true, joinedAtMs: T0, score: 0 });
+      }
+      const scored = structuredClone(crowded);
+      scored.players.forEach((p) => { p.score += 1; });
+
+      const client = new DeltaClient('host', 'host-1');
+      client.deliver(1, new SnapshotFrames(SESSION_ID, crowded));
+      const event = client.channel.next(SESSION_ID, 2, new SnapshotFrames(SESSION_ID, scored).stateFor('host', 'host-1'));
+      assertEqual(event.type, 'STATE_SNAPSHOT', 'Over 64 ops falls back to full');
+      assert(client.receive(event), 'Full snapshot applies');
+      assertMatchesProjection(client, scored, 'after full fallback');
+
+      const renamed = structuredClone(scored);
+      renamed.players[2].name = 'Spelare 1';
+      client.deliver(3, new SnapshotFrames(SESSION_ID, renamed));
+      assertEqual(client.patches, 1, 'Small changes after the fallback are patched again');
+      assertMatchesProjection(client, renamed, 'patch after full fallback');
+    }),
+  ]));
+
+  runner.printSummary();
+
+  if (!runner.allPassed()) {
+    process.exit(1);
+  }
+}
+
+if (require.main === module) {
+  runStateDeltaTests().catch(error => {
+    console.error('Test runner error:', error);
+    process.exit(1);
+  });
+}